@@ -3,9 +3,9 @@ import logging
 import random
 import string
 import time
-from queue import Queue, Empty
+from queue import Queue, Empty, Full
 from threading import Thread, Event, Lock
-from typing import Optional, Any, Union
+from typing import Optional, Any, Union, List
 
 import zmq
 
@@ -15,6 +15,11 @@ from wattson.util import get_logger
 
 
 class StatisticClient(Thread):
+    """
+    Sends logged statistics to the StatisticServer.
+    Messages are queued and sent in batches over a PUSH socket without waiting for any acknowledgement.
+    If the queue or the socket's send buffer is full, messages are dropped rather than blocking the caller.
+    """
     id_cache: dict = {}
     global_id: int = 0
     id_lock: Lock = Lock()
@@ -42,34 +47,91 @@ class StatisticClient(Thread):
 
         random_name = ''.join(random.choice(string.ascii_lowercase) for _ in range(5))
         self.host_name = kwargs.get("host", f"C_{random_name}")
-        self._queue = Queue()
+        # Maximum number of messages per batch and maximum time (in seconds) a message is held back
+        self._batch_size = kwargs.get("batch_size", 100)
+        self._flush_interval = kwargs.get("flush_interval", 0.5)
+        self._send_high_water_mark = kwargs.get("send_high_water_mark", 1000)
+        self._queue = Queue(maxsize=kwargs.get("max_queue_size", 100000))
         self._stop_requested = Event()
+        self._counter_lock = Lock()
+        self._sent_count = 0
+        self._batch_count = 0
+        self._dropped_count = 0
 
     def start(self) -> None:
-        super().start()
-        if self._enable:
-            try:
-                self._logger.info(f"Connecting to {self.server_address}...")
-                self.socket = zmq.Context().socket(zmq.REQ)
-                self.socket.connect(self.server_address)
-            except Exception as e:
-                self._logger.error(f"Could not connect to Statistic Server: {e=}")
-        else:
+        if not self._enable:
             self._stop_requested.set()
+        super().start()
 
     def stop(self):
+        """
+        Stops the client after sending all queued messages.
+        """
         self._stop_requested.set()
 
     def run(self) -> None:
+        if self._stop_requested.is_set():
+            return
+        try:
+            self._logger.info(f"Connecting to {self.server_address}...")
+            self.socket = zmq.Context.instance().socket(zmq.PUSH)
+            self.socket.setsockopt(zmq.SNDHWM, self._send_high_water_mark)
+            self.socket.setsockopt(zmq.LINGER, 1000)
+            self.socket.connect(self.server_address)
+        except Exception as e:
+            self._logger.error(f"Could not connect to Statistic Server: {e=}")
+            return
+
         while not self._stop_requested.is_set():
+            batch = self._collect_batch()
+            if len(batch) > 0:
+                self._send_batch(batch)
+        # Send remaining messages
+        while not self._queue.empty():
+            self._send_batch(self._collect_batch())
+        self.socket.close()
+
+    def _collect_batch(self) -> List[dict]:
+        batch = []
+        deadline = time.monotonic() + self._flush_interval
+        while len(batch) < self._batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
             try:
-                message: StatisticMessage = self._queue.get(True, 1)
-                self.socket.send_pyobj(message)
-                self.socket.recv_pyobj()
+                message: StatisticMessage = self._queue.get(True, timeout)
             except Empty:
-                continue
-            except zmq.error.ZMQError as e:
-                self._logger.error(f"Could not send: {e=}")
+                break
+            batch.append(message.to_dict())
+        return batch
+
+    def _send_batch(self, batch: List[dict]):
+        if len(batch) == 0:
+            return
+        try:
+            self.socket.send_pyobj(batch, flags=zmq.NOBLOCK)
+            with self._counter_lock:
+                self._sent_count += len(batch)
+                self._batch_count += 1
+        except zmq.Again:
+            with self._counter_lock:
+                self._dropped_count += len(batch)
+        except zmq.error.ZMQError as e:
+            with self._counter_lock:
+                self._dropped_count += len(batch)
+            self._logger.error(f"Could not send: {e=}")
+
+    def get_statistics(self) -> dict:
+        """
+        Returns the number of queued, sent and dropped messages as well as the number of sent batches.
+        """
+        with self._counter_lock:
+            return {
+                "queued": self._queue.qsize(),
+                "sent": self._sent_count,
+                "batches": self._batch_count,
+                "dropped": self._dropped_count
+            }
 
     def _get_event_id(self, event_class: str, event_name: str):
         key = (event_class, event_name)
@@ -113,7 +175,11 @@ class StatisticClient(Thread):
             value=value,
             data=data
         )
-        self._queue.put(message)
+        try:
+            self._queue.put_nowait(message)
+        except Full:
+            with self._counter_lock:
+                self._dropped_count += 1
 
     @classmethod
     def get_primary_instance(cls) -> Optional['StatisticClient']:
@@ -19,6 +19,7 @@ class StatisticServerDeployment(PythonDeployment):
         self.network = self.config["network"]
 
         self.max_size = statistics.get("max_size", None)
+        self.buffer_size = statistics.get("buffer_size", 1000)
         self.target_folder = Path(statistics.get("folder", "."))
         self.server = None
         return
@@ -27,6 +28,7 @@ class StatisticServerDeployment(PythonDeployment):
         self.server = StatisticServer(
             ip=self.ip_address,
             max_size=self.max_size,
+            buffer_size=self.buffer_size,
             target_folder=self.target_folder,
             power_net=self.powernet,
             data_points=self.datapoints,
@@ -1,10 +1,11 @@
 import logging
 import threading
 import time
+from collections import deque
 from pathlib import Path
 from threading import Thread, Event, Lock
+from typing import Union
 
-import yaml
 import zmq
 import ujson
 
@@ -18,7 +19,8 @@ from wattson.analysis.statistics.common.statistic_message import StatisticMessag
 class StatisticServer(Thread):
     """
     The statistic server collects (logged) statistics from all its clients and stores them in a consistent format at the given location.
-    To limit the memory overhead, the statistic log can be split into several files after a pre-defined number of entries has been collected.
+    Entries are buffered and appended to a JSON lines file, such that the memory overhead is bounded by the buffer size.
+    The statistic log can be split into several files after a pre-defined number of entries (max_size) has been written.
 
     """
     def __init__(self, ip: str, **kwargs):
@@ -30,7 +32,14 @@ class StatisticServer(Thread):
         self.target_folder.mkdir(mode=0o755, parents=True, exist_ok=True)
 
         self.server_address = f"tcp://{self.ip}:{self.port}"
-        self._log = []
+        # Number of buffered entries that triggers a write, maximum number of buffered entries and maximum time
+        # (in seconds) an entry is buffered
+        self._buffer_size = kwargs.get("buffer_size", 1000)
+        self._max_buffer_size = kwargs.get("max_buffer_size", 100000)
+        # Entries that have not yet been written
+        self._log = deque(maxlen=self._max_buffer_size)
+        self._flush_interval = kwargs.get("flush_interval", 1)
+        self._receive_high_water_mark = kwargs.get("receive_high_water_mark", 1000)
 
         self._network = kwargs.get("network")
         self._power_net = kwargs.get("power_net")
@@ -40,7 +49,14 @@ class StatisticServer(Thread):
 
         self._log_file_postfix = 0
         self._log_file_name = "wattson_statistics"
-        self._log_file_format = "json"
+        self._log_file_format = "jsonl"
+        self._log_file = None
+        self._log_file_entries = 0
+        self._last_write = time.time()
+
+        self._received_count = 0
+        self._written_count = 0
+        self._dropped_count = 0
 
         super().__init__()
         self._stop_requested = Event()
@@ -53,34 +69,35 @@ class StatisticServer(Thread):
         super().start()
 
     def stop(self):
+        self._stop_requested.set()
         # When stopping, write out any left out messages
+        if self.is_alive():
+            self.join()
         self.write_log()
-        self._stop_requested.set()
 
     def run(self) -> None:
         with zmq.Context() as context:
-            with context.socket(zmq.REP) as sock:
+            with context.socket(zmq.PULL) as sock:
                 self._logger.info(f"Listening on {self.server_address}")
                 self.sock = sock
+                self.sock.setsockopt(zmq.RCVHWM, self._receive_high_water_mark)
                 self.sock.bind(self.server_address)
 
                 while not self._stop_requested.is_set():
                     if self.sock.poll(1000):
-                        message: StatisticMessage = self.sock.recv_pyobj()
-                        self._logger.debug(f"Got message: {message.to_dict()}")
-                        self.sock.send_pyobj(True)
-                        self.log(message)
-                        self._handle_log_size()
+                        messages = self.sock.recv_pyobj()
+                        if not isinstance(messages, list):
+                            messages = [messages]
+                        self._logger.debug(f"Got {len(messages)} messages")
+                        for message in messages:
+                            self.log(message)
+                    self._handle_log_size()
                 self._logger.debug(f"Terminating...")
 
     def _handle_log_size(self):
-        if self.max_size is None:
-            return
         with self._lock:
-            size = self._log_size()
-            if size > self.max_size:
+            if self._log_size() >= self._buffer_size or time.time() - self._last_write >= self._flush_interval:
                 self._write_log()
-                self._clear_log()
 
     def log_size(self):
         with self._lock:
@@ -89,38 +106,78 @@ class StatisticServer(Thread):
     def _log_size(self):
         return len(self._log)
 
-    def log(self, message: StatisticMessage, locked: bool = False):
+    def log(self, message: Union[StatisticMessage, dict], locked: bool = False):
+        if isinstance(message, StatisticMessage):
+            message = message.to_dict()
+        with self._lock:
+            self._received_count += 1
+            if len(self._log) >= self._max_buffer_size:
+                # The oldest entry is discarded by the deque
+                self._dropped_count += 1
+            self._log.append(message)
+
+    def get_statistics(self) -> dict:
+        """
+        Returns the number of received, written, queued (buffered) and dropped entries.
+        """
         with self._lock:
-            self._log.append(message.to_dict())
+            return {
+                "received": self._received_count,
+                "written": self._written_count,
+                "queued": len(self._log),
+                "dropped": self._dropped_count
+            }
 
     def write_log(self):
         with self._lock:
             self._write_log()
+            self._close_log_file()
             self.target_folder.chmod(0o755)
             for file in self.target_folder.glob("*"):
                 file.chmod(0o755)
 
-    def _write_log(self):
+    def _open_log_file(self):
         log_file = self.target_folder.joinpath(f"{self._log_file_name}_{self._log_file_postfix}.{self._log_file_format}")
         self._logger.info(f"Writing log to {log_file}")
+        self._log_file = log_file.open("a")
+        self._log_file_entries = 0
+        self._log_file_postfix += 1
+
+    def _close_log_file(self):
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+
+    def _write_log(self):
+        self._last_write = time.time()
+        if len(self._log) == 0:
+            return
+        entries = list(self._log)
         try:
-            start_time = time.time()
-            if self._log_file_format == "yml":
-                with log_file.open("w") as f:
-                    yaml.dump(self._log, f)
-            elif self._log_file_format == "json":
-                with log_file.open("w") as f:
-                    ujson.dump(self._log, f, indent=4)
-            end_time = time.time()
-            self._logger.info(f"Log written to {log_file} in {round(end_time - start_time, 2)}s")
+            index = 0
+            while index < len(entries):
+                if self._log_file is None:
+                    self._open_log_file()
+                count = len(entries) - index
+                if self.max_size is not None:
+                    count = min(count, self.max_size - self._log_file_entries)
+                self._log_file.write("".join(ujson.dumps(entry) + "\n" for entry in entries[index:index + count]))
+                self._log_file_entries += count
+                index += count
+                if self.max_size is not None and self._log_file_entries >= self.max_size:
+                    self._close_log_file()
+            if self._log_file is not None:
+                self._log_file.flush()
+            self._written_count += len(entries)
         except Exception as e:
             self._logger.error(f"Could not save file: {e=}")
             self._logger.warning("Could not log to file. Logging to stdout")
-            print(ujson.dumps(self._log))
-        self._log_file_postfix += 1
+            print(ujson.dumps(entries))
+            self._close_log_file()
+        self._clear_log()
 
     def _clear_log(self):
-        self._log = []
+        self._log.clear()
 
     def _log_general_statistics(self):
         analyzer = ScenarioAnalyzer(self, self._power_net, self._network, self._data_points)
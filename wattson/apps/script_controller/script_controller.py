@@ -5,7 +5,7 @@ import threading
 import time
 from pathlib import Path
 from threading import Thread
-from typing import Any, Union
+from typing import Any, Union, Dict, Tuple
 from typing import Optional
 
 from powerowl.layers.powergrid.values.grid_value import GridValue
@@ -50,6 +50,12 @@ class ScriptControllerApp:
         self.wattson_client_query_socket = wattson_client_query_socket
         self.wattson_client_publish_socket = wattson_client_publish_socket
         self.datapoints = datapoints
+        # IEC 104 data points by (COA, IOA)
+        self._dp_by_coa_ioa: Dict[Tuple[int, int], dict] = {}
+        for _, dps in self.datapoints.items():
+            for dp in dps:
+                if dp["protocol"] == "60870-5-104":
+                    self._dp_by_coa_ioa.setdefault((dp["protocol_data"]["coa"], dp["protocol_data"]["ioa"]), dp)
 
         self.wattson_time: Optional[WattsonTime] = None
         self.power_grid_model: Optional[PandaPowerGridModel] = None
@@ -307,12 +313,7 @@ class ScriptControllerApp:
         return self.grid_wrapper.handle_measurement(update)
 
     def _get_dp(self, coa: int, ioa: int) -> Optional[dict]:
-        for _, dps in self.datapoints.items():
-            for dp in dps:
-                if dp["protocol"] == "60870-5-104":
-                    if dp["protocol_data"]["coa"] == coa and dp["protocol_data"]["ioa"] == ioa:
-                        return dp
-        return None
+        return self._dp_by_coa_ioa.get((coa, ioa))
 
     def _async_worker(self):
         while not self._work_terminate.is_set():
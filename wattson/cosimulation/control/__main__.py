@@ -75,6 +75,8 @@ def main():
         config["vcc_proxy"] = True
     if args.statistics:
         config["enable_statistics"] = True
+    if args.query_workers > 0:
+        config["query_workers"] = args.query_workers
 
     config["configuration"]["vcc_export"] = []
     if args.vcc_export is None:
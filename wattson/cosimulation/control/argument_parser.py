@@ -35,6 +35,8 @@ def get_argument_parser() -> argparse.ArgumentParser:
     parser.add_argument("--physical-export", action="store_true", help="Set to enable exports for the physical simulator")
     parser.add_argument("--ccx-export", type=str, default=None, help="Provide a file name (jsonl) to enable notification export in the CCX")
     parser.add_argument("--statistics", "--stats", action="store_true", help="Enable statistics export")
+    parser.add_argument("--query-workers", type=int, default=0,
+                        help="Number of WattsonServer workers for read-only queries (default: 0, i.e., sequential query handling)")
 
     # Time
     parser.add_argument("--wall-clock-reference", type=float, default=None,
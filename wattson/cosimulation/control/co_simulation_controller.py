@@ -100,7 +100,13 @@ class CoSimulationController(WattsonQueryHandler):
             WattsonNetworkNotificationTopic.NODE_CUSTOM_EVENT
         ]
         self._export_notifications = kwargs.get("export_notifications", default_notification_export)
+        self._export_compression = kwargs.get("export_compression", None)
+        self._export_max_segment_size = kwargs.get("export_max_segment_size", None)
         self._notification_history = kwargs.get("notification_history", default_notification_history)
+        self._notification_history_size = kwargs.get("notification_history_size", 100000)
+        self._notification_history_max_age = kwargs.get("notification_history_max_age", None)
+        self._notification_history_spill = kwargs.get("notification_history_spill", False)
+        self._query_workers = kwargs.get("query_workers", 0)
         self._fixed_extensions = []
         if kwargs.get("vcc_proxy", False):
             from wattson.lib.scenarios.extensions.vcc_proxy import VccProxy
@@ -257,7 +263,13 @@ class CoSimulationController(WattsonQueryHandler):
             wattson_time=self._wattson_time,
             export_notifications=self._export_notifications,
             enable_history=self._notification_history,
-            export_folder=self.working_directory.joinpath("wattson-notifications")
+            history_size=self._notification_history_size,
+            history_max_age=self._notification_history_max_age,
+            history_spill_folder=self.working_directory.joinpath("wattson-notification-history") if self._notification_history_spill else None,
+            export_folder=self.working_directory.joinpath("wattson-notifications"),
+            export_compression=self._export_compression,
+            export_max_segment_size=self._export_max_segment_size,
+            query_workers=self._query_workers
         )
         self._simulation_control_server.start()
         self._simulation_control_server.wait_until_ready()
@@ -592,7 +604,10 @@ class CoSimulationController(WattsonQueryHandler):
 
     def send_notification(self, notification: WattsonNotification):
         if self.simulation_control_server is not None:
-            self.simulation_control_server.broadcast(notification)
+            if len(notification.recipients) > 0 and "*" not in notification.recipients:
+                self.simulation_control_server.multicast(notification, recipients=notification.recipients)
+            else:
+                self.simulation_control_server.broadcast(notification)
 
     def _wait_for_wattson_clients(self):
         self.logger.info("Waiting for clients to connect")
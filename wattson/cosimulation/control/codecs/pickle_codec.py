@@ -0,0 +1,19 @@
+import pickle
+from typing import Any
+
+from wattson.cosimulation.control.codecs.wattson_codec import WattsonCodec
+
+
+class PickleCodec(WattsonCodec):
+    """
+    The legacy codec that pickles whole message objects, which equals zmq's send_pyobj / recv_pyobj.
+    Pickle frames (protocol >= 2) start with the PROTO opcode (0x80), which is used as this codec's tag.
+    """
+    name = "pickle"
+    tag = pickle.PROTO[0]
+
+    def encode(self, message: Any) -> bytes:
+        return pickle.dumps(message, protocol=pickle.DEFAULT_PROTOCOL)
+
+    def decode(self, frame: bytes) -> Any:
+        return pickle.loads(frame)
@@ -0,0 +1,180 @@
+import marshal
+import struct
+import time
+from typing import Any, Optional, List, Dict, Type, Tuple
+
+from wattson.cosimulation.control.codecs.pickle_codec import PickleCodec
+from wattson.cosimulation.control.codecs.wattson_codec import WattsonCodec
+from wattson.cosimulation.control.messages.wattson_notification import WattsonNotification
+from wattson.cosimulation.control.messages.wattson_notification_topic import WattsonNotificationTopic
+from wattson.cosimulation.control.messages.wattson_query import WattsonQuery
+from wattson.cosimulation.control.messages.wattson_query_type import WattsonQueryType
+from wattson.cosimulation.control.messages.wattson_response import WattsonResponse
+
+
+class SchemaCodec(WattsonCodec):
+    """
+    A compact codec for the most common messages exchanged between WattsonServer and WattsonClient.
+    Each frame consists of a fixed struct header (tag, message class, query type or notification topic) followed by the
+    marshal-serialized primitive payload. The message classes, query types and notification topics are identified by
+    their index in fixed schema tables, i.e., the tables must never be reordered - append new entries or increase the
+    schema version (and thus the codec name) instead.
+    Messages that are not covered by the schema or whose payload contains non-primitive values are transparently
+    encoded with the PickleCodec.
+    """
+    name = "schema-1"
+    tag = 0x57
+
+    _HEADER = struct.Struct("!BBB")
+
+    _KIND_QUERY = 0
+    _KIND_RESPONSE = 1
+    _KIND_NOTIFICATION = 2
+
+    _RESPONSE_GENERIC = 0
+    _RESPONSE_WATTSON_TIME = 1
+
+    def __init__(self):
+        self._fallback = PickleCodec()
+        self._classes: List[Tuple[int, Type]] = []
+        self._class_ids: Dict[Type, int] = {}
+        self._query_types: List[Any] = []
+        self._query_type_ids: Dict[Any, int] = {}
+        self._topics: List[Any] = []
+        self._topic_ids: Dict[Any, int] = {}
+        self._tables_loaded = False
+
+    def _load_tables(self):
+        # Imported lazily to avoid circular imports between the control and the simulator modules
+        from wattson.powergrid.simulator.messages.power_grid_notification import PowerGridNotification
+        from wattson.powergrid.simulator.messages.power_grid_notification_topic import PowerGridNotificationTopic
+        from wattson.powergrid.simulator.messages.power_grid_query import PowerGridQuery
+        from wattson.powergrid.simulator.messages.power_grid_query_type import PowerGridQueryType
+
+        self._classes = [
+            (self._KIND_QUERY, WattsonQuery),
+            (self._KIND_QUERY, PowerGridQuery),
+            (self._KIND_RESPONSE, WattsonResponse),
+            (self._KIND_NOTIFICATION, WattsonNotification),
+            (self._KIND_NOTIFICATION, PowerGridNotification),
+        ]
+        self._query_types = [
+            WattsonQueryType.ECHO,
+            WattsonQueryType.GET_TIME,
+            WattsonQueryType.GET_EVENT_STATE,
+            WattsonQueryType.SET_EVENT,
+            WattsonQueryType.CLEAR_EVENT,
+            PowerGridQueryType.GET_GRID_VALUE,
+            PowerGridQueryType.GET_GRID_VALUE_VALUE,
+            PowerGridQueryType.SET_GRID_VALUE,
+            PowerGridQueryType.SET_GRID_VALUE_SIMPLE,
+            PowerGridQueryType.SET_GRID_VALUE_STATE,
+            PowerGridQueryType.GET_GRID_VALUES,
+            PowerGridQueryType.SET_GRID_VALUES,
+            PowerGridQueryType.GET_GRID_REPRESENTATION_SNAPSHOT,
+            PowerGridQueryType.GET_GRID_REPRESENTATION_DELTA,
+            PowerGridQueryType.SET_GRID_VALUE_INTERESTS,
+        ]
+        self._topics = [
+            WattsonNotificationTopic.REGISTRATION,
+            WattsonNotificationTopic.EVENTS,
+            PowerGridNotificationTopic.GRID_VALUES_UPDATED,
+            PowerGridNotificationTopic.GRID_VALUE_STATE_CHANGED,
+            PowerGridNotificationTopic.SIMULATION_STEP_DONE,
+            PowerGridNotificationTopic.PROTECTION_TRIGGERED,
+            PowerGridNotificationTopic.PROTECTION_CLEARED,
+        ]
+        self._class_ids = {cls: i for i, (_, cls) in enumerate(self._classes)}
+        # The enum types hash and compare by their value, i.e., plain strings are resolved as well
+        self._query_type_ids = {query_type: i for i, query_type in enumerate(self._query_types)}
+        self._topic_ids = {topic: i for i, topic in enumerate(self._topics)}
+        self._tables_loaded = True
+
+    def encode(self, message: Any) -> bytes:
+        if not self._tables_loaded:
+            self._load_tables()
+        frame = None
+        try:
+            frame = self._encode_schema(message)
+        except (ValueError, TypeError):
+            # Payload contains non-primitive values
+            pass
+        if frame is None:
+            return self._fallback.encode(message)
+        return frame
+
+    def _encode_schema(self, message: Any) -> Optional[bytes]:
+        class_id = self._class_ids.get(message.__class__)
+        if class_id is None:
+            return None
+        kind = self._classes[class_id][0]
+
+        if kind == self._KIND_QUERY:
+            message: WattsonQuery
+            type_id = self._query_type_ids.get(message.query_type)
+            if type_id is None or message.response is not None or message.allow_multi_handling or message.is_handled():
+                return None
+            payload = (message.query_data, message.client_id)
+            return self._HEADER.pack(self.tag, class_id, type_id) + marshal.dumps(payload)
+
+        if kind == self._KIND_RESPONSE:
+            message: WattsonResponse
+            if message.get_post_send_callback() is not None:
+                return None
+            data = message.data
+            if isinstance(data, dict) and len(data) == 1 and "wattson_time" in data:
+                payload = self._get_wattson_time_payload(data["wattson_time"])
+                if payload is None:
+                    return None
+                payload = (message.is_successful(),) + payload
+                return self._HEADER.pack(self.tag, class_id, self._RESPONSE_WATTSON_TIME) + marshal.dumps(payload)
+            payload = (message.is_successful(), data)
+            return self._HEADER.pack(self.tag, class_id, self._RESPONSE_GENERIC) + marshal.dumps(payload)
+
+        if kind == self._KIND_NOTIFICATION:
+            message: WattsonNotification
+            topic_id = self._topic_ids.get(message.notification_topic)
+            if topic_id is None:
+                return None
+            payload = (message.recipients, message.notification_data, message.timestamp)
+            return self._HEADER.pack(self.tag, class_id, topic_id) + marshal.dumps(payload)
+        return None
+
+    @staticmethod
+    def _get_wattson_time_payload(wattson_time: Any) -> Optional[Tuple[float, float, float]]:
+        from wattson.time.wattson_time import WattsonTime
+        if wattson_time.__class__ is not WattsonTime:
+            return None
+        if wattson_time._wall_clock_function is not time.time or wattson_time._wattson_client is not None:
+            return None
+        return wattson_time.reference_wall, wattson_time.reference_sim, wattson_time.speed
+
+    def decode(self, frame: bytes) -> Any:
+        if frame[0] != self.tag:
+            return self._fallback.decode(frame)
+        if not self._tables_loaded:
+            self._load_tables()
+        _, class_id, type_id = self._HEADER.unpack_from(frame)
+        payload = marshal.loads(memoryview(frame)[self._HEADER.size:])
+        kind, cls = self._classes[class_id]
+
+        if kind == self._KIND_QUERY:
+            query_data, client_id = payload
+            query = cls(query_type=self._query_types[type_id], query_data=query_data)
+            query.client_id = client_id
+            return query
+
+        if kind == self._KIND_RESPONSE:
+            if type_id == self._RESPONSE_WATTSON_TIME:
+                from wattson.time.wattson_time import WattsonTime
+                successful, reference_wall, reference_sim, speed = payload
+                wattson_time = WattsonTime(wall_clock_reference=reference_wall, sim_clock_reference=reference_sim, speed=speed)
+                return cls(successful=successful, data={"wattson_time": wattson_time})
+            successful, data = payload
+            return cls(successful=successful, data=data)
+
+        recipients, notification_data, timestamp = payload
+        notification = cls(notification_topic=self._topics[type_id], notification_data=notification_data)
+        notification.recipients = recipients
+        notification._timestamp = timestamp
+        return notification
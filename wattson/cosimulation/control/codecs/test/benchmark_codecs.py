@@ -0,0 +1,88 @@
+import argparse
+import random
+import time
+from typing import List, Tuple, Any
+
+from wattson.cosimulation.control.codecs.wattson_codecs import WattsonCodecs
+from wattson.cosimulation.control.messages.wattson_query import WattsonQuery
+from wattson.cosimulation.control.messages.wattson_query_type import WattsonQueryType
+from wattson.cosimulation.control.messages.wattson_response import WattsonResponse
+from wattson.powergrid.simulator.messages.power_grid_notification import PowerGridNotification
+from wattson.powergrid.simulator.messages.power_grid_notification_topic import PowerGridNotificationTopic
+from wattson.powergrid.simulator.messages.power_grid_query import PowerGridQuery
+from wattson.powergrid.simulator.messages.power_grid_query_type import PowerGridQueryType
+from wattson.time.wattson_time import WattsonTime
+
+
+def build_message_mix(count: int, grid_values_per_update: int, seed: int = 0) -> List[Any]:
+    """
+    Creates a message mix resembling the control plane traffic of RTUs polling the WattsonServer:
+    Mostly grid value reads, some writes, time and echo queries and periodic bulk grid value updates.
+    """
+    rng = random.Random(seed)
+    identifiers = [f"bus.{i}.MEASUREMENT.voltage" for i in range(max(grid_values_per_update, 1))]
+    wattson_time = WattsonTime().copy(safe=True)
+    # (weight, factory)
+    factories = [
+        (40, lambda: PowerGridQuery(PowerGridQueryType.GET_GRID_VALUE_VALUE, {"grid_value_identifier": rng.choice(identifiers)})),
+        (40, lambda: WattsonResponse(True, {"value": rng.random()})),
+        (5, lambda: PowerGridQuery(PowerGridQueryType.SET_GRID_VALUE_SIMPLE, {
+            "grid_value_identifier": rng.choice(identifiers), "value": rng.random(), "override": False
+        })),
+        (3, lambda: WattsonQuery(WattsonQueryType.ECHO)),
+        (3, lambda: WattsonResponse(True)),
+        (3, lambda: WattsonQuery(WattsonQueryType.GET_TIME)),
+        (3, lambda: WattsonResponse(True, {"wattson_time": wattson_time.copy(safe=True)})),
+        (3, lambda: PowerGridNotification(PowerGridNotificationTopic.GRID_VALUES_UPDATED, {"grid_values": {
+            identifier: {"value": rng.random(), "wall_clock_time": time.time(), "sim_clock_time": time.time()}
+            for identifier in identifiers
+        }})),
+    ]
+    weights = [weight for weight, _ in factories]
+    messages = []
+    for _, factory in rng.choices(factories, weights=weights, k=count):
+        message = factory()
+        if isinstance(message, WattsonQuery):
+            message.client_id = "rtu-1_0"
+        messages.append(message)
+    return messages
+
+
+def benchmark_codec(codec_name: str, messages: List[Any], repetitions: int) -> Tuple[float, float, int]:
+    codec = WattsonCodecs.get_codec(codec_name)
+    frames = [codec.encode(message) for message in messages]
+    size = sum(len(frame) for frame in frames)
+
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        for message in messages:
+            codec.encode(message)
+    encode_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(repetitions):
+        for frame in frames:
+            WattsonCodecs.decode(frame)
+    decode_duration = time.perf_counter() - start
+    return encode_duration, decode_duration, size
+
+
+def main():
+    parser = argparse.ArgumentParser("Wattson Codec Benchmark")
+    parser.add_argument("--messages", type=int, default=10000, help="Number of messages in the mix")
+    parser.add_argument("--grid-values", type=int, default=200, help="Grid values per GRID_VALUES_UPDATED notification")
+    parser.add_argument("--repetitions", type=int, default=5, help="Number of repetitions")
+    args = parser.parse_args()
+
+    messages = build_message_mix(args.messages, args.grid_values)
+    total = len(messages) * args.repetitions
+    print(f"{len(messages)} messages x {args.repetitions} repetitions")
+    print(f"{'Codec':<10} {'Encode µs/msg':>14} {'Decode µs/msg':>14} {'Bytes/msg':>10}")
+    for codec_name in WattsonCodecs.get_codec_names():
+        encode_duration, decode_duration, size = benchmark_codec(codec_name, messages, args.repetitions)
+        print(f"{codec_name:<10} {encode_duration / total * 1e6:>14.2f} {decode_duration / total * 1e6:>14.2f} "
+              f"{size / len(messages):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
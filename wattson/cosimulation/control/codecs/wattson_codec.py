@@ -0,0 +1,40 @@
+import abc
+from typing import Any
+
+
+class WattsonCodec(abc.ABC):
+    """
+    Encodes and decodes messages (queries, responses and notifications) exchanged between WattsonServer and WattsonClient.
+    The first byte of each encoded frame identifies the codec, such that frames of different codecs can be received on the
+    same socket.
+    """
+    name: str = "generic"
+    tag: int = 0x00
+
+    @abc.abstractmethod
+    def encode(self, message: Any) -> bytes:
+        """
+        Serializes the given message to a single frame.
+
+        Args:
+            message (Any):
+                The message to serialize.
+
+        Returns:
+            bytes: The encoded frame, starting with the codec's tag.
+        """
+        ...
+
+    @abc.abstractmethod
+    def decode(self, frame: bytes) -> Any:
+        """
+        Restores a message from the given frame.
+
+        Args:
+            frame (bytes):
+                The frame as created by encode.
+
+        Returns:
+            Any: The decoded message.
+        """
+        ...
@@ -0,0 +1,87 @@
+from typing import Dict, List, Optional, Any
+
+from wattson.cosimulation.control.codecs.pickle_codec import PickleCodec
+from wattson.cosimulation.control.codecs.schema_codec import SchemaCodec
+from wattson.cosimulation.control.codecs.wattson_codec import WattsonCodec
+
+
+class WattsonCodecs:
+    """
+    Registry of the codecs available for WattsonServer / WattsonClient communication.
+    The codecs are listed in the order of preference. The PickleCodec is always supported as the fallback.
+    """
+    DEFAULT_CODEC = PickleCodec.name
+
+    _codecs: Dict[str, WattsonCodec] = {
+        SchemaCodec.name: SchemaCodec(),
+        PickleCodec.name: PickleCodec(),
+    }
+    _tags: Dict[int, WattsonCodec] = {codec.tag: codec for codec in _codecs.values()}
+
+    @staticmethod
+    def get_codec_names() -> List[str]:
+        return list(WattsonCodecs._codecs.keys())
+
+    @staticmethod
+    def get_codec(name: Optional[str] = None) -> WattsonCodec:
+        """
+        Returns the codec with the given name or the default codec if the name is unknown.
+
+        Args:
+            name (Optional[str], optional):
+                The name of the codec.
+                (Default value = None)
+
+        Returns:
+            WattsonCodec: The requested codec.
+        """
+        codec = WattsonCodecs._codecs.get(name)
+        if codec is None:
+            codec = WattsonCodecs._codecs[WattsonCodecs.DEFAULT_CODEC]
+        return codec
+
+    @staticmethod
+    def get_codec_by_frame(frame: bytes) -> WattsonCodec:
+        codec = WattsonCodecs._tags.get(frame[0])
+        if codec is None:
+            raise ValueError(f"Unknown codec tag {frame[0]}")
+        return codec
+
+    @staticmethod
+    def decode(frame: bytes) -> Any:
+        """
+        Decodes the given frame with the codec identified by the frame's tag.
+
+        Args:
+            frame (bytes):
+                The frame to decode.
+
+        Returns:
+            Any: The decoded message.
+        """
+        return WattsonCodecs.get_codec_by_frame(frame).decode(frame)
+
+    @staticmethod
+    def negotiate(offered_codecs: Optional[List[str]], supported_codecs: Optional[List[str]] = None) -> str:
+        """
+        Selects the codec to use based on the codecs offered by a peer.
+        The first offered codec that is locally supported is selected.
+
+        Args:
+            offered_codecs (Optional[List[str]]):
+                The codec names offered by the peer in the order of its preference.
+            supported_codecs (Optional[List[str]], optional):
+                The locally supported (or enabled) codec names. Defaults to all known codecs.
+                (Default value = None)
+
+        Returns:
+            str: The name of the selected codec.
+        """
+        if supported_codecs is None:
+            supported_codecs = WattsonCodecs.get_codec_names()
+        if not isinstance(offered_codecs, (list, tuple)):
+            return WattsonCodecs.DEFAULT_CODEC
+        for codec_name in offered_codecs:
+            if codec_name in supported_codecs and codec_name in WattsonCodecs._codecs:
+                return codec_name
+        return WattsonCodecs.DEFAULT_CODEC
@@ -1,88 +1,69 @@
-import json
 import logging
-import queue
-import threading
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from wattson.cosimulation.control.messages.wattson_notification import WattsonNotification
 from wattson.util import get_logger
+from wattson.util.json.jsonl_export_writer import JSONLExportWriter
 
 
-class NotificationExportThread(threading.Thread):
-    def __init__(self, base_folder: Path, allowed_topics: List[str], enabled: bool = True, logger: Optional[logging.Logger] = None):
-        super().__init__()
+class NotificationExportThread:
+    """
+    Exports the notifications of the allowed topics to one <topic>.jsonl file per topic.
+    Notifications are written in batches by the background thread of a JSONLExportWriter, optionally compressed and
+    rotated into segments (see JSONLExportWriter).
+    """
+    def __init__(self, base_folder: Path, allowed_topics: List[str], enabled: bool = True,
+                 logger: Optional[logging.Logger] = None, **kwargs):
         self.base_folder = base_folder
         self.allowed_topics = allowed_topics
         self.export_enabled = enabled
-        self._export_queue = queue.Queue()
-        self._termination_requested = threading.Event()
-        self._export_files = {}
         self.logger = logger
         if self.logger is None:
             self.logger = get_logger("NotificationExportThread")
+        self._writer_options = {
+            "batch_size": kwargs.get("batch_size", 1000),
+            "flush_interval": kwargs.get("flush_interval", 1),
+            "compression": kwargs.get("compression", None),
+            "compression_level": kwargs.get("compression_level", None),
+            "max_segment_size": kwargs.get("max_segment_size", None),
+            "max_queue_size": kwargs.get("max_queue_size", 100000),
+        }
+        self._writer: Optional[JSONLExportWriter] = None
 
     def queue(self, notification: WattsonNotification):
         if not self.export_enabled:
             return
-        if self.base_folder is None:
+        if self._writer is None:
             return
         if notification.notification_topic not in self.allowed_topics:
             return
-        try:
-            self._export_queue.put(notification, False)
-        except queue.Full:
+        if not self._writer.write(notification.notification_topic, notification.to_dict()):
             self.logger.error("Could not queue for export: queue is full")
 
     def start(self):
-        self._termination_requested.clear()
-        if self.base_folder is not None:
-            try:
-                self.base_folder.mkdir(parents=True, exist_ok=True)
-            except Exception as e:
-                self.logger.error(f"Could not create export folder ({self.base_folder}) : {e}")
-                self.base_folder = None
-                return
-        else:
+        if self.base_folder is None:
             return
-        super().start()
-
-    def stop(self, timeout: Optional[float] = None):
-        self._termination_requested.set()
         try:
-            self.join(timeout=timeout)
-        except RuntimeError:
-            pass
+            self._writer = JSONLExportWriter(self.base_folder, name="W/NotExport", logger=self.logger,
+                                             **self._writer_options)
+            self._writer.start()
+        except Exception as e:
+            self.logger.error(f"Could not start notification export to {self.base_folder}: {e}")
+            self._writer = None
 
-    def run(self):
-        while not self._termination_requested.is_set():
-            try:
-                notification = self._export_queue.get(True, timeout=1)
-            except queue.Empty:
-                continue
-
-            handle = self._get_export_file_handle(notification.notification_topic)
-            if handle is None:
-                return
-            json.dump(notification.to_dict(), handle)
-            handle.write("\n")
-            handle.flush()
-        self._close_file_handles()
-
-    def _get_export_file_handle(self, topic: str):
-        if topic not in self._export_files:
-            try:
-                file = self.base_folder.joinpath(f"{topic}.jsonl")
-                handle = file.open("a")
-                self._export_files[topic] = handle
-            except Exception:
-                self.logger.error(f"Could not create notification export file for topic {topic}")
-                return None
-        return self._export_files[topic]
+    def stop(self, timeout: Optional[float] = None):
+        if self._writer is None:
+            return
+        if not self._writer.stop(timeout=timeout):
+            return
+        statistics = self._writer.get_statistics()
+        self.logger.debug(f"Exported {statistics['written']} notifications ({statistics['dropped']} dropped)")
 
-    def _close_file_handles(self):
-        for topic, handle in self._export_files.items():
-            try:
-                handle.close()
-            except Exception:
-                self.logger.error(f"Could not close {topic} export file")
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Returns the export throughput and backlog metrics (see JSONLExportWriter.get_statistics).
+        """
+        if self._writer is None:
+            return {}
+        return self._writer.get_statistics()
@@ -0,0 +1,264 @@
+import bisect
+import collections
+import itertools
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Deque, Dict, List, NamedTuple, Optional
+
+from wattson.cosimulation.control.messages.wattson_notification import WattsonNotification
+
+
+class NotificationHistoryEntry(NamedTuple):
+    sequence: int
+    time: float
+    notification: WattsonNotification
+
+
+class NotificationHistorySegment(NamedTuple):
+    first_sequence: int
+    last_sequence: int
+    first_time: float
+    last_time: float
+    file: Path
+
+
+class NotificationHistory:
+    """
+    Bounded history of published notifications.
+    Entries are kept in a ring buffer limited by the number of entries (max_size) and / or their age in seconds (max_age).
+    Each entry gets a consecutive sequence number and the time it has been added to the history.
+    Per-topic indices allow to query the slice of a topic's history within a time or sequence range without
+    iterating the full history.
+    If a spill folder is given, evicted entries are appended to on-disk JSONL segments that are still considered
+    by queries.
+    """
+    def __init__(self, max_size: Optional[int] = 100000, max_age: Optional[float] = None,
+                 spill_folder: Optional[Path] = None, segment_size: int = 10000, spill_batch_size: int = 500):
+        self.max_size = max_size
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._next_sequence = 0
+        self._entries: Deque[NotificationHistoryEntry] = collections.deque()
+        self._topic_entries: Dict[str, Deque[NotificationHistoryEntry]] = {}
+
+        self._spill_folder = spill_folder
+        self._segment_size = max(1, segment_size)
+        self._spill_batch_size = max(1, spill_batch_size)
+        self._spill_pending: List[NotificationHistoryEntry] = []
+        self._segments: List[NotificationHistorySegment] = []
+        if self._spill_folder is not None:
+            self._spill_folder.mkdir(parents=True, exist_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def append(self, notification: WattsonNotification) -> int:
+        """
+        Adds the notification to the history and evicts the entries exceeding the size or age limit.
+
+        Args:
+            notification (WattsonNotification):
+                The notification to add.
+
+        Returns:
+            int: The sequence number assigned to the notification.
+        """
+        with self._lock:
+            entry = NotificationHistoryEntry(self._next_sequence, time.time(), notification)
+            self._next_sequence += 1
+            self._entries.append(entry)
+            self._topic_entries.setdefault(notification.notification_topic, collections.deque()).append(entry)
+            self._evict(entry.time)
+            return entry.sequence
+
+    def _evict(self, now: float):
+        while len(self._entries) > 0:
+            oldest = self._entries[0]
+            exceeds_size = self.max_size is not None and len(self._entries) > self.max_size
+            exceeds_age = self.max_age is not None and now - oldest.time > self.max_age
+            if not exceeds_size and not exceeds_age:
+                break
+            self._entries.popleft()
+            topic_entries = self._topic_entries[oldest.notification.notification_topic]
+            # Entries of a topic are evicted in the same order as they are added
+            topic_entries.popleft()
+            if len(topic_entries) == 0:
+                del self._topic_entries[oldest.notification.notification_topic]
+            if self._spill_folder is not None:
+                self._spill_pending.append(oldest)
+        if len(self._spill_pending) >= self._spill_batch_size:
+            self._write_spilled()
+
+    def _write_spilled(self):
+        if len(self._spill_pending) == 0:
+            return
+        pending = self._spill_pending
+        self._spill_pending = []
+        while len(pending) > 0:
+            if len(self._segments) == 0 or self._get_segment_length(self._segments[-1]) >= self._segment_size:
+                file = self._spill_folder.joinpath(f"history-{pending[0].sequence:012d}.jsonl")
+                self._segments.append(NotificationHistorySegment(pending[0].sequence, -1, pending[0].time, -1, file))
+            segment = self._segments[-1]
+            free = self._segment_size - self._get_segment_length(segment)
+            chunk, pending = pending[:free], pending[free:]
+            with segment.file.open("a") as f:
+                for entry in chunk:
+                    f.write(json.dumps({"sequence": entry.sequence, "time": entry.time,
+                                        "notification": entry.notification.to_dict()}, default=str))
+                    f.write("\n")
+            self._segments[-1] = segment._replace(last_sequence=chunk[-1].sequence, last_time=chunk[-1].time)
+
+    @staticmethod
+    def _get_segment_length(segment: NotificationHistorySegment) -> int:
+        if segment.last_sequence < 0:
+            return 0
+        return segment.last_sequence - segment.first_sequence + 1
+
+    def query(self, topic: Optional[str] = None, start_time: Optional[float] = None, end_time: Optional[float] = None,
+              start_sequence: Optional[int] = None, end_sequence: Optional[int] = None,
+              limit: Optional[int] = None) -> List[WattsonNotification]:
+        """
+        Returns the notifications of the given topic (or of all topics) in the given range, ordered by their sequence.
+        See query_entries for the parameters.
+        """
+        entries = self.query_entries(topic=topic, start_time=start_time, end_time=end_time,
+                                     start_sequence=start_sequence, end_sequence=end_sequence, limit=limit)
+        return [entry.notification for entry in entries]
+
+    def query_entries(self, topic: Optional[str] = None, start_time: Optional[float] = None,
+                      end_time: Optional[float] = None, start_sequence: Optional[int] = None,
+                      end_sequence: Optional[int] = None, limit: Optional[int] = None) -> List[NotificationHistoryEntry]:
+        """
+        Returns the history entries (sequence number, time and notification) of the given topic (or of all topics) in
+        the given range, ordered by their sequence. All bounds are inclusive.
+        Spilled segments are read without holding the history's lock, i.e., appending is not blocked by the disk reads.
+
+        Args:
+            topic (Optional[str], optional):
+                The notification topic to filter for.
+                (Default value = None)
+            start_time (Optional[float], optional):
+                The earliest time the notification has been added to the history.
+                (Default value = None)
+            end_time (Optional[float], optional):
+                The latest time the notification has been added to the history.
+                (Default value = None)
+            start_sequence (Optional[int], optional):
+                The first sequence number to return.
+                (Default value = None)
+            end_sequence (Optional[int], optional):
+                The last sequence number to return.
+                (Default value = None)
+            limit (Optional[int], optional):
+                The maximum number of entries to return. The oldest matching entries are returned.
+                (Default value = None)
+
+        Returns:
+            List[NotificationHistoryEntry]: The matching entries.
+        """
+        with self._lock:
+            self._evict(time.time())
+            if topic is None:
+                entries = self._entries
+            else:
+                entries = self._topic_entries.get(topic, ())
+            start = 0
+            end = len(entries)
+            if start_sequence is not None:
+                start = max(start, bisect.bisect_left(entries, start_sequence, key=lambda e: e.sequence))
+            if end_sequence is not None:
+                end = min(end, bisect.bisect_right(entries, end_sequence, key=lambda e: e.sequence))
+            if start_time is not None:
+                start = max(start, bisect.bisect_left(entries, start_time, key=lambda e: e.time))
+            if end_time is not None:
+                end = min(end, bisect.bisect_right(entries, end_time, key=lambda e: e.time))
+            if limit is not None:
+                end = min(end, start + limit)
+            in_memory = list(itertools.islice(entries, start, max(start, end)))
+
+            # Only consider spilled entries if the range reaches beyond the in-memory history
+            segments = []
+            if self._spill_folder is not None and self._reaches_spilled(start_time, start_sequence):
+                self._write_spilled()
+                segments = list(self._segments)
+
+        spilled = self._query_segments(segments, topic, start_time, end_time, start_sequence, end_sequence, limit)
+        entries = spilled + in_memory
+        if limit is not None:
+            entries = entries[:limit]
+        return entries
+
+    def _reaches_spilled(self, start_time: Optional[float], start_sequence: Optional[int]) -> bool:
+        # Called with the lock held
+        if len(self._entries) == 0:
+            return True
+        oldest = self._entries[0]
+        if start_sequence is not None and start_sequence >= oldest.sequence:
+            return False
+        if start_time is not None and start_time >= oldest.time:
+            return False
+        return True
+
+    @staticmethod
+    def _query_segments(segments: List[NotificationHistorySegment], topic: Optional[str], start_time: Optional[float],
+                        end_time: Optional[float], start_sequence: Optional[int], end_sequence: Optional[int],
+                        limit: Optional[int]) -> List[NotificationHistoryEntry]:
+        entries = []
+        for segment in segments:
+            if limit is not None and len(entries) >= limit:
+                break
+            if start_sequence is not None and segment.last_sequence < start_sequence:
+                continue
+            if end_sequence is not None and segment.first_sequence > end_sequence:
+                break
+            if start_time is not None and segment.last_time < start_time:
+                continue
+            if end_time is not None and segment.first_time > end_time:
+                break
+            with segment.file.open("r") as f:
+                for line in f:
+                    entry = json.loads(line)
+                    sequence = entry["sequence"]
+                    if end_sequence is not None and sequence > end_sequence:
+                        break
+                    if end_time is not None and entry["time"] > end_time:
+                        break
+                    notification = entry["notification"]
+                    matches = topic is None or notification.get("notification_topic") == topic
+                    matches = matches and (start_sequence is None or sequence >= start_sequence)
+                    matches = matches and (start_time is None or entry["time"] >= start_time)
+                    if matches:
+                        entries.append(NotificationHistoryEntry(sequence, entry["time"],
+                                                                WattsonNotification.from_dict(notification)))
+                        if limit is not None and len(entries) >= limit:
+                            break
+                    # The segment might be appended to concurrently - only read the lines of the snapshot
+                    if sequence >= segment.last_sequence:
+                        break
+        return entries
+
+    def get_sequence_range(self) -> Optional[tuple]:
+        """
+        Returns the first available (including spilled entries) and the last sequence number of the history,
+        or None if the history is empty.
+        """
+        with self._lock:
+            if len(self._entries) == 0 and len(self._segments) == 0 and len(self._spill_pending) == 0:
+                return None
+            if len(self._segments) > 0:
+                first = self._segments[0].first_sequence
+            elif len(self._spill_pending) > 0:
+                first = self._spill_pending[0].sequence
+            else:
+                first = self._entries[0].sequence
+            return first, self._next_sequence - 1
+
+    def close(self):
+        """
+        Writes all pending evicted entries to the spill segments.
+        """
+        with self._lock:
+            if self._spill_folder is not None:
+                self._write_spilled()
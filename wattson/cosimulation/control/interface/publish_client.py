@@ -1,13 +1,14 @@
 import logging
 import threading
 import queue
-from typing import Optional, Callable
+from typing import Optional, Callable, Set, Any
 
 import zmq
 import time
 
-from wattson.cosimulation.control.constants import WATTSON_BROADCAST_TOPIC
+from wattson.cosimulation.control.codecs.wattson_codecs import WattsonCodecs
 from wattson.cosimulation.control.interface.async_resolve import AsyncResolve
+from wattson.cosimulation.control.interface.publish_topics import get_zmq_topic, get_topic_name, BROADCAST_RECIPIENT
 from wattson.cosimulation.control.messages.wattson_notification import WattsonNotification
 from wattson.cosimulation.control.messages.wattson_notification_topic import WattsonNotificationTopic
 from wattson.util import get_logger
@@ -47,7 +48,8 @@ class PublishClient(threading.Thread):
         self._on_receive_notification_callback = on_receive_notification_callback
         self._termination_requested = threading.Event()
         self._worker_termination_requested = threading.Event()
-        self._socket_poll_timeout = 1000
+        # Subscription changes are applied by the socket thread, i.e., the poll timeout bounds their delay
+        self._socket_poll_timeout = 100
         self._queue_poll_timeout = 1
         self._logger = get_logger("PublishClient", "PublishClient")
         # self._logger.setLevel(logging.DEBUG)
@@ -55,7 +57,12 @@ class PublishClient(threading.Thread):
         self._resolve_queue = queue.Queue()
         self._direct_resolve = [WattsonNotificationTopic.ASYNC_QUERY_RESOLVE]
         self._socket = None
-        self._socket_ready_event = threading.Event()
+        self._subscription_lock = threading.Lock()
+        self._subscription_changed = threading.Event()
+        self._subscribed_topics: Set[str] = set()
+        self._recipients: Set[str] = {BROADCAST_RECIPIENT}
+        self._broadcast_excluded_topics: Set[str] = set()
+        self._active_prefixes: Set[bytes] = set()
 
     def set_on_receive_notification_callback(self, callback: Callable[[WattsonNotification], None]):
         """
@@ -118,13 +125,16 @@ class PublishClient(threading.Thread):
             with context.socket(zmq.SUB) as socket:
                 self._logger.info(f"Connecting to {self._socket_string}")
                 self._socket = socket
+                self._active_prefixes = set()
+                self._subscription_changed.set()
                 with socket.connect(self._socket_string):
-                    socket.subscribe(WATTSON_BROADCAST_TOPIC)
                     while not self._termination_requested.is_set():
+                        if self._subscription_changed.is_set():
+                            self._apply_subscriptions(socket)
                         if not socket.poll(self._socket_poll_timeout):
                             continue
-                        topic: str = socket.recv_string()
-                        notification: WattsonNotification = socket.recv_pyobj()
+                        topic: bytes = socket.recv()
+                        notification: WattsonNotification = WattsonCodecs.decode(socket.recv())
 
                         # self._logger.info(f"ZMQ: {topic} // Wattson: {notification.notification_topic}")
 
@@ -143,11 +153,82 @@ class PublishClient(threading.Thread):
                             self._resolve_queue.put(notification)
 
     def set_registration(self, client_id: str):
-        if self._socket is None:
-            if not self._socket_ready_event.wait(timeout=5):
-                self._logger.error(f"Could not set registration: socket not ready")
-                return
-        self._socket.subscribe(client_id)
+        """
+        Subscribes to the notifications that are explicitly addressed to the given client ID.
+
+        Args:
+            client_id (str):
+                The client ID assigned by the WattsonServer.
+        """
+        with self._subscription_lock:
+            self._recipients = {BROADCAST_RECIPIENT, client_id}
+        self._subscription_changed.set()
+
+    def subscribe_topic(self, topic: Any):
+        """
+        Subscribes to the given notification topic. Notifications of other topics are dropped by libzmq before they are
+        received and deserialized.
+
+        Args:
+            topic (Any):
+                The notification topic to subscribe to. "*" subscribes to all topics.
+        """
+        with self._subscription_lock:
+            self._subscribed_topics.add(get_topic_name(topic))
+        self._subscription_changed.set()
+
+    def unsubscribe_topic(self, topic: Any):
+        """
+        Unsubscribes from the given notification topic.
+
+        Args:
+            topic (Any):
+                The notification topic to unsubscribe from.
+        """
+        with self._subscription_lock:
+            self._subscribed_topics.discard(get_topic_name(topic))
+        self._subscription_changed.set()
+
+    def set_broadcast_subscription(self, topic: Any, subscribe: bool):
+        """
+        Defines whether broadcasts of the given notification topic are received, or only notifications that are
+        explicitly addressed to this client.
+
+        Args:
+            topic (Any):
+                The notification topic.
+            subscribe (bool):
+                Whether to receive broadcasts of this topic.
+        """
+        with self._subscription_lock:
+            if subscribe:
+                self._broadcast_excluded_topics.discard(get_topic_name(topic))
+            else:
+                self._broadcast_excluded_topics.add(get_topic_name(topic))
+        self._subscription_changed.set()
+
+    def unsubscribe_all(self):
+        with self._subscription_lock:
+            self._subscribed_topics.clear()
+        self._subscription_changed.set()
+
+    def _apply_subscriptions(self, socket: zmq.Socket):
+        with self._subscription_lock:
+            self._subscription_changed.clear()
+            if "*" in self._subscribed_topics:
+                prefixes = {get_zmq_topic("*")}
+            else:
+                prefixes = {
+                    get_zmq_topic(topic, recipient)
+                    for topic in self._subscribed_topics
+                    for recipient in self._recipients
+                    if recipient != BROADCAST_RECIPIENT or topic not in self._broadcast_excluded_topics
+                }
+        for prefix in self._active_prefixes - prefixes:
+            socket.unsubscribe(prefix)
+        for prefix in prefixes - self._active_prefixes:
+            socket.subscribe(prefix)
+        self._active_prefixes = prefixes
 
     def _resolve_notification_thread(self):
         while not self._worker_termination_requested.is_set():
@@ -2,12 +2,16 @@ import copy
 import queue
 import threading
 import traceback
-from typing import TYPE_CHECKING, Optional, List
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, List, Dict, Set, Tuple
 
 from wattson.util.threading import set_thread_name
 import zmq
-from wattson.cosimulation.control.constants import WATTSON_BROADCAST_TOPIC
+from wattson.cosimulation.control.codecs.wattson_codecs import WattsonCodecs
 from wattson.cosimulation.control.interface.notification_export_thread import NotificationExportThread
+from wattson.cosimulation.control.interface.notification_history import NotificationHistory, NotificationHistoryEntry
+from wattson.cosimulation.control.interface.publish_topics import get_zmq_topic, get_topic_name, BROADCAST_RECIPIENT, \
+    TOPIC_SEPARATOR
 
 from wattson.cosimulation.control.messages.wattson_notification import WattsonNotification
 from wattson.networking.namespaces.namespace import Namespace
@@ -49,9 +53,22 @@ class PublishServer(threading.Thread):
         self._enable_history = kwargs.get("enable_history", False)
         self._export_notifications = kwargs.get("export_notifications", [])
         self._export_folder = kwargs.get("export_folder", None)
-        self._export_thread = NotificationExportThread(self._export_folder, self._export_notifications)
-        self._publishing_history: List[WattsonNotification] = []
+        self._export_thread = NotificationExportThread(
+            self._export_folder, self._export_notifications,
+            batch_size=kwargs.get("export_batch_size", 1000),
+            flush_interval=kwargs.get("export_flush_interval", 1),
+            compression=kwargs.get("export_compression", None),
+            max_segment_size=kwargs.get("export_max_segment_size", None)
+        )
+        history_spill_folder = kwargs.get("history_spill_folder", None)
+        self._publishing_history = NotificationHistory(
+            max_size=kwargs.get("history_size", 100000),
+            max_age=kwargs.get("history_max_age", None),
+            spill_folder=Path(history_spill_folder) if history_spill_folder is not None else None
+        )
         self._ready_event = threading.Event()
+        self._subscribed_prefixes: Set[bytes] = set()
+        self._topic_statistics: Dict[str, Dict[str, int]] = {}
 
     def start(self) -> None:
         self._termination_requested.clear()
@@ -61,6 +78,7 @@ class PublishServer(threading.Thread):
     def stop(self, timeout: Optional[float] = None):
         self._termination_requested.set()
         self._export_thread.stop(timeout=timeout)
+        self._publishing_history.close()
         try:
             self.join(timeout=timeout)
         except RuntimeError:
@@ -72,19 +90,40 @@ class PublishServer(threading.Thread):
     def is_ready(self) -> bool:
         return self._ready_event.is_set()
 
-    def get_history(self, topic: Optional[str] = None):
-        with self._lock:
-            history = copy.copy(self._publishing_history)
-        if topic is None:
-            return history
-        return [notification for notification in self._publishing_history if notification.notification_topic == topic]
+    def get_history(self, topic: Optional[str] = None, start_time: Optional[float] = None,
+                    end_time: Optional[float] = None, start_sequence: Optional[int] = None,
+                    end_sequence: Optional[int] = None, limit: Optional[int] = None) -> List[WattsonNotification]:
+        """
+        Returns the slice of the notification history matching the given topic and time or sequence range.
+        See NotificationHistory.query for the parameters.
+        """
+        return self._publishing_history.query(topic=topic, start_time=start_time, end_time=end_time,
+                                              start_sequence=start_sequence, end_sequence=end_sequence, limit=limit)
+
+    def get_history_entries(self, topic: Optional[str] = None, start_time: Optional[float] = None,
+                            end_time: Optional[float] = None, start_sequence: Optional[int] = None,
+                            end_sequence: Optional[int] = None, limit: Optional[int] = None) -> List[NotificationHistoryEntry]:
+        """
+        Returns the slice of the notification history like get_history, but including each notification's history
+        sequence number and time. See NotificationHistory.query_entries for the parameters.
+        """
+        return self._publishing_history.query_entries(topic=topic, start_time=start_time, end_time=end_time,
+                                                      start_sequence=start_sequence, end_sequence=end_sequence,
+                                                      limit=limit)
+
+    def get_history_sequence_range(self) -> Optional[Tuple[int, int]]:
+        """
+        Returns the first available and the last sequence number of the notification history, or None if it is empty.
+        """
+        return self._publishing_history.get_sequence_range()
 
     def run(self) -> None:
         set_thread_name("W/Pub")
         if self._namespace is not None:
             self._namespace.thread_attach()
         with zmq.Context() as context:
-            with context.socket(zmq.PUB) as socket:
+            # XPUB instead of PUB to learn about the subscriptions of the connected PublishClients
+            with context.socket(zmq.XPUB) as socket:
                 self.logger.info(f"Binding to {self._socket_string}")
                 socket.bind(self._socket_string)
                 self._ready_event.set()
@@ -92,16 +131,11 @@ class PublishServer(threading.Thread):
                     try:
                         notification: WattsonNotification = self._send_queue.get(block=True, timeout=self._queue_timeout)
                     except queue.Empty:
+                        self._update_subscriptions(socket)
                         continue
                     try:
-                        # Derive topic
-                        if len(notification.recipients) == 1 and notification.recipients[0] != "*":
-                            # Unicast Topic
-                            zmq_topic = str(notification.recipients[0])
-                        else:
-                            zmq_topic = str(WATTSON_BROADCAST_TOPIC)
-                        socket.send_string(zmq_topic, zmq.SNDMORE)
-                        socket.send_pyobj(notification)  #, zmq.NOBLOCK)
+                        self._update_subscriptions(socket)
+                        self._publish(socket, notification)
                         self._check_append_history(notification)
                         self._check_export_notification(notification)
                     except Exception as e:
@@ -109,6 +143,76 @@ class PublishServer(threading.Thread):
                         self.logger.error(f"Could not sent: {notification.notification_topic} // {notification.notification_data}")
                         self.logger.error(traceback.format_exc())
 
+    def _publish(self, socket: zmq.Socket, notification: WattsonNotification):
+        topic_name = get_topic_name(notification.notification_topic)
+        if len(notification.recipients) == 0 or "*" in notification.recipients:
+            recipients = [BROADCAST_RECIPIENT]
+        else:
+            recipients = notification.recipients
+        frame = None
+        frame_count = 0
+        for recipient in recipients:
+            zmq_topic = get_zmq_topic(topic_name, recipient)
+            if not self._has_subscriber(zmq_topic):
+                # No PublishClient is interested in this notification - do not even serialize it
+                continue
+            if frame is None:
+                codec = WattsonCodecs.get_codec(self._simulation_control_server.get_notification_codec())
+                frame = codec.encode(notification)
+            socket.send(zmq_topic, zmq.SNDMORE)
+            socket.send(frame)  # , zmq.NOBLOCK)
+            frame_count += 1
+        with self._lock:
+            statistics = self._topic_statistics.setdefault(topic_name, {"published": 0, "suppressed": 0, "frames": 0, "bytes": 0})
+            statistics["published"] += 1
+            statistics["frames"] += frame_count
+            if frame is None:
+                statistics["suppressed"] += 1
+            else:
+                statistics["bytes"] += frame_count * len(frame)
+
+    def _update_subscriptions(self, socket: zmq.Socket):
+        while True:
+            try:
+                message = socket.recv(zmq.NOBLOCK)
+            except zmq.Again:
+                return
+            if len(message) == 0:
+                continue
+            # The first byte indicates (un)subscription, the remainder is the subscribed prefix
+            if message[0] == 1:
+                self._subscribed_prefixes.add(message[1:])
+            elif message[0] == 0:
+                self._subscribed_prefixes.discard(message[1:])
+
+    def _has_subscriber(self, zmq_topic: bytes) -> bool:
+        if b"" in self._subscribed_prefixes or zmq_topic in self._subscribed_prefixes:
+            return True
+        # Subscription to the notification topic regardless of the recipient
+        topic_prefix = zmq_topic[:zmq_topic.index(TOPIC_SEPARATOR) + 1]
+        return topic_prefix in self._subscribed_prefixes
+
+    def get_topic_statistics(self) -> Dict[str, Dict[str, int]]:
+        """
+        Returns the fan-out counters per notification topic, i.e., the number of published notifications, the number
+        of notifications that have been suppressed as no client subscribed to them, the number of sent frames (one per
+        addressed recipient) and the number of sent payload bytes.
+
+        Returns:
+            Dict[str, Dict[str, int]]: The counters by notification topic.
+        """
+        with self._lock:
+            return copy.deepcopy(self._topic_statistics)
+
+    def get_export_statistics(self) -> Dict[str, Any]:
+        """
+        Returns the throughput and backlog metrics of the notification export.
+
+        Returns:
+            Dict[str, Any]: The export metrics, or an empty dict if notifications are not exported.
+        """
+        return self._export_thread.get_statistics()
+
     def notify(self, simulation_notification: WattsonNotification):
         """
         Sends the given notification as it is. Only if no recipients are given, the notification is actively broadcasted.
@@ -170,8 +274,7 @@ class PublishServer(threading.Thread):
         elif self._enable_history is not True:
             return
 
-        with self._lock:
-            self._publishing_history.append(notification)
+        self._publishing_history.append(notification)
 
     def _check_export_notification(self, notification: WattsonNotification):
         self._export_thread.queue(notification)
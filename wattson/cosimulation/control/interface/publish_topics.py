@@ -0,0 +1,57 @@
+"""
+ZMQ topic prefixes for the PublishServer and PublishClient.
+Each notification is published under a topic that encodes the notification topic and the recipient,
+e.g., "grid-values-updated\x00*\x00" for broadcasts and "grid-values-updated\x00<client_id>\x00" for unicasts.
+As the separator terminates both parts, no notification topic or recipient is a prefix of another, i.e., libzmq
+filters notifications based on the subscriptions of each PublishClient before they are deserialized.
+"""
+
+import enum
+from typing import Any, Optional
+
+TOPIC_SEPARATOR = b"\x00"
+BROADCAST_RECIPIENT = "*"
+
+
+def get_topic_name(notification_topic: Any) -> str:
+    """
+    Returns the plain string representation of the given notification topic.
+
+    Args:
+        notification_topic (Any):
+            The notification topic, either as (string) enum or as string.
+
+    Returns:
+        str: The topic's string value.
+    """
+    if isinstance(notification_topic, enum.Enum):
+        return str(notification_topic.value)
+    return str(notification_topic)
+
+
+def get_zmq_topic(notification_topic: Any, recipient: Optional[str] = None) -> bytes:
+    """
+    Creates the ZMQ topic prefix for the given notification topic and recipient.
+
+    Args:
+        notification_topic (Any):
+            The notification topic, or "*" to refer to all notification topics.
+        recipient (Optional[str], optional):
+            The recipient's client ID, or None to refer to all recipients.
+            (Default value = None)
+
+    Returns:
+        bytes: The ZMQ topic (prefix).
+    """
+    topic_name = get_topic_name(notification_topic)
+    if topic_name == "*":
+        return b""
+    topic = topic_name.encode("utf-8") + TOPIC_SEPARATOR
+    if recipient is None:
+        return topic
+    return topic + str(recipient).encode("utf-8") + TOPIC_SEPARATOR
+
+
+def get_broadcast_zmq_topic(notification_topic: Any) -> bytes:
+    return get_zmq_topic(notification_topic, BROADCAST_RECIPIENT)
+
@@ -1,13 +1,17 @@
 import logging
 import math
 import queue
+import struct
 import threading
 import time
-from typing import Optional, Any, Callable, Dict, Union, List, TYPE_CHECKING
+from typing import Optional, Any, Callable, Dict, Union, List, Tuple, TYPE_CHECKING
 
 import zmq
 
+from wattson.cosimulation.control.codecs.wattson_codec import WattsonCodec
+from wattson.cosimulation.control.codecs.wattson_codecs import WattsonCodecs
 from wattson.cosimulation.control.constants import SIM_CONTROL_PORT, SIM_CONTROL_PUBLISH_PORT, SIM_CONTROL_ID
+from wattson.cosimulation.control.interface.notification_history import NotificationHistoryEntry
 from wattson.cosimulation.control.interface.publish_client import PublishClient
 from wattson.cosimulation.control.messages.failed_query_response import FailedQueryResponse
 from wattson.cosimulation.control.messages.wattson_async_response import WattsonAsyncResponse
@@ -54,7 +58,9 @@ class WattsonClient(threading.Thread):
                  client_name: str = "generic-client",
                  namespace: Optional[Union[str, Namespace]] = None,
                  wait_for_namespace: bool = False,
-                 wattson_socket_ip: Optional[str] = None):
+                 wattson_socket_ip: Optional[str] = None,
+                 codecs: Optional[List[str]] = None,
+                 max_outstanding_queries: int = 32):
         """
         Creates a new WattsonClient instance to connect to a running Wattson Co-Simulation.
 
@@ -78,6 +84,14 @@ class WattsonClient(threading.Thread):
                 Instead of providing individual socket strings, the IP of the server can be passed.
                 **This overrides both socket_string parameters!**
                 (Default value = None)
+            codecs (Optional[List[str]], optional):
+                The codecs to offer to the server during registration in the order of preference.
+                Until the registration is done, the pickle codec is used.
+                (Default value = all available codecs)
+            max_outstanding_queries (int, optional):
+                The maximum number of queries that are sent to the server without having received their response.
+                Responses are matched to their queries by a correlation ID and might arrive out of order.
+                (Default value = 32)
         """
 
         super().__init__(daemon=True)
@@ -108,10 +122,15 @@ class WattsonClient(threading.Thread):
                                              on_receive_notification_callback=self.on_receive_notification)
         self._query_queue = queue.Queue()
         self._queue_timeout = 1
+        self._max_outstanding_queries = max(1, max_outstanding_queries)
+        self._correlation_id_struct = struct.Struct("!I")
+        self._correlation_id_limit = 2 ** 32
         self._registered: bool = False
         self._subscriptions = {}
         self._client_name = client_name
         self._client_id: Optional[str] = None
+        self._offered_codecs: List[str] = codecs if codecs is not None else WattsonCodecs.get_codec_names()
+        self._codec: WattsonCodec = WattsonCodecs.get_codec()
 
         self._events: Dict[str, threading.Event] = {}
         self._event_lock = threading.RLock()
@@ -175,6 +194,7 @@ class WattsonClient(threading.Thread):
             self.join(timeout=timeout)
         self._registered = False
         self._client_id = None
+        self._codec = WattsonCodecs.get_codec()
         self.logger.debug(f"Stopped")
 
     def register(self, client_name: Optional[str] = None, force_new_id: bool = False) -> bool:
@@ -200,15 +220,21 @@ class WattsonClient(threading.Thread):
             self._client_name = client_name
         if self._client_name is None:
             raise ValueError("No client_name specified, cannot register to server")
-        query = WattsonQuery(query_type=WattsonQueryType.REGISTRATION, query_data={"client_name": self._client_name})
+        query = WattsonQuery(query_type=WattsonQueryType.REGISTRATION, query_data={
+            "client_name": self._client_name,
+            "codecs": self._offered_codecs
+        })
         resp = self.query(query)
         self._registered = resp.is_successful()
         if not self._registered:
             self.logger.error(f"Could not register with {query.query_type=} {query.query_data=} - {resp.data=}")
         else:
             self._client_id = resp.data.get("client_id")
-        self.logger.info(f"Registered as {self._client_id}")
-        self._publish_client.set_registration(self._client_name)
+            # Legacy servers do not negotiate a codec
+            self._codec = WattsonCodecs.get_codec(resp.data.get("codec"))
+        self.logger.info(f"Registered as {self._client_id} using codec {self._codec.name}")
+        if self._client_id is not None:
+            self._publish_client.set_registration(self._client_id)
         return self.is_registered
 
     def require_connection(self, timeout_seconds: Optional[float] = None) -> bool:
@@ -266,39 +292,66 @@ class WattsonClient(threading.Thread):
     def run(self) -> None:
         if self._namespace is not None:
             self._namespace.thread_attach()
+        # Requests sent, but not yet answered, by their correlation ID
+        outstanding: Dict[bytes, dict] = {}
+        correlation_id = 0
         with zmq.Context() as context:
-            with context.socket(zmq.REQ) as socket:
+            with context.socket(zmq.DEALER) as socket:
                 self.logger.info(f"Connecting to {self._query_socket_string}")
                 with socket.connect(self._query_socket_string) as socket_context:
                     while not self._termination_requested.is_set():
-                        try:
-                            request = self._query_queue.get(block=True, timeout=self._queue_timeout)
-                        except queue.Empty:
+                        # Send queued queries as long as the limit of outstanding queries is not reached
+                        while len(outstanding) < self._max_outstanding_queries:
+                            try:
+                                if len(outstanding) == 0:
+                                    request = self._query_queue.get(block=True, timeout=self._queue_timeout)
+                                else:
+                                    request = self._query_queue.get_nowait()
+                            except queue.Empty:
+                                break
+                            query: WattsonQuery = request["query"]
+                            query.client_id = self.client_id
+                            request_id = self._correlation_id_struct.pack(correlation_id)
+                            correlation_id = (correlation_id + 1) % self._correlation_id_limit
+                            try:
+                                # The correlation ID is part of the envelope, i.e., the server returns it as is
+                                socket.send_multipart([request_id, b"", self._codec.encode(query)])
+                                outstanding[request_id] = request
+                            except Exception as e:
+                                self.logger.error(f"{e=}")
+                        if len(outstanding) == 0:
                             continue
-                        query: WattsonQuery = request["query"]
-                        event: threading.Event = request["event"]
-                        query.client_id = self.client_id
-                        try:
-                            socket.send_pyobj(query)
-                            # Poll socket for answer, but be interruptable by the termination event
-                            while not socket.poll(1):
-                                if self._termination_requested.is_set():
-                                    query.add_response(WattsonResponse(successful=False, data={"error": "Socket Timeout due to shutdown"}))
+                        # Poll socket for answers, but be interruptable by the termination event and new queries
+                        if not socket.poll(1):
+                            continue
+                        while True:
+                            try:
+                                frames = socket.recv_multipart(zmq.NOBLOCK)
+                            except zmq.Again:
+                                break
+                            request = outstanding.pop(frames[0], None)
+                            if request is None:
+                                self.logger.warning(f"Received response with unknown correlation ID {frames[0]!r}")
+                                continue
+                            query: WattsonQuery = request["query"]
+                            event: threading.Event = request["event"]
+                            try:
+                                resp = WattsonCodecs.decode(frames[-1])
+                                if isinstance(resp, WattsonAsyncResponse):
+                                    # Build promise from AsyncResponse
+                                    promise = WattsonResponsePromise(query=query, resolve_event=event)
+                                    self._async_queries[resp.reference_id] = query
+                                    query.add_response(promise)
+                                    self._check_is_pre_resolved(resp.reference_id)
+                                else:
+                                    query.add_response(resp)
                                     event.set()
-                                    # Exit
-                                    return
-                            resp = socket.recv_pyobj()
-                            if isinstance(resp, WattsonAsyncResponse):
-                                # Build promise from AsyncResponse
-                                promise = WattsonResponsePromise(query=query, resolve_event=event)
-                                self._async_queries[resp.reference_id] = query
-                                query.add_response(promise)
-                                self._check_is_pre_resolved(resp.reference_id)
-                            else:
-                                query.add_response(resp)
-                                event.set()
-                        except Exception as e:
-                            self.logger.error(f"{e=}")
+                            except Exception as e:
+                                self.logger.error(f"{e=}")
+                    # Fail queries that are still waiting for a response
+                    for request in outstanding.values():
+                        request["query"].add_response(WattsonResponse(successful=False, data={"error": "Socket Timeout due to shutdown"}))
+                        request["event"].set()
 
     def async_query(self, query: WattsonQuery) -> WattsonResponsePromise:
         """
@@ -481,6 +534,7 @@ class WattsonClient(threading.Thread):
                 The function to be executed when a notification for the subscribed topic is received. Receives a WattsonNotification as its argument.
         """
         self._subscriptions.setdefault(topic, []).append(callback)
+        self._publish_client.subscribe_topic(topic)
 
     def unsubscribe_topic(self, topic: str):
         """
@@ -491,10 +545,25 @@ class WattsonClient(threading.Thread):
                 The topic to unsubscribe from, provided as a string. This will clear all subscriptions associated with the specified topic.
         """
         self._subscriptions[topic] = []
+        self._publish_client.unsubscribe_topic(topic)
+
+    def set_broadcast_subscription(self, topic: str, subscribe: bool):
+        """
+        Defines whether broadcasts of the given topic are received. If disabled, only notifications of this topic that
+        are explicitly addressed to this client are received.
+
+        Args:
+            topic (str):
+                The notification topic.
+            subscribe (bool):
+                Whether to receive broadcasts of this topic.
+        """
+        self._publish_client.set_broadcast_subscription(topic, subscribe)
 
     def unsubscribe_all(self):
         """Removes all subscriptions for all topics for this client."""
         self._subscriptions = {}
+        self._publish_client.unsubscribe_all()
 
     def notify(self, notification: WattsonNotification) -> bool:
         """
@@ -626,12 +695,80 @@ class WattsonClient(threading.Thread):
         promise = self.async_query(query)
         promise.raise_exception_on_fail()
 
-    def get_notification_history(self, topic: Optional[str]) -> List[WattsonNotification]:
-        response = self.query(WattsonQuery(query_type=WattsonQueryType.GET_NOTIFICATION_HISTORY, query_data={"topic": topic}))
+    def get_notification_history(self, topic: Optional[str] = None, start_time: Optional[float] = None,
+                                 end_time: Optional[float] = None, start_sequence: Optional[int] = None,
+                                 end_sequence: Optional[int] = None, limit: Optional[int] = None) -> List[WattsonNotification]:
+        """
+        Requests the notification history of the given topic (or of all topics) from the server.
+        The history can be restricted to a time range (based on the time notifications have been published) or to a
+        range of history sequence numbers. All bounds are inclusive.
+        Use get_notification_history_entries to obtain the sequence numbers, e.g., to page through the history.
+
+        Args:
+            topic (Optional[str], optional):
+                The notification topic to request the history for.
+                (Default value = None)
+            start_time (Optional[float], optional):
+                The earliest publishing timestamp.
+                (Default value = None)
+            end_time (Optional[float], optional):
+                The latest publishing timestamp.
+                (Default value = None)
+            start_sequence (Optional[int], optional):
+                The first history sequence number.
+                (Default value = None)
+            end_sequence (Optional[int], optional):
+                The last history sequence number.
+                (Default value = None)
+            limit (Optional[int], optional):
+                The maximum number of notifications to return.
+                (Default value = None)
+
+        Returns:
+            List[WattsonNotification]: The notifications ordered by their publishing.
+        """
+        entries, _ = self.get_notification_history_entries(topic=topic, start_time=start_time, end_time=end_time,
+                                                           start_sequence=start_sequence, end_sequence=end_sequence,
+                                                           limit=limit)
+        return [entry.notification for entry in entries]
+
+    def get_notification_history_entries(self, topic: Optional[str] = None, start_time: Optional[float] = None,
+                                         end_time: Optional[float] = None, start_sequence: Optional[int] = None,
+                                         end_sequence: Optional[int] = None, limit: Optional[int] = None
+                                         ) -> Tuple[List[NotificationHistoryEntry], Optional[Tuple[int, int]]]:
+        """
+        Requests the notification history like get_notification_history, but returns the history entries including
+        each notification's sequence number and publishing time, together with the sequence range covered by the
+        server's history. To page through the history, request the next page starting at the last returned sequence
+        number + 1.
+        See get_notification_history for the parameters.
+
+        Returns:
+            Tuple[List[NotificationHistoryEntry], Optional[Tuple[int, int]]]: The history entries ordered by their
+            sequence number and the first and last sequence number available on the server (None if the history
+            is empty).
+        """
+        query_data = {
+            "topic": topic,
+            "start_time": start_time,
+            "end_time": end_time,
+            "start_sequence": start_sequence,
+            "end_sequence": end_sequence,
+            "limit": limit
+        }
+        response = self.query(WattsonQuery(query_type=WattsonQueryType.GET_NOTIFICATION_HISTORY, query_data=query_data))
         if not response.is_successful():
             self.logger.error("Could not get notification history")
-            return []
-        return response.data.get("notifications", [])
+            return [], None
+        notifications = response.data.get("notifications", [])
+        sequences = response.data.get("sequences", [None] * len(notifications))
+        times = response.data.get("times", [None] * len(notifications))
+        entries = [NotificationHistoryEntry(sequence, timestamp, notification)
+                   for sequence, timestamp, notification in zip(sequences, times, notifications)]
+        sequence_range = None
+        if response.data.get("first_sequence") is not None:
+            sequence_range = (response.data["first_sequence"], response.data["last_sequence"])
+        return entries, sequence_range
 
     """
     CONVENIENCE METHODS
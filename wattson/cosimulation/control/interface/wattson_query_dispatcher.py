@@ -0,0 +1,239 @@
+import collections
+import queue
+import threading
+import time
+from typing import Callable, Optional, Dict, Any, List, Deque, Hashable
+
+import zmq
+
+from wattson.cosimulation.control.messages.wattson_query import WattsonQuery
+from wattson.cosimulation.control.messages.wattson_response import WattsonResponse
+from wattson.networking.namespaces.namespace import Namespace
+from wattson.util.threading import set_thread_name
+
+
+class QueryTask:
+    def __init__(self, client_key: Hashable, query: WattsonQuery, envelope: List[bytes], codec: Any):
+        self.client_key = client_key
+        self.query = query
+        self.envelope = envelope
+        self.codec = codec
+        self.lane: Optional[str] = None
+        self.response: Optional[WattsonResponse] = None
+        self.received_at: float = time.perf_counter()
+        self.started_at: Optional[float] = None
+        self.completed_at: Optional[float] = None
+
+
+class ClientState:
+    def __init__(self):
+        self.active: int = 0
+        self.active_mutating: bool = False
+        self.backlog: Deque[QueryTask] = collections.deque()
+
+    def can_dispatch(self, task: QueryTask) -> bool:
+        if self.active == 0:
+            return True
+        return not self.active_mutating and task.query.is_read_only()
+
+
+class WattsonQueryDispatcher:
+    """
+    Dispatches the queries received by the WattsonServer to a pool of worker threads.
+    Read-only queries are handled by a shared pool of read workers, i.e., cheap reads do not queue behind expensive queries.
+    Mutating queries are handled by one serial lane per handling simulator, such that their order is kept per simulator.
+    Queries of the same client keep their order with respect to mutating queries: Consecutive read-only queries of a
+    client might be handled concurrently, while a mutating query is only dispatched once all previous queries of the
+    client have been completed (and blocks all subsequent ones until it is completed itself).
+
+    All methods except for the worker loops are expected to be called by the WattsonServer's socket thread.
+    """
+    def __init__(self,
+                 handle_callback: Callable[[WattsonQuery], WattsonResponse],
+                 lane_callback: Callable[[WattsonQuery], str],
+                 read_worker_count: int,
+                 namespace: Optional[Namespace] = None,
+                 logger=None):
+        """
+        Args:
+            handle_callback (Callable[[WattsonQuery], WattsonResponse]):
+                The callback that handles a query and returns its response.
+            lane_callback (Callable[[WattsonQuery], str]):
+                The callback that returns the lane (i.e., the simulator) to serialize a mutating query in.
+            read_worker_count (int):
+                The number of worker threads handling read-only queries.
+            namespace (Optional[Namespace], optional):
+                The namespace to attach the worker threads to.
+                (Default value = None)
+            logger:
+                The logger to use.
+        """
+        self._handle_callback = handle_callback
+        self._lane_callback = lane_callback
+        self._read_worker_count = max(1, read_worker_count)
+        self._namespace = namespace
+        self.logger = logger
+
+        self._termination_requested = threading.Event()
+        self._context: Optional[zmq.Context] = None
+        self._notify_socket_string: Optional[str] = None
+        self._threads: List[threading.Thread] = []
+
+        self._read_queue: queue.Queue = queue.Queue()
+        self._lane_queues: Dict[str, queue.Queue] = {}
+        self._completed: queue.Queue = queue.Queue()
+
+        self._clients: Dict[Hashable, ClientState] = {}
+        self._pending_count: int = 0
+        # Tasks currently handled by a worker (accessed by the workers and the socket thread)
+        self._running: Dict[int, QueryTask] = {}
+        self._running_lock = threading.Lock()
+
+    def start(self, context: zmq.Context, notify_socket_string: str):
+        """
+        Starts the read workers. Lanes are started on demand.
+        The notification socket has to be bound (as PULL socket) by the caller before.
+
+        Args:
+            context (zmq.Context):
+                The zmq context to create the worker's notification sockets in.
+            notify_socket_string (str):
+                The inproc socket string the workers use to notify about completed queries.
+        """
+        self._termination_requested.clear()
+        self._context = context
+        self._notify_socket_string = notify_socket_string
+        for i in range(self._read_worker_count):
+            self._start_worker(self._read_queue, f"W/Srv/R{i}")
+
+    def stop(self, timeout: Optional[float] = None):
+        self._termination_requested.set()
+        for thread in self._threads:
+            if thread.is_alive():
+                thread.join(timeout=timeout)
+        self._threads = []
+        self._lane_queues = {}
+
+    def _start_worker(self, task_queue: queue.Queue, thread_name: str):
+        thread = threading.Thread(target=self._worker_loop, args=(task_queue, thread_name), daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def submit(self, client_key: Hashable, query: WattsonQuery, envelope: List[bytes], codec: Any):
+        """
+        Queues the given query for handling.
+
+        Args:
+            client_key (Hashable):
+                The key identifying the client connection (e.g., the socket identity).
+            query (WattsonQuery):
+                The query to handle.
+            envelope (List[bytes]):
+                The routing envelope to prepend to the response.
+            codec (Any):
+                The codec the query has been received with.
+        """
+        task = QueryTask(client_key, query, envelope, codec)
+        self._pending_count += 1
+        client = self._clients.setdefault(client_key, ClientState())
+        if len(client.backlog) > 0 or not client.can_dispatch(task):
+            # Has to wait for previous queries of this client
+            client.backlog.append(task)
+            return
+        self._dispatch(client, task)
+
+    def _dispatch(self, client: ClientState, task: QueryTask):
+        client.active += 1
+        client.active_mutating = not task.query.is_read_only()
+        if task.query.is_read_only():
+            task.lane = "read"
+            self._read_queue.put(task)
+            return
+        lane = self._lane_callback(task.query)
+        task.lane = lane
+        lane_queue = self._lane_queues.get(lane)
+        if lane_queue is None:
+            lane_queue = queue.Queue()
+            self._lane_queues[lane] = lane_queue
+            self._start_worker(lane_queue, f"W/Srv/{lane[:8]}")
+        lane_queue.put(task)
+
+    def get_completed(self) -> List[QueryTask]:
+        """
+        Returns all completed tasks and dispatches the next query of the respective clients.
+
+        Returns:
+            List[QueryTask]: The completed tasks in the order of their completion.
+        """
+        completed = []
+        while True:
+            try:
+                task: QueryTask = self._completed.get_nowait()
+            except queue.Empty:
+                break
+            completed.append(task)
+            self._pending_count -= 1
+            client = self._clients.get(task.client_key)
+            if client is None:
+                continue
+            client.active -= 1
+            if client.active == 0:
+                client.active_mutating = False
+            while len(client.backlog) > 0 and client.can_dispatch(client.backlog[0]):
+                self._dispatch(client, client.backlog.popleft())
+            if client.active == 0 and len(client.backlog) == 0:
+                self._clients.pop(task.client_key)
+        return completed
+
+    def get_oldest_running_task(self) -> Optional[QueryTask]:
+        """
+        Returns the task that has been handled by a worker for the longest time, or None if no task is handled.
+        Can be called from any thread.
+
+        Returns:
+            Optional[QueryTask]: The oldest running task.
+        """
+        with self._running_lock:
+            if len(self._running) == 0:
+                return None
+            return min(self._running.values(), key=lambda task: task.started_at)
+
+    def get_queue_depth(self) -> Dict[str, int]:
+        """
+        Returns the number of queries waiting for each lane as well as the total number of pending queries.
+
+        Returns:
+            Dict[str, int]: The queue depths.
+        """
+        depths = {"read": self._read_queue.qsize()}
+        for lane, lane_queue in list(self._lane_queues.items()):
+            depths[lane] = lane_queue.qsize()
+        depths["client_backlog"] = sum(len(client.backlog) for client in list(self._clients.values()))
+        depths["pending"] = self._pending_count
+        return depths
+
+    def _worker_loop(self, task_queue: queue.Queue, thread_name: str):
+        set_thread_name(thread_name)
+        if self._namespace is not None:
+            self._namespace.thread_attach()
+        with self._context.socket(zmq.PUSH) as notify_socket:
+            notify_socket.connect(self._notify_socket_string)
+            while not self._termination_requested.is_set():
+                try:
+                    task: QueryTask = task_queue.get(block=True, timeout=1)
+                except queue.Empty:
+                    continue
+                task.started_at = time.perf_counter()
+                with self._running_lock:
+                    self._running[id(task)] = task
+                try:
+                    task.response = self._handle_callback(task.query)
+                except Exception as e:
+                    if self.logger is not None:
+                        self.logger.error(f"Worker failed to handle {task.query.query_type}: {e=}")
+                    task.response = None
+                task.completed_at = time.perf_counter()
+                with self._running_lock:
+                    self._running.pop(id(task), None)
+                self._completed.put(task)
+                notify_socket.send(b"")
@@ -1,16 +1,20 @@
+import bisect
+import math
 import os
 import queue
 import sys
 import threading
 import time
 import traceback
-from typing import Optional, TYPE_CHECKING, List, Union, Type, Any, Set, Callable, Dict
+from typing import Optional, TYPE_CHECKING, List, Union, Type, Any, Set, Callable, Dict, Tuple
 
 import zmq
 
 from wattson.util.threading import set_thread_name
+from wattson.cosimulation.control.codecs.wattson_codecs import WattsonCodecs
 from wattson.cosimulation.control.interface.publish_server import PublishServer
 from wattson.cosimulation.control.interface.time_limit import TimeLimit
+from wattson.cosimulation.control.interface.wattson_query_dispatcher import WattsonQueryDispatcher
 from wattson.cosimulation.control.interface.wattson_query_handler import WattsonQueryHandler
 from wattson.cosimulation.control.messages.failed_query_response import FailedQueryResponse
 from wattson.cosimulation.control.messages.wattson_async_group_response import WattsonAsyncGroupResponse
@@ -70,7 +74,6 @@ class WattsonServer(threading.Thread, WattsonQueryHandler):
         self._query_watchdog_had_alarm: bool = False
         self._query_watchdog_query_start: Optional[float] = None
         self._query_watchdog_active_query: Optional[WattsonQuery] = None
-        self._query_watchdog_query_done_event: threading.Event = threading.Event()
 
         self._query_statistics = {
             "total_queries": 0,
@@ -78,19 +81,29 @@ class WattsonServer(threading.Thread, WattsonQueryHandler):
             "client_counts": {},
             "query_timestamps": [],
             "query_timespan": 10,
-            "queries_in_timespan": 0
+            "queries_in_timespan": 0,
+            "queue_depth": {},
+            "max_queue_depth": 0,
+            "latency_buckets": [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, math.inf],
+            "latency_histograms": {}
         }
         self._query_statistics_queue = queue.Queue()
         self._query_statistics_thread: Optional[threading.Thread] = None
+        self._dispatcher: Optional[WattsonQueryDispatcher] = None
+        self._main_namespace: Optional[Namespace] = None
+        self._async_reference_id: int = 0
 
         self._config = {
             "required_clients": [],     # List of client (IDs) to be connected before starting the simulation
             "connection_timeout_seconds": 30,   # Timeout in seconds to wait for all clients to connect
+            "codecs": WattsonCodecs.get_codec_names(),     # Codecs that can be negotiated by clients
+            "query_workers": 0,     # Number of workers for read-only queries. 0 handles all queries sequentially
         }
         self._config.update(kwargs)
 
         self._client_id: int = 0
         self._clients: Set[str] = set()
+        self._client_codecs: Dict[str, str] = {}
 
         self._events: Dict[str, threading.Event] = {}
 
@@ -134,31 +147,59 @@ class WattsonServer(threading.Thread, WattsonQueryHandler):
                     logger.info(f"Idle round detected - backlog has been worked on")
             self._idle_watchdog_no_alarm_event.clear()
 
+    def _get_active_query(self) -> Tuple[Optional[float], Optional[WattsonQuery]]:
+        """
+        Returns the duration and the query that is handled for the longest time, i.e., the active query in the
+        sequential mode or the oldest query handled by any worker in the dispatched mode.
+        """
+        if self._dispatcher is not None:
+            task = self._dispatcher.get_oldest_running_task()
+            if task is None or task.started_at is None:
+                return None, None
+            return time.perf_counter() - task.started_at, task.query
+        query_start_time = self._query_watchdog_query_start
+        if query_start_time is None:
+            return None, None
+        return time.time() - query_start_time, self._query_watchdog_active_query
+
     def _query_watchdog(self):
         logger = self.logger.getChild("QueryWatchdog")
+        alarmed_query = None
         while not self._termination_requested.is_set():
             self._termination_requested.wait(1)
-            query_start_time = self._query_watchdog_query_start
-            if query_start_time is not None:
-                if time.time() - query_start_time > self._query_watchdog_long_query_interval:
-                    if not self._idle_watchdog_had_alarm:
-                        logger.warning(f"Long running query detected!")
-                        if self._query_watchdog_active_query is not None:
-                            query = self._query_watchdog_active_query
-                            logger.warning(f"{query.query_type}")
-                            logger.warning(f"{str(repr(query.query_data))[:200]}")
-                        self._query_watchdog_had_alarm = True
-                    while not self._query_watchdog_query_done_event.wait(1):
-                        logger.warning(f"Long running query still blocking!")
-                    self._query_watchdog_query_done_event.clear()
-                    logger.info("Long running query resolved - no longer blocking")
+            duration, query = self._get_active_query()
+            if duration is not None and duration > self._query_watchdog_long_query_interval:
+                if query is not alarmed_query:
+                    if alarmed_query is not None:
+                        logger.info("Long running query resolved - no longer blocking")
+                    logger.warning(f"Long running query detected!")
+                    if query is not None:
+                        logger.warning(f"{query.query_type}")
+                        logger.warning(f"{str(repr(query.query_data))[:200]}")
+                    alarmed_query = query
+                    self._query_watchdog_had_alarm = True
+                else:
+                    logger.warning(f"Long running query still blocking!")
+            elif self._query_watchdog_had_alarm:
+                self._query_watchdog_had_alarm = False
+                alarmed_query = None
+                logger.info("Long running query resolved - no longer blocking")
 
     def _statistic_watchdog(self):
         logger = self.logger.getChild("QueryStatistics")
         last_info = 0
         while not self._termination_requested.is_set():
             try:
-                query: WattsonQuery = self._query_statistics_queue.get(block=True, timeout=1)
+                entry = self._query_statistics_queue.get(block=True, timeout=1)
+                if isinstance(entry, tuple):
+                    # Query handling latency
+                    query_type, duration = entry
+                    histogram = self._query_statistics["latency_histograms"].setdefault(
+                        query_type, [0] * len(self._query_statistics["latency_buckets"])
+                    )
+                    histogram[bisect.bisect_left(self._query_statistics["latency_buckets"], duration)] += 1
+                    continue
+                query: WattsonQuery = entry
                 query_type = query.query_type
                 client_id = query.client_id
                 if client_id is not None:
@@ -177,6 +218,9 @@ class WattsonServer(threading.Thread, WattsonQueryHandler):
     def _log_query_statistic(self, query: WattsonQuery):
         self._query_statistics_queue.put(query)
 
+    def _log_query_latency(self, query: WattsonQuery, duration: float):
+        self._query_statistics_queue.put((query.query_type, duration))
+
     def start(self) -> None:
         self._termination_requested.clear()
         self._publisher = PublishServer(simulation_control_server=self, socket_string=self._publish_socket_str,
@@ -194,7 +238,6 @@ class WattsonServer(threading.Thread, WattsonQueryHandler):
         self._termination_requested.set()
         self._publisher.stop(timeout=timeout)
         self._idle_watchdog_no_alarm_event.set()
-        self._query_watchdog_query_done_event.set()
         if self._idle_watchdog_thread is not None:
             if self._idle_watchdog_thread.is_alive():
                 self._idle_watchdog_thread.join(timeout=timeout)
@@ -212,89 +255,193 @@ class WattsonServer(threading.Thread, WattsonQueryHandler):
     def run(self) -> None:
 
         set_thread_name("W/Srv")
-        main_namespace = None
+        self._main_namespace = None
         if self._namespace is not None:
-            main_namespace = Namespace("w_main")
-            if not main_namespace.exists():
-                main_namespace.from_pid(os.getpid())
+            self._main_namespace = Namespace("w_main")
+            if not self._main_namespace.exists():
+                self._main_namespace.from_pid(os.getpid())
             self._namespace.thread_attach()
         self.logger.info(f"Binding to {self._query_socket_str} for queries")
-        async_reference_id = 0
-
-        count = 0
-        send_time_sum = 0
 
         with zmq.Context() as context:
-            with context.socket(zmq.REP) as socket:
-                socket.bind(self._query_socket_str)
-                self._ready_event.set()
+            if self._config.get("query_workers", 0) > 0:
+                self._run_dispatched(context)
+            else:
+                self._run_sequential(context)
+
+    def _run_sequential(self, context: zmq.Context):
+        """
+        Handles queries strictly one after another using a REP socket.
+        """
+        with context.socket(zmq.REP) as socket:
+            socket.bind(self._query_socket_str)
+            self._ready_event.set()
+            while not self._termination_requested.is_set():
+                poll_start = time.time()
+                if not socket.poll(timeout=self._poll_timeout_ms):
+                    # We have an idle round
+                    self._idle_watchdog_no_alarm_event.set()
+                    continue
+                poll_end = time.time()
+                poll_time = poll_end - poll_start
+                if poll_time > self._idle_poll_duration:
+                    # At least we were idle for a certain amount of time
+                    self._idle_watchdog_no_alarm_event.set()
+
+                self._query_watchdog_query_start = time.time()
+
+                frame = socket.recv()
+                try:
+                    codec = WattsonCodecs.get_codec_by_frame(frame)
+                    query: WattsonQuery = codec.decode(frame)
+                except Exception as e:
+                    self.logger.error(f"Could not decode query: {e=}")
+                    socket.send(WattsonCodecs.get_codec().encode(FailedQueryResponse(data={"error": "Could not decode query"})))
+                    continue
+
+                self._log_query_statistic(query)
+                self._query_watchdog_active_query = query
+
+                response = self._handle_query_in_namespace(query)
+                self._send_response(socket, None, query, response, codec)
+
+                self._query_watchdog_active_query = None
+                self._query_watchdog_query_start = None
+
+    def _run_dispatched(self, context: zmq.Context):
+        """
+        Receives queries via a ROUTER socket and hands them to a WattsonQueryDispatcher, i.e., a pool of workers.
+        Responses are sent by this thread once the dispatcher reports the respective query as completed.
+        """
+        notify_socket_string = f"inproc://wattson-server-{id(self)}"
+        self._dispatcher = WattsonQueryDispatcher(
+            handle_callback=self._handle_query_in_namespace,
+            lane_callback=self._get_query_lane,
+            read_worker_count=self._config.get("query_workers", 1),
+            namespace=self._namespace,
+            logger=self.logger.getChild("Dispatcher")
+        )
+        with context.socket(zmq.ROUTER) as socket, context.socket(zmq.PULL) as notify_socket:
+            notify_socket.bind(notify_socket_string)
+            socket.bind(self._query_socket_str)
+            self._dispatcher.start(context, notify_socket_string)
+            poller = zmq.Poller()
+            poller.register(socket, zmq.POLLIN)
+            poller.register(notify_socket, zmq.POLLIN)
+            self._ready_event.set()
+            try:
                 while not self._termination_requested.is_set():
-                    poll_start = time.time()
-                    if not socket.poll(timeout=self._poll_timeout_ms):
+                    events = dict(poller.poll(timeout=self._poll_timeout_ms))
+                    if len(events) == 0 or self._dispatcher.get_queue_depth()["pending"] == 0:
                         # We have an idle round
                         self._idle_watchdog_no_alarm_event.set()
-                        continue
-                    poll_end = time.time()
-                    poll_time = poll_end - poll_start
-                    if poll_time > self._idle_poll_duration:
-                        # At least we were idle for a certain amount of time
-                        self._idle_watchdog_no_alarm_event.set()
 
-                    self._query_watchdog_query_start = time.time()
-
-                    query: WattsonQuery = socket.recv_pyobj()
-
-                    self._log_query_statistic(query)
-                    self._query_watchdog_active_query = query
-
-                    if query.requires_native_namespace() and main_namespace is not None:
-                        response = main_namespace.call(self._handle_query_wrapper, arguments=(query, self._query_timeout_seconds))
-                    else:
-                        response = self._handle_query_wrapper(query, self._query_timeout_seconds)
-
-                    # Async queries get a unique ID
-                    callback = response.get_post_send_callback()
-                    response.clear_post_send_callback()
-                    try:
-                        if isinstance(response, WattsonAsyncResponse):
-                            # Single or Group Asynchronous Response
-                            response.register_reference(query.client_id, async_reference_id)
-                            if isinstance(response, WattsonAsyncGroupResponse):
-                                self.logger.debug(f"Sending GroupResponse {response.group_key} for {len(response.reference_map)} clients")
-                                # A Group response has asynchronous functionalities - hence, it is blocked while inserting a new client and reference.
-                                response.unblock()
-                            response.wattson_server = self
-                            send_response = response.copy_for_sending(query.client_id)
-                            socket.send_pyobj(send_response)
-                            response.resolvable.set()
-                            async_reference_id += 1
-                        else:
-                            # Synchronous Response
-                            start_time = time.perf_counter()
-                            socket.send_pyobj(response)
-                            send_time_sum += time.perf_counter() - start_time
-                            count += 1
-                            """
-                            if count % 100 == 0:
-                                self.logger.info(f"Sent {count} queries in {send_time_sum:.2f} seconds -> Avg {send_time_sum / count:.2f}")
-                                send_time_sum = 0
-                                count = 0
-                            """
-                    except AttributeError as e:
-                        self.logger.error(f"Failed to reply to {query.query_type=}, {repr(query.query_data)}")
-                        self.logger.error(f"{e=}")
-                        socket.send_pyobj(FailedQueryResponse())
-                    except Exception as e:
-                        self.logger.error(f"Failed to send response for {query.__class__.__name__} // {query.query_type}")
-                        self.logger.error(f"{e=}")
-                        self.logger.error(traceback.print_exception(*sys.exc_info()))
-                        socket.send_pyobj(FailedQueryResponse())
-                    if callback is not None:
-                        callback()
-
-                    self._query_watchdog_active_query = None
-                    self._query_watchdog_query_start = None
-                    self._query_watchdog_query_done_event.set()
+                    if notify_socket in events:
+                        while True:
+                            try:
+                                notify_socket.recv(zmq.NOBLOCK)
+                            except zmq.Again:
+                                break
+                        for task in self._dispatcher.get_completed():
+                            response = task.response
+                            if response is None:
+                                response = FailedQueryResponse(data={"error": "Query handling failed"})
+                            self._send_response(socket, task.envelope, task.query, response, task.codec)
+                        self._query_statistics["queue_depth"] = self._dispatcher.get_queue_depth()
+
+                    if socket in events:
+                        while True:
+                            try:
+                                frames = socket.recv_multipart(zmq.NOBLOCK)
+                            except zmq.Again:
+                                break
+                            envelope, frame = frames[:-1], frames[-1]
+                            try:
+                                codec = WattsonCodecs.get_codec_by_frame(frame)
+                                query: WattsonQuery = codec.decode(frame)
+                            except Exception as e:
+                                self.logger.error(f"Could not decode query: {e=}")
+                                socket.send_multipart(envelope + [WattsonCodecs.get_codec().encode(
+                                    FailedQueryResponse(data={"error": "Could not decode query"})
+                                )])
+                                continue
+                            self._log_query_statistic(query)
+                            # The first envelope frame identifies the client's connection
+                            self._dispatcher.submit(envelope[0], query, envelope, codec)
+                        depth = self._dispatcher.get_queue_depth()
+                        self._query_statistics["queue_depth"] = depth
+                        self._query_statistics["max_queue_depth"] = max(self._query_statistics["max_queue_depth"], depth["pending"])
+            finally:
+                self._dispatcher.stop(timeout=2)
+
+    def _get_query_lane(self, query: WattsonQuery) -> str:
+        """
+        Returns the name of the lane to serialize a mutating query in, i.e., the class name of the first handler
+        that handles the query's type.
+        """
+        handlers: List[WattsonQueryHandler] = [self, self._co_simulation_controller] + self._simulators
+        for handler in handlers:
+            if handler.handles_simulation_query_type(query):
+                return handler.__class__.__name__
+        return "default"
+
+    def _handle_query_in_namespace(self, query: WattsonQuery) -> WattsonResponse:
+        if query.requires_native_namespace() and self._main_namespace is not None:
+            return self._main_namespace.call(self._handle_query_wrapper, arguments=(query, self._query_timeout_seconds))
+        return self._handle_query_wrapper(query, self._query_timeout_seconds)
+
+    def _send_response(self, socket: zmq.Socket, envelope: Optional[List[bytes]], query: WattsonQuery, response: WattsonResponse, codec):
+        """
+        Sends the response for the given query and calls the response's post send callback.
+        Asynchronous responses are assigned a unique reference ID.
+
+        Args:
+            socket (zmq.Socket):
+                The socket to send the response with.
+            envelope (Optional[List[bytes]]):
+                The routing envelope to prepend (ROUTER sockets) or None (REP sockets).
+            query (WattsonQuery):
+                The query to respond to.
+            response (WattsonResponse):
+                The response to send.
+            codec:
+                The codec to encode the response with.
+        """
+        def send(message):
+            if envelope is None:
+                socket.send(codec.encode(message))
+            else:
+                socket.send_multipart(envelope + [codec.encode(message)])
+
+        callback = response.get_post_send_callback()
+        response.clear_post_send_callback()
+        try:
+            if isinstance(response, WattsonAsyncResponse):
+                # Single or Group Asynchronous Response
+                response.register_reference(query.client_id, self._async_reference_id)
+                if isinstance(response, WattsonAsyncGroupResponse):
+                    self.logger.debug(f"Sending GroupResponse {response.group_key} for {len(response.reference_map)} clients")
+                    # A Group response has asynchronous functionalities - hence, it is blocked while inserting a new client and reference.
+                    response.unblock()
+                response.wattson_server = self
+                send_response = response.copy_for_sending(query.client_id)
+                send(send_response)
+                response.resolvable.set()
+                self._async_reference_id += 1
+            else:
+                # Synchronous Response
+                send(response)
+        except AttributeError as e:
+            self.logger.error(f"Failed to reply to {query.query_type=}, {repr(query.query_data)}")
+            self.logger.error(f"{e=}")
+            send(FailedQueryResponse())
+        except Exception as e:
+            self.logger.error(f"Failed to send response for {query.__class__.__name__} // {query.query_type}")
+            self.logger.error(f"{e=}")
+            self.logger.error(traceback.print_exception(*sys.exc_info()))
+            send(FailedQueryResponse())
+        if callback is not None:
+            callback()
 
     def set_on_client_registration_callback(self, callback: Callable[[str], None]):
         self._on_client_registration_callback = callback
@@ -309,6 +456,33 @@ class WattsonServer(threading.Thread, WattsonQueryHandler):
     def get_clients(self):
         return self._clients.copy()
 
+    def get_client_codec(self, client_id: str) -> str:
+        return self._client_codecs.get(client_id, WattsonCodecs.DEFAULT_CODEC)
+
+    def get_notification_codec(self) -> str:
+        """
+        Returns the name of the codec to use for notifications, i.e., the codec all registered clients negotiated.
+        In case clients negotiated different codecs, the default (pickle) codec is used.
+
+        Returns:
+            str: The name of the notification codec
+        """
+        codecs = set(self._client_codecs.values())
+        if len(codecs) == 1:
+            return codecs.pop()
+        return WattsonCodecs.DEFAULT_CODEC
+
+    def get_notification_statistics(self) -> Dict[str, Dict[str, int]]:
+        """
+        Returns the PublishServer's fan-out counters per notification topic.
+
+        Returns:
+            Dict[str, Dict[str, int]]: The counters by notification topic.
+        """
+        if self._publisher is None:
+            return {}
+        return self._publisher.get_topic_statistics()
+
     def broadcast(self, simulation_notification: WattsonNotification):
         """
         Sends a notification to all connected clients
@@ -381,9 +555,22 @@ class WattsonServer(threading.Thread, WattsonQueryHandler):
 
         if query.query_type == WattsonQueryType.GET_NOTIFICATION_HISTORY:
             query.mark_as_handled()
-            topic = query.query_data.get("topic", None)
-            notifications = self._publisher.get_history(topic=topic)
-            return WattsonResponse(successful=True, data={"notifications": notifications})
+            entries = self._publisher.get_history_entries(
+                topic=query.query_data.get("topic", None),
+                start_time=query.query_data.get("start_time", None),
+                end_time=query.query_data.get("end_time", None),
+                start_sequence=query.query_data.get("start_sequence", None),
+                end_sequence=query.query_data.get("end_sequence", None),
+                limit=query.query_data.get("limit", None)
+            )
+            sequence_range = self._publisher.get_history_sequence_range()
+            return WattsonResponse(successful=True, data={
+                "notifications": [entry.notification for entry in entries],
+                "sequences": [entry.sequence for entry in entries],
+                "times": [entry.time for entry in entries],
+                "first_sequence": sequence_range[0] if sequence_range is not None else None,
+                "last_sequence": sequence_range[1] if sequence_range is not None else None
+            })
 
         if query.query_type == WattsonQueryType.SEND_NOTIFICATION:
             query.mark_as_handled()
@@ -398,6 +585,8 @@ class WattsonServer(threading.Thread, WattsonQueryHandler):
             #     trigger the local callback if set.
             client_name = query.query_data.get("client_name")
             client_id = query.query_data.get("client_id")
+            # Clients offer the codecs they support - legacy clients do not offer any and keep using pickle
+            codec = WattsonCodecs.negotiate(query.query_data.get("codecs"), self._config.get("codecs"))
             query.mark_as_handled()
             if client_name is None:
                 return WattsonResponse(False)
@@ -406,10 +595,12 @@ class WattsonServer(threading.Thread, WattsonQueryHandler):
                     self.logger.warning(f"Client {client_name} tried to register with unknown ID {client_id}")
                     return WattsonResponse(False)
                 # Already registered
-                return WattsonResponse(True, data={"client_id": client_id})
+                self._client_codecs[client_id] = codec
+                return WattsonResponse(True, data={"client_id": client_id, "codec": codec})
             client_id = f"{client_name}_{self._client_id}"
             self._client_id += 1
             self._clients.add(client_id)
+            self._client_codecs[client_id] = codec
             self.logger.debug(f"Registering client {client_name}")
             self.on_client_registration(client_id=client_id)
             self.broadcast(WattsonNotification(
@@ -420,7 +611,7 @@ class WattsonServer(threading.Thread, WattsonQueryHandler):
                     "clients": list(self._clients)
                 }
             ))
-            return WattsonResponse(True, data={"client_id": client_id})
+            return WattsonResponse(True, data={"client_id": client_id, "codec": codec})
 
         if query.query_type == WattsonQueryType.ECHO:
             # ECHO Query just receives an ACK
@@ -531,6 +722,7 @@ class WattsonServer(threading.Thread, WattsonQueryHandler):
                 t = time.perf_counter()
                 response = time_limit.run(self._handle_query, query)
                 duration = time.perf_counter() - t
+                self._log_query_latency(query, duration)
                 if duration > 1:
                     self.logger.warning(f"Query handling of {query.__class__.__name__} ({query.query_type}) took {duration} s")
                 return response
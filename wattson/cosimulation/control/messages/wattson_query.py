@@ -1,5 +1,6 @@
 from typing import Optional, Any
 
+from wattson.cosimulation.control.messages.wattson_query_type import WattsonQueryType
 from wattson.cosimulation.control.messages.wattson_response import WattsonResponse
 
 
@@ -20,6 +21,24 @@ class WattsonQuery:
     def requires_native_namespace(self) -> bool:
         return True
 
+    def is_read_only(self) -> bool:
+        """
+        Whether handling this query neither changes the simulation state nor depends on the order of other queries.
+        Read-only queries might be handled concurrently to other queries.
+
+        Returns:
+            bool: True iff the query is read-only.
+        """
+        return self.query_type in [
+            WattsonQueryType.ECHO,
+            WattsonQueryType.GET_TIME,
+            WattsonQueryType.GET_EVENT_STATE,
+            WattsonQueryType.GET_CONFIGURATION,
+            WattsonQueryType.GET_NOTIFICATION_HISTORY,
+            WattsonQueryType.HAS_SIMULATOR,
+            WattsonQueryType.GET_SIMULATORS,
+        ]
+
     def add_response(self, response: WattsonResponse):
         self.response = response
 
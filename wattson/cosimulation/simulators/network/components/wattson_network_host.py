@@ -99,8 +99,7 @@ class WattsonNetworkHost(WattsonNetworkNode, NetworkHost):
             self.logger.warning(f"Refusing to clear routes when not in namespace")
             return False
 
-        code, lines = self.exec(["ip", "route", "flush", "table", "main"])
-        if not code == 0:
+        if not self.get_namespace().route_flush():
             self.logger.error(f"Could not clear routes")
             return False
         return True
@@ -108,17 +107,13 @@ class WattsonNetworkHost(WattsonNetworkNode, NetworkHost):
     def set_route(self, target: str, interface: Optional[Union['WattsonNetworkInterface', str]] = None, gateway_ip: Optional[str] = None) -> bool:
         if interface is None and gateway_ip is None:
             return False
-        self.exec(f"ip route delete {target}")
-        cmd = f"ip route add {target}"
+        interface_name = None
         if interface is not None:
             if isinstance(interface, str):
                 interface_name = interface
             else:
                 interface_name = interface.interface_name
-            cmd += f" dev {interface_name}"
-        if gateway_ip is not None:
-            cmd += f" via {gateway_ip}"
-        return self.exec(cmd)[0] == 0
+        return self.get_namespace().route_set(target, interface_name=interface_name, gateway_ip=gateway_ip)
 
     def get_routes_list(self) -> list:
         code, lines = self.exec(f"ip --json route show")
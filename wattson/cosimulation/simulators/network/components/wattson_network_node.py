@@ -81,17 +81,10 @@ class WattsonNetworkNode(WattsonNetworkEntity, NetworkNode):
         return self._is_outside_namespace
 
     def set_sysctl(self, key, value) -> bool:
-        code = self.exec(["sysctl", "-w", f"{key}={value}"])
-        return code == 0
+        return self.get_namespace().sysctl_set(key, value)
 
     def get_sysctl(self, key) -> typing.Any:
-        code, out = self.exec(["sysctl", f"{key}"])
-        if code != 0:
-            return None
-        for line in out:
-            if line.startswith(key):
-                return line.split(" = ", 1)[1].strip()
-        return None
+        return self.get_namespace().sysctl_get(key)
 
     def get_prefix(self) -> str:
         return "n"
@@ -28,8 +28,8 @@ class WattsonNetworkRouter(WattsonNetworkHost, NetworkRouter):
 
     def start(self):
         super().start()
-        self.exec("sysctl -w net.ipv4.ip_forward=1")
-        self.exec("sysctl -w net.ipv6.conf.all.forwarding=1")
+        self.set_sysctl("net.ipv4.ip_forward", 1)
+        self.set_sysctl("net.ipv6.conf.all.forwarding", 1)
         # Search if routing service exists
         service = self.get_routing_service()
         if service is None:
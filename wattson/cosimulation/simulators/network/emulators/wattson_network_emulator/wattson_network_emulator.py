@@ -46,8 +46,12 @@ class WattsonNetworkEmulator(NetworkEmulator):
         # Size of the ThreadPool to use for the async start. Lower values increase stability at the cost of startup speed
         self._async_threads: int = int(kwargs.get("async_thread", 200))
         self._started = threading.Event()
+        # Backend for native namespaces: "subprocess" uses `ip netns exec`, "netlink" uses pyroute2 (LinuxNamespace)
+        self._namespace_backend: str = kwargs.get("namespace_backend", "subprocess")
+        if self._namespace_backend not in ["subprocess", "netlink"]:
+            raise ValueError(f"Unknown namespace backend: {self._namespace_backend}")
         # Namespace object to represent the default / initial / system namespace
-        self._main_namespace: Namespace = Namespace("w_main")
+        self._main_namespace: Namespace = self.create_namespace("w_main")
         self._disable_tc_link = kwargs.get("disable_link_properties", False)
 
         self._topology_change_timer: Optional[ResettableTimer] = None
@@ -169,6 +173,15 @@ class WattsonNetworkEmulator(NetworkEmulator):
     def get_main_namespace(self) -> Namespace:
         return self._main_namespace
 
+    def create_namespace(self, name: str) -> Namespace:
+        """
+        Creates the Namespace object for a native namespace using the configured namespace backend.
+        This does not create the namespace itself.
+        """
+        if self._namespace_backend == "netlink":
+            return LinuxNamespace(name)
+        return Namespace(name)
+
     def _adjust_resource_limits(self):
         try:
             limit = resource.getrlimit(resource.RLIMIT_NOFILE)
@@ -5,11 +5,17 @@ from powerowl.performance.timing import Timing
 from wattson.cosimulation.simulators.network.components.wattson_network_host import WattsonNetworkHost
 from wattson.cosimulation.simulators.network.components.wattson_network_node import WattsonNetworkNode
 from wattson.cosimulation.simulators.network.emulators.wattson_network_emulator.wrapper.node_wrapper import NodeWrapper
-from wattson.networking.namespaces.linux_namespace import LinuxNamespace
 from wattson.networking.namespaces.namespace import Namespace
 
+if typing.TYPE_CHECKING:
+    from wattson.cosimulation.simulators.network.emulators.wattson_network_emulator import WattsonNetworkEmulator
+
 
 class NativeWrapper(NodeWrapper):
+    def __init__(self, entity: WattsonNetworkNode, emulator: 'WattsonNetworkEmulator'):
+        super().__init__(entity, emulator)
+        self._namespace: typing.Optional[Namespace] = None
+
     @property
     def node(self) -> WattsonNetworkNode:
         return typing.cast(WattsonNetworkNode, self.entity)
@@ -17,9 +23,9 @@ class NativeWrapper(NodeWrapper):
     def get_namespace(self) -> Namespace:
         if self.node.is_outside_namespace():
             return self.emulator.get_main_namespace()
-        if self._virtual_machine_namespace is None:
+        if self._namespace is None:
             namespace_name = f"w_{self.entity.entity_id}"
-            self._namespace = Namespace(name=namespace_name)
+            self._namespace = self.emulator.create_namespace(namespace_name)
         return self._namespace
 
     def create(self):
@@ -1,8 +1,59 @@
+import ast
+import operator
+import threading
+
 from wattson.datapoints.interface import DataPointValue
-from typing import Optional
+from typing import Optional, Callable, Dict, Any
+
+CompiledSnippet = Callable[[dict], DataPointValue]
 
 
 class SnippetParser:
+    """
+    Evaluates the coupling and transform snippets of data points, e.g., "res = X1 * 1000".
+    Snippets are compiled once and cached by their source text, shared across all SnippetParser instances.
+    Snippets of the form "res = <expression>" are compiled to callables if the expression only consists of
+    whitelisted constructs (arithmetic, comparisons, boolean logic and a few builtin functions), i.e., they skip exec.
+    All other snippets are compiled to code objects and executed with exec as before.
+    """
+    _cache: Dict[str, CompiledSnippet] = {}
+    _cache_lock = threading.Lock()
+
+    _BINARY_OPERATORS = {
+        ast.Add: operator.add,
+        ast.Sub: operator.sub,
+        ast.Mult: operator.mul,
+        ast.Div: operator.truediv,
+        ast.FloorDiv: operator.floordiv,
+        ast.Mod: operator.mod,
+        ast.Pow: operator.pow,
+        ast.BitAnd: operator.and_,
+        ast.BitOr: operator.or_,
+        ast.BitXor: operator.xor,
+        ast.LShift: operator.lshift,
+        ast.RShift: operator.rshift,
+    }
+    _UNARY_OPERATORS = {
+        ast.UAdd: operator.pos,
+        ast.USub: operator.neg,
+        ast.Not: operator.not_,
+        ast.Invert: operator.invert,
+    }
+    _FUNCTIONS = {
+        "abs": abs,
+        "min": min,
+        "max": max,
+        "round": round,
+        "int": int,
+        "float": float,
+        "bool": bool,
+    }
+    _EXPRESSION_NODES = (
+        ast.Expression, ast.Name, ast.Load, ast.Constant, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp,
+        ast.Call, ast.And, ast.Or, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Is, ast.IsNot,
+        *_BINARY_OPERATORS.keys(), *_UNARY_OPERATORS.keys()
+    )
+
     def __init__(self):
         pass
 
@@ -15,7 +66,118 @@ class SnippetParser:
             if "X1" in namespace:
                 return namespace["X1"]
             return 0
-        exec(snippet, {}, namespace)
-        if "res" in namespace:
-            return namespace["res"]
-        return 0
+        if namespace is None:
+            namespace = {}
+        compiled_snippet = self._cache.get(snippet)
+        if compiled_snippet is None:
+            compiled_snippet = self.compile(snippet)
+        return compiled_snippet(namespace)
+
+    @classmethod
+    def compile(cls, snippet: str) -> CompiledSnippet:
+        """
+        Compiles the given snippet to a callable that evaluates the snippet for a given namespace and returns its
+        result (i.e., the value of "res"). The compiled snippet is cached.
+
+        Args:
+            snippet (str):
+                The snippet's source code.
+
+        Returns:
+            CompiledSnippet: The callable evaluating the snippet.
+        """
+        with cls._cache_lock:
+            compiled_snippet = cls._cache.get(snippet)
+            if compiled_snippet is None:
+                compiled_snippet = cls._compile_expression(snippet)
+                if compiled_snippet is None:
+                    compiled_snippet = cls._compile_code(snippet)
+                cls._cache[snippet] = compiled_snippet
+            return compiled_snippet
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._cache_lock:
+            cls._cache = {}
+
+    @staticmethod
+    def _compile_code(snippet: str) -> CompiledSnippet:
+        code = compile(snippet, "<snippet>", "exec")
+
+        def execute(namespace: dict) -> DataPointValue:
+            exec(code, {}, namespace)
+            if "res" in namespace:
+                return namespace["res"]
+            return 0
+        return execute
+
+    @classmethod
+    def _compile_expression(cls, snippet: str) -> Optional[CompiledSnippet]:
+        try:
+            module = ast.parse(snippet, mode="exec")
+        except SyntaxError:
+            return None
+        if len(module.body) != 1 or not isinstance(module.body[0], ast.Assign):
+            return None
+        assignment = module.body[0]
+        if len(assignment.targets) != 1 or not isinstance(assignment.targets[0], ast.Name) or assignment.targets[0].id != "res":
+            return None
+        expression = ast.Expression(body=assignment.value)
+        if not cls._is_whitelisted(expression):
+            return None
+        evaluate = cls._build_callable(assignment.value)
+        if evaluate is None:
+            # Whitelisted, but not pure arithmetic - evaluate the compiled expression without exec
+            code = compile(ast.fix_missing_locations(expression), "<snippet>", "eval")
+            restricted_globals = {"__builtins__": cls._FUNCTIONS}
+
+            def evaluate(namespace: dict) -> DataPointValue:
+                return eval(code, restricted_globals, namespace)
+
+        def execute(namespace: dict) -> DataPointValue:
+            result = evaluate(namespace)
+            namespace["res"] = result
+            return result
+        return execute
+
+    @classmethod
+    def _is_whitelisted(cls, expression: ast.Expression) -> bool:
+        for node in ast.walk(expression):
+            if not isinstance(node, cls._EXPRESSION_NODES):
+                return False
+            if isinstance(node, ast.Call):
+                if not isinstance(node.func, ast.Name) or node.func.id not in cls._FUNCTIONS or len(node.keywords) > 0:
+                    return False
+        return True
+
+    @classmethod
+    def _build_callable(cls, node: ast.AST) -> Optional[Callable[[dict], Any]]:
+        """
+        Builds a callable for pure arithmetic expressions of names and constants, or returns None for any other node.
+        """
+        if isinstance(node, ast.Constant):
+            value = node.value
+            return lambda namespace: value
+        if isinstance(node, ast.Name):
+            name = node.id
+
+            def lookup(namespace: dict) -> Any:
+                try:
+                    return namespace[name]
+                except KeyError:
+                    raise NameError(f"name '{name}' is not defined") from None
+            return lookup
+        if isinstance(node, ast.UnaryOp):
+            operand = cls._build_callable(node.operand)
+            if operand is None:
+                return None
+            unary_operator = cls._UNARY_OPERATORS[type(node.op)]
+            return lambda namespace: unary_operator(operand(namespace))
+        if isinstance(node, ast.BinOp):
+            left = cls._build_callable(node.left)
+            right = cls._build_callable(node.right)
+            if left is None or right is None:
+                return None
+            binary_operator = cls._BINARY_OPERATORS[type(node.op)]
+            return lambda namespace: binary_operator(left(namespace), right(namespace))
+        return None
@@ -44,6 +44,7 @@ class PowerGridProvider(DataPointProvider):
         self._max_state_count = 2000
 
         self.filter_paths = set()
+        self._use_grid_value_interests = self.config.get("grid_value_interests", True)
 
         self.logger = get_logger("PowerGridProvider", "PowerGridProvider")
         self.statistics = self.config.get("statistics", None)
@@ -87,6 +88,7 @@ class PowerGridProvider(DataPointProvider):
             paths (Set):
                 A set of grid value identifiers / paths to monitor.
         """
+        new_paths = set(paths).difference(self.filter_paths)
         self.filter_paths.update(paths)
         for path in paths:
             try:
@@ -94,6 +96,19 @@ class PowerGridProvider(DataPointProvider):
                 grid_value.add_on_set_callback(self._on_set)
             except Exception as e:
                 self.logger.error(f"Could not subscribe to element updates for {path}: {repr(e)}")
+        if len(new_paths.difference(self._path_to_identifier_map.keys())) > 0:
+            self._update_grid_value_interests()
+
+    def _update_grid_value_interests(self):
+        """
+        Registers the grid values mapped by the data points of this provider (and the filter paths) as the only grid
+        values this client receives updates for.
+        """
+        if not self._use_grid_value_interests or self.remote_power_grid_model is None:
+            return
+        paths = set(self._path_to_identifier_map.keys())
+        paths.update(self.filter_paths)
+        self.remote_power_grid_model.set_grid_value_interests(paths)
 
     @property
     def _next_state_id(self) -> str:
@@ -125,6 +140,7 @@ class PowerGridProvider(DataPointProvider):
         if not self.client.is_registered:
             self.client.register()
         self.remote_power_grid_model = RemotePowerGridModel(wattson_client=self.client)
+        self._update_grid_value_interests()
 
         self._wattson_time = self.client.get_wattson_time()
         self.logger.info(f"Got Simulation start time: "
@@ -187,8 +203,33 @@ class PowerGridProvider(DataPointProvider):
     def clear_cache(self):
         self.cache = {}
 
+    def synchronize_values(self, identifiers: Iterable[str]):
+        """
+        Synchronizes the grid values of all POWER_GRID source providers of the given data points with a single query.
+        Subsequent reads of these data points are served locally until the grid values' synchronization interval
+        has passed.
+
+        Args:
+            identifiers (Iterable[str]):
+                The data point identifiers to synchronize.
+        """
+        if self.remote_power_grid_model is None:
+            return
+        paths = set()
+        for identifier in identifiers:
+            for index in self.source_providers.get(identifier, []):
+                info = self._get_provider_info(identifier, index, "sources")
+                paths.add(f"{info['grid_element']}.{info['context']}.{info['attribute']}")
+        if len(paths) == 0:
+            return
+        try:
+            self.remote_power_grid_model.get_grid_values(paths)
+        except Exception as e:
+            self.logger.error(f"Failed to synchronize power grid data: {e=}")
+
     def update_cache(self):
         self.cache = {}
+        self.synchronize_values(self.source_providers.keys())
         for identifier, providers in self.source_providers.items():
             for index in providers:
                 self.get_value(identifier, index)
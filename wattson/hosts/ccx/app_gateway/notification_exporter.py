@@ -1,52 +1,66 @@
-import json
-import queue
-import threading
+import logging
 from pathlib import Path
-from typing import Union
+from typing import Any, Dict, Optional, Union
 
 from wattson.hosts.ccx.app_gateway import AppGatewayClient
 from wattson.hosts.ccx.app_gateway import AppGatewayServer
 from wattson.hosts.ccx.app_gateway.messages.app_gateway_notification import AppGatewayNotification
 from wattson.hosts.ccx.app_gateway.notification_client import AppGatewayNotificationClient
 from wattson.hosts.ccx.app_gateway.notification_server import AppGatewayNotificationServer
-from wattson.util.json.pickle_encoder import PickleEncoder
+from wattson.util import get_logger
+from wattson.util.json.jsonl_export_writer import JSONLExportWriter
 
 
-class NotificationExporter(threading.Thread):
-    def __init__(self, app_gateway: Union['AppGatewayClient', 'AppGatewayServer'], export_file: Path):
-        super().__init__()
+class NotificationExporter:
+    """
+    Writes all notifications of the AppGateway to the export file as JSON lines.
+    Notifications are written in batches by the background thread of a JSONLExportWriter, optionally compressed and
+    rotated into numbered segments (see JSONLExportWriter).
+    """
+    def __init__(self, app_gateway: Union['AppGatewayClient', 'AppGatewayServer'], export_file: Path,
+                 logger: Optional[logging.Logger] = None, **kwargs):
         self._app_gateway = app_gateway
+        self.logger = logger
+        if self.logger is None:
+            self.logger = get_logger("NotificationExporter")
         self.notification_handler: Union[AppGatewayNotificationClient, AppGatewayNotificationServer]
         if isinstance(app_gateway, AppGatewayClient):
             self.notification_handler = self._app_gateway._publisher
         else:
             self.notification_handler = self._app_gateway._notification_server
-        self._notification_queue = queue.Queue()
         self._export_file = export_file
+        self._stream = export_file.name.removesuffix(".jsonl")
+        self._writer = JSONLExportWriter(
+            export_file.parent,
+            batch_size=kwargs.get("batch_size", 1000),
+            flush_interval=kwargs.get("flush_interval", 1),
+            compression=kwargs.get("compression", None),
+            compression_level=kwargs.get("compression_level", None),
+            max_segment_size=kwargs.get("max_segment_size", None),
+            max_queue_size=kwargs.get("max_queue_size", 100000),
+            # The export file is overwritten on every start
+            append=False,
+            name="W/CCXExport",
+            logger=self.logger
+        )
         self._enabled: bool = False
-        self._stop_requested: threading.Event = threading.Event()
 
     def start(self):
-        super().start()
+        self._writer.start()
         self._enabled = True
-        self._stop_requested.clear()
         self.notification_handler.add_additional_callback(self._on_notification)
 
-    def stop(self):
-        self._stop_requested.set()
+    def stop(self, timeout: Optional[float] = None) -> bool:
         self._enabled = False
         self.notification_handler.remove_additional_callback(self._on_notification)
+        return self._writer.stop(timeout=timeout)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Returns the export throughput and backlog metrics (see JSONLExportWriter.get_statistics).
+        """
+        return self._writer.get_statistics()
 
     def _on_notification(self, notification: AppGatewayNotification):
         if self._enabled:
-            self._notification_queue.put(notification)
-
-    def run(self):
-        with self._export_file.open('w') as export_file:
-            while not self._stop_requested.is_set():
-                try:
-                    notification = self._notification_queue.get(timeout=1)
-                except queue.Empty:
-                    continue
-                line = json.dumps(notification.to_dict(), cls=PickleEncoder)
-                export_file.write(line + '\n')
+            self._writer.write(self._stream, notification.to_dict())
@@ -0,0 +1,88 @@
+import threading
+from typing import Dict, Optional, Tuple, Any
+
+from wattson.hosts.ccx.protocols import CCXProtocol
+
+
+class CCXDataPointIndex:
+    """
+    Maps protocol-specific addresses to data point identifiers, such that incoming ASDUs and report entries can be
+    resolved without scanning all data points.
+    IEC 104 data points are indexed by (server, COA, IOA), IEC 61850 MMS data points by
+    (server, logical device, logical node, attribute path).
+    """
+    def __init__(self, data_points: Optional[Dict[str, dict]] = None):
+        self._lock = threading.Lock()
+        self._iec104: Dict[Tuple[Any, int, int], str] = {}
+        self._iec104_by_coa_ioa: Dict[Tuple[int, int], str] = {}
+        self._mms: Dict[Tuple[Any, str, str, str], str] = {}
+        # The index keys of each data point for removal
+        self._keys_by_identifier: Dict[str, Tuple[CCXProtocol, tuple]] = {}
+        if data_points is not None:
+            for data_point in data_points.values():
+                self.add(data_point)
+
+    @staticmethod
+    def split_mms_path(mms_path: str) -> Tuple[str, str, str]:
+        """
+        Splits an MMS attribute reference (LD/LN.DO.DA) into the logical device, the logical node and the attribute path.
+        """
+        logical_device, _, node_path = mms_path.partition("/")
+        logical_node, _, attribute_path = node_path.partition(".")
+        return logical_device, logical_node, attribute_path
+
+    def add(self, data_point: dict):
+        identifier = data_point["identifier"]
+        protocol = data_point.get("protocol")
+        protocol_data = data_point.get("protocol_data", {})
+        server_id = data_point.get("protocol_server_id")
+        with self._lock:
+            self._remove(identifier)
+            if protocol == CCXProtocol.IEC104:
+                coa = int(protocol_data["coa"])
+                ioa = int(protocol_data["ioa"])
+                key = (server_id, coa, ioa)
+                self._iec104[key] = identifier
+                self._iec104_by_coa_ioa[(coa, ioa)] = identifier
+            elif protocol == CCXProtocol.IEC61850_MMS:
+                mms_path = protocol_data.get("mms_path")
+                if mms_path is None:
+                    return
+                key = (server_id,) + self.split_mms_path(mms_path)
+                self._mms[key] = identifier
+            else:
+                return
+            self._keys_by_identifier[identifier] = (protocol, key)
+
+    def remove(self, data_point_identifier: str):
+        with self._lock:
+            self._remove(data_point_identifier)
+
+    def _remove(self, data_point_identifier: str):
+        entry = self._keys_by_identifier.pop(data_point_identifier, None)
+        if entry is None:
+            return
+        protocol, key = entry
+        if protocol == CCXProtocol.IEC104:
+            if self._iec104.get(key) == data_point_identifier:
+                del self._iec104[key]
+            if self._iec104_by_coa_ioa.get(key[1:]) == data_point_identifier:
+                del self._iec104_by_coa_ioa[key[1:]]
+        elif protocol == CCXProtocol.IEC61850_MMS:
+            if self._mms.get(key) == data_point_identifier:
+                del self._mms[key]
+
+    def get_iec104_identifier(self, coa: int, ioa: int, server_id: Optional[Any] = None) -> Optional[str]:
+        """
+        Returns the identifier of the IEC 104 data point with the given address.
+        If no server is given, any data point with the given COA and IOA is returned.
+        """
+        if server_id is None:
+            return self._iec104_by_coa_ioa.get((coa, ioa))
+        return self._iec104.get((server_id, coa, ioa))
+
+    def get_mms_identifier(self, server_id: Any, mms_path: str) -> Optional[str]:
+        """
+        Returns the identifier of the IEC 61850 MMS data point with the given attribute reference on the given server.
+        """
+        return self._mms.get((server_id,) + self.split_mms_path(mms_path))
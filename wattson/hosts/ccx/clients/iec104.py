@@ -36,14 +36,11 @@ class Iec104CCXProtocolClient(CCXProtocolClient):
         # Add servers
         self.server_key_by_coa = {}
         self.coa_by_server = {}
-        self.data_point_identifier_by_coa_ioa = {}
         self.known_servers = set()
         for dp_id, dp in self.data_points.items():
             server_id = dp["protocol_server_id"]
             protocol_data = dp["protocol_data"]
             coa = protocol_data["coa"]
-            ioa = protocol_data["ioa"]
-            self.data_point_identifier_by_coa_ioa[f"{coa}.{ioa}"] = dp["identifier"]
 
             if server_id in self.known_servers:
                 continue
@@ -87,6 +84,9 @@ class Iec104CCXProtocolClient(CCXProtocolClient):
             return None
         return self.get_server(server_key)
 
+    def _get_data_point_identifier(self, coa: int, ioa: int) -> Optional[str]:
+        return self.ccx.data_point_index.get_iec104_identifier(coa, ioa, self.server_key_by_coa.get(coa))
+
     def _on_receive_apdu(self, apdu: APDU, coa: int, raw_callback: bool = False):
         # TODO: Remove raw_callback
         server = self._get_server_by_coa(coa)
@@ -121,7 +121,7 @@ class Iec104CCXProtocolClient(CCXProtocolClient):
         self.trigger_on_send_packet(server_key, server_ip, server_port, raw_data, raw_data_info)
 
     def _on_receive_data_point(self, data_point: IEC104Point, previous_point: IEC104Point, incoming_message: IEC104Message):
-        data_point_identifier = self.data_point_identifier_by_coa_ioa.get(f"{data_point.coa}.{data_point.ioa}")
+        data_point_identifier = self._get_data_point_identifier(data_point.coa, data_point.ioa)
         if data_point_identifier is None:
             self.logger.error(f"Cannot find data point identifier for {data_point.coa} {data_point.ioa}")
             return
@@ -135,7 +135,7 @@ class Iec104CCXProtocolClient(CCXProtocolClient):
         self.trigger_on_receive_data_point(data_point_identifier=data_point_identifier, value=data_point.value, protocol_data=protocol_data)
 
     def _on_explicit_control_exit(self, coa: int, data_point: IEC104Point, successful: bool, original_cot: int):
-        data_point_identifier = self.data_point_identifier_by_coa_ioa.get(f"{data_point.coa}.{data_point.ioa}")
+        data_point_identifier = self._get_data_point_identifier(data_point.coa, data_point.ioa)
         if data_point_identifier is None:
             self.logger.error(f"Cannot find data point identifier for {data_point.coa} {data_point.ioa}")
             return
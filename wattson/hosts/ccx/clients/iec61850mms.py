@@ -1,3 +1,4 @@
+import hashlib
 import logging
 import threading
 import time
@@ -14,6 +15,9 @@ from wattson.hosts.ccx.app_gateway.data_objects.ccx_mms_report import CCXMmsRepo
 from wattson.hosts.ccx.clients.ccx_client import CCXProtocolClient
 from wattson.hosts.ccx.connection_status import CCXConnectionStatus
 from wattson.hosts.ccx.protocols import CCXProtocol
+from wattson.analysis.statistics.common.static import StaticStatisticClient
+from wattson.analysis.statistics.common.statistic_message import StatisticMessage
+from wattson.iec61850.common.iec61850_model_cache import IEC61850ModelCache
 from wattson.iec61850.common.iec61850_python_mappings import iec61850_python_mappings
 from wattson.iec61850.iec61850_mms_report import IEC61850MMSReport
 from wattson.iec61850.iec61850_model import IEC61850Model
@@ -55,7 +59,6 @@ class Iec61850MMSCCXProtocolClient(CCXProtocolClient):
         self.connections_with_rcbs = []
 
         self._data_attributes_by_data_point_identifier: Dict[str, IEC61850RemoteDataAttribute] = {}
-        self._data_point_identifier_by_data_attribute: Dict[int, str] = {}
 
         # TLS
         ## List of (public) certificates of servers to accept.
@@ -69,6 +72,20 @@ class Iec61850MMSCCXProtocolClient(CCXProtocolClient):
         if self._export_tls_keys:
             self._export_tls_keys_folder.mkdir(parents=True, exist_ok=True)
 
+        # Model cache
+        ## Reconnects to servers with an unchanged model reuse the browsed model instead of browsing the server again
+        self._model_browse_delay = kwargs.get("model_browse_delay", 2)
+        self._model_cache: Optional[IEC61850ModelCache] = None
+        if kwargs.get("model_cache", True):
+            cache_folder = None
+            if self.ccx.get_node_working_directory() is not None:
+                cache_folder = self.ccx.get_node_working_directory().joinpath("iec61850_model_cache")
+            self._model_cache = IEC61850ModelCache(cache_folder)
+        ## Connection metrics by server ID
+        self._connect_times: Dict[str, float] = {}
+        self._connection_metrics: Dict[str, dict] = {}
+        self._metrics_lock = threading.Lock()
+
         for dp_id, dp in self.data_points.items():
             server_id = dp["protocol_server_id"]
             protocol_data = dp["protocol_data"]
@@ -241,21 +258,13 @@ class Iec61850MMSCCXProtocolClient(CCXProtocolClient):
         return server_id
 
     def get_data_point_identifier(self, mms_attribute: IEC61850RemoteDataAttribute) -> Optional[str]:
-        if id(mms_attribute) in self._data_point_identifier_by_data_attribute:
-            return self._data_point_identifier_by_data_attribute[id(mms_attribute)]
-
-        reference = mms_attribute.get_attribute_reference()
         server_id = self.server_id_by_model.get(id(mms_attribute.get_model()))
         if server_id is None:
             return None
-        for data_point in self.data_points_by_server_id[server_id]:
-            data_point_identifier = data_point["identifier"]
-            data_point_path = data_point.get("protocol_data", {}).get("mms_path")
-            if data_point_path == reference:
-                self._data_attributes_by_data_point_identifier[data_point_identifier] = mms_attribute
-                self._data_point_identifier_by_data_attribute[id(mms_attribute)] = data_point_identifier
-                return data_point_identifier
-        return None
+        data_point_identifier = self.ccx.data_point_index.get_mms_identifier(server_id, mms_attribute.get_attribute_reference())
+        if data_point_identifier is not None:
+            self._data_attributes_by_data_point_identifier[data_point_identifier] = mms_attribute
+        return data_point_identifier
 
     def get_mms_value_type_from_data_points(self, mms_attribute: IEC61850RemoteDataAttribute) -> Optional[iec61850_python.MmsType]:
         mms_type = None
@@ -287,10 +296,74 @@ class Iec61850MMSCCXProtocolClient(CCXProtocolClient):
     def mms_data_points(self) -> dict:
         return {dp_id: dp for dp_id, dp in self.data_points.items() if dp.get("type") == DataPointType.DATA_POINT and dp.get("protocol") == CCXProtocol.IEC61850_MMS}
 
-    def init_after_connect(self, connection: iec61850_python.Connection):
-        time.sleep(2)
+    def _get_model_fingerprint(self, server_id: str, connection: iec61850_python.Connection) -> Optional[str]:
+        """
+        Combines the server's root-level model fingerprint with the configured data points of the server.
+        """
+        model_fingerprint = self.get_model(server_id).get_fingerprint(connection)
+        if model_fingerprint is None:
+            return None
+        mms_paths = sorted(str(dp.get("protocol_data", {}).get("mms_path")) for dp in self.data_points_by_server_id.get(server_id, []))
+        content = "\n".join([model_fingerprint, self.get_model_name(server_id)] + mms_paths)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _load_model(self, server_id: str, connection: iec61850_python.Connection) -> bool:
+        """
+        Builds the model of the given server, either from the model cache or by browsing the server.
+        """
+        model = self.get_model(server_id)
+        model_logger = self.logger.getChild(f"Server{server_id}Model")
+        server_key = None
+        fingerprint = None
+        if self._model_cache is not None:
+            server_key = IEC61850ModelCache.get_server_key(server_id, connection.get_remote_hostname(), connection.get_remote_port())
+            fingerprint = self._get_model_fingerprint(server_id, connection)
+            if fingerprint is not None:
+                description = self._model_cache.load(server_key, fingerprint)
+                if description is not None:
+                    self.logger.debug(f"Building model for {server_id} from cache")
+                    try:
+                        built = model.build_from_description(connection, description, model_logger)
+                    except Exception as e:
+                        # E.g., a cache entry of an outdated or corrupted format
+                        self.logger.warning(f"Could not build model for {server_id} from cache: {e=}")
+                        built = False
+                    if built:
+                        self._update_connection_metrics(server_id, cache_hits=1)
+                        return True
+                    self.logger.warning(f"Cached model for {server_id} is invalid")
+                    self._model_cache.invalidate(server_key)
+
+        self._update_connection_metrics(server_id, cache_misses=1)
+        time.sleep(self._model_browse_delay)
         self.logger.debug("Building model.")
+        if not model.build_from_connection(connection, model_logger):
+            return False
+        if self._model_cache is not None and fingerprint is not None:
+            self._model_cache.store(server_key, fingerprint, model.get_description())
+        return True
+
+    def _update_connection_metrics(self, server_id: str, **increments):
+        with self._metrics_lock:
+            metrics = self._connection_metrics.setdefault(server_id, {
+                "connects": 0,
+                "cache_hits": 0,
+                "cache_misses": 0,
+                "model_load_seconds": None,
+                "connect_to_first_report_seconds": None
+            })
+            for key, value in increments.items():
+                metrics[key] += value
+
+    def get_connection_metrics(self) -> Dict[str, dict]:
+        """
+        Returns, per server ID, the number of connects, model cache hits and misses as well as the duration of the
+        last model load and the latency between the last connect and the first report received afterward.
+        """
+        with self._metrics_lock:
+            return {server_id: dict(metrics) for server_id, metrics in self._connection_metrics.items()}
 
+    def init_after_connect(self, connection: iec61850_python.Connection):
         connection_ip = connection.get_remote_hostname()
         connection_port = connection.get_remote_port()
 
@@ -303,7 +376,12 @@ class Iec61850MMSCCXProtocolClient(CCXProtocolClient):
         self.logger.debug(f"Server id is {server_id}")
 
         try:
-            model.build_from_connection(connection, self.logger.getChild(f"Server{server_id}Model"))
+            start_time = time.time()
+            if not self._load_model(server_id, connection):
+                self.logger.error(f"Could not build model for {server_id}")
+                return
+            with self._metrics_lock:
+                self._connection_metrics[server_id]["model_load_seconds"] = time.time() - start_time
 
             self.logger.debug("Installing data attribute callbacks")
             for data_attribute in model.get_data_attributes():
@@ -361,10 +439,7 @@ class Iec61850MMSCCXProtocolClient(CCXProtocolClient):
         server_key = self.server_key_by_id[data_point_identifier]
         if server_key != server_id:
             return None
-        else:
-            dp = next((x for x in self.data_points_by_server_id[server_id] if
-                       x["identifier"] == data_point_identifier), None)
-            return dp
+        return self.data_points.get(data_point_identifier)
 
     def _on_connection_indication(self, connection: iec61850_python.Connection,
                                   new_state: iec61850_python.IedConnectionState):
@@ -384,6 +459,9 @@ class Iec61850MMSCCXProtocolClient(CCXProtocolClient):
 
         if connection_status != CCXConnectionStatus.CONNECTED:
             return
+        self._update_connection_metrics(server_id, connects=1)
+        with self._metrics_lock:
+            self._connect_times[server_id] = time.time()
         threading.Thread(target=self.init_after_connect, args=(connection,)).start()
 
     def on_report_callback(self, connection: iec61850_python.Connection, report: iec61850_python.RemoteReport):
@@ -392,6 +470,7 @@ class Iec61850MMSCCXProtocolClient(CCXProtocolClient):
         if server_id is None:
             self.logger.error(f"Cannot find server for address {connection.get_remote_hostname()}")
             return
+        self._on_first_report(server_id)
         model = self.get_model(server_id)
         try:
             mms_report = IEC61850MMSReport(report, model)
@@ -431,6 +510,16 @@ class Iec61850MMSCCXProtocolClient(CCXProtocolClient):
         )
         # self.logger.debug(f"on_report_callback done")
 
+    def _on_first_report(self, server_id: str):
+        with self._metrics_lock:
+            connect_time = self._connect_times.pop(server_id, None)
+            if connect_time is None:
+                return
+            latency = time.time() - connect_time
+            self._connection_metrics[server_id]["connect_to_first_report_seconds"] = latency
+        self.logger.info(f"First report from {server_id} {round(latency, 3)}s after connecting")
+        StaticStatisticClient.emit(StatisticMessage(event_class="61850-mms-connect", event_name=f"first-report-{server_id}", value=latency))
+
     def on_attribute_value_update(self, data_attribute: IEC61850RemoteDataAttribute, old_value: Any, new_value: Any):
         data_point_identifier = self.get_data_point_identifier(data_attribute)
         if data_point_identifier is None:
@@ -39,9 +39,13 @@ class ModbusCCXProtocolClient(CCXProtocolClient):
             server_data[server_id] = server
         self.known_servers = set(server_data.keys())
         # Create client
+        modbus_options = self.ccx.options.get("modbus", {})
         self.client = ModbusClient(
             server_data=server_data,
             logger=self.logger.getChild("Client"),
+            coalesce_reads=modbus_options.get("coalesce_reads", True),
+            read_gap_tolerance=modbus_options.get("read_gap_tolerance", 0),
+            shared_event_loop=modbus_options.get("shared_event_loop", False)
         )
         self.client.set_on_connection_change_callback(self._on_connection_change)
 
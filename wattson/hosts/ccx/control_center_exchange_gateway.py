@@ -7,6 +7,7 @@ from wattson.cosimulation.control.interface.wattson_client import WattsonClient
 from wattson.cosimulation.control.messages.wattson_event import WattsonEvent
 from wattson.hosts.ccx.app_gateway import AppGatewayServer
 from wattson.hosts.ccx.app_gateway.notification_exporter import NotificationExporter
+from wattson.hosts.ccx.ccx_data_point_index import CCXDataPointIndex
 from wattson.hosts.ccx.clients.ccx_client import CCXProtocolClient
 from wattson.hosts.ccx.connection_status import CCXConnectionStatus
 from wattson.hosts.ccx.logics.logic_return_action import LogicReturnAction
@@ -47,7 +48,9 @@ class ControlCenterExchangeGateway:
             "logics": [],
             "export": {
                 "enabled": False,
-                "file": Path("ccx_notifications.jsonl")
+                "file": Path("ccx_notifications.jsonl"),
+                "compression": None,
+                "max_segment_size": None
             },
             "node-directory": None,
             "node-directory-host": None
@@ -77,18 +80,11 @@ class ControlCenterExchangeGateway:
 
         # Assign data points to protocol
         for dp_id, dp in self.data_points.items():
-            protocol = dp["protocol"]
-            if protocol == CCXProtocol.IEC104:
-                dp["server_key"] = dp["protocol_data"]["coa"]
-            elif protocol == CCXProtocol.IEC61850_MMS:
-                dp["server_key"] = dp["protocol_data"]["server"]
-            elif protocol == CCXProtocol.MODBUS:
-                dp["server_key"] = dp["protocol_server_id"]
-            else:
-                self.logger.error(f"Unknown CCXProtocol: {protocol}")
-            self.protocol_info.setdefault(protocol, {})[dp_id] = dp
+            self._assign_data_point_protocol(dp_id, dp)
 
         self.protocols = set(self.protocol_info.keys())
+        # Resolves protocol-specific addresses to data point identifiers
+        self.data_point_index = CCXDataPointIndex(self.data_points)
 
         # Assign data points to grid values
         for dp_id, dp in self.data_points.items():
@@ -120,9 +116,16 @@ class ControlCenterExchangeGateway:
 
         self.notification_exporter: Optional[NotificationExporter] = None
         if self.options.get("export", {}).get("enabled", False):
-            export_path = Path(self.options.get("export", {}).get("file", "ccx-notifications.jsonl"))
+            export_options = self.options.get("export", {})
+            export_path = Path(export_options.get("file", "ccx-notifications.jsonl"))
             export_path.parent.mkdir(parents=True, exist_ok=True)
-            self.notification_exporter = NotificationExporter(app_gateway=self.app_gateway, export_file=export_path)
+            self.notification_exporter = NotificationExporter(
+                app_gateway=self.app_gateway,
+                export_file=export_path,
+                logger=self.logger.getChild("NotificationExporter"),
+                compression=export_options.get("compression", None),
+                max_segment_size=export_options.get("max_segment_size", None)
+            )
 
         # Initialize Logics
         self.logics = []
@@ -178,7 +181,9 @@ class ControlCenterExchangeGateway:
                 self.clients[CCXProtocol.IEC61850_MMS] = Iec61850MMSCCXProtocolClient(
                     self,
                     tls_configurations=self.get_tls_configurations(CCXProtocol.IEC61850_MMS),
-                    enable_single_server=self.options.get("iec61850_mms", {}).get("enable_single_server", False)
+                    enable_single_server=self.options.get("iec61850_mms", {}).get("enable_single_server", False),
+                    model_cache=self.options.get("iec61850_mms", {}).get("model_cache", True),
+                    model_browse_delay=self.options.get("iec61850_mms", {}).get("model_browse_delay", 2)
                 )
             elif protocol == CCXProtocol.MODBUS:
                 from wattson.hosts.ccx.clients.modbus import ModbusCCXProtocolClient
@@ -340,6 +345,36 @@ class ControlCenterExchangeGateway:
     def get_data_point(self, data_point_identifier: str) -> Optional[dict]:
         return self.data_points.get(data_point_identifier)
 
+    def _assign_data_point_protocol(self, data_point_identifier: str, data_point: dict):
+        protocol = data_point["protocol"]
+        if protocol == CCXProtocol.IEC104:
+            data_point["server_key"] = data_point["protocol_data"]["coa"]
+        elif protocol == CCXProtocol.IEC61850_MMS:
+            data_point["server_key"] = data_point["protocol_data"]["server"]
+        elif protocol == CCXProtocol.MODBUS:
+            data_point["server_key"] = data_point["protocol_server_id"]
+        else:
+            self.logger.error(f"Unknown CCXProtocol: {protocol}")
+        self.protocol_info.setdefault(protocol, {})[data_point_identifier] = data_point
+
+    def add_data_point(self, data_point: dict):
+        """
+        Adds (or replaces) a data point and updates the data point index accordingly.
+        Protocol clients do not connect to servers that are only introduced by this data point.
+        """
+        data_point_identifier = data_point["identifier"]
+        self.remove_data_point(data_point_identifier)
+        self.data_points[data_point_identifier] = data_point
+        self._assign_data_point_protocol(data_point_identifier, data_point)
+        self.data_point_index.add(data_point)
+
+    def remove_data_point(self, data_point_identifier: str):
+        data_point = self.data_points.pop(data_point_identifier, None)
+        if data_point is None:
+            return
+        self.protocol_info.get(data_point["protocol"], {}).pop(data_point_identifier, None)
+        self.data_point_index.remove(data_point_identifier)
+
     def get_data_point_protocol(self, data_point: dict) -> CCXProtocol:
         protocol_name = data_point["protocol"]
         try:
@@ -57,6 +57,8 @@ class RTU:
         self.iec104_port = kwargs.get("iec104_port", 2404)
 
         self.modbus_port = kwargs.get("modbus_port", 502)
+        self.modbus_shared_event_loop = kwargs.get("modbus_shared_event_loop", False)
+        self.modbus_array_memory = kwargs.get("modbus_array_memory", False)
 
         self.iec61850_port = kwargs.get("iec61850_port", 102)
 
@@ -253,6 +255,8 @@ class RTU:
             port=self.modbus_port,
             allowed_mtu_ips=self._allowed_mtu_ips,
             block_control_commands=self._local_control,
+            shared_event_loop=self.modbus_shared_event_loop,
+            array_memory=self.modbus_array_memory,
             tls_configuration=self._tls_configuration
         )
         rtu_modbus.setup_socket()
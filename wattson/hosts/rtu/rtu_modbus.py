@@ -20,6 +20,8 @@ class RtuModbus:
 
         self.allowed_mtu_ips = kwargs.get("allowed_mtu_ips", True)
         self.block_control_commands = kwargs.get("block_control_commands", False)
+        self.shared_event_loop = kwargs.get("shared_event_loop", False)
+        self.array_memory = kwargs.get("array_memory", False)
         self.server: Optional[ModbusServer] = None
 
         self.logger.info("Initialized RtuModbus")
@@ -31,7 +33,9 @@ class RtuModbus:
             bind_ip=self.rtu.ip,
             bind_port=self.port,
             zero_based=True,
-            logger=self.logger.getChild("Server")
+            logger=self.logger.getChild("Server"),
+            shared_event_loop=self.shared_event_loop,
+            array_memory=self.array_memory
         )
         self.server.set_on_client_connect(self._on_client_connect)
         self.server.set_on_client_disconnect(self._on_client_disconnect)
@@ -0,0 +1,82 @@
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Optional, Dict
+
+
+class IEC61850ModelCache:
+    """
+    Caches the descriptions of browsed IEC 61850 server models (see IEC61850Model.get_description).
+    Entries are keyed by the server identity and only returned if the model's fingerprint is unchanged.
+    If a cache folder is given, entries are persisted as JSON files and survive restarts.
+    Entries of another FORMAT_VERSION, i.e., of an incompatible description format, are ignored.
+    """
+    FORMAT_VERSION = 1
+
+    def __init__(self, cache_folder: Optional[Path] = None):
+        self._cache_folder = cache_folder
+        if self._cache_folder is not None:
+            self._cache_folder.mkdir(parents=True, exist_ok=True)
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_server_key(server_id: str, ip: str, port: int) -> str:
+        return f"v{IEC61850ModelCache.FORMAT_VERSION}_{server_id}_{ip}_{port}"
+
+    def _get_file(self, server_key: str) -> Optional[Path]:
+        if self._cache_folder is None:
+            return None
+        file_name = hashlib.sha1(server_key.encode("utf-8")).hexdigest()
+        return self._cache_folder.joinpath(f"{file_name}.json")
+
+    def load(self, server_key: str, fingerprint: str) -> Optional[dict]:
+        """
+        Returns the cached model description for the given server if its fingerprint matches.
+        """
+        with self._lock:
+            entry = self._entries.get(server_key)
+            if entry is None:
+                file = self._get_file(server_key)
+                if file is None or not file.exists():
+                    return None
+                try:
+                    entry = json.loads(file.read_text())
+                except (OSError, ValueError):
+                    return None
+                if not isinstance(entry, dict):
+                    return None
+                self._entries[server_key] = entry
+            if entry.get("format_version") != IEC61850ModelCache.FORMAT_VERSION:
+                return None
+            if entry.get("server_key") != server_key or entry.get("fingerprint") != fingerprint:
+                return None
+            description = entry.get("description")
+            if not isinstance(description, dict):
+                return None
+            return description
+
+    def store(self, server_key: str, fingerprint: str, description: dict):
+        entry = {
+            "format_version": IEC61850ModelCache.FORMAT_VERSION,
+            "server_key": server_key,
+            "fingerprint": fingerprint,
+            "description": description
+        }
+        with self._lock:
+            self._entries[server_key] = entry
+            file = self._get_file(server_key)
+            if file is None:
+                return
+            # Write atomically to not leave a corrupted entry on crashes
+            temporary_file = file.with_suffix(".tmp")
+            temporary_file.write_text(json.dumps(entry))
+            temporary_file.replace(file)
+
+    def invalidate(self, server_key: str):
+        with self._lock:
+            self._entries.pop(server_key, None)
+            file = self._get_file(server_key)
+            if file is not None:
+                file.unlink(missing_ok=True)
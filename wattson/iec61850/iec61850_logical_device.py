@@ -93,3 +93,16 @@ class IEC61850LogicalDevice:
             if not logical_node.build_from_connection(connection, logger):
                 return False
         return True
+
+    def build_from_description(self, connection: iec61850_python.Connection, description: dict, logger: logging.Logger):
+        for node_name, node_description in description.items():
+            logical_node = self.ensure_logical_node(node_name)
+            if not logical_node.build_from_description(connection, node_description, logger):
+                return False
+        return True
+
+    def get_description(self) -> dict:
+        """
+        Returns the descriptions of all logical nodes of this device by their name.
+        """
+        return {logical_node.name: logical_node.get_description() for logical_node in self.logical_nodes}
@@ -31,6 +31,7 @@ class IEC61850LogicalNode:
         self.data_sets: List['IEC61850DataSet'] = []
         self.report_control_blocks: List['IEC61850ReportControlBlock'] = []
         self.data_objects = data_objects
+        self._description: Optional[dict] = None
 
     @property
     def name(self) -> str:
@@ -202,18 +203,76 @@ class IEC61850LogicalNode:
             attributes.extend(data_object.get_data_attributes())
         return attributes
 
-    def build_from_connection(self, connection: iec61850_python.Connection, logger: logging.Logger):
-        from wattson.iec61850.iec61850_remote_data_set import IEC61850RemoteDataSet
-        from wattson.iec61850.iec61850_remote_report_control_block import IEC61850RemoteReportControlBlock
-
+    def get_description(self) -> Optional[dict]:
+        """
+        Returns the description this node has been built from, i.e., the browsed variables and data set directories.
+        """
+        return self._description
+
+    def browse(self, connection: iec61850_python.Connection, logger: logging.Logger) -> Optional[dict]:
+        """
+        Browses the variables and data sets of this node on the server.
+
+        Args:
+            connection (iec61850_python.Connection):
+                The connection to the server
+            logger (logging.Logger):
+                The logger to use
+
+        Returns:
+            Optional[dict]: A (JSON serializable) description of this node or None in case of an error
+        """
         # Read variables
         # TODO: This assumes a flat hierarchy, i.e., no nested objects or attributes
         variables, error = connection.get_logical_node_variables(self.reference)
         if is_error(error):
             logger.error(f"Failed while retrieving variables for {self.reference}: {error=}")
-            return False
+            return None
         logger.debug(f"Logical node {self.reference} has {len(variables)} variables")
 
+        # Read Data Sets
+        acsi_class = iec61850_python.ACSIClass.ACSI_CLASS_DATA_SET
+        data_sets, error = connection.get_logical_node_directory(self.reference, acsi_class)
+        if is_error(error):
+            logger.error(f"Failed while retrieving data sets for {self.reference}: {error=}")
+            return None
+        logger.debug(f"Node {self.name} has {len(data_sets)} data sets")
+        data_set_directories = {}
+        for data_set_name in data_sets:
+            if data_set_name in data_set_directories:
+                continue
+            data_set_reference = f"{self.reference}${data_set_name}"
+            # Request data set directory
+            logger.debug(f"Querying {data_set_reference}")
+            directory, is_deletable, error = connection.get_data_set_directory(data_set_reference)
+            if is_error(error):
+                logger.error(f"Failed while retrieving data set {data_set_reference} for {self.reference}: {error=}")
+                return None
+            data_set_directories[data_set_name] = list(directory)
+
+        return {
+            "variables": list(variables),
+            "data_sets": data_set_directories
+        }
+
+    def build_from_connection(self, connection: iec61850_python.Connection, logger: logging.Logger):
+        description = self.browse(connection, logger)
+        if description is None:
+            return False
+        return self.build_from_description(connection, description, logger)
+
+    def build_from_description(self, connection: iec61850_python.Connection, description: dict, logger: logging.Logger):
+        """
+        Creates the data objects, data sets and report control blocks of this node from the given description
+        (as returned by browse) and enables the report control blocks.
+        Besides enabling the reports, this does not query the server.
+        """
+        from wattson.iec61850.iec61850_remote_data_set import IEC61850RemoteDataSet
+        from wattson.iec61850.iec61850_remote_report_control_block import IEC61850RemoteReportControlBlock
+
+        self._description = description
+        variables = description["variables"]
+
         report_control_block_references = []
 
         attribute_interrogation_events = {}
@@ -274,25 +333,13 @@ class IEC61850LogicalNode:
 
         logger.debug(f"Attributes created")
 
-        # Read Data Sets
-        acsi_class = iec61850_python.ACSIClass.ACSI_CLASS_DATA_SET
-        data_sets, error = connection.get_logical_node_directory(self.reference, acsi_class)
-        if is_error(error):
-            logger.error(f"Failed while retrieving data sets for {self.reference}: {error=}")
-            return False
-        logger.debug(f"Node {self.name} has {len(data_sets)} data sets")
-        for data_set_name in data_sets:
+        # Create Data Sets
+        for data_set_name, directory in description["data_sets"].items():
             logger.debug(f"  {data_set_name}")
             if self.has_data_set(data_set_name):
                 logger.warning(f"Data set {data_set_name} already exists")
                 continue
             data_set_reference = f"{self.reference}${data_set_name}"
-            # Request data set directory
-            logger.debug(f"Querying {data_set_reference}")
-            directory, is_deletable, error = connection.get_data_set_directory(data_set_reference)
-            if is_error(error):
-                logger.error(f"Failed while retrieving data set {data_set_reference} for {self.reference}: {error=}")
-                return False
 
             data_set = IEC61850RemoteDataSet(data_set_name)
             self.add_data_set(data_set)
@@ -1,3 +1,4 @@
+import hashlib
 import logging
 from typing import List, TYPE_CHECKING, Optional, Union, Dict, Callable, Any, Tuple
 
@@ -199,3 +200,58 @@ class IEC61850Model:
             if not logical_device.build_from_connection(connection, logger):
                 return False
         return True
+
+    def build_from_description(self, connection: iec61850_python.Connection, description: dict, logger: Optional[logging.Logger] = None) -> bool:
+        """
+        Builds the model from a description (see get_description) of a previous browse instead of browsing the server.
+        Only the report control blocks are read from and enabled on the server.
+
+        Args:
+            connection (iec61850_python.Connection):
+                The connection to the server
+            description (dict):
+                The model description
+            logger (Optional[logging.Logger], optional):
+                The logger to use
+                (Default value = None)
+
+        Returns:
+            bool: Whether the model has been built successfully
+        """
+        self.clear()
+        if logger is None:
+            logger = get_logger(f"MMS-Model-{self.name}")
+            logger.setLevel(logging.CRITICAL)
+        self._connection = connection
+        for device_name, device_description in description["devices"].items():
+            logical_device = self.ensure_logical_device(device_name)
+            if not logical_device.build_from_description(connection, device_description, logger):
+                return False
+        return True
+
+    def get_description(self) -> dict:
+        """
+        Returns a JSON serializable description of the browsed server model, i.e., the variables and data set
+        directories of all logical nodes.
+        """
+        return {
+            "devices": {logical_device.name: logical_device.get_description() for logical_device in self.logical_devices}
+        }
+
+    def get_fingerprint(self, connection: iec61850_python.Connection) -> Optional[str]:
+        """
+        Computes a cheap fingerprint of the server model by only requesting the root level, i.e., the list of
+        logical devices.
+
+        Args:
+            connection (iec61850_python.Connection):
+                The connection to the server
+
+        Returns:
+            Optional[str]: The fingerprint or None if the root level cannot be retrieved
+        """
+        devices, error = connection.get_server_directory()
+        if is_error(error):
+            return None
+        content = "\n".join([self.name] + sorted(devices))
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
@@ -1,29 +1,75 @@
 import logging
-from typing import Optional, List, Dict
+import shutil
+import socket
+import threading
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Callable
 
-from pyroute2 import IPRoute
+from pyroute2 import IPRoute, netns
 
 from wattson.networking.namespaces.namespace import Namespace
 
 
 class LinuxNamespace(Namespace):
+    """
+    A network namespace that performs link, address, route and sysctl operations over a netlink socket bound to the
+    namespace instead of spawning `ip netns exec` processes.
+    Arbitrary commands (exec, popen) still use the subprocess path of the Namespace.
+    """
     def __init__(self, name: str, logger: Optional[logging.Logger] = None):
         super().__init__(name, logger)
-        self._pyroute_ns: IPRoute = None
+        self._pyroute_ns: Optional[IPRoute] = None
+        # The netlink socket is shared by all threads working on this namespace
+        self._pyroute_lock = threading.RLock()
         self._interface_id_map: Dict[str, int] = {}
 
     def __del__(self):
+        self._close_pyroute()
+        super().__del__()
+
+    def _close_pyroute(self):
         if self._pyroute_ns is not None:
-            self._pyroute_ns.close()
+            try:
+                self._pyroute_ns.close()
+            except Exception:
+                pass
             self._pyroute_ns = None
+        self._interface_id_map.clear()
+
+    def exists(self) -> bool:
+        return Namespace.NAMESPACE_PATH_RUN.joinpath(self.name).exists()
 
     def create(self, clean: bool = True) -> bool:
-        res = super().create(clean)
-        return res
+        if clean:
+            self.clean()
+        try:
+            netns.create(self.name)
+        except Exception as e:
+            self.logger.error(f"Could not create namespace: {e}")
+            return False
+        # Create directories and files
+        Namespace.NAMESPACE_PATH_ETC.joinpath(self.name).mkdir(parents=True, exist_ok=True)
+        shutil.copy(Path("/etc/resolv.conf"), Namespace.NAMESPACE_PATH_ETC.joinpath(self.name).joinpath("resolv.conf"))
+        # Reserve ports
+        reserved_ports = ["2404", "51000-51010"]
+        self.logger.debug(f"Reserving ports: {', '.join(reserved_ports)}")
+        if not self.sysctl_set("net.ipv4.ip_local_reserved_ports", ",".join(reserved_ports)):
+            self.logger.error(f"Could not reserve ports.")
+        return True
 
     def clean(self) -> bool:
-        res = super().clean()
-        return res
+        with self._pyroute_lock:
+            self._close_pyroute()
+        success = True
+        try:
+            netns.remove(self.name)
+        except Exception:
+            success = False
+        shutil.rmtree(Namespace.NAMESPACE_PATH_ETC.joinpath(self.name), ignore_errors=True)
+        return success
+
+    def loopback_up(self) -> bool:
+        return self.if_up("lo")
 
     def _ensure_pyroute(self):
         if self._pyroute_ns is None:
@@ -32,134 +78,258 @@ class LinuxNamespace(Namespace):
             else:
                 raise RuntimeError("Cannot use PyRoute in non-existent namespace")
 
-    def if_get_index(self, interface_name: str) -> Optional[int]:
-        if interface_name not in self._interface_id_map:
-            self._ensure_pyroute()
+    def _netlink(self, action: Callable[[IPRoute], Any], error_message: Optional[str] = None,
+                 enable_logging: bool = False) -> bool:
+        """
+        Runs the given action with the namespace's netlink socket.
+
+        Returns:
+            bool: Whether the action succeeded.
+        """
+        with self._pyroute_lock:
             try:
-                if_index = self._pyroute_ns.link_lookup(ifname=interface_name)[0]
-                if if_index is not None:
-                    self._interface_id_map[interface_name] = if_index
-            except IndexError:
-                return None
+                self._ensure_pyroute()
+                action(self._pyroute_ns)
             except Exception as e:
-                self.logger.error(f"{interface_name}: {repr(e)}")
-                return None
-        return self._interface_id_map.get(interface_name)
+                if enable_logging and error_message is not None:
+                    self.logger.warning(f"{error_message}: {e}")
+                return False
+        return True
 
-    def if_get_info(self, interface_name: str):
-        self._ensure_pyroute()
-        try:
-            return self._pyroute_ns.link_lookup(ifname=interface_name)
-        except:
-            return False
+    def _run_in_namespace(self, function: Callable[[], Any]) -> Any:
+        """
+        Runs the given function in a short-lived thread attached to this namespace.
+        Exceptions are re-raised in the calling thread.
+        """
+        result = {}
 
-    def if_add(self, interface_name: str, interface_type: str) -> bool:
-        self._ensure_pyroute()
-        try:
-            self._pyroute_ns.link("add", ifname=interface_name, kind=interface_type)
-        except:
-            return False
-        return True
+        def target():
+            try:
+                self.thread_attach()
+                result["value"] = function()
+            except Exception as e:
+                result["error"] = e
 
-    def if_delete(self, interface_name: str) -> bool:
-        self._ensure_pyroute()
-        try:
-            if_index = self.if_get_index(interface_name)
-            self._interface_id_map.pop(interface_name, None)
-            self._pyroute_ns.link("delete", index=if_index)
-        except:
-            return False
-        return True
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+        if "error" in result:
+            raise result["error"]
+        return result.get("value")
 
-    def if_set_namespace(self, interface_name: str, namespace: str) -> bool:
-        self._ensure_pyroute()
+    """
+    File handling
+    """
+    def _resolve_path(self, file_path: Path) -> Path:
+        """
+        `ip netns exec` bind-mounts the files of /etc/netns/<name>/ over /etc/.
+        This returns the file that a process in this namespace would see for the given path.
+        """
+        file_path = file_path.absolute()
         try:
-            self._pyroute_ns.link("set", index=self.if_get_index(interface_name), net_ns_fd=namespace)
-        except:
-            return False
-        return True
+            relative_path = file_path.relative_to("/etc")
+        except ValueError:
+            return file_path
+        namespace_path = Namespace.NAMESPACE_PATH_ETC.joinpath(self.name).joinpath(relative_path)
+        if namespace_path.exists():
+            return namespace_path
+        return file_path
 
-    def if_up(self, interface_name: str) -> bool:
-        self._ensure_pyroute()
+    def _write_to_file(self, file_path: Path, content: str) -> bool:
         try:
-            self._pyroute_ns.link("set", index=self.if_get_index(interface_name), state="up")
-        except:
+            self._resolve_path(file_path).write_text(content + "\n")
+        except OSError as e:
+            self.logger.error(f"Could not write {file_path}: {e}")
             return False
         return True
 
-    def if_down(self, interface_name: str) -> bool:
-        self._ensure_pyroute()
+    def _read_from_file(self, file_path: Path) -> Optional[str]:
         try:
-            self._pyroute_ns.link("set", index=self.if_get_index(interface_name), state="down")
-        except:
-            return False
-        return True
+            return self._resolve_path(file_path).read_text().rstrip("\n")
+        except OSError:
+            return None
 
-    def if_flush_ip(self, interface_name: str) -> bool:
-        self._ensure_pyroute()
-        try:
-            self._pyroute_ns.flush_addr(index=self.if_get_index(interface_name))
-        except:
+    """
+    Routing and sysctl handling
+    """
+    def route_set(self, target: str, interface_name: Optional[str] = None, gateway_ip: Optional[str] = None,
+                  enable_logging: bool = False) -> bool:
+        if interface_name is None and gateway_ip is None:
             return False
-        return True
+        route = {}
+        if target != "default":
+            route["dst"] = target
+        if interface_name is not None:
+            if_index = self.if_get_index(interface_name)
+            if if_index is None:
+                if enable_logging:
+                    self.logger.warning(f"Failed to set route to {target}: Unknown interface {interface_name}")
+                return False
+            route["oif"] = if_index
+        if gateway_ip is not None:
+            route["gateway"] = gateway_ip
+        return self._netlink(lambda ipr: ipr.route("replace", **route),
+                             f"Failed to set route to {target}", enable_logging)
 
-    def if_set_ip(self, interface_name: str, ip_address: str) -> bool:
-        self._ensure_pyroute()
-        try:
-            self._pyroute_ns.addr("add", index=self.if_get_index(interface_name), address=ip_address)
-        except:
-            return False
-        return True
+    def route_flush(self, enable_logging: bool = False) -> bool:
+        return self._netlink(lambda ipr: ipr.flush_routes(table=254), "Failed to flush routes", enable_logging)
 
-    def if_set_mac(self, interface_name: str, mac_address: str) -> bool:
-        self._ensure_pyroute()
-        self.logger.info(f"Setting {interface_name} MAC to {mac_address}")
+    def sysctl_set(self, key: str, value: Any, enable_logging: bool = False) -> bool:
+        sysctl_path = Path("/proc/sys").joinpath(key.replace(".", "/"))
         try:
-            self._pyroute_ns.link("set", index=self.if_get_index(interface_name), address=mac_address)
-        except:
+            self._run_in_namespace(lambda: sysctl_path.write_text(str(value)))
+        except OSError as e:
+            if enable_logging:
+                self.logger.warning(f"Failed to set {key} to {value}: {e}")
             return False
         return True
 
-    def if_rename(self, interface_name_old: str, interface_name_new: str) -> bool:
-        self._ensure_pyroute()
+    def sysctl_get(self, key: str) -> Optional[str]:
+        sysctl_path = Path("/proc/sys").joinpath(key.replace(".", "/"))
         try:
-            self._pyroute_ns.link("set", index=self.if_get_index(interface_name_old), name=interface_name_new)
-        except:
+            return self._run_in_namespace(lambda: sysctl_path.read_text().strip())
+        except OSError:
+            return None
+
+    """
+    Interface handling
+    """
+    def if_get_index(self, interface_name: str) -> Optional[int]:
+        if interface_name not in self._interface_id_map:
+            with self._pyroute_lock:
+                self._ensure_pyroute()
+                try:
+                    if_index = self._pyroute_ns.link_lookup(ifname=interface_name)[0]
+                    if if_index is not None:
+                        self._interface_id_map[interface_name] = if_index
+                except IndexError:
+                    return None
+                except Exception as e:
+                    self.logger.error(f"{interface_name}: {repr(e)}")
+                    return None
+        return self._interface_id_map.get(interface_name)
+
+    def if_get_info(self, interface_name: str):
+        with self._pyroute_lock:
+            self._ensure_pyroute()
+            try:
+                return self._pyroute_ns.link_lookup(ifname=interface_name)
+            except Exception:
+                return False
+
+    def _interface_action(self, interface_name: str, action: Callable[[IPRoute, int], Any], error_message: str,
+                          enable_logging: bool) -> bool:
+        if_index = self.if_get_index(interface_name)
+        if if_index is None:
+            if enable_logging:
+                self.logger.warning(f"{error_message}: Interface not found")
             return False
-        return True
+        return self._netlink(lambda ipr: action(ipr, if_index), error_message, enable_logging)
 
-    def _if_parse_info(self, info: dict) -> dict:
-        ip_addresses = []
-        if "ifindex" in info:
-            return super()._if_parse_info(info)
-        try:
-            info["attrs"] = dict(info["attrs"])
-            attrs = info["attrs"]
-        except KeyError:
-            self.logger.error(repr(info))
-            raise
+    def if_add(self, interface_name: str, interface_type: str, enable_logging: bool = False) -> bool:
+        return self._netlink(lambda ipr: ipr.link("add", ifname=interface_name, kind=interface_type),
+                             f"Failed to create {interface_name} of type {interface_type}", enable_logging)
+
+    def if_delete(self, interface_name: str, enable_logging: bool = False) -> bool:
+        success = self._interface_action(interface_name, lambda ipr, index: ipr.link("delete", index=index),
+                                         f"Failed to delete {interface_name}", enable_logging)
+        self._interface_id_map.pop(interface_name, None)
+        return success
 
-        for address_info in info.get("addr_info", []):
+    def if_set_namespace(self, interface_name: str, namespace: str, enable_logging: bool = False) -> bool:
+        success = self._interface_action(interface_name, lambda ipr, index: ipr.link("set", index=index, net_ns_fd=namespace),
+                                         f"Failed to set namespace for {interface_name}", enable_logging)
+        self._interface_id_map.pop(interface_name, None)
+        return success
+
+    def if_up(self, interface_name: str, enable_logging: bool = False) -> bool:
+        return self._interface_action(interface_name, lambda ipr, index: ipr.link("set", index=index, state="up"),
+                                      f"Failed to set link {interface_name} up", enable_logging)
+
+    def if_down(self, interface_name: str, enable_logging: bool = False) -> bool:
+        return self._interface_action(interface_name, lambda ipr, index: ipr.link("set", index=index, state="down"),
+                                      f"Failed to set link {interface_name} down", enable_logging)
+
+    def if_flush_ip(self, interface_name: str, enable_logging: bool = False) -> bool:
+        return self._interface_action(interface_name, lambda ipr, index: ipr.flush_addr(index=index),
+                                      f"Failed to flush {interface_name}", enable_logging)
+
+    def if_set_ip(self, interface_name: str, ip_address: str, enable_logging: bool = False) -> bool:
+        address, _, prefix = ip_address.partition("/")
+        if prefix == "":
+            prefix = "128" if ":" in address else "32"
+        return self._interface_action(
+            interface_name, lambda ipr, index: ipr.addr("add", index=index, address=address, prefixlen=int(prefix)),
+            f"Failed set IP for {interface_name} to {ip_address}", enable_logging
+        )
+
+    def if_set_mac(self, interface_name: str, mac_address: str, enable_logging: bool = False) -> bool:
+        return self._interface_action(interface_name, lambda ipr, index: ipr.link("set", index=index, address=mac_address),
+                                      f"Failed to set MAC for {interface_name} to {mac_address}", enable_logging)
+
+    def if_rename(self, interface_name_old: str, interface_name_new: str, enable_logging: bool = False) -> bool:
+        success = self._interface_action(interface_name_old, lambda ipr, index: ipr.link("set", index=index, ifname=interface_name_new),
+                                         f"Failed to rename {interface_name_old} to {interface_name_new}", enable_logging)
+        self._interface_id_map.pop(interface_name_old, None)
+        return success
+
+    def _if_parse_link(self, link, addresses: List) -> dict:
+        ip_addresses = []
+        for address in addresses:
             addr_type = "inet"
-            if address_info.get("family") == "inet":
+            if address["family"] == socket.AF_INET:
                 addr_type = "ipv4"
-            elif address_info.get("family") == "inet6":
+            elif address["family"] == socket.AF_INET6:
                 addr_type = "ipv6"
             ip_addresses.append({
                 "ip-address-type": addr_type,
-                "ip-address": address_info.get("local"),
-                "prefix": address_info.get("prefixlen")
+                "ip-address": address.get_attr("IFA_LOCAL") or address.get_attr("IFA_ADDRESS"),
+                "prefix": address["prefixlen"]
             })
         return {
-            "name": attrs.get("IFLA_IFNAME"),
+            "name": link.get_attr("IFLA_IFNAME"),
             "ip-addresses": ip_addresses,
             "statistics": {},
-            "hardware-address": attrs.get("IFLA_ADDRESS"),
-            "state": info.get("state", "unknown"),
-            "index": info.get("index"),
+            "hardware-address": link.get_attr("IFLA_ADDRESS"),
+            "state": link.get_attr("IFLA_OPERSTATE", "unknown"),
+            "index": link["index"],
         }
 
-    def if_list_existing(self, try_num: int = 0, max_tries: int = 10, retry_error_message: str = "") -> List[Dict]:
-        self._ensure_pyroute()
-        links = [self._if_parse_info(l) for l in self._pyroute_ns.get_links()]
-        return links
+    def if_exists(self, interface_name: str) -> bool:
+        with self._pyroute_lock:
+            try:
+                self._ensure_pyroute()
+                return len(self._pyroute_ns.link_lookup(ifname=interface_name)) > 0
+            except Exception:
+                return False
+
+    def if_info(self, interface_name: str, try_num=0, max_tries: int = 10, enable_logging: bool = False) -> Optional[dict]:
+        with self._pyroute_lock:
+            try:
+                self._ensure_pyroute()
+                indices = self._pyroute_ns.link_lookup(ifname=interface_name)
+                if len(indices) == 0:
+                    return None
+                links = self._pyroute_ns.get_links(indices[0])
+                addresses = self._pyroute_ns.get_addr(index=indices[0])
+            except Exception as e:
+                if enable_logging:
+                    self.logger.error(f"Could not load interface information for {interface_name}: {e}")
+                return None
+        if len(links) != 1:
+            return None
+        return self._if_parse_link(links[0], addresses)
+
+    def if_list_existing(self, try_num: int = 0, max_tries: int = 10, retry_error_message: str = "", context: str = "") -> List[Dict]:
+        with self._pyroute_lock:
+            try:
+                self._ensure_pyroute()
+                links = self._pyroute_ns.get_links()
+                addresses = self._pyroute_ns.get_addr()
+            except Exception as e:
+                self.logger.error(f"[{context}] Could not load interface information: {e}")
+                return []
+        addresses_by_index: Dict[int, List] = {}
+        for address in addresses:
+            addresses_by_index.setdefault(address["index"], []).append(address)
+        return [self._if_parse_link(link, addresses_by_index.get(link["index"], [])) for link in links]
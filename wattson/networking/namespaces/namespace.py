@@ -304,6 +304,64 @@ class Namespace:
         namespaces = [Namespace(n) for n in namespace_names]
         return namespaces
 
+    """
+    Routing and sysctl handling
+    """
+    def route_set(self, target: str, interface_name: Optional[str] = None, gateway_ip: Optional[str] = None,
+                  enable_logging: bool = False) -> bool:
+        """
+        Sets the route to the given target, replacing any existing route to this target.
+
+        Args:
+            target (str):
+                The route's destination, e.g., a subnet or "default".
+            interface_name (Optional[str], optional):
+                The outgoing interface.
+                (Default value = None)
+            gateway_ip (Optional[str], optional):
+                The gateway (next hop) IP address.
+                (Default value = None)
+            enable_logging (bool, optional):
+                Whether to log failures.
+                (Default value = False)
+
+        Returns:
+            bool: Whether the route has been set.
+        """
+        if interface_name is None and gateway_ip is None:
+            return False
+        self.exec(["ip", "route", "delete", target])
+        cmd = ["ip", "route", "add", target]
+        if interface_name is not None:
+            cmd.extend(["dev", interface_name])
+        if gateway_ip is not None:
+            cmd.extend(["via", gateway_ip])
+        code0, lines = self.exec(cmd)
+        if not code0 and enable_logging:
+            self.logger.warning(f"Failed to set route to {target}\n" + "\n".join(lines))
+        return code0
+
+    def route_flush(self, enable_logging: bool = False) -> bool:
+        """
+        Removes all routes from the main routing table.
+        """
+        code0, lines = self.exec(["ip", "route", "flush", "table", "main"])
+        if not code0 and enable_logging:
+            self.logger.warning(f"Failed to flush routes\n" + "\n".join(lines))
+        return code0
+
+    def sysctl_set(self, key: str, value: Any, enable_logging: bool = False) -> bool:
+        code0, lines = self.exec(["sysctl", "-w", f"{key}={value}"])
+        if not code0 and enable_logging:
+            self.logger.warning(f"Failed to set {key} to {value}\n" + "\n".join(lines))
+        return code0
+
+    def sysctl_get(self, key: str) -> Optional[str]:
+        code0, lines = self.exec(["sysctl", "-n", key])
+        if not code0 or len(lines) == 0:
+            return None
+        return lines[0].strip()
+
     """
     Interface handling
     """
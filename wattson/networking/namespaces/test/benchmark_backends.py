@@ -0,0 +1,66 @@
+import argparse
+import os
+import sys
+import time
+from typing import Type
+
+from wattson.networking.namespaces.linux_namespace import LinuxNamespace
+from wattson.networking.namespaces.namespace import Namespace
+
+
+def run(namespace_class: Type[Namespace], node_count: int, prefix: str) -> dict:
+    """
+    Sets up a synthetic topology of node_count namespaces, each with a loopback and a dummy interface, an IP address,
+    a default route and IP forwarding enabled, as done by the WattsonNetworkEmulator for hosts and routers.
+    Returns the time spent on setup, on querying the interfaces and on cleanup.
+    """
+    namespaces = [namespace_class(f"{prefix}{i}") for i in range(node_count)]
+    timings = {}
+
+    start = time.perf_counter()
+    for i, namespace in enumerate(namespaces):
+        if not namespace.create():
+            raise RuntimeError(f"Could not create namespace {namespace.name}")
+        namespace.loopback_up()
+        namespace.if_add("eth0", "dummy")
+        namespace.if_set_ip("eth0", f"10.{i // 250}.{i % 250}.1/24")
+        namespace.if_up("eth0")
+        namespace.route_set("default", interface_name="eth0", gateway_ip=f"10.{i // 250}.{i % 250}.254")
+        namespace.sysctl_set("net.ipv4.ip_forward", 1)
+        namespace.sysctl_set("net.ipv6.conf.all.forwarding", 1)
+    timings["setup"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for namespace in namespaces:
+        if namespace.if_info("eth0") is None:
+            raise RuntimeError(f"Missing interface in {namespace.name}")
+        if namespace.sysctl_get("net.ipv4.ip_forward") != "1":
+            raise RuntimeError(f"IP forwarding not enabled in {namespace.name}")
+    timings["query"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for namespace in namespaces:
+        namespace.clean()
+    timings["cleanup"] = time.perf_counter() - start
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser("Compares the subprocess and the netlink namespace backends")
+    parser.add_argument("--nodes", type=int, default=100, help="Number of namespaces to create")
+    args = parser.parse_args()
+
+    if os.geteuid() != 0:
+        print("This benchmark has to be run as root")
+        sys.exit(1)
+
+    for backend, namespace_class, prefix in [("subprocess", Namespace, "w_bs"), ("netlink", LinuxNamespace, "w_bn")]:
+        timings = run(namespace_class, args.nodes, prefix)
+        print(f"{backend} ({args.nodes} nodes)")
+        for key, value in timings.items():
+            print(f"   {key.ljust(10)} {value:.3f} s")
+        print(f"   {'total'.ljust(10)} {sum(timings.values()):.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,6 +25,8 @@ class NoiseManager:
         self._pre_sim_noise_rules = {}
         self._post_sim_noise_rules = {}
         self._measurement_noise_rules = {}
+        # Incremented whenever the rules change, e.g., to let consumers update derived data
+        self.rules_version: int = 0
 
     def set_power_grid_model(self, power_grid_model: PowerGridModel):
         self._grid_model = power_grid_model
@@ -68,6 +70,7 @@ class NoiseManager:
             self._post_sim_noise_rules = {}
         if include_measurement_noise:
             self._measurement_noise_rules = {}
+        self.rules_version += 1
 
     def reset_to_static(self, include_pre_sim_noise: bool = True, include_post_sim_noise: bool = True, include_measurement_noise: bool = True):
         if include_pre_sim_noise:
@@ -76,6 +79,21 @@ class NoiseManager:
             self._post_sim_noise_rules = self._create_rules(GridValueContext.MEASUREMENT, self._static_post_sim_noise, "post_sim")
         if include_measurement_noise:
             self._measurement_noise_rules = self._create_rules(GridValueContext.MEASUREMENT, self._static_measurement_noise, "measurement")
+        self.rules_version += 1
+
+    def has_post_sim_or_measurement_noise(self, grid_value: GridValue) -> bool:
+        """
+        Checks whether a post-simulation or measurement noise rule applies to the given grid value.
+
+        Args:
+            grid_value (GridValue):
+                The grid value to check.
+
+        Returns:
+            bool: Whether the grid value's value can change without a change of the simulation result.
+        """
+        identifier = grid_value.get_identifier()
+        return identifier in self._measurement_noise_rules or identifier in self._post_sim_noise_rules
 
     """
     MANUAL RULES
@@ -85,18 +103,21 @@ class NoiseManager:
         if transformation is not None:
             transformation.transformation_type = "pre_sim"
             self._pre_sim_noise_rules[grid_value.get_identifier()] = transformation
+            self.rules_version += 1
 
     def create_post_sim_transformation(self, grid_value: GridValue, specification: str):
         transformation = self._generate_transformation(grid_value, specification)
         if transformation is not None:
             transformation.transformation_type = "post_sim"
             self._post_sim_noise_rules[grid_value.get_identifier()] = transformation
+            self.rules_version += 1
 
     def create_measurement_transformation(self, grid_value: GridValue, specification: str):
         transformation = self._generate_transformation(grid_value, specification)
         if transformation is not None:
             transformation.transformation_type = "measurement"
             self._measurement_noise_rules[grid_value.get_identifier()] = transformation
+            self.rules_version += 1
 
     """
     RULE GENERATION
@@ -2,9 +2,10 @@ import datetime
 import json
 import math
 import sys
-from typing import Union
+from typing import Union, Optional, Sequence
 
-from scipy.interpolate import interp1d
+import numpy as np
+from scipy.interpolate import interp1d, CubicSpline
 
 
 class Interpolation:
@@ -99,3 +100,112 @@ class Interpolation:
             return linear(target_dt)
 
         return i
+
+    def to_table(self) -> 'InterpolationTable':
+        """
+        Converts this interpolation to a flat, read-only InterpolationTable.
+
+        Returns:
+            InterpolationTable: The interpolation table.
+        """
+        if self._interpolation_type is False:
+            # The last sample at or before the requested time applies, duplicates included
+            x = [entry["ts"] for entry in self.data_list]
+            y = [entry["value"] for entry in self.data_list]
+            return InterpolationTable(x, y, kind=False)
+        x, y = [], []
+        for entry in self.data_list:
+            # Account for daylight savings...
+            if entry["ts"] not in x:
+                x.append(entry["ts"])
+                y.append(entry["value"])
+        if self._interpolation_type == "steps":
+            return InterpolationTable(x, y, kind=self._step_interpolation_type, step_size_sec=self._step_size_sec)
+        return InterpolationTable(x, y, kind=self._interpolation_type)
+
+
+class InterpolationTable:
+    """
+    The interpolation of a single day and dimension of a profile, kept as flat, read-only NumPy arrays instead of a
+    scipy interpolator object. The arrays are never modified after creation, i.e., tables can be shared between
+    ProfileCalculators and with forked processes.
+    Linear interpolation uses the sample arrays directly. For cubic interpolation, the (not-a-knot) spline
+    coefficients are computed once and stored as a (4, n - 1) array, which matches interp1d(kind="cubic").
+    Other scipy interpolation kinds fall back to a (lazily created) interp1d object.
+    """
+    def __init__(self, x: Sequence[float], y: Sequence[float], kind: Union[bool, str] = "linear",
+                 step_size_sec: Optional[int] = None):
+        """
+        Args:
+            x (Sequence[float]):
+                The sorted timestamps of the samples.
+            y (Sequence[float]):
+                The sample values.
+            kind (Union[bool, str], optional):
+                The interpolation kind, i.e., False (no interpolation), "linear", "cubic" or any other kind supported
+                by interp1d.
+                (Default value = "linear")
+            step_size_sec (Optional[int], optional):
+                If given, the requested time is floored to a multiple of this step size before interpolating.
+                (Default value = None)
+        """
+        self.x = np.array(x, dtype=np.float64)
+        self.y = np.array(y, dtype=np.float64)
+        self.kind = kind
+        self.step_size_sec = step_size_sec if step_size_sec else None
+        self.coefficients: Optional[np.ndarray] = None
+        self._fallback = None
+        if kind is not False:
+            if len(self.x) < 2:
+                raise ValueError("At least 2 samples are required for interpolation")
+            if kind == "cubic":
+                if len(self.x) < 4:
+                    raise ValueError("At least 4 samples are required for cubic interpolation")
+                self.coefficients = np.ascontiguousarray(CubicSpline(self.x, self.y).c)
+                self.coefficients.setflags(write=False)
+        self.x.setflags(write=False)
+        self.y.setflags(write=False)
+
+    @property
+    def nbytes(self) -> int:
+        size = self.x.nbytes + self.y.nbytes
+        if self.coefficients is not None:
+            size += self.coefficients.nbytes
+        return size
+
+    def interpolate(self, date_time: datetime.datetime) -> float:
+        return self.evaluate(date_time.timestamp())
+
+    def evaluate(self, ts: float) -> float:
+        """
+        Returns the interpolated value for the given timestamp.
+
+        Args:
+            ts (float):
+                The timestamp to interpolate the value for.
+
+        Returns:
+            float: The interpolated value.
+
+        Raises:
+            ValueError: If the timestamp is outside the interpolation range.
+        """
+        if self.step_size_sec is not None:
+            ts = math.floor(ts / self.step_size_sec) * self.step_size_sec
+        if self.kind is False:
+            position = int(np.searchsorted(self.x, ts, side="right")) - 1
+            if position < 0:
+                return 0
+            return float(self.y[position])
+        if ts < self.x[0] or ts > self.x[-1]:
+            raise ValueError(f"Timestamp {ts} is outside the interpolation range")
+        if self.kind == "linear":
+            return float(np.interp(ts, self.x, self.y))
+        if self.kind == "cubic":
+            position = min(max(int(np.searchsorted(self.x, ts, side="right")) - 1, 0), len(self.x) - 2)
+            dx = ts - self.x[position]
+            c = self.coefficients[:, position]
+            return float(((c[0] * dx + c[1]) * dx + c[2]) * dx + c[3])
+        if self._fallback is None:
+            self._fallback = interp1d(self.x, self.y, kind=self.kind)
+        return float(self._fallback(ts))
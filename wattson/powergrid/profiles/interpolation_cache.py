@@ -0,0 +1,107 @@
+import collections
+import threading
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from wattson.powergrid.profiles.interpolation import InterpolationTable
+
+InterpolationCacheKey = Tuple[Hashable, ...]
+
+
+class InterpolationCache:
+    """
+    A bounded cache for InterpolationTables, evicted by day in least-recently-used order.
+    Entries are grouped by their day, i.e., once more than max_days days are cached, all tables of the least recently
+    used day are dropped. Optionally, the total number of tables is bounded as well. The most recently used day is
+    never evicted.
+    The cache is thread-safe and can be shared between multiple ProfileCalculators.
+    """
+    def __init__(self, max_days: Optional[int] = 2, max_entries: Optional[int] = None):
+        """
+        Args:
+            max_days (Optional[int], optional):
+                The maximum number of days to keep tables for, or None for no limit.
+                (Default value = 2)
+            max_entries (Optional[int], optional):
+                The maximum number of tables to keep, or None for no limit.
+                (Default value = None)
+        """
+        self.max_days = max_days
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # Day -> (Key -> Table), ordered by the days' last access
+        self._days: Dict[Hashable, Dict[InterpolationCacheKey, InterpolationTable]] = collections.OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return self._size
+
+    def get(self, day: Hashable, key: InterpolationCacheKey,
+            factory: Callable[[], InterpolationTable]) -> InterpolationTable:
+        """
+        Returns the cached table for the given day and key, or creates (and caches) it using the given factory.
+
+        Args:
+            day (Hashable):
+                The day the table belongs to.
+            key (InterpolationCacheKey):
+                The key of the table within the day, e.g., (element type, profile name, dimension).
+            factory (Callable[[], InterpolationTable]):
+                Creates the table in case of a cache miss. Exceptions are passed to the caller and nothing is cached.
+
+        Returns:
+            InterpolationTable: The interpolation table.
+        """
+        with self._lock:
+            tables = self._days.get(day)
+            if tables is not None:
+                table = tables.get(key)
+                if table is not None:
+                    self.hits += 1
+                    self._days.move_to_end(day)
+                    return table
+            self.misses += 1
+        table = factory()
+        with self._lock:
+            tables = self._days.get(day)
+            if tables is None:
+                tables = {}
+                self._days[day] = tables
+            if key not in tables:
+                self._size += 1
+            tables[key] = table
+            self._days.move_to_end(day)
+            self._evict()
+        return table
+
+    def _evict(self):
+        while len(self._days) > 1 and (
+                (self.max_days is not None and len(self._days) > self.max_days)
+                or (self.max_entries is not None and self._size > self.max_entries)):
+            _, tables = self._days.popitem(last=False)
+            self._size -= len(tables)
+            self.evictions += len(tables)
+
+    def clear(self):
+        with self._lock:
+            self._days.clear()
+            self._size = 0
+
+    def get_statistics(self) -> Dict[str, int]:
+        """
+        Returns the cache's counters.
+
+        Returns:
+            Dict[str, int]: The number of hits, misses, evictions, cached days, cached tables and the tables' size in bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "days": len(self._days),
+                "entries": self._size,
+                "bytes": sum(table.nbytes for tables in self._days.values() for table in tables.values())
+            }
@@ -1,7 +1,7 @@
 import datetime
 import json
 from pathlib import Path
-from typing import Union, Optional
+from typing import Union, Optional, List
 
 import pandas as pd
 import yaml
@@ -58,6 +58,15 @@ class PowerOwlProfileLoader(PowerProfileLoader):
                 normalized_profiles.update(self._normalize_profiles(raw_profiles))
         return normalized_profiles
 
+    def get_cache_sources(self) -> List[Path]:
+        return [file for file in self.files if file.exists()]
+
+    def get_cache_parameters(self) -> dict:
+        parameters = super().get_cache_parameters()
+        parameters["domain"] = self.domain
+        parameters["files"] = [file.name for file in self.files if file.exists()]
+        return parameters
+
     def _normalize_profiles(self, profiles: dict):
         normalized = {}
 
@@ -1,13 +1,15 @@
+from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Optional, Union
+from typing import Optional, Union, List
 
 import pandapower
 from powerowl.layers.powergrid import PowerGridModel
 
+from wattson.powergrid.profiles.profile_cache import ProfileCache
 from wattson.util import get_logger
 
 
-class PowerProfileLoader:
+class PowerProfileLoader(ABC):
     def __init__(
         self,
         grid_model: PowerGridModel,
@@ -61,3 +63,62 @@ class PowerProfileLoader:
         self._day_cache = {}
         self._base_values = {}
         self._interpolation_cache = {}
+
+    @abstractmethod
+    def load_profile(self) -> Optional[dict]:
+        """
+        Loads the profiles from their sources and returns them in the normalized profile format.
+
+        Returns:
+            Optional[dict]: The normalized profiles.
+        """
+        ...
+
+    def get_cache_sources(self) -> List[Path]:
+        """
+        Returns the source files of the profiles loaded by this loader. Loaders without source files are not cached.
+
+        Returns:
+            List[Path]: The source files.
+        """
+        return []
+
+    def get_cache_parameters(self) -> dict:
+        """
+        Returns the parameters that affect the normalized profiles besides the source files' contents.
+
+        Returns:
+            dict: The parameters.
+        """
+        return {
+            "loader": self.__class__.__name__,
+            "date_format": self.date_format,
+            "time_format": self.time_format,
+            "default_dimension": self._default_dimension
+        }
+
+    def load_cached_profile(self, profile_cache: Optional[ProfileCache] = None) -> Optional[dict]:
+        """
+        Loads the normalized profiles from the given profile cache. In case no cache entry exists for the current
+        source files, the profiles are loaded and stored in the cache.
+
+        Args:
+            profile_cache (Optional[ProfileCache], optional):
+                The profile cache to use. If None, the profiles are loaded directly.
+                (Default value = None)
+
+        Returns:
+            Optional[dict]: The normalized profiles.
+        """
+        sources = self.get_cache_sources()
+        if profile_cache is None or len(sources) == 0 or not all(source.exists() for source in sources):
+            return self.load_profile()
+        key = profile_cache.get_key(sources, self.get_cache_parameters())
+        profiles = profile_cache.load(key)
+        if profiles is not None:
+            self.logger.debug(f"Loaded cached profiles {key}")
+            return profiles
+        profiles = self.load_profile()
+        if profiles is not None:
+            profile_cache.store(key, profiles)
+        return profiles
@@ -2,7 +2,7 @@ import datetime
 import json
 import numbers
 from pathlib import Path
-from typing import Optional, Union
+from typing import Optional, Union, List
 
 from powerowl.layers.powergrid import PowerGridModel
 
@@ -52,6 +52,14 @@ class SeasonedProfileLoader(PowerProfileLoader):
             else:
                 self.logger.error(f"Cannot find {self.key} profile in file")
 
+    def get_cache_sources(self) -> List[Path]:
+        return [Path(self.file)]
+
+    def get_cache_parameters(self) -> dict:
+        parameters = super().get_cache_parameters()
+        parameters["key"] = self.key
+        return parameters
+
     def _normalize_json_profiles(self, profiles: dict):
         # Detect format and rewrite scheme to day_wise
         profile_format = get_profile_format(profiles)
@@ -1,11 +1,13 @@
 import datetime
 from pathlib import Path
-from typing import Union, Optional
+from typing import Union, Optional, Dict, List
 
+import numpy as np
 import pandas as pd
 from powerowl.layers.powergrid import PowerGridModel
 
 from wattson.powergrid.profiles.loaders.power_profile_loader import PowerProfileLoader
+from wattson.powergrid.profiles.profile_cache import ProfileArray, ArrayProfile
 
 
 class SimbenchProfileLoader(PowerProfileLoader):
@@ -44,9 +46,18 @@ class SimbenchProfileLoader(PowerProfileLoader):
                 pd.read_csv(f, sep=";", index_col="time")
             )
 
-    def _normalize_df_profiles(self, df: pd.DataFrame):
-        normalized = {}
-        col_map = {}
+    def get_cache_sources(self) -> List[Path]:
+        return [Path(self.file)]
+
+    def get_cache_parameters(self) -> dict:
+        parameters = super().get_cache_parameters()
+        parameters["simbench_date_format"] = self.simbench_date_format
+        return parameters
+
+    def _normalize_df_profiles(self, df: pd.DataFrame) -> Dict[str, ArrayProfile]:
+        profile_names = {}
+        dimensions = {}
+        col_map = []
         for col in list(df.columns):
             col_name: str = col
             dimension: str = self._default_dimension
@@ -56,33 +67,40 @@ class SimbenchProfileLoader(PowerProfileLoader):
             if "_qload" in col:
                 dimension = "reactive_power"
                 col_name = col_name.replace("_qload", "")
-            col_map[col] = {"dimension": dimension, "name": col_name}
-            normalized[col_name] = {}
-        # Translate
-        date_time = None
-        for index, row in df.iterrows():
-            date_time = datetime.datetime.strptime(
-                str(index), self.simbench_date_format
-            )
-            date_str = date_time.strftime(self.date_format)
-            time_str = date_time.strftime(self.time_format)
-            for col, col_info in col_map.items():
-                col_name = col_info["name"]
-                dimension = col_info["dimension"]
-                value = row[col]
-                normalized[col_name].setdefault(date_str, {}).setdefault(time_str, {})[
-                    dimension
-                ] = value
+            col_map.append((profile_names.setdefault(col_name, len(profile_names)),
+                            dimensions.setdefault(dimension, len(dimensions))))
+
+        # Translate the time index once, only the distinct days and times are formatted
+        index = pd.to_datetime(df.index.astype(str), format=self.simbench_date_format)
+        day_codes = index.month.to_numpy() * 100 + index.day.to_numpy()
+        time_codes = index.hour.to_numpy() * 3600 + index.minute.to_numpy() * 60 + index.second.to_numpy()
+        unique_days, day_positions = np.unique(day_codes, return_inverse=True)
+        unique_times, time_positions = np.unique(time_codes, return_inverse=True)
+        # Use a leap year
+        days = [datetime.date(2016, code // 100, code % 100).strftime(self.date_format) for code in unique_days.tolist()]
+        times = [
+            datetime.time(code // 3600, (code % 3600) // 60, code % 60).strftime(self.time_format)
+            for code in unique_times.tolist()
+        ]
+        midnight_index = times.index("00:00:00") if "00:00:00" in times else None
+        times.append("24:00:00")
+
+        values = np.full((len(profile_names), len(days), len(times), len(dimensions)), np.nan)
+        data = df.to_numpy(dtype=float)
+        for col_position, (profile_index, dimension_index) in enumerate(col_map):
+            values[profile_index, day_positions, time_positions, dimension_index] = data[:, col_position]
+
         # Ensure 24:00:00 value
-        for col_name, days in normalized.items():
-            for day, entries in days.items():
-                date = datetime.datetime.strptime(
-                    day + "-2016", self.date_format + "-%Y"
-                )
-                if "24:00:00" not in entries:
-                    date_time = date_time.replace(day=date.day, month=date.month)
-                    n_day = date_time + datetime.timedelta(days=1)
-                    n_day_key = n_day.strftime(self.date_format)
-                    value = days[n_day_key]["00:00:00"]
-                    entries["24:00:00"] = value
-        return normalized
+        if len(index) > 0 and midnight_index is not None:
+            year = index[-1].year
+            day_indices = {day: i for i, day in enumerate(days)}
+            for day_index, code in enumerate(unique_days.tolist()):
+                try:
+                    date = datetime.date(year, code // 100, code % 100)
+                except ValueError:
+                    date = datetime.date(2016, code // 100, code % 100)
+                n_day_key = (date + datetime.timedelta(days=1)).strftime(self.date_format)
+                n_day_index = day_indices.get(n_day_key)
+                if n_day_index is not None:
+                    values[:, day_index, -1, :] = values[:, n_day_index, midnight_index, :]
+        return ProfileArray(list(profile_names.keys()), days, times, list(dimensions.keys()), values).to_profiles()
@@ -0,0 +1,249 @@
+import hashlib
+import json
+import os
+import tempfile
+from collections.abc import Mapping
+from pathlib import Path
+from typing import List, Dict, Optional, Iterator, Any
+
+import numpy as np
+
+from wattson.util import get_logger
+
+
+class ProfileArray:
+    """
+    A set of normalized profiles stored as a single dense array of shape (profiles, days, times, dimensions).
+    Missing values are NaN. The names of the profiles, days (e.g., "01-31"), times (e.g., "13:15:00") and dimensions
+    form the (small) index of the array.
+    The profiles are exposed as read-only mappings (day -> time -> dimension -> value), i.e., they can be used in place
+    of the nested dicts created by the profile loaders. Per-day dicts are only created on access, such that a
+    memory-mapped array is usable without reading it as a whole.
+    """
+    def __init__(self, profile_names: List[str], days: List[str], times: List[str], dimensions: List[str],
+                 values: np.ndarray):
+        """
+        Args:
+            profile_names (List[str]):
+                The profile names.
+            days (List[str]):
+                The days.
+            times (List[str]):
+                The times of day.
+            dimensions (List[str]):
+                The dimensions, e.g., "active_power".
+            values (np.ndarray):
+                The values of shape (profiles, days, times, dimensions).
+        """
+        self.profile_names = list(profile_names)
+        self.days = list(days)
+        self.times = list(times)
+        self.dimensions = list(dimensions)
+        self.values = values
+        self.day_indices = {day: i for i, day in enumerate(self.days)}
+
+    @staticmethod
+    def from_profiles(profiles: Dict[str, Any]) -> Optional['ProfileArray']:
+        """
+        Creates a ProfileArray from normalized profiles.
+
+        Args:
+            profiles (Dict[str, Any]):
+                The normalized profiles, i.e., profile name -> day -> time -> dimension -> value.
+
+        Returns:
+            Optional[ProfileArray]: The ProfileArray or None, if the profiles contain non-numeric values.
+        """
+        arrays = {id(profile.array) for profile in profiles.values() if isinstance(profile, ArrayProfile)}
+        if len(arrays) == 1 and all(isinstance(profile, ArrayProfile) for profile in profiles.values()):
+            return next(iter(profiles.values())).array
+
+        days, times, dimensions = {}, {}, {}
+        for profile in profiles.values():
+            for day, entries in profile.items():
+                days.setdefault(day, len(days))
+                for time_str, values in entries.items():
+                    times.setdefault(time_str, len(times))
+                    for dimension in values.keys():
+                        dimensions.setdefault(dimension, len(dimensions))
+        day_list = sorted(days.keys())
+        time_list = sorted(times.keys())
+        dimension_list = list(dimensions.keys())
+        day_indices = {day: i for i, day in enumerate(day_list)}
+        time_indices = {time_str: i for i, time_str in enumerate(time_list)}
+        dimension_indices = {dimension: i for i, dimension in enumerate(dimension_list)}
+
+        values = np.full((len(profiles), len(day_list), len(time_list), len(dimension_list)), np.nan)
+        for profile_index, profile in enumerate(profiles.values()):
+            for day, entries in profile.items():
+                day_index = day_indices[day]
+                for time_str, dimension_values in entries.items():
+                    time_index = time_indices[time_str]
+                    for dimension, value in dimension_values.items():
+                        try:
+                            values[profile_index, day_index, time_index, dimension_indices[dimension]] = float(value)
+                        except (TypeError, ValueError):
+                            return None
+        return ProfileArray(list(profiles.keys()), day_list, time_list, dimension_list, values)
+
+    def to_profiles(self) -> Dict[str, 'ArrayProfile']:
+        return {name: ArrayProfile(self, i) for i, name in enumerate(self.profile_names)}
+
+    def get_index(self) -> dict:
+        return {
+            "profile_names": self.profile_names,
+            "days": self.days,
+            "times": self.times,
+            "dimensions": self.dimensions
+        }
+
+
+class ArrayProfile(Mapping):
+    """
+    A single profile of a ProfileArray, mapping each day to its time -> dimension -> value dict.
+    """
+    def __init__(self, array: ProfileArray, profile_index: int):
+        self.array = array
+        self.profile_index = profile_index
+        self._days: Optional[List[str]] = None
+
+    def __getitem__(self, day: str) -> Dict[str, Dict[str, float]]:
+        day_index = self.array.day_indices[day]
+        block = np.asarray(self.array.values[self.profile_index, day_index])
+        present = ~np.isnan(block)
+        rows = np.flatnonzero(present.any(axis=1))
+        if len(rows) == 0:
+            raise KeyError(day)
+        entries = {}
+        for time_index in rows.tolist():
+            entries[self.array.times[time_index]] = {
+                self.array.dimensions[dimension_index]: float(block[time_index, dimension_index])
+                for dimension_index in np.flatnonzero(present[time_index]).tolist()
+            }
+        return entries
+
+    def _get_days(self) -> List[str]:
+        if self._days is None:
+            values = np.asarray(self.array.values[self.profile_index])
+            present = ~np.isnan(values).all(axis=(1, 2))
+            self._days = [self.array.days[i] for i in np.flatnonzero(present).tolist()]
+        return self._days
+
+    def __contains__(self, day) -> bool:
+        return day in self._get_days()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._get_days())
+
+    def __len__(self) -> int:
+        return len(self._get_days())
+
+
+class ProfileCache:
+    """
+    A persistent cache for normalized profiles.
+    Each entry is keyed by the hashes of the profiles' source files and the loader's parameters and consists of the
+    ProfileArray's values as .npy file, which is memory-mapped when loaded, and the array's index as .json file.
+    """
+    VERSION = 1
+
+    def __init__(self, cache_dir: Optional[Path] = None, logger=None):
+        """
+        Args:
+            cache_dir (Optional[Path], optional):
+                The directory to store cached profiles in. Defaults to ~/.cache/wattson/profiles.
+                (Default value = None)
+            logger:
+                The logger to use.
+        """
+        if cache_dir is None:
+            cache_dir = Path.home().joinpath(".cache", "wattson", "profiles")
+        self.cache_dir = Path(cache_dir)
+        self.logger = logger if logger is not None else get_logger("ProfileCache")
+
+    def get_key(self, sources: List[Path], parameters: dict) -> str:
+        """
+        Computes the cache key for the given source files and loader parameters.
+
+        Args:
+            sources (List[Path]):
+                The source files the profiles are loaded from.
+            parameters (dict):
+                The (JSON serializable) parameters that affect the normalized profiles.
+
+        Returns:
+            str: The cache key.
+        """
+        key_hash = hashlib.sha256()
+        key_hash.update(json.dumps({"version": self.VERSION, "parameters": parameters},
+                                   sort_keys=True, default=str).encode("utf-8"))
+        for source in sources:
+            file_hash = hashlib.sha256()
+            with Path(source).open("rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    file_hash.update(chunk)
+            key_hash.update(file_hash.digest())
+        return key_hash.hexdigest()
+
+    def load(self, key: str) -> Optional[Dict[str, ArrayProfile]]:
+        """
+        Loads the cached profiles for the given key.
+
+        Args:
+            key (str):
+                The cache key.
+
+        Returns:
+            Optional[Dict[str, ArrayProfile]]: The profiles or None, if no (valid) cache entry exists.
+        """
+        index_file = self.cache_dir.joinpath(f"{key}.json")
+        values_file = self.cache_dir.joinpath(f"{key}.npy")
+        if not index_file.exists() or not values_file.exists():
+            return None
+        try:
+            with index_file.open("r") as f:
+                index = json.load(f)
+            values = np.load(values_file, mmap_mode="r")
+            array = ProfileArray(index["profile_names"], index["days"], index["times"], index["dimensions"], values)
+        except Exception as e:
+            self.logger.warning(f"Could not load cached profiles {key}: {e=}")
+            return None
+        return array.to_profiles()
+
+    def store(self, key: str, profiles: Dict[str, Any]) -> bool:
+        """
+        Stores the given normalized profiles in the cache.
+
+        Args:
+            key (str):
+                The cache key.
+            profiles (Dict[str, Any]):
+                The normalized profiles.
+
+        Returns:
+            bool: Whether the profiles have been stored.
+        """
+        array = ProfileArray.from_profiles(profiles)
+        if array is None:
+            self.logger.debug(f"Profiles contain non-numeric values and are not cached")
+            return False
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write to temporary files first so concurrent readers never see partial entries
+            for suffix, write in [
+                (".npy", lambda f: np.save(f, np.ascontiguousarray(array.values))),
+                (".json", lambda f: f.write(json.dumps(array.get_index()).encode("utf-8")))
+            ]:
+                fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=f"{suffix}.tmp")
+                try:
+                    with os.fdopen(fd, "wb") as f:
+                        write(f)
+                    os.replace(tmp_name, self.cache_dir.joinpath(f"{key}{suffix}"))
+                except Exception:
+                    if os.path.exists(tmp_name):
+                        os.remove(tmp_name)
+                    raise
+        except Exception as e:
+            self.logger.warning(f"Could not cache profiles in {self.cache_dir}: {e=}")
+            return False
+        return True
@@ -10,7 +10,8 @@ from powerowl.layers.powergrid import PowerGridModel
 from powerowl.layers.powergrid.elements import GridElement
 from powerowl.layers.powergrid.values.grid_value_context import GridValueContext
 
-from wattson.powergrid.profiles.interpolation import Interpolation
+from wattson.powergrid.profiles.interpolation import Interpolation, InterpolationTable
+from wattson.powergrid.profiles.interpolation_cache import InterpolationCache
 from wattson.powergrid.profiles.loaders.seasoned_profile_loader import SeasonedProfileLoader
 from wattson.powergrid.profiles.loaders.simbench_profile_loader import SimbenchProfileLoader
 from wattson.util import get_logger, translate_value
@@ -28,7 +29,9 @@ class ProfileCalculator:
         step_size_sec: int = 300,
         step_interpolation_type: str = "linear",
         base_dir: Optional[Path] = None,
-        activate_none_profiles: bool = False
+        activate_none_profiles: bool = False,
+        interpolation_cache: Optional[InterpolationCache] = None,
+        interpolation_cache_days: Optional[int] = 2
     ):
 
         self.logger = (
@@ -63,7 +66,9 @@ class ProfileCalculator:
         self.date_format = "%m-%d"
 
         self._base_values = {}
-        self._interpolation_cache = {}
+        if interpolation_cache is None:
+            interpolation_cache = InterpolationCache(max_days=interpolation_cache_days)
+        self._interpolation_cache = interpolation_cache
         self._store_base_values()
         np.random.seed(self.seed)
 
@@ -95,6 +100,35 @@ class ProfileCalculator:
             Optional[float]: The percentage value
         """
         element_type = element.prefix
+        element_profile = self.get_profile_name(element)
+        if element_profile is None:
+            return None
+        profile = self._profiles[element_type][element_profile]
+        value = None
+        try:
+            value = self._get_weighted_value(
+                date_time, profile, dimension, (element_type, element_profile)
+            )
+            # value = self._scale_value(element, value)
+            value = self._add_noise(element, element_profile, value)
+        except Exception as e:
+            pass
+            #self.logger.error(f"{e=}")
+            #self.logger.error(traceback.print_exception(*sys.exc_info()))
+        return value
+
+    def get_profile_name(self, element: GridElement) -> Optional[str]:
+        """
+        Returns the name of the profile that applies to the given grid element.
+
+        Args:
+            element (GridElement):
+                The grid element
+
+        Returns:
+            Optional[str]: The profile name or None, if no (loaded) profile applies to the element.
+        """
+        element_type = element.prefix
         if element_type not in self._profiles:
             return None
 
@@ -111,21 +145,15 @@ class ProfileCalculator:
             if element_profile is not None:
                 self.logger.warning(f"Profile {element_profile} not available for {element_type}")
             return None
-        profile = self._profiles[element_type].get(element_profile)
-        if profile is None:
+        if self._profiles[element_type].get(element_profile) is None:
             return None
-        value = None
-        try:
-            value = self._get_weighted_value(
-                date_time, profile, dimension, (element_type, element_profile)
-            )
-            # value = self._scale_value(element, value)
-            value = self._add_noise(element, element_profile, value)
-        except Exception as e:
-            pass
-            #self.logger.error(f"{e=}")
-            #self.logger.error(traceback.print_exception(*sys.exc_info()))
-        return value
+        return element_profile
+
+    def get_profile(self, element_type: str, profile_name: str) -> Optional[dict]:
+        profiles = self._profiles.get(element_type)
+        if profiles is None:
+            return None
+        return profiles.get(profile_name)
 
     def _scale_value(self, element: GridElement, value, dimension: str = "active_power"):
         # Scale the value according to the element's specification (i.e., max power)
@@ -160,32 +188,57 @@ class ProfileCalculator:
         return value
 
     def _get_weighted_value(self, date_time: datetime.datetime, profile: dict, dimension: str, cache_key: Tuple) -> float:
-        day_str = date_time.strftime(self.date_format)
-        data = profile[day_str]
-        interpolation = self._get_interpolation(
-            data, date_time, dimension, cache_key + (day_str, dimension)
-        )
+        interpolation = self._get_interpolation(profile, date_time, dimension, cache_key)
         return interpolation.interpolate(date_time)
 
+    def get_interpolation_table(self, element_type: str, profile_name: str, date_time: datetime.datetime,
+                                dimension: str) -> InterpolationTable:
+        """
+        Returns the (cached) interpolation table of the given profile for the day of the given date_time.
+
+        Args:
+            element_type (str):
+                The element type of the profile
+            profile_name (str):
+                The name of the profile
+            date_time (datetime.datetime):
+                A date time within the day to get the table for
+            dimension (str):
+                The dimension to get the table for
+
+        Returns:
+            InterpolationTable: The interpolation table
+
+        Raises:
+            KeyError: If the profile or its day does not exist
+        """
+        profile = self._profiles[element_type][profile_name]
+        return self._get_interpolation(profile, date_time, dimension, (element_type, profile_name))
+
+    def get_interpolation_cache_statistics(self) -> dict:
+        return self._interpolation_cache.get_statistics()
+
     def _get_interpolation(
-        self, data: dict, date_time: datetime.datetime, dimension: str, cache_key: Tuple
-    ) -> Interpolation:
-        if cache_key in self._interpolation_cache:
-            return self._interpolation_cache[cache_key]
-
-        interpolation = Interpolation(
-            date_time=date_time,
-            logger=self.logger,
-            data=data,
-            dimension=dimension,
-            interpolation_type=self.interpolate
-            if self.interpolate in [False, "cubic", "linear", "steps"]
-            else False,
-            step_size_sec=self.step_size_sec,
-            step_interpolation_type=self.step_interpolation_type,
-        )
-        self._interpolation_cache[cache_key] = interpolation
-        return interpolation
+        self, profile: dict, date_time: datetime.datetime, dimension: str, cache_key: Tuple
+    ) -> InterpolationTable:
+        day_str = date_time.strftime(self.date_format)
+        # Timestamps of the samples depend on the year, i.e., the full date identifies the day
+        day = date_time.date()
+
+        def create_table() -> InterpolationTable:
+            return Interpolation(
+                date_time=date_time,
+                logger=self.logger,
+                data=profile[day_str],
+                dimension=dimension,
+                interpolation_type=self.interpolate
+                if self.interpolate in [False, "cubic", "linear", "steps"]
+                else False,
+                step_size_sec=self.step_size_sec,
+                step_interpolation_type=self.step_interpolation_type,
+            ).to_table()
+
+        return self._interpolation_cache.get(day, cache_key + (dimension,), create_table)
 
     def _store_base_values(self):
         # Store base power values of all elements
@@ -0,0 +1,262 @@
+import datetime
+import math
+from typing import List, Dict, Tuple, Optional, Callable, Iterable, Union
+
+import numpy as np
+from powerowl.layers.powergrid import PowerGridModel
+from powerowl.layers.powergrid.elements import GridElement
+from powerowl.layers.powergrid.values.grid_value import GridValue
+from powerowl.layers.powergrid.values.grid_value_context import GridValueContext
+from scipy.interpolate import interp1d
+
+from wattson.powergrid.profiles.profile_calculator import ProfileCalculator
+
+
+class ProfileUpdateBatch:
+    """
+    The profile values of a single step, given as a list of target grid values and a NumPy array holding the respective
+    values. Rows without a profile value (e.g., as the profile does not cover the current day) are NaN.
+    """
+    def __init__(self, grid_values: List[GridValue], values: np.ndarray):
+        self.grid_values = grid_values
+        self.values = values
+
+    def __len__(self):
+        return len(self.grid_values)
+
+    def to_update_dicts(self) -> List[Dict]:
+        """
+        Converts this batch to the list of update dicts as used by legacy update callbacks.
+
+        Returns:
+            List[Dict]: The updates.
+        """
+        updates = []
+        for grid_value, value in zip(self.grid_values, self.values.tolist()):
+            if math.isnan(value):
+                continue
+            updates.append({
+                "element": grid_value.get_grid_element(),
+                "value_context": grid_value.value_context,
+                "value_name": grid_value.name,
+                "value": value
+            })
+        return updates
+
+
+class ProfileEngine:
+    """
+    Evaluates the profiles of all elements for a given point in time at once.
+    Each element is resolved once to its profile, its target grid value and its scaling factor.
+    Per day and dimension, the profiles' interpolation tables (shared with the ProfileCalculator's interpolation cache)
+    sharing the same time samples are stacked into a contiguous matrix
+    (profiles x time samples), which is interpolated for all profiles in a single vectorized call. The element values
+    are then gathered from the interpolated profile values, i.e., the cost per step is independent of the number
+    of elements sharing a profile. The interpolation follows the semantics of the Interpolation class
+    (per-day, with cubic, linear, steps or no interpolation).
+    Scaling factors given as callables (e.g., an element's maximum power) are re-read on every evaluation. The resolved
+    elements are dropped if the number of elements changes or invalidate is called.
+    """
+    DIMENSIONS = ["active_power", "reactive_power"]
+
+    def __init__(self,
+                 grid_model: PowerGridModel,
+                 profile_calculator: ProfileCalculator,
+                 target_callback: Callable[[GridElement, str], Optional[Tuple[str, Union[float, Callable[[], Optional[float]]]]]],
+                 element_types: Iterable[str] = ("load", "sgen"),
+                 logger=None):
+        """
+        Args:
+            grid_model (PowerGridModel):
+                The grid model holding the elements to apply profiles to.
+            profile_calculator (ProfileCalculator):
+                The calculator holding the loaded profiles and the interpolation configuration.
+            target_callback (Callable[[GridElement, str], Optional[Tuple[str, float]]]):
+                Returns the name of the CONFIGURATION grid value to apply a dimension's profile value to and the
+                factor to scale the profile value with, or None if the dimension is not applied to the element.
+                The factor can be given as a callable that returns the current factor (or None to skip the element).
+            element_types (Iterable[str], optional):
+                The element types to apply profiles to.
+                (Default value = ("load", "sgen"))
+            logger:
+                The logger to use.
+        """
+        self.grid_model = grid_model
+        self._calculator = profile_calculator
+        self._target_callback = target_callback
+        self._element_types = list(element_types)
+        self.logger = logger if logger is not None else profile_calculator.logger
+
+        self._is_resolved = False
+        # Per row (element and dimension)
+        self._grid_values: List[GridValue] = []
+        self._row_element_types: np.ndarray = np.empty(0, dtype=object)
+        self._row_dimensions: np.ndarray = np.empty(0, dtype=np.int64)
+        self._row_profiles: np.ndarray = np.empty(0, dtype=np.int64)
+        self._row_factors: np.ndarray = np.empty(0, dtype=float)
+        # Rows whose factor is re-read on every evaluation
+        self._dynamic_rows: np.ndarray = np.empty(0, dtype=np.int64)
+        self._dynamic_factor_callbacks: List[Callable[[], Optional[float]]] = []
+        self._element_counts: Optional[Tuple[int, ...]] = None
+        # Per profile
+        self._profile_keys: List[Tuple[str, str]] = []
+        # Per day: (day_str, dimension) -> List[(profile indices, interpolator)]
+        self._day_key: Optional[str] = None
+        self._day_interpolators: Dict[int, List[Tuple[np.ndarray, Callable[[float], np.ndarray]]]] = {}
+
+    def invalidate(self):
+        """
+        Drops the resolved elements, e.g., as elements or their profiles changed.
+        """
+        self._is_resolved = False
+        self._day_key = None
+        self._day_interpolators = {}
+
+    def _get_element_counts(self) -> Tuple[int, ...]:
+        return tuple(len(self.grid_model.get_elements_by_type(element_type)) for element_type in self._element_types)
+
+    def _resolve(self):
+        grid_values = []
+        element_types = []
+        dimensions = []
+        profiles = []
+        factors = []
+        dynamic_rows = []
+        dynamic_factor_callbacks = []
+        profile_indices: Dict[Tuple[str, str], int] = {}
+        for element_type in self._element_types:
+            for element in self.grid_model.get_elements_by_type(element_type):
+                profile_name = self._calculator.get_profile_name(element)
+                if profile_name is None:
+                    continue
+                profile_key = (element_type, profile_name)
+                for dimension_index, dimension in enumerate(self.DIMENSIONS):
+                    target = self._target_callback(element, dimension)
+                    if target is None:
+                        continue
+                    value_name, factor = target
+                    try:
+                        grid_value = element.get(key=value_name, context=GridValueContext.CONFIGURATION)
+                    except Exception as e:
+                        self.logger.warning(f"Cannot apply profile to {element.get_identifier()}.{value_name}: {e=}")
+                        continue
+                    if callable(factor):
+                        dynamic_rows.append(len(grid_values))
+                        dynamic_factor_callbacks.append(factor)
+                        factor = np.nan
+                    grid_values.append(grid_value)
+                    element_types.append(element_type)
+                    dimensions.append(dimension_index)
+                    profiles.append(profile_indices.setdefault(profile_key, len(profile_indices)))
+                    factors.append(factor)
+        self._grid_values = grid_values
+        self._row_element_types = np.array(element_types, dtype=object)
+        self._row_dimensions = np.array(dimensions, dtype=np.int64)
+        self._row_profiles = np.array(profiles, dtype=np.int64)
+        self._row_factors = np.array(factors, dtype=float)
+        self._dynamic_rows = np.array(dynamic_rows, dtype=np.int64)
+        self._dynamic_factor_callbacks = dynamic_factor_callbacks
+        self._element_counts = self._get_element_counts()
+        self._profile_keys = list(profile_indices.keys())
+        self._day_key = None
+        self._day_interpolators = {}
+        self._is_resolved = True
+        self.logger.info(f"Resolved {len(grid_values)} profile targets using {len(self._profile_keys)} profiles")
+
+    def _update_dynamic_factors(self):
+        if len(self._dynamic_factor_callbacks) == 0:
+            return
+        factors = []
+        for factor_callback in self._dynamic_factor_callbacks:
+            factor = factor_callback()
+            factors.append(np.nan if factor is None else factor)
+        self._row_factors[self._dynamic_rows] = factors
+
+    def _prepare_day(self, date_time: datetime.datetime, day_str: str):
+        self._day_interpolators = {}
+        for dimension_index, dimension in enumerate(self.DIMENSIONS):
+            # Profiles sharing the same time samples are interpolated together
+            groups: Dict[Tuple[float, ...], Tuple[List[int], List[np.ndarray]]] = {}
+            for profile_index, (element_type, profile_name) in enumerate(self._profile_keys):
+                try:
+                    table = self._calculator.get_interpolation_table(element_type, profile_name, date_time, dimension)
+                except (KeyError, TypeError, ValueError):
+                    # Profile does not cover this day (or dimension)
+                    continue
+                if len(table.x) == 0:
+                    continue
+                indices, matrix = groups.setdefault(tuple(table.x.tolist()), ([], []))
+                indices.append(profile_index)
+                matrix.append(table.y)
+            self._day_interpolators[dimension_index] = [
+                (np.array(indices, dtype=np.int64), self._create_interpolator(np.array(x), np.vstack(matrix)))
+                for x, (indices, matrix) in groups.items()
+            ]
+        self._day_key = day_str
+
+    def _create_interpolator(self, x: np.ndarray, matrix: np.ndarray) -> Callable[[float], np.ndarray]:
+        interpolation_type = self._calculator.interpolate
+        if interpolation_type not in ["cubic", "linear", "steps"]:
+            interpolation_type = False
+
+        if interpolation_type is False:
+            def no_interpolation(ts: float) -> np.ndarray:
+                position = np.searchsorted(x, ts, side="right") - 1
+                if position < 0:
+                    return np.zeros(matrix.shape[0])
+                return matrix[:, position]
+            return no_interpolation
+
+        if interpolation_type in ["cubic", "linear"]:
+            f = interp1d(np.array(x), matrix, kind=interpolation_type, axis=1)
+            return lambda ts: f(ts)
+
+        step_size_sec = self._calculator.step_size_sec
+        f = interp1d(np.array(x), matrix, kind=self._calculator.step_interpolation_type, axis=1)
+
+        def step_interpolation(ts: float) -> np.ndarray:
+            target = math.floor(ts / step_size_sec) * step_size_sec
+            return f(datetime.datetime.fromtimestamp(target).timestamp())
+        return step_interpolation
+
+    def evaluate(self, date_time: datetime.datetime, element_types: Optional[Iterable[str]] = None) -> ProfileUpdateBatch:
+        """
+        Evaluates the profiles of all elements for the given point in time.
+
+        Args:
+            date_time (datetime.datetime):
+                The (local) simulation time to evaluate the profiles for.
+            element_types (Optional[Iterable[str]], optional):
+                The element types to include. If None, all configured element types are included.
+                (Default value = None)
+
+        Returns:
+            ProfileUpdateBatch: The target grid values and their new values.
+        """
+        if self._is_resolved and self._element_counts != self._get_element_counts():
+            # Elements have been added or removed
+            self.invalidate()
+        if not self._is_resolved:
+            self._resolve()
+        self._update_dynamic_factors()
+        day_str = date_time.strftime(self._calculator.date_format)
+        if self._day_key != day_str:
+            self._prepare_day(date_time, day_str)
+
+        ts = date_time.timestamp()
+        # Profile values: profiles x dimensions
+        profile_values = np.full((len(self._profile_keys), len(self.DIMENSIONS)), np.nan)
+        for dimension_index, interpolators in self._day_interpolators.items():
+            for indices, interpolator in interpolators:
+                try:
+                    profile_values[indices, dimension_index] = interpolator(ts)
+                except ValueError:
+                    # Out of the interpolation range
+                    pass
+
+        values = profile_values[self._row_profiles, self._row_dimensions] * self._row_factors
+        if element_types is None:
+            return ProfileUpdateBatch(self._grid_values, values)
+        mask = np.isin(self._row_element_types, list(element_types))
+        rows = np.flatnonzero(mask)
+        return ProfileUpdateBatch([self._grid_values[i] for i in rows], values[rows])
@@ -8,6 +8,7 @@ from wattson.powergrid.profiles.loaders.power_profile_loader import PowerProfile
 
 from wattson.powergrid.profiles.loaders.seasoned_profile_loader import SeasonedProfileLoader
 from wattson.powergrid.profiles.loaders.simbench_profile_loader import SimbenchProfileLoader
+from wattson.powergrid.profiles.profile_cache import ProfileCache
 
 
 class ProfileLoaderFactory:
@@ -23,7 +24,15 @@ class ProfileLoaderFactory:
         step_interpolation_type: str = "linear",
         base_dir: Optional[Path] = None,
         scenario_path: Optional[Path] = None,
+        profile_cache_dir: Union[None, bool, str, Path] = None,
     ):
+        # None uses the default cache directory, False disables the profile cache
+        profile_cache = None
+        if profile_cache_dir is not False:
+            profile_cache = ProfileCache(
+                cache_dir=None if profile_cache_dir in [None, True] else Path(profile_cache_dir),
+                logger=logger
+            )
         normalized_profiles = {}
         for profile_name, profile in profiles.items():
             if profile is None or profile is False:
@@ -51,6 +60,6 @@ class ProfileLoaderFactory:
                 domain=profile_name,
                 **kwargs
             )
-            normalized_profiles[profile_name] = provider.load_profile()
+            normalized_profiles[profile_name] = provider.load_cached_profile(profile_cache)
         return normalized_profiles
 
@@ -16,28 +16,30 @@ import logging
 import threading
 import time
 from pathlib import Path
-from typing import Union, Optional, Dict, List, Callable
+from typing import Union, Optional, Dict, Callable, Tuple
 
 from wattson.util.threading import set_thread_name
 from powerowl.layers.powergrid import PowerGridModel
-from powerowl.layers.powergrid.elements import StaticGenerator, Load, Storage
+from powerowl.layers.powergrid.elements import StaticGenerator, Load, Storage, GridElement
 from powerowl.layers.powergrid.elements.enums.static_generator_type import StaticGeneratorType
 from powerowl.layers.powergrid.values.grid_value_context import GridValueContext
 
 from wattson.cosimulation.control.interface.wattson_client import WattsonClient
 from wattson.powergrid.profiles.profile_calculator import ProfileCalculator
+from wattson.powergrid.profiles.profile_engine import ProfileEngine, ProfileUpdateBatch
 from wattson.powergrid.profiles.profile_loader_factory import ProfileLoaderFactory, ProfileLoaderFactory
-from wattson.time import WattsonTime, WattsonTimeType
+from wattson.time import WattsonTime, WattsonTimeType, DiscreteEventScheduler
 from wattson.util import get_logger
 
 
 # noinspection PyMethodMayBeStatic
 class ProfileLoader(threading.Thread):
-    def __init__(self, grid_model: 'PowerGridModel', apply_updates_callback: Optional[Callable[[List[Dict]], None]],
+    def __init__(self, grid_model: 'PowerGridModel', apply_updates_callback: Optional[Callable[[ProfileUpdateBatch], None]],
                  wattson_time: dict, profiles: dict, seed: int = 0, noise: str = "0", interval: float = 1,
                  interpolate: Union[bool, str] = False, stop: Union[Dict, float, int, bool] = False,
                  profile_path: Optional[str] = None, profile_dir: str = "default_profiles", scenario_path: Optional[Path] = None,
-                 activate_none_profiles: bool = False):
+                 activate_none_profiles: bool = False, interpolation_cache_days: Optional[int] = 2,
+                 profile_cache_dir: Union[None, bool, str] = None):
 
         super().__init__()
 
@@ -50,6 +52,8 @@ class ProfileLoader(threading.Thread):
         self._wattson_client: Optional[WattsonClient] = None
         self._wattson_time: Optional[WattsonTime] = None
         self._create_wattson_time()
+        # In the discrete-event mode, profile steps are scheduled before power flow iterations of the same time
+        self._participant = self._wattson_time.register_participant("profiles", priority=0)
 
         self.ready_event = threading.Event()
 
@@ -93,7 +97,8 @@ class ProfileLoader(threading.Thread):
             step_size_sec=step_size_sec,
             step_interpolation_type=step_type,
             base_dir=base_path,
-            scenario_path=scenario_path
+            scenario_path=scenario_path,
+            profile_cache_dir=profile_cache_dir
         )
         self.logger.info(f"Loaded Profiles")
         self._profile_calculator = ProfileCalculator(
@@ -105,9 +110,16 @@ class ProfileLoader(threading.Thread):
             step_size_sec=step_size_sec,
             step_interpolation_type=step_type,
             base_dir=base_path,
-            activate_none_profiles=activate_none_profiles
+            activate_none_profiles=activate_none_profiles,
+            interpolation_cache_days=interpolation_cache_days
         )
         self.logger.info(f"Created calculator")
+        self._profile_engine = ProfileEngine(
+            grid_model=self.grid_model,
+            profile_calculator=self._profile_calculator,
+            target_callback=self._get_update_target,
+            logger=self.logger
+        )
 
         self.interval = interval
         self._terminate = threading.Event()
@@ -122,7 +134,22 @@ class ProfileLoader(threading.Thread):
         else:
             wattson_time_ref_sim = datetime.datetime.strptime(wattson_time_datetime, "%Y-%m-%d %H:%M:%S").timestamp()
 
-        if wattson_time_mode == "standalone":
+        if wattson_time_mode == "discrete-event":
+            if wattson_time_speed is None:
+                wattson_time_speed = 1
+            wattson_time_end_datetime = self._wattson_time_config.get("end_datetime", None)
+            end_time = None
+            if wattson_time_end_datetime is not None:
+                end_time = datetime.datetime.strptime(wattson_time_end_datetime, "%Y-%m-%d %H:%M:%S").timestamp()
+            self._wattson_time = WattsonTime(
+                wall_clock_reference=wattson_time_ref_wall,
+                sim_clock_reference=wattson_time_ref_sim,
+                speed=wattson_time_speed
+            )
+            self._wattson_time.enable_discrete_event_mode(
+                DiscreteEventScheduler(start_time=self._wattson_time.reference_sim, end_time=end_time)
+            )
+        elif wattson_time_mode == "standalone":
             if wattson_time_speed is None:
                 wattson_time_speed = 1
             self._wattson_time = WattsonTime(
@@ -152,8 +179,14 @@ class ProfileLoader(threading.Thread):
                 grid_element.get_config("profile_enabled").set_value(True)
         super().start()
 
+    @property
+    def wattson_time(self) -> WattsonTime:
+        return self._wattson_time
+
     def stop(self):
         self._terminate.set()
+        if self._participant is not None:
+            self._participant.wake()
         if self._wattson_client is not None:
             self._wattson_client.stop()
 
@@ -168,8 +201,7 @@ class ProfileLoader(threading.Thread):
             self.logger.debug(f"Simulation Time: {self._wattson_time.to_local_datetime(WattsonTimeType.SIM).strftime('%Y-%m-%d %H:%M:%S')}")
             # Update values of loads and generators
 
-            updates = []
-
+            element_types = []
             for element_type in ["load", "sgen"]:
                 stop_step = self.stop_config.get(element_type, False)
                 if stop_step is True:
@@ -185,53 +217,9 @@ class ProfileLoader(threading.Thread):
                             self.logger.info(f"Stopping profiles for {element_type} after {stop_step} steps")
                             self.stop_config[element_type] = True
                             continue
+                element_types.append(element_type)
 
-                for element in self.grid_model.get_elements_by_type(element_type):
-                    for dimension in ["active_power", "reactive_power"]:
-                        value = self._profile_calculator.get_value(element, self._wattson_time.to_local_datetime(WattsonTimeType.SIM), dimension=dimension)
-                        if value is None:
-                            continue
-                        value_context = GridValueContext.CONFIGURATION
-                        value_name = f"{dimension}_profile_percentage"
-                        if isinstance(element, StaticGenerator):
-                            # self.logger.info(f"{element.get_identifier()}: {dimension}={value}")
-                            generator_type = element.get_property_value("generator_type").get_clear_type()
-                            if generator_type in [StaticGeneratorType.PHOTOVOLTAIC, StaticGeneratorType.WIND]:
-                                # value_context = GridValueContext.PROPERTY
-                                value_name = f"{dimension}_limit"
-                                # Apply scaling
-                                max_power = None
-                                if dimension == "active_power":
-                                    max_power = element.get_maximum_active_power()
-                                elif dimension == "reactive_power":
-                                    max_power = element.get_maximum_reactive_power()
-                                if max_power is None:
-                                    self.logger.warning(f"Cannot update {element.get_identifier()} - no maximum active power found")
-                                    continue
-                                value = max_power * value
-                            else:
-                                value_name = f"{dimension}_profile_percentage"
-                                value = 100 * value
-                        elif isinstance(element, Load):
-                            # self.logger.info(f"{element.get_identifier()}: {dimension}={value}")
-                            value_name = f"{dimension}_profile_percentage"
-                            value = 100 * value
-                        elif isinstance(element, Storage):
-                            # self.logger.info(f"{element.get_identifier()}: {dimension}={value}")
-                            value_name = f"{dimension}_profile_percentage"
-                            value = 100 * value
-                            # Do not actually apply this
-                            continue
-
-                        updates.append(
-                            {
-                                "element": element,
-                                "value_context": value_context,
-                                "value_name": value_name,
-                                "value": value
-                            }
-                        )
-
+            updates = self._profile_engine.evaluate(self._wattson_time.to_local_datetime(WattsonTimeType.SIM), element_types=element_types)
             self._apply_updates(updates)
 
             if first_run:
@@ -241,11 +229,70 @@ class ProfileLoader(threading.Thread):
             runtime = end_time - start_time
             diff = max(0.0, self.interval - runtime)
             first_run = False
-            self._terminate.wait(diff)
+            if self._participant is not None:
+                # Each step advances the simulated time by the interval's equivalent in simulated seconds
+                self._wattson_time.wait(self.interval * self._wattson_time.speed, participant=self._participant,
+                                        wake_event=self._terminate)
+                if self._participant.scheduler.is_finished():
+                    self.logger.info(f"Discrete-event run finished after {self._step} steps")
+                    break
+            else:
+                self._terminate.wait(diff)
+        if self._participant is not None:
+            self._participant.unregister()
+
+    def invalidate_profile_targets(self):
+        """
+        Resolves the profile targets of all elements again before the next step, e.g., as the profiles of
+        elements changed.
+        """
+        self._profile_engine.invalidate()
+
+    def _get_update_target(self, element: GridElement, dimension: str) -> Optional[Tuple[str, Union[float, Callable[[], Optional[float]]]]]:
+        """
+        Returns the name of the grid value to apply the profile value of the given dimension to and the factor to scale
+        the profile value with.
+
+        Args:
+            element (GridElement):
+                The grid element
+            dimension (str):
+                The dimension, i.e., active_power or reactive_power
+
+        Returns:
+            Optional[Tuple[str, Union[float, Callable[[], Optional[float]]]]]: The grid value name and the scaling factor
+            (or a callable returning the current factor), or None if no profile is applied.
+        """
+        value_name = f"{dimension}_profile_percentage"
+        if isinstance(element, StaticGenerator):
+            generator_type = element.get_property_value("generator_type").get_clear_type()
+            if generator_type in [StaticGeneratorType.PHOTOVOLTAIC, StaticGeneratorType.WIND]:
+                value_name = f"{dimension}_limit"
+                # Apply scaling - the maximum power is re-read on every step as it might change
+                if dimension == "active_power":
+                    get_max_power = element.get_maximum_active_power
+                elif dimension == "reactive_power":
+                    get_max_power = element.get_maximum_reactive_power
+                else:
+                    return None
+
+                def get_factor() -> Optional[float]:
+                    max_power = get_max_power()
+                    if max_power is None:
+                        self.logger.warning(f"Cannot update {element.get_identifier()} - no maximum {dimension} found")
+                    return max_power
+                return value_name, get_factor
+            return value_name, 100
+        elif isinstance(element, Load):
+            return value_name, 100
+        elif isinstance(element, Storage):
+            # Do not actually apply this
+            return None
+        return value_name, 1
 
     def _get_sim_time_passed(self):
         return self._wattson_time.passed_sim_clock_seconds()
 
-    def _apply_updates(self, updates: List[Dict]):
+    def _apply_updates(self, updates: ProfileUpdateBatch):
         if self._apply_updates_callback is not None:
             self._apply_updates_callback(updates)
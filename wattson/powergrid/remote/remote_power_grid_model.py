@@ -1,6 +1,6 @@
 import threading
 import typing
-from typing import Any, Type, List, Callable
+from typing import Any, Type, List, Callable, Dict, Iterable, Optional
 
 from powerowl.layers.powergrid import PowerGridModel
 from powerowl.layers.powergrid.elements import GridElement
@@ -10,6 +10,7 @@ from wattson.cosimulation.control.interface.wattson_client import WattsonClient
 from wattson.cosimulation.control.messages.wattson_notification import WattsonNotification
 from wattson.cosimulation.remote.wattson_remote_object import WattsonRemoteObject
 from wattson.powergrid.remote.remote_grid_value import RemoteGridValue
+from wattson.powergrid.simulator.grid_representation_store import GridRepresentationStore
 from wattson.powergrid.simulator.messages.power_grid_notification_topic import PowerGridNotificationTopic
 from wattson.powergrid.simulator.messages.power_grid_query import PowerGridQuery
 from wattson.powergrid.simulator.messages.power_grid_query_type import PowerGridQueryType
@@ -34,6 +35,7 @@ class RemotePowerGridModel(PowerGridModel, WattsonRemoteObject):
         self._on_grid_value_state_changed_callbacks: List[Callable[[RemoteGridValue], Any]] = []
         self._update_cache = []
         self._initialized = threading.Event()
+        self._revision: Optional[int] = None
 
         # Subscribe to element updates
         self.wattson_client.subscribe(PowerGridNotificationTopic.GRID_VALUES_UPDATED, self._grid_values_updated)
@@ -62,20 +64,95 @@ class RemotePowerGridModel(PowerGridModel, WattsonRemoteObject):
         raise NotImplementedError("RemotePowerGridModel can only be exported from the non-remote instance")
 
     def synchronize(self, force: bool = False, block: bool = True):
-        self.elements = {}
+        """
+        Synchronizes the grid with the simulator.
+        Once the grid has been loaded, only the grid values that changed since the last synchronization are requested,
+        unless a full synchronization is forced.
+
+        Args:
+            force (bool, optional):
+                Whether to load the full grid representation.
+                (Default value = False)
+            block (bool, optional):
+                Whether to block until the synchronization is done.
+                (Default value = True)
+        """
+        if not force and self._revision is not None and self._initialized.is_set():
+            self.synchronize_delta()
+            return
 
         query = PowerGridQuery(
-            query_type=PowerGridQueryType.GET_GRID_REPRESENTATION,
+            query_type=PowerGridQueryType.GET_GRID_REPRESENTATION_SNAPSHOT,
             query_data={}
         )
         response = self.wattson_client.query(query)
+        if response.is_successful():
+            revision = response.data["revision"]
+            grid_elements = GridRepresentationStore.load_snapshot(response.data["snapshot"])
+        else:
+            # Simulator does not provide versioned representations
+            query = PowerGridQuery(
+                query_type=PowerGridQueryType.GET_GRID_REPRESENTATION,
+                query_data={}
+            )
+            response = self.wattson_client.query(query)
+            if not response.is_successful():
+                error = response.data.get("error")
+                self.logger.error(f"Could not retrieve power grid: {error=}")
+                return
+            revision = None
+            grid_elements = response.data["grid_elements"]
+
+        self._build_from_representation(grid_elements)
+        self._revision = revision
+        self._initialized.set()
+        self._clear_deferred_notifications()
+        if self._revision is not None:
+            # The shared snapshot might be slightly outdated
+            self.synchronize_delta()
+
+    def synchronize_delta(self) -> bool:
+        """
+        Requests all grid values that changed since the last synchronized revision and updates them.
+        In case the revision is no longer available at the simulator, the full grid is synchronized.
+
+        Returns:
+            bool: Whether the synchronization succeeded.
+        """
+        if self._revision is None:
+            self.synchronize(force=True)
+            return self._initialized.is_set()
+        query = PowerGridQuery(
+            query_type=PowerGridQueryType.GET_GRID_REPRESENTATION_DELTA,
+            query_data={"revision": self._revision}
+        )
+        response = self.wattson_client.query(query)
         if not response.is_successful():
+            if response.data.get("snapshot_required", False):
+                self.synchronize(force=True)
+                return self._initialized.is_set()
             error = response.data.get("error")
-            self.logger.error(f"Could not retrieve power grid: {error=}")
-            return
-        data = response.data
+            self.logger.error(f"Could not synchronize power grid: {error=}")
+            return False
+        for identifier, entry in response.data["grid_values"].items():
+            try:
+                grid_value = self.get_grid_value_by_identifier(identifier)
+            except Exception as e:
+                self.logger.error(f"{identifier}: Could not apply update: {e=}")
+                continue
+            old_value = grid_value.value
+            grid_value._update_from_data(entry["representation"])
+            grid_value._trigger_on_set(old_value)
+        self._revision = response.data["revision"]
+        return True
+
+    def get_revision(self) -> Optional[int]:
+        return self._revision
+
+    def _build_from_representation(self, grid_elements: Dict):
+        self.elements = {}
         # Create Grid Elements
-        for e_type, elements in data["grid_elements"].items():
+        for e_type, elements in grid_elements.items():
             for e_id, element in elements.items():
                 grid_element_class: Type[GridElement] = GridElement.element_class_by_type(e_type)
                 grid_element = grid_element_class(create_specification=False, index=e_id)
@@ -84,7 +161,7 @@ class RemotePowerGridModel(PowerGridModel, WattsonRemoteObject):
                     grid_element.set_data(key, value)
 
         # Fill in Attributes
-        for e_type, elements in data["grid_elements"].items():
+        for e_type, elements in grid_elements.items():
             for e_id, element in elements.items():
                 grid_element = self.get_element(e_type, e_id)
                 attributes = element["attributes"]
@@ -101,8 +178,114 @@ class RemotePowerGridModel(PowerGridModel, WattsonRemoteObject):
                         grid_value.add_on_set_callback(self._on_grid_value_set)
                         grid_element.set(grid_value.name, grid_value.value_context, grid_value)
 
-        self._initialized.set()
-        self._clear_deferred_notifications()
+    def get_grid_values(self, grid_value_identifiers: Iterable[str]) -> Dict[str, Any]:
+        """
+        Synchronizes the given grid values with a single query and returns their values.
+
+        Args:
+            grid_value_identifiers (Iterable[str]):
+                The identifiers of the grid values to synchronize.
+
+        Returns:
+            Dict[str, Any]: The values of all successfully synchronized grid values by their identifier.
+        """
+        query = PowerGridQuery(
+            query_type=PowerGridQueryType.GET_GRID_VALUES,
+            query_data={"grid_value_identifiers": list(grid_value_identifiers)}
+        )
+        response = self.wattson_client.query(query)
+        data = response.data if isinstance(response.data, dict) else {}
+        for identifier, error in data.get("errors", {}).items():
+            self.logger.error(f"{identifier}: Could not synchronize: {error=}")
+        if "grid_values" not in data:
+            self.logger.error(f"Could not synchronize grid values: {data.get('error')=}")
+            return {}
+        values = {}
+        for identifier, grid_value_data in data["grid_values"].items():
+            grid_value = self.get_grid_value_by_identifier(identifier)
+            grid_value._update_from_data(grid_value_data)
+            values[identifier] = grid_value.value
+        return values
+
+    def set_grid_values(self, grid_values: Dict[str, Any], override: bool = False) -> bool:
+        """
+        Sets multiple grid values with a single query.
+        The simulator applies all values before the next simulation iteration is triggered, i.e.,
+        at most one iteration is caused by the update.
+
+        Args:
+            grid_values (Dict[str, Any]):
+                The values to set by their grid value identifier.
+            override (bool, optional):
+                Whether to override locks of the grid values.
+                (Default value = False)
+
+        Returns:
+            bool: Whether all values have been set successfully.
+        """
+        if len(grid_values) == 0:
+            return True
+        query = PowerGridQuery(
+            query_type=PowerGridQueryType.SET_GRID_VALUES,
+            query_data={"grid_values": dict(grid_values), "override": override}
+        )
+        response = self.wattson_client.query(query)
+        data = response.data if isinstance(response.data, dict) else {}
+        for identifier, error in data.get("errors", {}).items():
+            self.logger.error(f"{identifier}: Could not synchronize (on_set): {error=}")
+        if "grid_values" not in data:
+            self.logger.error(f"Could not set grid values: {data.get('error')=}")
+            return False
+        for identifier, grid_value_data in data["grid_values"].items():
+            grid_value = self.get_grid_value_by_identifier(identifier)
+            old_value = grid_value.value
+            grid_value._update_from_data(grid_value_data)
+            grid_value._trigger_on_set(old_value)
+        return response.is_successful()
+
+    def set_grid_value_interests(self, grid_value_identifiers: Iterable[str], patterns: Optional[Iterable[str]] = None) -> bool:
+        """
+        Restricts the GRID_VALUES_UPDATED notifications received by this model's WattsonClient to the given grid values.
+        Other grid values are only updated when they are read and their synchronization interval has passed.
+
+        Args:
+            grid_value_identifiers (Iterable[str]):
+                The identifiers of the grid values of interest.
+            patterns (Optional[Iterable[str]], optional):
+                Glob patterns matching further grid values of interest, e.g., "bus.*.MEASUREMENT.voltage".
+                (Default value = None)
+
+        Returns:
+            bool: Whether the interests have been registered.
+        """
+        query = PowerGridQuery(
+            query_type=PowerGridQueryType.SET_GRID_VALUE_INTERESTS,
+            query_data={
+                "grid_value_identifiers": sorted(grid_value_identifiers),
+                "patterns": sorted(patterns) if patterns is not None else []
+            }
+        )
+        response = self.wattson_client.query(query)
+        if not response.is_successful():
+            self.logger.error(f"Could not register grid value interests: {response.data.get('error')=}")
+            return False
+        # Only receive the updates explicitly addressed to this client
+        self.wattson_client.set_broadcast_subscription(PowerGridNotificationTopic.GRID_VALUES_UPDATED, False)
+        return True
+
+    def clear_grid_value_interests(self) -> bool:
+        """
+        Removes the registered grid value interests, i.e., updates of all grid values are received again.
+
+        Returns:
+            bool: Whether the interests have been removed.
+        """
+        self.wattson_client.set_broadcast_subscription(PowerGridNotificationTopic.GRID_VALUES_UPDATED, True)
+        query = PowerGridQuery(
+            query_type=PowerGridQueryType.SET_GRID_VALUE_INTERESTS,
+            query_data={"clear": True}
+        )
+        return self.wattson_client.query(query).is_successful()
 
     def get_grid_value_by_identifier(self, grid_value_identifier: str) -> RemoteGridValue:
         grid_value = super().get_grid_value_by_identifier(grid_value_identifier=grid_value_identifier)
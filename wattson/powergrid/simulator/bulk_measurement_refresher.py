@@ -0,0 +1,200 @@
+import logging
+import time
+from typing import Optional, Dict, Tuple, List, Callable, Any
+
+import numpy as np
+
+from powerowl.layers.powergrid import PowerGridModel
+from powerowl.layers.powergrid.values.grid_value import GridValue
+from powerowl.layers.powergrid.values.grid_value_context import GridValueContext
+
+
+class BulkMeasurementRefresher:
+    """
+    Refreshes the MEASUREMENT grid values after a power flow iteration in bulk.
+    Instead of calling get_value() for every measurement, the simulator's result tables (res_bus, res_line, ...) are read
+    as NumPy arrays once per iteration and compared against the previous iteration. Only grid values whose result
+    changed beyond the configured tolerance are refreshed, i.e., only these trigger their set callback chain.
+    Grid values that are not backed by a result table column (or that are subject to noise) are refreshed individually.
+    """
+    def __init__(self,
+                 grid_model: PowerGridModel,
+                 result_table_provider: Optional[Callable[[], Any]] = None,
+                 always_refresh_callback: Optional[Callable[[GridValue], bool]] = None,
+                 always_refresh_version_provider: Optional[Callable[[], Any]] = None,
+                 tolerance: float = 1e-9,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            grid_model (PowerGridModel):
+                The power grid model whose measurements to refresh.
+            result_table_provider (Optional[Callable[[], Any]], optional):
+                Callable that returns the (pandapower) net holding the result tables.
+                (Default value = grid_model.get_panda_power_net)
+            always_refresh_callback (Optional[Callable[[GridValue], bool]], optional):
+                Callable that decides whether a grid value has to be refreshed in every iteration regardless of its
+                result table entry, e.g., as noise is applied to it. It is evaluated once per grid value when the
+                index is built.
+                (Default value = None)
+            always_refresh_version_provider (Optional[Callable[[], Any]], optional):
+                Callable that returns a value that changes whenever the decisions of the always_refresh_callback
+                change (e.g., the noise rules' version), such that the set of always refreshed grid values is rebuilt.
+                (Default value = None)
+            tolerance (float, optional):
+                The absolute difference that has to be exceeded for a value to be considered changed.
+                (Default value = 1e-9)
+            logger (Optional[logging.Logger], optional):
+                The logger to use.
+                (Default value = None)
+        """
+        self._grid_model = grid_model
+        if result_table_provider is None:
+            # Read the result tables from the live net instead of exporting the model
+            result_table_provider = getattr(grid_model, "get_panda_power_net", grid_model.to_external)
+        self._result_table_provider = result_table_provider
+        self._always_refresh_callback = always_refresh_callback
+        self._always_refresh_version_provider = always_refresh_version_provider
+        self._always_refresh_version: Any = None
+        self._always_refresh_grid_values: List[GridValue] = []
+        self._tolerance = tolerance
+        self.logger = logger if logger is not None else logging.getLogger("BulkMeasurementRefresher")
+
+        # (table, column) -> (simulator indices, grid values)
+        self._columns: Dict[Tuple[str, str], Tuple[np.ndarray, List[GridValue]]] = {}
+        self._previous: Dict[Tuple[str, str], np.ndarray] = {}
+        self._individual_grid_values: List[GridValue] = []
+        self._is_indexed: bool = False
+        self.last_timings: Dict[str, float] = {}
+        self.last_statistics: Dict[str, int] = {}
+
+    def invalidate(self):
+        """
+        Drops the index and the previous results such that the next refresh rebuilds the index and refreshes all
+        grid values.
+        """
+        self._columns = {}
+        self._previous = {}
+        self._individual_grid_values = []
+        self._always_refresh_grid_values = []
+        self._is_indexed = False
+
+    def reset_previous_results(self):
+        """
+        Forgets the previous results such that the next refresh refreshes all grid values.
+        """
+        self._previous = {}
+
+    def _build_index(self):
+        columns: Dict[Tuple[str, str], Tuple[List[Any], List[GridValue]]] = {}
+        self._individual_grid_values = []
+        for e_type, elements in self._grid_model.elements.items():
+            for e_id, element in elements.items():
+                for (value_name, grid_value) in element.get_grid_values(context=GridValueContext.MEASUREMENT):
+                    simulator_context = grid_value.simulator_context
+                    if simulator_context is None:
+                        continue
+                    if (isinstance(simulator_context, (tuple, list)) and len(simulator_context) == 3
+                            and isinstance(simulator_context[0], str) and simulator_context[0].startswith("res_")):
+                        table, index, column = simulator_context
+                        indices, grid_values = columns.setdefault((table, column), ([], []))
+                        indices.append(index)
+                        grid_values.append(grid_value)
+                    else:
+                        self._individual_grid_values.append(grid_value)
+        self._columns = {key: (np.array(indices), grid_values) for key, (indices, grid_values) in columns.items()}
+        self._previous = {}
+        self._update_always_refresh_grid_values()
+        self._is_indexed = True
+
+    def _update_always_refresh_grid_values(self):
+        if self._always_refresh_version_provider is not None:
+            self._always_refresh_version = self._always_refresh_version_provider()
+        if self._always_refresh_callback is None:
+            self._always_refresh_grid_values = []
+            return
+        self._always_refresh_grid_values = [
+            grid_value
+            for _, grid_values in self._columns.values()
+            for grid_value in grid_values
+            if self._always_refresh_callback(grid_value)
+        ]
+
+    def _read_result_tables(self) -> Dict[Tuple[str, str], Optional[np.ndarray]]:
+        net = self._result_table_provider()
+        results = {}
+        for (table, column), (indices, _) in self._columns.items():
+            try:
+                data_frame = net[table]
+                positions = data_frame.index.get_indexer(indices)
+                values = np.asarray(data_frame[column].to_numpy(), dtype=float)
+                current = np.full(len(indices), np.nan)
+                valid = positions >= 0
+                current[valid] = values[positions[valid]]
+                results[(table, column)] = current
+            except (KeyError, TypeError, ValueError):
+                # Column cannot be represented numerically - refresh its values individually
+                results[(table, column)] = None
+        return results
+
+    def _diff(self, results: Dict[Tuple[str, str], Optional[np.ndarray]]) -> List[GridValue]:
+        changed_grid_values = []
+        for key, current in results.items():
+            _, grid_values = self._columns[key]
+            previous = self._previous.get(key)
+            if current is None or previous is None or len(previous) != len(current):
+                changed_grid_values.extend(grid_values)
+                continue
+            changed = ~np.isclose(current, previous, rtol=0, atol=self._tolerance, equal_nan=True)
+            changed_grid_values.extend(grid_values[i] for i in np.flatnonzero(changed))
+        if len(self._always_refresh_grid_values) > 0:
+            changed_set = set(id(grid_value) for grid_value in changed_grid_values)
+            changed_grid_values.extend(grid_value for grid_value in self._always_refresh_grid_values
+                                       if id(grid_value) not in changed_set)
+        for key, current in results.items():
+            if current is None:
+                self._previous.pop(key, None)
+            else:
+                self._previous[key] = current
+        return changed_grid_values
+
+    def refresh(self) -> Dict[str, float]:
+        """
+        Reads the current simulation results, determines the changed measurements and refreshes them.
+        In case the result tables cannot be read, all measurements are refreshed individually.
+
+        Returns:
+            Dict[str, float]: The durations (in seconds) of the read, diff and dispatch phases.
+        """
+        if not self._is_indexed:
+            self._build_index()
+        elif (self._always_refresh_version_provider is not None
+              and self._always_refresh_version_provider() != self._always_refresh_version):
+            self._update_always_refresh_grid_values()
+
+        start = time.perf_counter()
+        try:
+            results = self._read_result_tables()
+        except Exception as e:
+            self.logger.warning(f"Cannot read result tables, falling back to individual refresh: {e=}")
+            results = {key: None for key in self._columns.keys()}
+        read_done = time.perf_counter()
+        changed_grid_values = self._diff(results)
+        diff_done = time.perf_counter()
+        for grid_value in changed_grid_values:
+            grid_value.get_value()
+        for grid_value in self._individual_grid_values:
+            grid_value.get_value()
+        dispatch_done = time.perf_counter()
+
+        self.last_timings = {
+            "read": read_done - start,
+            "diff": diff_done - read_done,
+            "dispatch": dispatch_done - diff_done,
+            "total": dispatch_done - start
+        }
+        self.last_statistics = {
+            "indexed": sum(len(grid_values) for _, grid_values in self._columns.values()),
+            "changed": len(changed_grid_values),
+            "individual": len(self._individual_grid_values)
+        }
+        return self.last_timings
@@ -0,0 +1,150 @@
+import collections
+import pickle
+import threading
+import time
+import zlib
+from typing import Callable, Dict, Optional, Tuple
+
+from powerowl.layers.powergrid.values.grid_value import GridValue
+
+
+class GridRepresentationStore:
+    """
+    Keeps track of the revisions of the grid values of a power grid model to serve versioned grid representations.
+    Every change of a grid value (or its state) increases a global, monotonically increasing revision, which is assigned
+    to the changed grid value. Clients fetch a compressed, pre-serialized snapshot once and then only request the
+    grid values that changed since the snapshot's revision.
+    The snapshot blob is built at most once per revision and shared across all clients. As clients catch up via deltas,
+    a slightly outdated snapshot is served as long as it is younger than the configured minimum interval.
+    """
+    def __init__(self,
+                 representation_callback: Callable[[], Dict],
+                 grid_value_representation_callback: Callable[[GridValue], Dict],
+                 snapshot_min_interval_seconds: float = 1,
+                 compression_level: int = 1):
+        """
+        Args:
+            representation_callback (Callable[[], Dict]):
+                The callback that creates the full grid representation.
+            grid_value_representation_callback (Callable[[GridValue], Dict]):
+                The callback that creates the representation of a single grid value.
+            snapshot_min_interval_seconds (float, optional):
+                The minimum age of a snapshot before it is rebuilt for a newer revision.
+                (Default value = 1)
+            compression_level (int, optional):
+                The zlib compression level of the snapshot blob.
+                (Default value = 1)
+        """
+        self._representation_callback = representation_callback
+        self._grid_value_representation_callback = grid_value_representation_callback
+        self._snapshot_min_interval_seconds = snapshot_min_interval_seconds
+        self._compression_level = compression_level
+
+        self._lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()
+        self._revision: int = 0
+        # Deltas older than the base revision are not available, e.g., after the grid model has been replaced
+        self._base_revision: int = 0
+        # Identifier -> (revision, grid value), ordered by revision
+        self._changes: Dict[str, Tuple[int, GridValue]] = collections.OrderedDict()
+
+        self._snapshot: Optional[bytes] = None
+        self._snapshot_revision: Optional[int] = None
+        self._snapshot_time: float = 0
+
+    def get_revision(self) -> int:
+        return self._revision
+
+    def reset(self):
+        """
+        Invalidates all revisions, e.g., as the structure of the grid has changed.
+        Clients requesting a delta for an earlier revision are required to fetch a new snapshot.
+        """
+        with self._lock:
+            self._revision += 1
+            self._base_revision = self._revision
+            self._changes.clear()
+        with self._snapshot_lock:
+            self._snapshot = None
+            self._snapshot_revision = None
+
+    def mark_changed(self, grid_value: GridValue):
+        """
+        Assigns a new revision to the given grid value.
+
+        Args:
+            grid_value (GridValue):
+                The grid value whose value or state has changed.
+        """
+        identifier = grid_value.get_identifier()
+        with self._lock:
+            self._revision += 1
+            self._changes[identifier] = (self._revision, grid_value)
+            self._changes.move_to_end(identifier)
+
+    def get_delta(self, revision: int) -> Optional[Tuple[int, Dict[str, Dict]]]:
+        """
+        Returns the representations of all grid values that changed after the given revision.
+
+        Args:
+            revision (int):
+                The revision the client is synchronized to.
+
+        Returns:
+            Optional[Tuple[int, Dict[str, Dict]]]: The current revision and the changed grid values by their identifier
+            (each holding its "revision" and "representation"), or None in case the requested revision is no longer
+            available.
+        """
+        with self._lock:
+            if revision < self._base_revision or revision > self._revision:
+                return None
+            current_revision = self._revision
+            changed = []
+            for identifier, (grid_value_revision, grid_value) in reversed(self._changes.items()):
+                if grid_value_revision <= revision:
+                    break
+                changed.append((identifier, grid_value_revision, grid_value))
+        delta = {}
+        for identifier, grid_value_revision, grid_value in changed:
+            delta[identifier] = {
+                "revision": grid_value_revision,
+                "representation": self._grid_value_representation_callback(grid_value)
+            }
+        return current_revision, delta
+
+    def get_snapshot(self) -> Tuple[int, bytes]:
+        """
+        Returns the shared, zlib-compressed and pickled snapshot of the grid representation.
+        The snapshot reflects at least all changes up to its revision. Changes made while building the snapshot might
+        be included as well - they are contained in the next delta anyway.
+
+        Returns:
+            Tuple[int, bytes]: The snapshot's revision and the snapshot blob.
+        """
+        with self._snapshot_lock:
+            if self._snapshot is not None:
+                if self._snapshot_revision == self._revision:
+                    return self._snapshot_revision, self._snapshot
+                if time.time() - self._snapshot_time < self._snapshot_min_interval_seconds:
+                    return self._snapshot_revision, self._snapshot
+            revision = self._revision
+            representation = self._representation_callback()
+            self._snapshot = zlib.compress(pickle.dumps(representation, protocol=pickle.HIGHEST_PROTOCOL),
+                                           self._compression_level)
+            self._snapshot_revision = revision
+            self._snapshot_time = time.time()
+            return self._snapshot_revision, self._snapshot
+
+    @staticmethod
+    def load_snapshot(snapshot: bytes) -> Dict:
+        """
+        Restores the grid representation from a snapshot blob.
+
+        Args:
+            snapshot (bytes):
+                The snapshot blob as returned by get_snapshot.
+
+        Returns:
+            Dict: The grid representation.
+        """
+        return pickle.loads(zlib.decompress(snapshot))
@@ -0,0 +1,321 @@
+"""
+Append-only, columnar export of the power grid state.
+An export directory holds a sequence of row groups, each stored as .npz archive with one array per grid value
+(i.e., column), and an index file (index.jsonl) that lists the schemas (column identifiers and types) and the
+row groups with their wall-clock and simulation clock time ranges.
+Row groups are only appended, i.e., a run can be read while it is still being exported. Readers only open the row
+groups that overlap the requested time range and only decompress the requested columns.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+
+INDEX_FILE = "index.jsonl"
+WALL_TIME_COLUMN = "wall_time"
+SIM_TIME_COLUMN = "sim_time"
+
+
+class GridStateExportWriter:
+    """
+    Writes grid states to a columnar export directory. Rows are buffered and flushed as a row group once the
+    configured number of rows is reached or the oldest buffered row exceeds the configured age.
+    """
+    def __init__(self, export_path: Path, row_group_size: int = 1000, flush_interval_seconds: float = 10,
+                 compress: bool = True):
+        """
+        Args:
+            export_path (Path):
+                The export directory.
+            row_group_size (int, optional):
+                The maximum number of rows per row group.
+                (Default value = 1000)
+            flush_interval_seconds (float, optional):
+                The maximum (wall-clock) time rows are buffered before they are flushed.
+                (Default value = 10)
+            compress (bool, optional):
+                Whether to compress the row groups.
+                (Default value = True)
+        """
+        self.export_path = export_path
+        self.row_group_size = row_group_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.compress = compress
+        self._rows: List[Tuple[float, Optional[float], Dict[str, Any]]] = []
+        self._buffer_start: Optional[float] = None
+        self._schemas: Dict[Tuple[Tuple[str, str], ...], int] = {}
+        self._row_group_count = 0
+        self._load_index()
+
+    def _load_index(self):
+        index_file = self.export_path.joinpath(INDEX_FILE)
+        if not index_file.exists():
+            return
+        for entry in _read_index(index_file):
+            if entry["type"] == "schema":
+                self._schemas[tuple(zip(entry["columns"], entry["kinds"]))] = entry["id"]
+            elif entry["type"] == "row_group":
+                self._row_group_count += 1
+
+    def append(self, wall_time: float, sim_time: Optional[float], values: Dict[str, Any]):
+        """
+        Appends a single row, i.e., the state of the grid at the given time.
+
+        Args:
+            wall_time (float):
+                The wall-clock timestamp of the state.
+            sim_time (Optional[float]):
+                The simulation clock timestamp of the state.
+            values (Dict[str, Any]):
+                The grid values by their identifier.
+        """
+        if self._buffer_start is None:
+            self._buffer_start = time.time()
+        self._rows.append((wall_time, sim_time, values))
+        if self.is_flush_required():
+            self.flush()
+
+    def is_flush_required(self) -> bool:
+        if len(self._rows) == 0:
+            return False
+        if len(self._rows) >= self.row_group_size:
+            return True
+        return time.time() - self._buffer_start >= self.flush_interval_seconds
+
+    def flush(self):
+        """
+        Writes all buffered rows as a new row group.
+        """
+        if len(self._rows) == 0:
+            return
+        rows = self._rows
+        self._rows = []
+        self._buffer_start = None
+
+        kinds: Dict[str, str] = {}
+        for _, _, values in rows:
+            for identifier, value in values.items():
+                kind = _get_kind(value)
+                previous_kind = kinds.get(identifier)
+                if previous_kind is None or previous_kind == kind:
+                    kinds[identifier] = kind
+                elif "str" in (previous_kind, kind):
+                    kinds[identifier] = "str"
+                else:
+                    kinds[identifier] = "float"
+        schema = tuple(sorted(kinds.items()))
+        index_entries = []
+        schema_id = self._schemas.get(schema)
+        if schema_id is None:
+            schema_id = len(self._schemas)
+            self._schemas[schema] = schema_id
+            index_entries.append({
+                "type": "schema",
+                "id": schema_id,
+                "columns": [identifier for identifier, _ in schema],
+                "kinds": [kind for _, kind in schema]
+            })
+
+        wall_times = np.array([row[0] for row in rows], dtype=np.float64)
+        sim_times = np.array([np.nan if row[1] is None else row[1] for row in rows], dtype=np.float64)
+        arrays = {WALL_TIME_COLUMN: wall_times, SIM_TIME_COLUMN: sim_times}
+        for column_index, (identifier, kind) in enumerate(schema):
+            column = [values.get(identifier) for _, _, values in rows]
+            if kind == "str":
+                arrays[f"c{column_index}"] = np.array(["" if value is None else str(value) for value in column])
+            else:
+                arrays[f"c{column_index}"] = np.array([np.nan if value is None else value for value in column],
+                                                      dtype=np.float64)
+
+        file_name = f"row-group-{self._row_group_count:06d}.npz"
+        self._row_group_count += 1
+        self.export_path.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.export_path.joinpath(f".{file_name}.tmp")
+        with tmp_file.open("wb") as f:
+            if self.compress:
+                np.savez_compressed(f, **arrays)
+            else:
+                np.savez(f, **arrays)
+        os.replace(tmp_file, self.export_path.joinpath(file_name))
+
+        index_entries.append({
+            "type": "row_group",
+            "file": file_name,
+            "schema": schema_id,
+            "rows": len(rows),
+            "wall_start": float(np.min(wall_times)),
+            "wall_end": float(np.max(wall_times)),
+            "sim_start": None if np.isnan(sim_times).all() else float(np.nanmin(sim_times)),
+            "sim_end": None if np.isnan(sim_times).all() else float(np.nanmax(sim_times))
+        })
+        # The index is only appended to after the row group exists
+        with self.export_path.joinpath(INDEX_FILE).open("a") as f:
+            for entry in index_entries:
+                f.write(json.dumps(entry) + "\n")
+
+    def close(self):
+        self.flush()
+
+
+class GridStateExportReader:
+    """
+    Reads (parts of) a columnar grid state export.
+    """
+    def __init__(self, export_path: Path):
+        """
+        Args:
+            export_path (Path):
+                The export directory.
+        """
+        self.export_path = Path(export_path)
+        self._schemas: Dict[int, Dict[str, str]] = {}
+        self._row_groups: List[dict] = []
+        self.refresh()
+
+    def refresh(self):
+        """
+        Reloads the index, e.g., to include row groups appended since this reader has been created.
+        """
+        self._schemas = {}
+        self._row_groups = []
+        index_file = self.export_path.joinpath(INDEX_FILE)
+        if not index_file.exists():
+            return
+        for entry in _read_index(index_file):
+            if entry["type"] == "schema":
+                self._schemas[entry["id"]] = dict(zip(entry["columns"], entry["kinds"]))
+            elif entry["type"] == "row_group":
+                self._row_groups.append(entry)
+
+    def get_columns(self) -> List[str]:
+        """
+        Returns the identifiers of all exported grid values.
+
+        Returns:
+            List[str]: The grid value identifiers.
+        """
+        columns = {}
+        for schema in self._schemas.values():
+            columns.update(schema)
+        return sorted(columns.keys())
+
+    def get_time_range(self, use_sim_time: bool = False) -> Optional[Tuple[float, float]]:
+        """
+        Returns the time range covered by the export.
+
+        Args:
+            use_sim_time (bool, optional):
+                Whether to return the simulation clock time range instead of the wall-clock time range.
+                (Default value = False)
+
+        Returns:
+            Optional[Tuple[float, float]]: The first and last timestamp or None, if the export is empty.
+        """
+        start_key, end_key = ("sim_start", "sim_end") if use_sim_time else ("wall_start", "wall_end")
+        starts = [row_group[start_key] for row_group in self._row_groups if row_group[start_key] is not None]
+        ends = [row_group[end_key] for row_group in self._row_groups if row_group[end_key] is not None]
+        if len(starts) == 0:
+            return None
+        return min(starts), max(ends)
+
+    def read(self,
+             start: Optional[float] = None,
+             end: Optional[float] = None,
+             columns: Optional[Iterable[str]] = None,
+             use_sim_time: bool = False) -> pd.DataFrame:
+        """
+        Loads the grid states of the given time range.
+
+        Args:
+            start (Optional[float], optional):
+                The first timestamp to include, or None to start at the beginning of the export.
+                (Default value = None)
+            end (Optional[float], optional):
+                The last timestamp to include, or None to read until the end of the export.
+                (Default value = None)
+            columns (Optional[Iterable[str]], optional):
+                The grid value identifiers to load, or None to load all grid values.
+                (Default value = None)
+            use_sim_time (bool, optional):
+                Whether start and end refer to the simulation clock instead of the wall clock.
+                (Default value = False)
+
+        Returns:
+            pd.DataFrame: The grid states with one row per exported state, the wall_time and sim_time columns and one
+            column per selected grid value.
+        """
+        start_key, end_key = ("sim_start", "sim_end") if use_sim_time else ("wall_start", "wall_end")
+        time_column = SIM_TIME_COLUMN if use_sim_time else WALL_TIME_COLUMN
+        selected_columns = None if columns is None else list(columns)
+        frames = []
+        for row_group in self._row_groups:
+            if row_group[start_key] is None:
+                continue
+            if start is not None and row_group[end_key] < start:
+                continue
+            if end is not None and row_group[start_key] > end:
+                continue
+            schema = self._schemas[row_group["schema"]]
+            schema_columns = list(schema.keys())
+            column_indices = {identifier: i for i, identifier in enumerate(schema_columns)}
+            with np.load(self.export_path.joinpath(row_group["file"])) as data:
+                times = data[time_column]
+                mask = np.ones(len(times), dtype=bool)
+                if start is not None:
+                    mask &= times >= start
+                if end is not None:
+                    mask &= times <= end
+                if not mask.any():
+                    continue
+                frame_data = {
+                    WALL_TIME_COLUMN: data[WALL_TIME_COLUMN][mask],
+                    SIM_TIME_COLUMN: data[SIM_TIME_COLUMN][mask]
+                }
+                for identifier in (schema_columns if selected_columns is None else selected_columns):
+                    column_index = column_indices.get(identifier)
+                    if column_index is None:
+                        continue
+                    values = data[f"c{column_index}"][mask]
+                    kind = schema[identifier]
+                    if kind == "bool":
+                        values = pd.array(np.where(np.isnan(values), None, values == 1), dtype="boolean")
+                    elif kind == "str":
+                        values = np.where(values == "", None, values)
+                    frame_data[identifier] = values
+            frames.append(pd.DataFrame(frame_data))
+        if len(frames) == 0:
+            return pd.DataFrame(columns=[WALL_TIME_COLUMN, SIM_TIME_COLUMN] + (selected_columns or []))
+        data_frame = pd.concat(frames, ignore_index=True)
+        if selected_columns is not None:
+            data_frame = data_frame.reindex(columns=[WALL_TIME_COLUMN, SIM_TIME_COLUMN] + selected_columns)
+        return data_frame
+
+
+def _get_kind(value: Any) -> str:
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    return "str"
+
+
+def _read_index(index_file: Path) -> List[dict]:
+    entries = []
+    with index_file.open("r") as f:
+        for line in f:
+            line = line.strip()
+            if line == "":
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Partially written line of a running export
+                break
+    return entries
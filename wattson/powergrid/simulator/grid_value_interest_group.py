@@ -0,0 +1,64 @@
+import fnmatch
+import re
+from typing import Iterable, Set, Dict, Optional, Tuple, FrozenSet
+
+
+class GridValueInterestGroup:
+    """
+    A set of clients that are interested in the same grid values, given as identifiers and glob patterns
+    (e.g., "bus.*.MEASUREMENT.voltage").
+    Clients with identical interests share a group, i.e., the filtered GRID_VALUES_UPDATED batch is built once per
+    group. Matching results are cached per grid value identifier.
+    """
+    def __init__(self, grid_value_identifiers: Iterable[str], patterns: Iterable[str]):
+        """
+        Args:
+            grid_value_identifiers (Iterable[str]):
+                The identifiers of the grid values of interest.
+            patterns (Iterable[str]):
+                Glob patterns matching the identifiers of further grid values of interest.
+        """
+        self.grid_value_identifiers: FrozenSet[str] = frozenset(grid_value_identifiers)
+        self.patterns: Tuple[str, ...] = tuple(sorted(set(patterns)))
+        self.client_ids: Set[str] = set()
+        self._pattern_regex: Optional[re.Pattern] = None
+        if len(self.patterns) > 0:
+            self._pattern_regex = re.compile("|".join(f"(?:{fnmatch.translate(pattern)})" for pattern in self.patterns))
+        self._match_cache: Dict[str, bool] = {}
+
+    @property
+    def key(self) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
+        return self.get_key(self.grid_value_identifiers, self.patterns)
+
+    @staticmethod
+    def get_key(grid_value_identifiers: Iterable[str], patterns: Iterable[str]) -> Tuple[FrozenSet[str], Tuple[str, ...]]:
+        return frozenset(grid_value_identifiers), tuple(sorted(set(patterns)))
+
+    def matches(self, grid_value_identifier: str) -> bool:
+        if grid_value_identifier in self.grid_value_identifiers:
+            return True
+        if self._pattern_regex is None:
+            return False
+        matches = self._match_cache.get(grid_value_identifier)
+        if matches is None:
+            matches = self._pattern_regex.match(grid_value_identifier) is not None
+            self._match_cache[grid_value_identifier] = matches
+        return matches
+
+    def filter(self, grid_value_updates: Dict[str, Dict]) -> Dict[str, Dict]:
+        """
+        Returns the subset of the given grid value updates this group is interested in.
+
+        Args:
+            grid_value_updates (Dict[str, Dict]):
+                The grid value updates by grid value identifier.
+
+        Returns:
+            Dict[str, Dict]: The filtered updates.
+        """
+        if self._pattern_regex is None and len(self.grid_value_identifiers) < len(grid_value_updates):
+            return {
+                identifier: grid_value_updates[identifier]
+                for identifier in self.grid_value_identifiers if identifier in grid_value_updates
+            }
+        return {identifier: entry for identifier, entry in grid_value_updates.items() if self.matches(identifier)}
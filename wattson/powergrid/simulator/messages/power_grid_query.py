@@ -1,6 +1,16 @@
 from wattson.cosimulation.control.messages.wattson_query import WattsonQuery
+from wattson.powergrid.simulator.messages.power_grid_query_type import PowerGridQueryType
 
 
 class PowerGridQuery(WattsonQuery):
     def requires_native_namespace(self) -> bool:
         return False
+
+    def is_read_only(self) -> bool:
+        return self.query_type in [
+            PowerGridQueryType.GET_GRID_VALUE,
+            PowerGridQueryType.GET_GRID_VALUE_VALUE,
+            PowerGridQueryType.GET_GRID_VALUES,
+            PowerGridQueryType.GET_GRID_REPRESENTATION_SNAPSHOT,
+            PowerGridQueryType.GET_GRID_REPRESENTATION_DELTA,
+        ]
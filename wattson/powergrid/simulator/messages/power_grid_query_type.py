@@ -11,7 +11,12 @@ class PowerGridQueryType(str, enum.Enum):
     SET_GRID_VALUE = "set-grid-value"
     SET_GRID_VALUE_SIMPLE = "set-grid-value-simple"
     SET_GRID_VALUE_STATE = "set-grid-value-state"
+    GET_GRID_VALUES = "get-grid-values"
+    SET_GRID_VALUES = "set-grid-values"
+    SET_GRID_VALUE_INTERESTS = "set-grid-value-interests"
     GET_GRID_REPRESENTATION = "get-grid-representation"
+    GET_GRID_REPRESENTATION_SNAPSHOT = "get-grid-representation-snapshot"
+    GET_GRID_REPRESENTATION_DELTA = "get-grid-representation-delta"
 
     def __eq__(self, other):
         if isinstance(other, str):
@@ -1,3 +1,5 @@
+import contextlib
+import math
 import threading
 import time
 import traceback
@@ -21,6 +23,10 @@ from wattson.cosimulation.control.messages.wattson_response import WattsonRespon
 from wattson.datapoints.data_point_loader import DataPointLoader
 from wattson.powergrid.noise.noise_manager import NoiseManager
 from wattson.powergrid.profiles.profile_provider import  ProfileLoader
+from wattson.powergrid.simulator.bulk_measurement_refresher import BulkMeasurementRefresher
+from wattson.powergrid.simulator.grid_representation_store import GridRepresentationStore
+from wattson.powergrid.simulator.grid_value_interest_group import GridValueInterestGroup
+from wattson.powergrid.profiles.profile_engine import ProfileUpdateBatch
 from wattson.powergrid.simulator.default_configurations.ccx_default_configuration import CCXDefaultConfiguration
 from wattson.powergrid.simulator.messages.power_grid_query_type import PowerGridQueryType
 from wattson.powergrid.simulator.threads.export_thread import ExportThread
@@ -75,12 +81,18 @@ class PowerGridSimulator(PhysicalSimulator):
         self._auto_interval_maximum = kwargs.get("auto_iteration_maximum_pause_seconds", 20)
 
         self._termination_requested = threading.Event()
+        self._iteration_lock = threading.RLock()
+        self._deferred_iteration_lock = threading.Lock()
+        self._deferred_iteration_depth: int = 0
+        self._deferred_iteration_requested: bool = False
         self._simulator_thread: Optional[SimulationThread] = None
         self._simulation_required = QueueEvent(max_queue_time_s=2, max_wait_time_s=0.05, max_queue_interval_s=max_queue_interval_s)
         self._required_sim_control_clients = set()
         self._profile_thread: Optional[ProfileLoader] = None
         self._export_thread: Optional[ExportThread] = None
         self._auto_export_enable: bool = kwargs.get("auto_export_enable", False)
+        # E.g., export_format, row_group_size or flush_interval_seconds
+        self._export_config: dict = kwargs.get("export_config", {})
         self._ready_event = MultiEvent()
 
         self._use_bulk_grid_value_updates = threading.Event()
@@ -89,10 +101,23 @@ class PowerGridSimulator(PhysicalSimulator):
         self._bulk_grid_value_lock = threading.Lock()
         self._flush_interval = 0.5
         self._flush_thread = threading.Thread(target=self._flush_bulk_grid_value_updates_loop)
+        # Clients that registered the grid values they are interested in only receive these grid values' updates
+        self._grid_value_interest_lock = threading.Lock()
+        self._grid_value_interest_groups: Dict[Any, GridValueInterestGroup] = {}
+        self._grid_value_interest_clients: Dict[str, Any] = {}
 
         self._grid_representation_cache = TimedCache(cache_refresh_callback=self._get_grid_representation, cache_timeout_seconds=30)
+        self._grid_representation_store = GridRepresentationStore(
+            representation_callback=self._get_grid_representation,
+            grid_value_representation_callback=self._get_grid_value_remote_dict,
+            snapshot_min_interval_seconds=kwargs.get("grid_representation_snapshot_interval_seconds", 1)
+        )
         self._async_group_responses: Dict[str, WattsonAsyncGroupResponse] = {}
 
+        self._bulk_measurement_refresh_enable: bool = kwargs.get("bulk_measurement_refresh", True)
+        self._bulk_measurement_refresh_tolerance: float = kwargs.get("bulk_measurement_refresh_tolerance", 1e-9)
+        self._measurement_refresher = self._create_measurement_refresher()
+
     def start(self):
         self._termination_requested.clear()
         self._simulation_required.set()
@@ -116,6 +141,7 @@ class PowerGridSimulator(PhysicalSimulator):
             on_value_state_change_callback=self._on_value_state_change,
             on_protection_equipment_triggered_callback=self._on_protection_equipment_triggered,
             on_protection_equipment_cleared_callback=self._on_protection_equipment_cleared,
+            iteration_lock=self._iteration_lock,
             **simulator_config
         )
         self._simulator_thread.daemon = True
@@ -130,10 +156,16 @@ class PowerGridSimulator(PhysicalSimulator):
             **profile_config
         )
         self._profile_thread.daemon = True
+        if self._profile_thread.wattson_time.is_discrete_event_mode():
+            self.logger.info(f" Using discrete-event time")
+            self.wattson_time = self._profile_thread.wattson_time
+            self._simulator_thread.set_wattson_time(self.wattson_time)
+            threading.Thread(target=self._watch_discrete_event_run, name="W/PG/DES", daemon=True).start()
         self.logger.info(f" Initializing Export")
         self._export_thread = ExportThread(
             export_path=self.get_working_directory().joinpath("power_grid_exports"),
-            enable=self._auto_export_enable
+            enable=self._auto_export_enable,
+            **self._export_config
         )
         self._export_thread.daemon = True
         self._ready_event.monitor(
@@ -174,9 +206,75 @@ class PowerGridSimulator(PhysicalSimulator):
     def disable_export(self):
         self._export_thread.disable_export()
 
+    def _create_measurement_refresher(self) -> BulkMeasurementRefresher:
+        return BulkMeasurementRefresher(
+            grid_model=self._grid_model,
+            always_refresh_callback=self._noise_manager.has_post_sim_or_measurement_noise,
+            always_refresh_version_provider=lambda: self._noise_manager.rules_version,
+            tolerance=self._bulk_measurement_refresh_tolerance,
+            logger=self.logger.getChild("MeasurementRefresher")
+        )
+
+    def get_measurement_refresh_timings(self) -> Dict[str, float]:
+        """
+        Returns the durations (in seconds) of the read, diff and dispatch phases of the last bulk measurement refresh.
+
+        Returns:
+            Dict[str, float]: The phase durations of the last refresh.
+        """
+        return self._measurement_refresher.last_timings.copy()
+
     def queue_iteration_required(self):
+        with self._deferred_iteration_lock:
+            if self._deferred_iteration_depth > 0:
+                # Queued once the batch is completed
+                self._deferred_iteration_requested = True
+                return
+        self._queue_iteration()
+
+    def _queue_iteration(self):
+        if self.wattson_time.is_discrete_event_mode() and self._simulator_thread is not None:
+            # Iterations are not delayed in wall-clock time, simulated time does not advance before the iteration completed
+            self._simulator_thread.set_iteration_required()
+            return
         self._simulation_required.queue()
 
+    @contextlib.contextmanager
+    def batch_update(self):
+        """
+        Context manager for applying multiple grid value updates atomically with respect to a simulation iteration.
+        No iteration runs while the batch is applied, and at most one iteration is queued after the batch.
+        """
+        with self._iteration_lock:
+            with self._deferred_iteration_lock:
+                self._deferred_iteration_depth += 1
+            try:
+                yield
+            finally:
+                with self._deferred_iteration_lock:
+                    self._deferred_iteration_depth -= 1
+                    iteration_requested = self._deferred_iteration_depth == 0 and self._deferred_iteration_requested
+                    if self._deferred_iteration_depth == 0:
+                        self._deferred_iteration_requested = False
+                if iteration_requested:
+                    self._queue_iteration()
+
+    def _watch_discrete_event_run(self):
+        """
+        Stops the profile and simulator threads once the discrete-event scheduler reached its end time.
+        """
+        scheduler = self.wattson_time.get_scheduler()
+        while not self._termination_requested.is_set():
+            if scheduler.finished_event.wait(timeout=1):
+                break
+        if self._termination_requested.is_set():
+            return
+        self.logger.info(f"Discrete-event run reached its end time after {scheduler.event_count} events")
+        if self._profile_thread is not None:
+            self._profile_thread.stop()
+        if self._simulator_thread is not None:
+            self._simulator_thread.stop(timeout=10)
+
     def stop(self):
         self._termination_requested.set()
         if self._profile_thread is not None and self._profile_thread.is_alive():
@@ -206,6 +304,8 @@ class PowerGridSimulator(PhysicalSimulator):
         self._grid_model.set_pre_sim_noise_callback(self._noise_manager.pre_sim_noise)
         self._grid_model.set_post_sim_noise_callback(self._noise_manager.post_sim_noise)
         self._grid_model.set_measurement_noise_callback(self._noise_manager.measurement_noise)
+        self._measurement_refresher = self._create_measurement_refresher()
+        self._grid_representation_store.reset()
 
         self._configuration_store.register_configuration("datapoints", data_points)
         # power_grid_data = self._grid_model.to_primitive_dict()
@@ -226,6 +326,8 @@ class PowerGridSimulator(PhysicalSimulator):
         with power_grid_file.open("r") as f:
             power_grid_data = yaml.load(f, Loader=yaml.CLoader)
         self._grid_model.from_primitive_dict(power_grid_data)
+        self._measurement_refresher.invalidate()
+        self._grid_representation_store.reset()
         self._configuration_store.register_configuration("power_grid_model", power_grid_data)
 
         # Load data points
@@ -287,7 +389,7 @@ class PowerGridSimulator(PhysicalSimulator):
                 except Exception as e:
                     return WattsonResponse(successful=False, data={"error": repr(e)})
                 if query.query_type == PowerGridQueryType.GET_GRID_VALUE_VALUE:
-                    value_dict = {"value": grid_value.raw_get_value(override_freeze=True)}
+                    value_dict = {"value": self._get_primitive_value(grid_value)}
                 else:
                     value_dict = self._get_grid_value_remote_dict(grid_value)
                 return WattsonResponse(successful=True, data=value_dict)
@@ -303,11 +405,62 @@ class PowerGridSimulator(PhysicalSimulator):
                 except Exception as e:
                     return WattsonResponse(successful=False, data={"error": repr(e)})
                 if query.query_type == PowerGridQueryType.SET_GRID_VALUE_SIMPLE:
-                    value_dict = {"value": grid_value.raw_get_value(override_freeze=True)}
+                    value_dict = {"value": self._get_primitive_value(grid_value)}
                 else:
                     value_dict = self._get_grid_value_remote_dict(grid_value)
                 return WattsonResponse(successful=True, data=value_dict)
 
+            if query.query_type == PowerGridQueryType.GET_GRID_VALUES:
+                query.mark_as_handled()
+                grid_value_identifiers = query.query_data.get("grid_value_identifiers", [])
+                simple = query.query_data.get("simple", False)
+                values = {}
+                errors = {}
+                for grid_value_identifier in grid_value_identifiers:
+                    try:
+                        grid_value = self.grid_model.get_grid_value_by_identifier(grid_value_identifier)
+                    except Exception as e:
+                        errors[grid_value_identifier] = repr(e)
+                        continue
+                    if simple:
+                        values[grid_value_identifier] = {"value": self._get_primitive_value(grid_value)}
+                    else:
+                        values[grid_value_identifier] = self._get_grid_value_remote_dict(grid_value)
+                return WattsonResponse(successful=len(errors) == 0, data={"grid_values": values, "errors": errors})
+
+            if query.query_type == PowerGridQueryType.SET_GRID_VALUES:
+                query.mark_as_handled()
+                grid_value_updates = query.query_data.get("grid_values", {})
+                override = query.query_data.get("override")
+                simple = query.query_data.get("simple", False)
+                values = {}
+                errors = {}
+                with self.batch_update():
+                    for grid_value_identifier, value in grid_value_updates.items():
+                        try:
+                            grid_value = self.grid_model.get_grid_value_by_identifier(grid_value_identifier)
+                            grid_value.set_value(value, override_lock=override)
+                        except Exception as e:
+                            errors[grid_value_identifier] = repr(e)
+                            continue
+                        if simple:
+                            values[grid_value_identifier] = {"value": self._get_primitive_value(grid_value)}
+                        else:
+                            values[grid_value_identifier] = self._get_grid_value_remote_dict(grid_value)
+                return WattsonResponse(successful=len(errors) == 0, data={"grid_values": values, "errors": errors})
+
+            if query.query_type == PowerGridQueryType.SET_GRID_VALUE_INTERESTS:
+                query.mark_as_handled()
+                if query.client_id is None:
+                    return WattsonResponse(successful=False, data={"error": "Grid value interests require a registered client"})
+                self._set_grid_value_interests(
+                    client_id=query.client_id,
+                    grid_value_identifiers=query.query_data.get("grid_value_identifiers", []),
+                    patterns=query.query_data.get("patterns", []),
+                    clear=query.query_data.get("clear", False)
+                )
+                return WattsonResponse(successful=True)
+
             if query.query_type == PowerGridQueryType.GET_GRID_REPRESENTATION:
                 query.mark_as_handled()
                 if self._grid_representation_cache.is_up_to_date():
@@ -325,6 +478,19 @@ class PowerGridSimulator(PhysicalSimulator):
                         response.resolve_with_task(resolve_power_grid_task)
                     return response
 
+            if query.query_type == PowerGridQueryType.GET_GRID_REPRESENTATION_SNAPSHOT:
+                query.mark_as_handled()
+                revision, snapshot = self._grid_representation_store.get_snapshot()
+                return WattsonResponse(successful=True, data={"revision": revision, "snapshot": snapshot})
+
+            if query.query_type == PowerGridQueryType.GET_GRID_REPRESENTATION_DELTA:
+                query.mark_as_handled()
+                delta = self._grid_representation_store.get_delta(query.query_data.get("revision", -1))
+                if delta is None:
+                    return WattsonResponse(successful=False, data={"error": "Revision not available", "snapshot_required": True})
+                revision, grid_values = delta
+                return WattsonResponse(successful=True, data={"revision": revision, "grid_values": grid_values})
+
             if query.query_type == PowerGridQueryType.SET_GRID_VALUE_STATE:
                 query.mark_as_handled()
                 grid_value_identifier = query.query_data.get("grid_value_identifier")
@@ -526,11 +692,19 @@ class PowerGridSimulator(PhysicalSimulator):
     def _on_simulation_iteration_completed(self, successful: bool):
         t = time.time()
         # Trigger measurement value updates
-        for e_type, elements in self.grid_model.elements.items():
-            for e_id, element in elements.items():
-                for (value_name, grid_value) in element.get_grid_values(context=GridValueContext.MEASUREMENT):
-                    if grid_value.simulator_context is not None:
-                        grid_value.get_value()
+        if self._bulk_measurement_refresh_enable and successful:
+            timings = self._measurement_refresher.refresh()
+            statistics = self._measurement_refresher.last_statistics
+            self.logger.debug(f"Measurement refresh: {statistics['changed']} of {statistics['indexed']} changed, "
+                              f"{statistics['individual']} individual | read {timings['read']:.4f}s, "
+                              f"diff {timings['diff']:.4f}s, dispatch {timings['dispatch']:.4f}s")
+        else:
+            self._measurement_refresher.reset_previous_results()
+            for e_type, elements in self.grid_model.elements.items():
+                for e_id, element in elements.items():
+                    for (value_name, grid_value) in element.get_grid_values(context=GridValueContext.MEASUREMENT):
+                        if grid_value.simulator_context is not None:
+                            grid_value.get_value()
         self._flush_bulk_grid_value_updates()
         self.send_notification(PowerGridNotification(
             notification_topic=PowerGridNotificationTopic.SIMULATION_STEP_DONE,
@@ -547,7 +721,7 @@ class PowerGridSimulator(PhysicalSimulator):
                             value = value.item()
                         if isinstance(value, (float, bool, int, str)):
                             export_dict[grid_value.get_identifier()] = value
-            self._export_thread.export(timestamp=t, values=export_dict)
+            self._export_thread.export(timestamp=t, values=export_dict, sim_timestamp=self.wattson_time.sim_clock_time())
 
         # Potentially adjust simulation interval
         if successful and self._auto_interval_enable and self._auto_interval_last_start is not None:
@@ -587,6 +761,7 @@ class PowerGridSimulator(PhysicalSimulator):
         self._queue_grid_value_update_notification(grid_value=grid_value)
 
     def _on_value_change(self, grid_value: GridValue, old_value: Any, new_value: Any):
+        self._grid_representation_store.mark_changed(grid_value)
         for related in grid_value.get_related_grid_values():
             # Potentially trigger callbacks for related grid values
             related.get_value()
@@ -603,9 +778,17 @@ class PowerGridSimulator(PhysicalSimulator):
             """
             self.queue_iteration_required()
 
+    @staticmethod
+    def _get_primitive_value(grid_value: GridValue) -> Any:
+        value = grid_value.raw_get_value(override_freeze=True)
+        if hasattr(value, "item"):
+            # Transmit NumPy scalars as native Python types
+            value = value.item()
+        return value
+
     def _queue_grid_value_update_notification(self, grid_value: GridValue):
         entry = {
-            "value": grid_value.raw_get_value(override_freeze=True),
+            "value": self._get_primitive_value(grid_value),
             "wall_clock_time": self.wattson_time.wall_clock_time(),
             "sim_clock_time": self.wattson_time.sim_clock_time()
         }
@@ -614,14 +797,7 @@ class PowerGridSimulator(PhysicalSimulator):
             with self._bulk_grid_value_lock:
                 self._bulk_grid_value_updates[grid_value.get_identifier()] = entry
         else:
-            self.send_notification(
-                PowerGridNotification(
-                    notification_topic=PowerGridNotificationTopic.GRID_VALUES_UPDATED,
-                    notification_data={"grid_values": {
-                        grid_value.get_identifier(): entry
-                    }}
-                )
-            )
+            self._send_grid_value_updates({grid_value.get_identifier(): entry})
 
     def _flush_bulk_grid_value_updates_loop(self):
         while not self._termination_requested.is_set():
@@ -632,15 +808,66 @@ class PowerGridSimulator(PhysicalSimulator):
     def _flush_bulk_grid_value_updates(self):
         with self._bulk_grid_value_lock:
             if len(self._bulk_grid_value_updates) > 0:
-                self.send_notification(
-                    PowerGridNotification(
-                        notification_topic=PowerGridNotificationTopic.GRID_VALUES_UPDATED,
-                        notification_data={"grid_values": self._bulk_grid_value_updates}
-                    )
-                )
+                self._send_grid_value_updates(self._bulk_grid_value_updates)
             self._bulk_grid_value_updates = {}
 
+    def _send_grid_value_updates(self, grid_value_updates: Dict[str, Dict]):
+        # Clients without registered interests receive all updates. In case no such client exists, the
+        # PublishServer drops this notification without serializing it.
+        self.send_notification(
+            PowerGridNotification(
+                notification_topic=PowerGridNotificationTopic.GRID_VALUES_UPDATED,
+                notification_data={"grid_values": grid_value_updates}
+            )
+        )
+        with self._grid_value_interest_lock:
+            interest_groups = list(self._grid_value_interest_groups.values())
+        for interest_group in interest_groups:
+            filtered_updates = interest_group.filter(grid_value_updates)
+            if len(filtered_updates) == 0:
+                continue
+            notification = PowerGridNotification(
+                notification_topic=PowerGridNotificationTopic.GRID_VALUES_UPDATED,
+                notification_data={"grid_values": filtered_updates}
+            )
+            notification.recipients = sorted(interest_group.client_ids)
+            self.send_notification(notification)
+
+    def _set_grid_value_interests(self, client_id: str, grid_value_identifiers: List[str], patterns: List[str], clear: bool = False):
+        """
+        Registers the grid values the given client is interested in. Clients with identical interests are grouped, such
+        that each filtered update batch is only built once.
+
+        Args:
+            client_id (str):
+                The ID of the client.
+            grid_value_identifiers (List[str]):
+                The identifiers of the grid values of interest.
+            patterns (List[str]):
+                Glob patterns for further grid values of interest.
+            clear (bool, optional):
+                Whether to remove the client's interests, i.e., the client receives all updates again.
+                (Default value = False)
+        """
+        with self._grid_value_interest_lock:
+            previous_key = self._grid_value_interest_clients.pop(client_id, None)
+            if previous_key is not None:
+                previous_group = self._grid_value_interest_groups[previous_key]
+                previous_group.client_ids.discard(client_id)
+                if len(previous_group.client_ids) == 0:
+                    self._grid_value_interest_groups.pop(previous_key)
+            if clear:
+                return
+            key = GridValueInterestGroup.get_key(grid_value_identifiers, patterns)
+            interest_group = self._grid_value_interest_groups.get(key)
+            if interest_group is None:
+                interest_group = GridValueInterestGroup(grid_value_identifiers, patterns)
+                self._grid_value_interest_groups[key] = interest_group
+            interest_group.client_ids.add(client_id)
+            self._grid_value_interest_clients[client_id] = key
+
     def _on_value_state_change(self, grid_value: GridValue):
+        self._grid_representation_store.mark_changed(grid_value)
         self.send_notification(PowerGridNotification(
             notification_topic=PowerGridNotificationTopic.GRID_VALUE_STATE_CHANGED,
             notification_data={"grid_value": {
@@ -649,7 +876,19 @@ class PowerGridSimulator(PhysicalSimulator):
             }}
         ))
 
-    def _apply_profile_updates(self, updates: List[Dict]):
+    def _apply_profile_updates(self, updates: Union[ProfileUpdateBatch, List[Dict]]):
+        if isinstance(updates, ProfileUpdateBatch):
+            # All values of a profile step are applied before the next iteration is triggered
+            with self.batch_update():
+                for grid_value, value in zip(updates.grid_values, updates.values.tolist()):
+                    if math.isnan(value):
+                        continue
+                    try:
+                        grid_value.set_value(value)
+                    except Exception as e:
+                        self.logger.error(f"{e=}")
+                        self.logger.error(f"{traceback.format_exc()}")
+            return
         for update in updates:
             element = update.get("element", None)
             value_context = update.get("value_context", None)
@@ -4,29 +4,68 @@ import threading
 from pathlib import Path
 from typing import Optional
 
+from wattson.powergrid.simulator.grid_state_export import GridStateExportWriter
 from wattson.util.threading import set_thread_name
 from wattson.time import WattsonTime, WattsonTimeType
 from wattson.util import get_logger
 
 
 class ExportThread(threading.Thread):
+    """
+    Exports the grid state after simulation iterations.
+    By default, all states are appended to a columnar export (see GridStateExportWriter), which can be read with the
+    GridStateExportReader. The legacy "json" format writes one file per exported state.
+    """
     def __init__(self, export_path: Path, enable: bool = False,
-                 maximum_export_interval: float = 0.5):
+                 maximum_export_interval: Optional[float] = None,
+                 export_format: str = "columnar",
+                 row_group_size: int = 1000,
+                 flush_interval_seconds: float = 10):
+        """
+        Args:
+            export_path (Path):
+                The export directory.
+            enable (bool, optional):
+                Whether to enable the export.
+                (Default value = False)
+            maximum_export_interval (Optional[float], optional):
+                The minimum time between two exported states (in seconds). Defaults to 0.5 for the json format and
+                0 (i.e., all states are exported) for the columnar format.
+                (Default value = None)
+            export_format (str, optional):
+                The export format, either "columnar" or "json".
+                (Default value = "columnar")
+            row_group_size (int, optional):
+                The maximum number of states per row group of the columnar export.
+                (Default value = 1000)
+            flush_interval_seconds (float, optional):
+                The maximum time states are buffered before they are written to the columnar export.
+                (Default value = 10)
+        """
         super().__init__()
         self._export_path = export_path
         self._enable: bool = enable
         self._queue = queue.Queue()
         self._termination_requested: threading.Event = threading.Event()
         self._cancel_export: threading.Event = threading.Event()
+        if export_format not in ["columnar", "json"]:
+            raise ValueError(f"Unknown export format {export_format}")
+        self._export_format = export_format
+        if maximum_export_interval is None:
+            maximum_export_interval = 0.5 if export_format == "json" else 0
         self._maximum_export_interval: float = maximum_export_interval
+        self._row_group_size = row_group_size
+        self._flush_interval_seconds = flush_interval_seconds
+        self._writer: Optional[GridStateExportWriter] = None
         self._initial_configuration_applied_event: Optional[threading.Event] = None
         self.logger = get_logger("ExportThread", "ExportThread")
 
-    def export(self, timestamp: float, values: dict):
+    def export(self, timestamp: float, values: dict, sim_timestamp: Optional[float] = None):
         if not self._enable:
             return
         self._queue.put({
             "timestamp": timestamp,
+            "sim_timestamp": sim_timestamp,
             "values": values
         })
 
@@ -72,19 +111,39 @@ class ExportThread(threading.Thread):
             while not self._cancel_export.is_set() or self._queue.qsize() > 0:
                 try:
                     export_entry = self._queue.get(block=True, timeout=1)
+                    if self._cancel_export.is_set():
+                        # Discard the states that are still queued
+                        continue
                     timestamp = export_entry.get("timestamp")
                     if timestamp - last_timestamp < self._maximum_export_interval:
                         # Skip
                         continue
-                    filename = f"power_grid_{self._get_filename(timestamp)}.json"
                     last_timestamp = timestamp
-                    export_file = self._export_path.joinpath(filename)
-                    with export_file.open("w") as f:
-                        json.dump(export_entry, f)
+                    if self._export_format == "columnar":
+                        self._get_writer().append(timestamp, export_entry.get("sim_timestamp"), export_entry["values"])
+                    else:
+                        filename = f"power_grid_{self._get_filename(timestamp)}.json"
+                        export_file = self._export_path.joinpath(filename)
+                        with export_file.open("w") as f:
+                            json.dump(export_entry, f)
                 except queue.Empty:
                     break
                 if self._queue.qsize() > 10:
                     self.logger.warning(f"Can't keep up: Queue is potentially overflowing")
+            if self._writer is not None and self._writer.is_flush_required():
+                self._writer.flush()
+        # States already passed to the writer are always written
+        if self._writer is not None:
+            self._writer.close()
+
+    def _get_writer(self) -> GridStateExportWriter:
+        if self._writer is None:
+            self._writer = GridStateExportWriter(
+                export_path=self._export_path,
+                row_group_size=self._row_group_size,
+                flush_interval_seconds=self._flush_interval_seconds
+            )
+        return self._writer
 
     def _ensure_export_path(self) -> bool:
         if self._export_path.exists() and self._export_path.is_dir():
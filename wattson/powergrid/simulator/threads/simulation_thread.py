@@ -8,6 +8,7 @@ from powerowl.layers.powergrid.elements import GridElement
 from powerowl.layers.powergrid.values.grid_value import GridValue
 
 from wattson.powergrid.profiles.profile_provider import ProfileLoaderFactory
+from wattson.time import WattsonTime, DiscreteEventParticipant
 from wattson.util import get_logger
 
 
@@ -26,6 +27,7 @@ class SimulationThread(threading.Thread):
             on_value_state_change_callback: Optional[Callable[[GridValue], None]] = None,
             on_protection_equipment_triggered_callback: Optional[Callable[[GridElement, str], None]] = None,
             on_protection_equipment_cleared_callback: Optional[Callable[[GridElement, str], None]] = None,
+            iteration_lock: Optional[threading.RLock] = None,
 
             **kwargs
             ):
@@ -46,6 +48,8 @@ class SimulationThread(threading.Thread):
         else:
             self._iteration_required = threading.Event()
         self._interval = automatic_simulation_interval_seconds
+        # Held while simulating, i.e., batched updates can be applied atomically with respect to an iteration
+        self._iteration_lock = iteration_lock if iteration_lock is not None else threading.RLock()
         self._on_iteration_start_callback = on_iteration_start_callback
         self._on_iteration_sync_callback = on_iteration_sync_callback
         self._on_iteration_complete_callback = on_iteration_completed_callback
@@ -54,12 +58,30 @@ class SimulationThread(threading.Thread):
         self._on_value_state_change_callback = on_value_state_change_callback
         self._add_on_value_change_callbacks()
         self._last_run = 0
+        self._wattson_time: Optional[WattsonTime] = None
+        self._participant: Optional[DiscreteEventParticipant] = None
         self.ready_event = threading.Event()
         self._initial_configuration_applied_event: Optional[threading.Event] = None
         self.power_grid_model.prepare_simulator()
 
     def set_iteration_required(self):
         self._iteration_required.set()
+        if self._participant is not None:
+            self._participant.wake()
+
+    def set_wattson_time(self, wattson_time: WattsonTime):
+        """
+        Sets the WattsonTime that drives the automatic simulation interval. In the discrete-event mode, this thread
+        registers as a participant of the scheduler, i.e., simulated time only advances after required iterations
+        have been completed. Has to be called before starting the thread.
+
+        Args:
+            wattson_time (WattsonTime):
+                The WattsonTime to use.
+        """
+        self._wattson_time = wattson_time
+        # Power flow iterations follow other events (e.g., profile steps) of the same time
+        self._participant = wattson_time.register_participant("power-flow", priority=1)
 
     def _add_on_value_change_callbacks(self):
         for e_type in self.power_grid_model.elements.keys():
@@ -97,7 +119,7 @@ class SimulationThread(threading.Thread):
                 (Default value = None)
         """
         self._terminate_requested.set()
-        self._iteration_required.set()
+        self.set_iteration_required()
         self.join(timeout=timeout)
 
     def run(self) -> None:
@@ -122,7 +144,8 @@ class SimulationThread(threading.Thread):
             try:
                 self._on_iteration_start()
                 self.logger.debug("Starting power grid simulation iteration")
-                self.power_grid_model.simulate()
+                with self._iteration_lock:
+                    self.power_grid_model.simulate()
                 self.logger.debug("Done with power grid simulation iteration")
                 self._on_iteration_complete(True)
                 if not self.ready_event.is_set():
@@ -131,8 +154,17 @@ class SimulationThread(threading.Thread):
                 self.logger.error(e)
                 self.logger.error(traceback.format_exc())
                 self._on_iteration_complete(False)
-            self._iteration_required.wait(self._interval)
+            if self._participant is not None:
+                self._wattson_time.wait(self._interval * self._wattson_time.speed, participant=self._participant,
+                                        wake_event=self._iteration_required)
+                if self._participant.scheduler.is_finished():
+                    self.logger.info("Discrete-event run finished")
+                    break
+            else:
+                self._iteration_required.wait(self._interval)
             self._iteration_required.clear()
+        if self._participant is not None:
+            self._participant.unregister()
 
     def _on_iteration_complete(self, success: bool):
         if self._on_iteration_complete_callback is not None:
@@ -9,7 +9,7 @@ import queue
 import threading
 import time
 from pathlib import Path
-from typing import Callable, Optional, List, Dict, Any
+from typing import Callable, Optional, List, Dict, Any, Tuple
 
 from powerowl.layers.network.configuration.protocols.iec61850.mms_trigger_options import MMSTriggerOptions
 from powerowl.layers.powergrid import PowerGridModel
@@ -40,12 +40,20 @@ class GridWrapper:
         if kwargs.get("disable_estimation_sources", False):
             self._clear_source_values(GridValueContext.ESTIMATION)
 
-        self.data_points = datapoints
         self.logger = logger
         if self.logger is None:
             self.logger = get_logger("GridWrapper")
         self.lock = threading.Lock()
-        self._dp_cache = {}
+        # Data point indexes, built once for the given data points
+        self._dp_index_lock = threading.RLock()
+        self._dp_index: Dict[str, dict] = {}
+        self._iec104_index: Dict[Tuple[Any, Any], dict] = {}
+        self._iec61850mms_index: Dict[Tuple[Any, Any], dict] = {}
+        self._modbus_index: Dict[Tuple[Any, Any, Any, Any], dict] = {}
+        self._element_dp_index: Dict[str, List[dict]] = {}
+        self._dp_grid_value_index: Dict[str, Tuple[dict, List[GridValue]]] = {}
+        self._data_points: Dict[str, List[dict]] = {}
+        self.data_points = datapoints
         self._export_folder = None
         self._export_interval = 1
         self._stop_export_event = threading.Event()
@@ -119,57 +127,119 @@ class GridWrapper:
             for _, grid_value in grid_element.get_grid_values(context=context):
                 grid_value.source = None
 
+    @property
+    def data_points(self) -> Dict[str, List[dict]]:
+        return self._data_points
+
+    @data_points.setter
+    def data_points(self, data_points: Dict[str, List[dict]]):
+        self._data_points = data_points if data_points is not None else {}
+        self.rebuild_data_point_indexes()
+
+    def add_data_point(self, host: str, data_point: dict):
+        """
+        Adds a data point for the given host and updates the data point indexes.
+
+        Args:
+            host (str):
+                The host the data point belongs to
+            data_point (dict):
+                The data point
+        """
+        with self._dp_index_lock:
+            self._data_points.setdefault(host, []).append(data_point)
+            self._index_data_point(data_point)
+
+    def remove_data_point(self, identifier: str) -> bool:
+        """
+        Removes all data points with the given identifier and updates the data point indexes.
+
+        Args:
+            identifier (str):
+                The data point identifier
+
+        Returns:
+            bool: Whether any data point has been removed.
+        """
+        with self._dp_index_lock:
+            removed = False
+            for host, data_points in self._data_points.items():
+                remaining = [dp for dp in data_points if dp["identifier"] != identifier]
+                if len(remaining) != len(data_points):
+                    self._data_points[host] = remaining
+                    removed = True
+            if removed:
+                self.rebuild_data_point_indexes()
+            return removed
+
+    def rebuild_data_point_indexes(self):
+        """
+        Rebuilds all data point indexes. Has to be called when data points are modified in place.
+        """
+        with self._dp_index_lock:
+            self._dp_index = {}
+            self._iec104_index = {}
+            self._iec61850mms_index = {}
+            self._modbus_index = {}
+            self._element_dp_index = {}
+            self._dp_grid_value_index = {}
+            for host, data_points in self._data_points.items():
+                for data_point in data_points:
+                    self._index_data_point(data_point)
+
+    def _index_data_point(self, data_point: dict):
+        # For duplicate keys, the first data point is kept (as with a linear search)
+        identifier = data_point["identifier"]
+        self._dp_index.setdefault(identifier, data_point)
+        protocol = data_point.get("protocol")
+        protocol_data = data_point.get("protocol_data")
+        try:
+            if protocol == CCXProtocol.IEC104:
+                self._iec104_index.setdefault((protocol_data["coa"], protocol_data["ioa"]), data_point)
+            elif protocol == CCXProtocol.IEC61850_MMS:
+                self._iec61850mms_index.setdefault((protocol_data["server"], protocol_data["mms_path"]), data_point)
+            elif protocol == "MODBUS/TCP":
+                key = (data_point.get("protocol_server_id"), protocol_data["unit_id"], protocol_data["table"], protocol_data["address"])
+                self._modbus_index.setdefault(key, data_point)
+        except (KeyError, TypeError) as e:
+            self.logger.warning(f"Invalid protocol data for data point {identifier}: {e=}")
+
+        element_identifiers = set()
+        for direction in ["targets", "sources"]:
+            provider = self._get_power_grid_provider(data_point, direction)
+            if provider is not None:
+                element_identifiers.add(provider["grid_element"])
+        for element_identifier in element_identifiers:
+            element_data_points = self._element_dp_index.setdefault(element_identifier, [])
+            if not any(dp["identifier"] == identifier for dp in element_data_points):
+                element_data_points.append(data_point)
+
+        if identifier not in self._dp_grid_value_index:
+            try:
+                self._dp_grid_value_index[identifier] = (data_point, self._resolve_grid_values_for_data_point(data_point))
+            except Exception:
+                # Unresolvable grid values are reported when the data point is used
+                pass
+
     def get_data_point(self, identifier: str):
-        if identifier in self._dp_cache:
-            return self._dp_cache[identifier]
-        for host, data_points in self.data_points.items():
-            for data_point in data_points:
-                if data_point["identifier"] == identifier:
-                    self._dp_cache[identifier] = data_point
-                    return data_point
-        return None
+        return self._dp_index.get(identifier)
 
     def get_iec61850mms_data_point(self, server_id, mms_path):
-        key = f"{CCXProtocol.IEC61850_MMS.name}-{server_id}-{mms_path}"
-        if key in self._dp_cache:
-            return self._dp_cache[key]
-        for host, dps in self.data_points.items():
-            for dp in dps:
-                if dp.get("protocol") == CCXProtocol.IEC61850_MMS:
-                    if dp["protocol_data"]["server"] == server_id and dp["protocol_data"]["mms_path"] == mms_path:
-                        self._dp_cache[key] = dp
-                        return dp
-        return None
+        return self._iec61850mms_index.get((server_id, mms_path))
 
     def get_iec104_data_point(self, coa, ioa):
-        key = f"IEC104.{coa}.{ioa}"
-        if key in self._dp_cache:
-            return self._dp_cache[key]
-        for host, dps in self.data_points.items():
-            for dp in dps:
-                info = self.get_104_info(dp)
-                if info is not None:
-                    if info["coa"] == coa and info["ioa"] == ioa:
-                        self._dp_cache[key] = dp
-                        return dp
-        return None
+        return self._iec104_index.get((coa, ioa))
 
     def get_modbus_data_point(self, device: str, unit_id: int, table: str, address: int):
-        key = f"Modbus.{device}.{unit_id}.{table}.{address}"
-        if key in self._dp_cache:
-            return self._dp_cache[key]
-        for host, dps in self.data_points.items():
-            for dp in dps:
-                if dp.get("protocol") != "MODBUS/TCP":
-                    continue
-                server_id = dp.get("protocol_server_id")
-                pd = dp.get("protocol_data")
-                if server_id == device and pd["unit_id"] == unit_id and pd["table"] == table and pd["address"] == address:
-                    self._dp_cache[key] = dp
-                    return dp
-        return None
+        return self._modbus_index.get((device, unit_id, table, address))
 
     def get_grid_values_for_data_point(self, data_point) -> List[GridValue]:
+        entry = self._dp_grid_value_index.get(data_point.get("identifier"))
+        if entry is not None and entry[0] is data_point:
+            return list(entry[1])
+        return self._resolve_grid_values_for_data_point(data_point)
+
+    def _resolve_grid_values_for_data_point(self, data_point) -> List[GridValue]:
         grid_values = []
         providers = data_point.get("providers", {})
         sources = providers.get("sources", [])
@@ -748,21 +818,7 @@ class GridWrapper:
         Returns:
             list: A list of datapoints
         """
-        result = []
-        identifiers = set()
-        for device, dps in self.data_points.items():
-            for dp in dps:
-                control_provider = self._get_power_grid_provider(dp, "targets")
-                monitoring_provider = self._get_power_grid_provider(dp, "sources")
-                for p in [control_provider, monitoring_provider]:
-                    if p is None:
-                        continue
-                    if grid_element.get_identifier() == p["grid_element"]:
-                        if dp["identifier"] not in identifiers:
-                            result.append(dp)
-                            identifiers.add(dp["identifier"])
-                        break
-        return result
+        return list(self._element_dp_index.get(grid_element.get_identifier(), []))
 
     def get_data_points_for_grid_value(self, grid_value: GridValue) -> List[dict]:
         """
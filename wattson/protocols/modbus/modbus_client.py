@@ -1,5 +1,6 @@
 import asyncio
 import concurrent
+import resource
 import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, Future
@@ -22,6 +23,8 @@ from wattson.protocols.modbus.model.modbus_table import ModbusTable
 from wattson.protocols.modbus.model.modbus_unit_client import ModbusUnitClient
 from wattson.protocols.modbus.model.modbus_value_definition import ModbusValueDefinition
 from wattson.protocols.modbus.model.modbus_value_type import ModbusValueType
+from wattson.protocols.modbus.util.modbus_event_loop_pool import ModbusEventLoopPool
+from wattson.protocols.modbus.util.modbus_read_planner import ModbusReadPlanner, ModbusReadBlock
 from wattson.protocols.modbus.util.periodic_task import PeriodicTask
 from wattson.util import get_logger
 from wattson.util.threading import set_thread_name
@@ -39,8 +42,23 @@ class ModbusClient(threading.Thread):
     - Zero-based and one-based addressing for each Unit (defaults to zero-based-addressing)
     - Object-oriented data point wrappers (ModbusValueDefinition)
     - Object-oriented Data Unit Clients (ModbusUnitClient)
+    - Coalescing of periodic reads of adjacent registers and coils into range reads (ModbusReadPlanner)
+    - Optionally, all connections and periodic polling share the event loops of a ModbusEventLoopPool
     """
-    def __init__(self, server_data: Dict[str, dict], logger: Optional[Logger] = None):
+    def __init__(self, server_data: Dict[str, dict], logger: Optional[Logger] = None,
+                 coalesce_reads: bool = True, read_gap_tolerance: int = 0,
+                 shared_event_loop: bool = False, event_loop_pool: Optional[ModbusEventLoopPool] = None):
+        """
+        Args:
+            server_data: The connection details (ip, port) by server ID.
+            logger: An optional logger to use.
+            coalesce_reads: Whether to merge periodic reads of adjacent values into range reads.
+            read_gap_tolerance: The maximum number of unused registers / coils between two values that are read
+                with the same request.
+            shared_event_loop: Whether to run all connections and periodic polling on the event loops of a
+                ModbusEventLoopPool instead of dedicated threads and event loops per server.
+            event_loop_pool: The pool to use in the shared event loop mode. Defaults to the process-wide pool.
+        """
         super(ModbusClient, self).__init__()
         self.logger = logger
         if self.logger is None:
@@ -60,8 +78,19 @@ class ModbusClient(threading.Thread):
         self._client_threads: Dict[str, threading.Thread] = {}
         self._client_loops: Dict[str, asyncio.AbstractEventLoop] = {}
         self._periodic_loops: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+        self._shared_periodic_futures: List[Future] = []
         self._client_periodic_threads: Dict[str, threading.Thread] = {}
         self._connected_events: Dict[str, threading.Event] = {}
+        self._coalesce_reads = coalesce_reads
+        self._read_planner = ModbusReadPlanner(gap_tolerance=read_gap_tolerance)
+        # Key: Server ID
+        self._periodic_read_blocks: Dict[str, List[ModbusReadBlock]] = {}
+        self._shared_event_loop = shared_event_loop or event_loop_pool is not None
+        self._event_loop_pool: Optional[ModbusEventLoopPool] = None
+        if self._shared_event_loop:
+            self._event_loop_pool = event_loop_pool or ModbusEventLoopPool.get_shared()
+        self._poll_statistics_lock = threading.Lock()
+        self._poll_statistics = {"count": 0, "total_latency": 0.0, "max_latency": 0.0}
 
         self._stop_requested = threading.Event()
         # High level callbacks
@@ -198,6 +227,18 @@ class ModbusClient(threading.Thread):
         for server_id, device_client in self._servers.items():
             self.logger.info(f"Creating Client for {server_id} ({device_client.server_address}:{device_client.server_port})")
             self._connected_events[server_id] = threading.Event()
+            if self._shared_event_loop:
+                loop = self._event_loop_pool.acquire()
+                self._client_loops[server_id] = loop
+                asyncio.run_coroutine_threadsafe(self._run_client(server_id), loop)
+                if enable_polling:
+                    event = asyncio.Event()
+                    self._periodic_loops.append((loop, event))
+                    periodic_tasks = self._create_periodic_tasks(server_id)
+                    self._shared_periodic_futures.append(
+                        asyncio.run_coroutine_threadsafe(self._run_periodic_tasks(periodic_tasks, event), loop)
+                    )
+                continue
             thread = threading.Thread(target=self._client_thread, args=(server_id, do_general_interrogation))
             thread.start()
             self._client_threads[server_id] = thread
@@ -259,6 +300,19 @@ class ModbusClient(threading.Thread):
         self._stop_requested.set()
         for loop, event in self._periodic_loops:
             loop.call_soon_threadsafe(event.set)
+        if self._shared_event_loop:
+            for future in self._shared_periodic_futures:
+                try:
+                    future.result(timeout=timeout)
+                except Exception as e:
+                    self.logger.error(f"Failed to stop periodic tasks: {e}")
+            for server_id, loop in self._client_loops.items():
+                client = self._pymodbus_clients.get(server_id)
+                if client is not None:
+                    self.logger.info(f"Stopping Client for {server_id}")
+                    loop.call_soon_threadsafe(client.close)
+                self._event_loop_pool.release(loop)
+            return
         for thread in self._client_periodic_threads.values():
             if thread.is_alive():
                 thread.join(timeout=timeout)
@@ -312,53 +366,56 @@ class ModbusClient(threading.Thread):
         """
         To be run in a distinct thread for handling a single server connection.
         """
-        device_client = self._servers[server_id]
-
         set_thread_name(f"W/MB/C/{server_id}")
 
-        async def run_client():
-            def _trace_pdu(sent, pdu):
-                if sent:
-                    self._trigger_on_send_pdu(device_client, pdu)
-                else:
-                    self._trigger_on_receive_pdu(device_client, pdu)
-                return pdu
-
-            def _trace_connect(connected: bool):
-                self._trigger_on_connection_change(device_client, connected)
-
-            client = AsyncPyModbusTcpClient(
-                device_client.server_address,
-                port=device_client.server_port,
-                reconnect_delay=1,
-                reconnect_delay_max=10,
-                trace_pdu=_trace_pdu,
-                trace_connect=_trace_connect
-            )
-            self._pymodbus_clients[server_id] = client
-            # Initialize connection status
-            self._trigger_on_connection_change(device_client, False)
-            while not self._stop_requested.is_set():
-                try:
-                    self.logger.info(f"Connecting to {server_id} ({device_client.server_address}:{device_client.server_port})")
-                    await client.connect()
-                    if client.connected:
-                        break
-                    self.logger.warning(f"Could not connect to server {server_id} ({device_client.server_address}:{device_client.server_port})")
-                    await asyncio.sleep(1)
-                except Exception as e:
-                    self.logger.error(f"Failed to connect to server {server_id}: {e}")
-                    continue
-            self._connected_events[server_id].set()
-            self.logger.info(f"Connected to server {server_id} ({device_client.server_address}:{device_client.server_port})")
-
         loop = asyncio.new_event_loop()
         loop.set_debug(True)
         self._client_loops[server_id] = loop
         asyncio.set_event_loop(loop)
-        loop.run_until_complete(run_client())
+        loop.run_until_complete(self._run_client(server_id))
         loop.run_forever()
-        # asyncio.run(run_client(), debug=True)
+        # asyncio.run(self._run_client(server_id), debug=True)
+
+    async def _run_client(self, server_id: str):
+        """
+        Creates the client for the given server and connects to it.
+        """
+        device_client = self._servers[server_id]
+
+        def _trace_pdu(sent, pdu):
+            if sent:
+                self._trigger_on_send_pdu(device_client, pdu)
+            else:
+                self._trigger_on_receive_pdu(device_client, pdu)
+            return pdu
+
+        def _trace_connect(connected: bool):
+            self._trigger_on_connection_change(device_client, connected)
+
+        client = AsyncPyModbusTcpClient(
+            device_client.server_address,
+            port=device_client.server_port,
+            reconnect_delay=1,
+            reconnect_delay_max=10,
+            trace_pdu=_trace_pdu,
+            trace_connect=_trace_connect
+        )
+        self._pymodbus_clients[server_id] = client
+        # Initialize connection status
+        self._trigger_on_connection_change(device_client, False)
+        while not self._stop_requested.is_set():
+            try:
+                self.logger.info(f"Connecting to {server_id} ({device_client.server_address}:{device_client.server_port})")
+                await client.connect()
+                if client.connected:
+                    break
+                self.logger.warning(f"Could not connect to server {server_id} ({device_client.server_address}:{device_client.server_port})")
+                await asyncio.sleep(1)
+            except Exception as e:
+                self.logger.error(f"Failed to connect to server {server_id}: {e}")
+                continue
+        self._connected_events[server_id].set()
+        self.logger.info(f"Connected to server {server_id} ({device_client.server_address}:{device_client.server_port})")
 
     ###
     ### PERIODIC POLLING
@@ -371,29 +428,127 @@ class ModbusClient(threading.Thread):
         loop = asyncio.new_event_loop()
         event = asyncio.Event()
         self._periodic_loops.append((loop, event))
+        periodic_tasks = self._create_periodic_tasks(server_id)
+        loop.run_until_complete(self._run_periodic_tasks(periodic_tasks, event))
+
+    def _create_periodic_tasks(self, server_id: str) -> Dict[str, PeriodicTask]:
+        """
+        Creates the periodic tasks for polling the values of the given server.
+        In the shared event loop mode, the tasks read asynchronously on the client's event loop.
+        """
         periodic_tasks = {}
         device_client = self._servers[server_id]
-        for unit_id, unit_client in device_client.units.items():
-            for value_definition in unit_client.get_value_definition_list():
-                if value_definition.periodicity is not None:
-                    logger = self.logger.getChild(f"Periodic-{value_definition.data_point_identifier}")
-                    periodic_task = PeriodicTask(period_seconds=value_definition.periodicity,
-                                                 callback=self._periodic_read,
-                                                 callback_args=[value_definition],
-                                                 logger=logger)
-                    periodic_tasks[value_definition.data_point_identifier] = periodic_task
-
-        async def start_periodic_tasks():
-            for _periodic_task in periodic_tasks.values():
-                await _periodic_task.start()
-            await event.wait()
-            for _periodic_task in periodic_tasks.values():
-                await _periodic_task.stop()
-        loop.run_until_complete(start_periodic_tasks())
+        periodic_values = [value_definition for value_definition in device_client.get_value_definitions()
+                           if value_definition.periodicity is not None]
+        if self._coalesce_reads:
+            blocks = self._read_planner.plan(periodic_values)
+            self._periodic_read_blocks[server_id] = blocks
+            for period, statistics in ModbusReadPlanner.get_statistics(blocks).items():
+                self.logger.info(f"Polling {statistics['values']} values of {server_id} every {period}s with "
+                                 f"{statistics['requests']} requests ({statistics['requests_saved']} requests saved per cycle)")
+            for i, block in enumerate(blocks):
+                logger = self.logger.getChild(f"Periodic-{block.unit_id}-{block.modbus_table.short_value}-{block.start_address}")
+                periodic_tasks[f"block-{i}"] = PeriodicTask(
+                    period_seconds=block.periodicity,
+                    callback=self._periodic_read_block_async if self._shared_event_loop else self._periodic_read_block,
+                    callback_args=[block],
+                    logger=logger
+                )
+        else:
+            for value_definition in periodic_values:
+                logger = self.logger.getChild(f"Periodic-{value_definition.data_point_identifier}")
+                periodic_task = PeriodicTask(
+                    period_seconds=value_definition.periodicity,
+                    callback=self._periodic_read_async if self._shared_event_loop else self._periodic_read,
+                    callback_args=[value_definition],
+                    logger=logger
+                )
+                periodic_tasks[value_definition.data_point_identifier] = periodic_task
+        return periodic_tasks
+
+    @staticmethod
+    async def _run_periodic_tasks(periodic_tasks: Dict[str, PeriodicTask], event: asyncio.Event):
+        for _periodic_task in periodic_tasks.values():
+            await _periodic_task.start()
+        await event.wait()
+        for _periodic_task in periodic_tasks.values():
+            await _periodic_task.stop()
 
     def _periodic_read(self, value_definition: ModbusClientValueDefinition):
         self.logger.debug(f"Periodic reading for {value_definition.data_point_identifier}")
+        start = time.perf_counter()
         value_definition.read_raw(global_notify_read_done=False)
+        self._record_poll_latency(time.perf_counter() - start)
+
+    async def _periodic_read_async(self, value_definition: ModbusClientValueDefinition):
+        self.logger.debug(f"Periodic reading for {value_definition.data_point_identifier}")
+        start = time.perf_counter()
+        data = await self._read_from_table_async(
+            value_definition.unit_client.device_client.server_id, value_definition.modbus_table,
+            value_definition.get_relative_address(), value_definition.register_width, value_definition.unit_id
+        )
+        self._record_poll_latency(time.perf_counter() - start)
+        if data is not None:
+            value_definition.set_value(value_definition.decode_value(data))
+
+    def _periodic_read_block(self, block: ModbusReadBlock):
+        self.logger.debug(f"Periodic reading for {block.modbus_table.name} {block.start_address} (length {block.count}) "
+                          f"covering {len(block.value_definitions)} values")
+        start = time.perf_counter()
+        data = self.read_from_table(block.server_id, block.modbus_table, block.start_address, block.count,
+                                    block.unit_id, trim=True, error_as_none=True)
+        self._record_poll_latency(time.perf_counter() - start)
+        self._apply_block_data(block, data)
+
+    async def _periodic_read_block_async(self, block: ModbusReadBlock):
+        self.logger.debug(f"Periodic reading for {block.modbus_table.name} {block.start_address} (length {block.count}) "
+                          f"covering {len(block.value_definitions)} values")
+        start = time.perf_counter()
+        data = await self._read_from_table_async(block.server_id, block.modbus_table, block.start_address, block.count,
+                                                 block.unit_id)
+        self._record_poll_latency(time.perf_counter() - start)
+        self._apply_block_data(block, data)
+
+    def _apply_block_data(self, block: ModbusReadBlock, data: List[int] | List[bool] | None):
+        if data is None:
+            self.logger.debug(f"Failed to read {block.modbus_table.name} {block.start_address} (length {block.count})")
+            return
+        for value_definition, values in block.split_values(data):
+            try:
+                value_definition.set_value(value_definition.decode_value(values))
+            except Exception as e:
+                self.logger.debug(f"Failed to decode {value_definition.data_point_identifier}: {e}")
+
+    def _record_poll_latency(self, latency: float):
+        with self._poll_statistics_lock:
+            self._poll_statistics["count"] += 1
+            self._poll_statistics["total_latency"] += latency
+            self._poll_statistics["max_latency"] = max(self._poll_statistics["max_latency"], latency)
+
+    def get_runtime_statistics(self) -> dict:
+        """
+        Returns runtime measurements of this client and its process, i.e., the number of threads of the process,
+        the voluntary and involuntary context switches of the process and the latency of periodic reads (in seconds).
+        """
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        with self._poll_statistics_lock:
+            poll_count = self._poll_statistics["count"]
+            return {
+                "shared_event_loop": self._shared_event_loop,
+                "thread_count": threading.active_count(),
+                "voluntary_context_switches": usage.ru_nvcsw,
+                "involuntary_context_switches": usage.ru_nivcsw,
+                "poll_count": poll_count,
+                "poll_latency_mean": self._poll_statistics["total_latency"] / poll_count if poll_count > 0 else None,
+                "poll_latency_max": self._poll_statistics["max_latency"] if poll_count > 0 else None,
+            }
+
+    def get_read_plan_statistics(self) -> Dict[str, Dict[Optional[float], dict]]:
+        """
+        Returns the number of polled values, issued requests and saved requests per polling cycle
+        for each server and polling periodicity.
+        """
+        return {server_id: ModbusReadPlanner.get_statistics(blocks) for server_id, blocks in self._periodic_read_blocks.items()}
 
     ###
     ### READ DATA POINTS AND REGISTERS
@@ -401,6 +556,9 @@ class ModbusClient(threading.Thread):
     def _read_from_table_future(
             self, server_id: str, modbus_table: ModbusTable, address: int, count: int, unit_id: int, trim: bool = True) -> Future:
         loop = self.get_client_loop(server_id)
+        return asyncio.run_coroutine_threadsafe(self._read_from_table_coroutine(server_id, modbus_table, address, count, unit_id), loop)
+
+    def _read_from_table_coroutine(self, server_id: str, modbus_table: ModbusTable, address: int, count: int, unit_id: int) -> Awaitable[ModbusPDU]:
         client = self._pymodbus_clients.get(server_id)
         relative_address = address
         match modbus_table:
@@ -414,7 +572,33 @@ class ModbusClient(threading.Thread):
                 a_data = client.read_holding_registers(address=relative_address, count=count, device_id=unit_id)
             case _:
                 raise ModbusError(f"Cannot read value - invalid table {modbus_table.name}")
-        return asyncio.run_coroutine_threadsafe(a_data, loop)
+        return a_data
+
+    async def _read_from_table_async(self, server_id: str, modbus_table: ModbusTable, address: int, count: int,
+                                     unit_id: int) -> List[int] | List[bool] | None:
+        """
+        Reads the specified address range from the server. Has to be awaited on the server's client event loop.
+        Returns:
+            The values of the queried registers (int) or coils (bool) or None if the read failed.
+        """
+        try:
+            pdu = await self._read_from_table_coroutine(server_id, modbus_table, address, count, unit_id)
+        except Exception as e:
+            self.logger.debug(f"Error reading from {modbus_table.name} {address}: {e}")
+            return None
+        if pdu.isError():
+            return None
+        if modbus_table.is_register():
+            return pdu.registers
+        return pdu.bits[:count]
+
+    def _ensure_not_in_event_loop(self, server_id: str):
+        """
+        Blocking calls cannot be served from within the event loop that has to process the request.
+        """
+        loop = self._client_loops.get(server_id)
+        if loop is not None and loop.is_running() and self._event_loop_pool is not None and self._event_loop_pool.is_loop_thread(loop):
+            raise ModbusError("Blocking Modbus calls are not allowed from within the shared event loop")
 
     def read_from_table(self, server_id: str, modbus_table: ModbusTable, address: int, count: int,
                         unit_id: int, trim: bool = True, error_as_none: bool = True) -> List[int] | List[bool] | None:
@@ -437,6 +621,7 @@ class ModbusClient(threading.Thread):
             ModbusResponseError: If the server indicates an error.
         """
         try:
+            self._ensure_not_in_event_loop(server_id)
             future = self._read_from_table_future(server_id, modbus_table, address, count, unit_id, trim)
         except Exception as e:
             if error_as_none:
@@ -482,6 +667,9 @@ class ModbusClient(threading.Thread):
             ModbusError: If an error occurs during reading.
             ModbusResponseError: If the server indicates an error.
         """
+        value_definition = self._value_definition_by_data_point.get(data_point_identifier)
+        if value_definition is not None:
+            self._ensure_not_in_event_loop(value_definition.unit_client.device_client.server_id)
         event: threading.Event = threading.Event()
         success = False
         error_code = None
@@ -661,6 +849,9 @@ class ModbusClient(threading.Thread):
         """
         success: bool = False
         callback_done: threading.Event = threading.Event()
+        value_definition = self._value_definition_by_data_point.get(data_point_identifier)
+        if value_definition is not None:
+            self._ensure_not_in_event_loop(value_definition.unit_client.device_client.server_id)
 
         def callback(_value_definition: ModbusValueDefinition, _success: bool, _error_code: Optional[int], _values: List[int] | List[bool], _value: ModbusValueType):
             nonlocal success
@@ -692,6 +883,9 @@ class ModbusClient(threading.Thread):
         """
         success: bool = False
         callback_done: threading.Event = threading.Event()
+        value_definition = self._value_definition_by_data_point.get(data_point_identifier)
+        if value_definition is not None:
+            self._ensure_not_in_event_loop(value_definition.unit_client.device_client.server_id)
 
         def callback(_value_definition, _success, _error_code, _values, _value):
             nonlocal success
@@ -11,6 +11,7 @@ from pymodbus.pdu import ModbusPDU
 from pymodbus.server import ServerStop, ModbusTcpServer
 
 from powerowl.layers.network.configuration.protocols.protocol_name import ProtocolName
+from wattson.protocols.modbus.model.array_modbus_unit_memory import ArrayModbusUnitMemory
 from wattson.protocols.modbus.model.modbus_data_block import ModbusDataBlock
 from wattson.protocols.modbus.model.modbus_endian import ModbusEndian
 from wattson.protocols.modbus.model.modbus_server_value_definition import ModbusServerValueDefinition
@@ -18,6 +19,7 @@ from wattson.protocols.modbus.model.modbus_table import ModbusTable
 from wattson.protocols.modbus.model.modbus_unit_memory import ModbusUnitMemory
 from wattson.protocols.modbus.model.modbus_value_definition import ModbusValueDefinition
 from wattson.protocols.modbus.model.modbus_value_type import ModbusValueType
+from wattson.protocols.modbus.util.modbus_event_loop_pool import ModbusEventLoopPool
 from wattson.util import get_logger
 from wattson.util.threading import set_thread_name
 
@@ -28,8 +30,24 @@ class ModbusServer(threading.Thread):
                  bind_port: int = 502,
                  device_id: str = None,
                  zero_based: bool = True,
-                 logger: Optional[Logger] = None
+                 logger: Optional[Logger] = None,
+                 shared_event_loop: bool = False,
+                 event_loop_pool: Optional[ModbusEventLoopPool] = None,
+                 array_memory: bool = False
                  ):
+        """
+        Args:
+            bind_ip: The IP to bind the server to.
+            bind_port: The port to bind the server to.
+            device_id: The ID of the device this server belongs to.
+            zero_based: Whether the server uses zero-based addressing.
+            logger: An optional logger to use.
+            shared_event_loop: Whether to run the server on an event loop of a ModbusEventLoopPool instead of a
+                dedicated thread. In this mode, the thread itself is not started.
+            event_loop_pool: The pool to use in the shared event loop mode. Defaults to the process-wide pool.
+            array_memory: Whether to store the units' registers and coils in array segments (ArrayModbusUnitMemory)
+                instead of dicts.
+        """
         super(ModbusServer, self).__init__()
 
         self.bind_ip = bind_ip
@@ -55,6 +73,7 @@ class ModbusServer(threading.Thread):
         self._value_definitions: Dict[str, ModbusServerValueDefinition] = {}
 
         self.unit_memories: Dict[int, ModbusUnitMemory] = {}
+        self._memory_class = ArrayModbusUnitMemory if array_memory else ModbusUnitMemory
 
         self._known_connections: Dict[str, Tuple[str, int]] = {}
         self._connection_id_by_peer_info: Dict[Tuple[str, int], str] = {}
@@ -69,6 +88,10 @@ class ModbusServer(threading.Thread):
         self.pymodbus_server: Optional[ModbusTcpServer] = None
         self.coroutine: Optional[asyncio.Future] = None
         self._shutdown_requested = threading.Event()
+        self._event_loop_pool: Optional[ModbusEventLoopPool] = None
+        if shared_event_loop or event_loop_pool is not None:
+            self._event_loop_pool = event_loop_pool or ModbusEventLoopPool.get_shared()
+        self._shared_loop: Optional[asyncio.AbstractEventLoop] = None
 
     def set_on_client_connect(self, on_client_connect: Callable[[str, int], bool]):
         self._on_client_connect = on_client_connect
@@ -153,6 +176,10 @@ class ModbusServer(threading.Thread):
                 "MajorMinorRevision": "1.0"
             }
         )
+        if self._event_loop_pool is not None:
+            self._shared_loop = self._event_loop_pool.acquire()
+            self.coroutine = asyncio.run_coroutine_threadsafe(self.run_async_server(), self._shared_loop)
+            return
         super().start()
 
     def run(self):
@@ -176,6 +203,17 @@ class ModbusServer(threading.Thread):
 
     def stop(self):
         self._shutdown_requested.set()
+        if self._shared_loop is not None:
+            # ServerStop only addresses the most recently started server, which is ambiguous with a shared loop
+            if self.pymodbus_server is not None:
+                future = asyncio.run_coroutine_threadsafe(self.pymodbus_server.shutdown(), self._shared_loop)
+                try:
+                    future.result(timeout=10)
+                except Exception as e:
+                    self.logger.error(f"Failed to stop server: {e}")
+            self._event_loop_pool.release(self._shared_loop)
+            self._shared_loop = None
+            return
         try:
             ServerStop()
         except RuntimeError:
@@ -198,7 +236,7 @@ class ModbusServer(threading.Thread):
             self.data_point_dict[identifier] = data_point
             self.data_points_by_unit.setdefault(unit_id, {})[identifier] = data_point
             if unit_id not in self.unit_memories:
-                self.unit_memories[unit_id] = ModbusUnitMemory(
+                self.unit_memories[unit_id] = self._memory_class(
                     unit_id,
                     on_before_read_callback=self._trigger_on_before_read,
                     on_before_write_callback=self._trigger_on_before_write,
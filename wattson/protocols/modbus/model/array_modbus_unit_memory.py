@@ -0,0 +1,297 @@
+import array
+import bisect
+from logging import Logger
+from typing import Dict, List, Optional, Tuple
+
+from wattson.protocols.modbus.model.callbacks import ModbusOnValueReadCallback, ModbusOnValueWriteCallback, ModbusOnUnmappedReadCallback, \
+    ModbusOnUnmappedWriteCallback, ModbusOnBeforeValueWriteCallback
+from wattson.protocols.modbus.model.modbus_server_value_definition import ModbusServerValueDefinition
+from wattson.protocols.modbus.model.modbus_table import ModbusTable
+from wattson.protocols.modbus.model.modbus_unit_memory import ModbusUnitMemory
+from wattson.protocols.modbus.model.modbus_value_definition import ModbusValueDefinition
+
+
+class MemorySegment:
+    """
+    A contiguous, preallocated block of registers (array of unsigned 16-bit integers) or coils (bytearray of 0 / 1).
+    """
+    def __init__(self, start_address: int, count: int, is_register: bool):
+        self.start_address = start_address
+        self.is_register = is_register
+        self.data = self._allocate(count)
+
+    @property
+    def count(self) -> int:
+        return len(self.data)
+
+    @property
+    def end_address(self) -> int:
+        return self.start_address + len(self.data) - 1
+
+    def _allocate(self, count: int) -> array.array | bytearray:
+        return array.array("H", bytes(2 * count)) if self.is_register else bytearray(count)
+
+    def extend(self, start_address: int, end_address: int):
+        """
+        Grows this segment to cover the given address range.
+        The data is reallocated (rather than resized in place), so views on the previous data remain valid.
+        """
+        prefix = max(0, self.start_address - start_address)
+        suffix = max(0, end_address - self.end_address)
+        self.data = self._allocate(prefix) + self.data + self._allocate(suffix)
+        self.start_address -= prefix
+
+
+class SegmentedTable:
+    """
+    Sparse storage for the registers or coils of a unit.
+    Addresses are stored in sorted, non-overlapping segments. Segments that are less than segment_gap addresses apart
+    are merged, i.e., densely used address ranges are stored in a single segment, while distant ranges do not
+    allocate the memory in between. Addresses outside any segment read as 0 / False.
+    """
+    def __init__(self, is_register: bool, segment_gap: int = 64):
+        self.is_register = is_register
+        self.segment_gap = segment_gap
+        self._starts: List[int] = []
+        self._segments: List[MemorySegment] = []
+
+    def reserve(self, start_address: int, count: int) -> MemorySegment:
+        """
+        Ensures that the given address range is backed by a single segment and returns this segment.
+        """
+        end_address = start_address + count - 1
+        # Segments that overlap or are close to the requested range
+        lo = bisect.bisect_right(self._starts, start_address) - 1
+        if lo < 0 or self._segments[lo].end_address + self.segment_gap < start_address:
+            lo += 1
+        hi = lo
+        while hi < len(self._segments) and self._segments[hi].start_address - self.segment_gap <= end_address:
+            hi += 1
+        if lo == hi:
+            segment = MemorySegment(start_address, count, self.is_register)
+            self._segments.insert(lo, segment)
+            self._starts.insert(lo, start_address)
+            return segment
+        segment = self._segments[lo]
+        if lo + 1 == hi and segment.start_address <= start_address and segment.end_address >= end_address:
+            return segment
+        # Merge all affected segments into the first one
+        merged_end = max(end_address, self._segments[hi - 1].end_address)
+        segment.extend(min(start_address, segment.start_address), merged_end)
+        for other in self._segments[lo + 1:hi]:
+            offset = other.start_address - segment.start_address
+            segment.data[offset:offset + other.count] = other.data
+        del self._segments[lo + 1:hi]
+        del self._starts[lo + 1:hi]
+        self._starts[lo] = segment.start_address
+        return segment
+
+    def _find_segment(self, start_address: int, count: int) -> Optional[MemorySegment]:
+        index = bisect.bisect_right(self._starts, start_address) - 1
+        if index < 0:
+            return None
+        segment = self._segments[index]
+        if segment.end_address < start_address + count - 1:
+            return None
+        return segment
+
+    def view(self, start_address: int, count: int) -> Optional[memoryview]:
+        """
+        Returns a zero-copy view of the given address range, or None if the range is not covered by a single segment.
+        """
+        segment = self._find_segment(start_address, count)
+        if segment is None:
+            return None
+        offset = start_address - segment.start_address
+        return memoryview(segment.data)[offset:offset + count]
+
+    def read(self, start_address: int, count: int) -> List[int] | List[bool]:
+        view = self.view(start_address, count)
+        if view is None:
+            values = [0] * count
+            end_address = start_address + count - 1
+            index = max(0, bisect.bisect_right(self._starts, start_address) - 1)
+            while index < len(self._segments) and self._segments[index].start_address <= end_address:
+                segment = self._segments[index]
+                overlap_start = max(start_address, segment.start_address)
+                overlap_end = min(end_address, segment.end_address)
+                if overlap_start <= overlap_end:
+                    offset = overlap_start - segment.start_address
+                    values[overlap_start - start_address:overlap_end - start_address + 1] = \
+                        segment.data[offset:offset + overlap_end - overlap_start + 1]
+                index += 1
+        else:
+            values = view.tolist()
+        if self.is_register:
+            return values
+        return [value != 0 for value in values]
+
+    def write(self, start_address: int, values: List[int] | List[bool]):
+        segment = self.reserve(start_address, len(values))
+        offset = start_address - segment.start_address
+        if self.is_register:
+            segment.data[offset:offset + len(values)] = array.array("H", values)
+        else:
+            segment.data[offset:offset + len(values)] = bytes(values)
+
+    def to_dict(self) -> Dict[int, int] | Dict[int, bool]:
+        values = {}
+        for segment in self._segments:
+            for i, value in enumerate(segment.data):
+                values[segment.start_address + i] = value if self.is_register else value != 0
+        return values
+
+    def copy(self) -> 'SegmentedTable':
+        clone = SegmentedTable(self.is_register, self.segment_gap)
+        for segment in self._segments:
+            cloned_segment = MemorySegment(segment.start_address, 0, self.is_register)
+            cloned_segment.data = segment.data[:]
+            clone._segments.append(cloned_segment)
+            clone._starts.append(segment.start_address)
+        return clone
+
+
+class ArrayModbusUnitMemory(ModbusUnitMemory):
+    """
+    A ModbusUnitMemory that stores registers and coils in preallocated, sparse array segments instead of dicts.
+    Range reads and writes copy whole slices under a single lock acquisition, and the value definitions affected by
+    an address range are resolved via sorted interval indexes instead of per-address lookups.
+    """
+    def __init__(self,
+                 unit_id: int,
+                 on_before_read_callback: Optional[ModbusOnValueReadCallback] = None,
+                 on_before_write_callback: Optional[ModbusOnBeforeValueWriteCallback] = None,
+                 on_write_callback: Optional[ModbusOnValueWriteCallback] = None,
+                 on_unmapped_read_callback: Optional[ModbusOnUnmappedReadCallback] = None,
+                 on_unmapped_write_callback: Optional[ModbusOnUnmappedWriteCallback] = None,
+                 logger: Optional[Logger] = None,
+                 segment_gap: int = 64):
+        """
+        Args:
+            unit_id: The ID of the Unit this memory is for.
+            on_before_read_callback: See ModbusUnitMemory.
+            on_before_write_callback: See ModbusUnitMemory.
+            on_write_callback: See ModbusUnitMemory.
+            on_unmapped_read_callback: See ModbusUnitMemory.
+            on_unmapped_write_callback: See ModbusUnitMemory.
+            logger: A logger instance. If not provided, a default logger will be created.
+            segment_gap: The maximum number of unused addresses between two address ranges stored in the same segment.
+        """
+        # The tables have to exist before the base class initializes its (empty) register and coil dicts
+        self._register_table = SegmentedTable(is_register=True, segment_gap=segment_gap)
+        self._coil_table = SegmentedTable(is_register=False, segment_gap=segment_gap)
+        super().__init__(unit_id=unit_id,
+                         on_before_read_callback=on_before_read_callback,
+                         on_before_write_callback=on_before_write_callback,
+                         on_write_callback=on_write_callback,
+                         on_unmapped_read_callback=on_unmapped_read_callback,
+                         on_unmapped_write_callback=on_unmapped_write_callback,
+                         logger=logger)
+        # Sorted (start_address, end_address, value definition) intervals
+        self._register_intervals: List[Tuple[int, int, ModbusValueDefinition]] = []
+        self._coil_intervals: List[Tuple[int, int, ModbusValueDefinition]] = []
+        self._max_register_width = 0
+        self._max_coil_width = 0
+
+    @property
+    def registers(self) -> Dict[int, int]:
+        return self._register_table.to_dict()
+
+    @registers.setter
+    def registers(self, registers: Dict[int, int]):
+        for address, value in registers.items():
+            self._register_table.write(address, [value & 0xFFFF])
+
+    @property
+    def coils(self) -> Dict[int, bool]:
+        return self._coil_table.to_dict()
+
+    @coils.setter
+    def coils(self, coils: Dict[int, bool]):
+        for address, value in coils.items():
+            self._coil_table.write(address, [bool(value)])
+
+    def clone(self) -> 'ArrayModbusUnitMemory':
+        clone = ArrayModbusUnitMemory(unit_id=self.unit_id, logger=self.logger, segment_gap=self._register_table.segment_gap)
+        with self._memory_lock:
+            clone._register_table = self._register_table.copy()
+            clone._coil_table = self._coil_table.copy()
+        clone._table_offsets = self._table_offsets.copy()
+        for value in self.values.values():
+            cloned_value = value.clone()
+            clone.register_value(cloned_value)
+            if isinstance(cloned_value, ModbusServerValueDefinition):
+                cloned_value.set_unit_memory(clone)
+        return clone
+
+    def register_value(self, value_definition: ModbusValueDefinition):
+        is_replacement = value_definition.data_point_identifier in self.values
+        super().register_value(value_definition)
+        entry = (value_definition.start_address, value_definition.end_address, value_definition)
+        with self._memory_lock:
+            if is_replacement:
+                self._register_intervals = [i for i in self._register_intervals if i[2].data_point_identifier != value_definition.data_point_identifier]
+                self._coil_intervals = [i for i in self._coil_intervals if i[2].data_point_identifier != value_definition.data_point_identifier]
+            if value_definition.is_register():
+                bisect.insort(self._register_intervals, entry, key=lambda i: i[0])
+                self._max_register_width = max(self._max_register_width, value_definition.register_width)
+                self._register_table.reserve(value_definition.start_address, value_definition.register_width)
+            else:
+                bisect.insort(self._coil_intervals, entry, key=lambda i: i[0])
+                self._max_coil_width = max(self._max_coil_width, value_definition.register_width)
+                self._coil_table.reserve(value_definition.start_address, value_definition.register_width)
+
+    def _get_table(self, register_type: ModbusTable) -> SegmentedTable:
+        return self._register_table if register_type.is_register() else self._coil_table
+
+    def read_raw_values(self, start_address: int, count: int, register_type: ModbusTable) -> List[int] | List[bool]:
+        with self._memory_lock:
+            return self._get_table(register_type).read(start_address, count)
+
+    def read_raw_view(self, start_address: int, count: int, register_type: ModbusTable) -> Optional[memoryview]:
+        """
+        Returns a zero-copy view of the given memory range, or None if the range is not stored contiguously.
+        The view reflects later writes and must not be kept beyond building a response.
+        """
+        with self._memory_lock:
+            return self._get_table(register_type).view(start_address, count)
+
+    def write_raw_values(self, start_address: int, values: List[int] | List[bool], register_type: ModbusTable):
+        if register_type.is_register():
+            for i, value in enumerate(values):
+                if not isinstance(value, int):
+                    raise ValueError(f"Cannot write {value} ({start_address} + {i}) to register {register_type.name} with {type(value)}")
+            values = [value & 0xFFFF for value in values]
+        else:
+            for i, value in enumerate(values):
+                if not isinstance(value, bool) and not (isinstance(value, int) and value in [0, 1]):
+                    raise ValueError(f"Cannot write {value} ({start_address} + {i}) to coil {register_type.name} with {type(value)}")
+        with self._memory_lock:
+            self._get_table(register_type).write(start_address, values)
+
+    def _find_values_covering(self, start_address: int, count: int, is_register: bool) -> List[Tuple[ModbusValueDefinition, int, int]]:
+        intervals = self._register_intervals if is_register else self._coil_intervals
+        max_width = self._max_register_width if is_register else self._max_coil_width
+        end_address = start_address + count - 1
+        found = []
+        index = bisect.bisect_left(intervals, start_address - max_width + 1, key=lambda i: i[0])
+        while index < len(intervals) and intervals[index][0] <= end_address:
+            value_start, value_end, value_definition = intervals[index]
+            if value_end >= start_address:
+                overlap_start = max(value_start, start_address)
+                overlap_end = min(value_end, end_address)
+                found.append((value_definition, overlap_start, overlap_end - overlap_start + 1))
+            index += 1
+        return found
+
+    def _get_memory_map(self, start_address: int, count: int, register_type: ModbusTable) -> Dict[int, Tuple[Optional[ModbusValueDefinition], int, int]]:
+        memory_map: Dict[int, Tuple[Optional[ModbusValueDefinition], int, int]] = {}
+        next_unmapped = start_address
+        for value_definition, overlap_start, overlap_count in self._find_values_covering(start_address, count, register_type.is_register()):
+            if overlap_start > next_unmapped:
+                memory_map[next_unmapped] = (None, next_unmapped, overlap_start - next_unmapped)
+            memory_map[overlap_start] = (value_definition, overlap_start, overlap_count)
+            next_unmapped = max(next_unmapped, overlap_start + overlap_count)
+        if next_unmapped < start_address + count:
+            memory_map[next_unmapped] = (None, next_unmapped, start_address + count - next_unmapped)
+        return memory_map
@@ -0,0 +1,71 @@
+import copy
+import logging
+import resource
+import threading
+import time
+
+from wattson.protocols.modbus.modbus_client import ModbusClient
+from wattson.protocols.modbus.modbus_server import ModbusServer
+from wattson.protocols.modbus.test.data_points import MODBUS_TEST_DATA_POINTS
+from wattson.util import get_logger
+
+
+def run(shared_event_loop: bool, server_count: int, duration: float, base_port: int) -> dict:
+    """
+    Starts server_count local Modbus servers and a single client polling all of them for the given duration.
+    Returns the client's runtime statistics and the context switches of the process during the run.
+    """
+    logger = get_logger("Benchmark")
+    logger.setLevel(logging.WARNING)
+    servers = []
+    server_data = {}
+    data_points = []
+    for i in range(server_count):
+        server_id = f"server-{i}"
+        server_data[server_id] = {"ip": "127.0.0.1", "port": base_port + i}
+        server_data_points = copy.deepcopy(MODBUS_TEST_DATA_POINTS)
+        for data_point in server_data_points:
+            data_point["identifier"] = f"{server_id}.{data_point['identifier']}"
+            data_point["protocol_server_id"] = server_id
+            data_point["protocol_data"]["polling_interval"] = 0.1
+            data_point["protocol_data"]["polling_enabled"] = True
+        data_points.extend(server_data_points)
+        server = ModbusServer(bind_ip="127.0.0.1", bind_port=base_port + i, logger=logger.getChild(server_id),
+                              shared_event_loop=shared_event_loop)
+        server.logger.setLevel(logging.WARNING)
+        server.set_data_points(server_data_points)
+        server.set_on_client_connect(lambda ip, port: True)
+        server.start()
+        servers.append(server)
+
+    client = ModbusClient(server_data=server_data, logger=logger.getChild("Client"), shared_event_loop=shared_event_loop)
+    client.set_data_points(data_points)
+    client.start(do_general_interrogation=False, enable_polling=True)
+    client.wait_until_connected(timeout=10)
+
+    usage_start = resource.getrusage(resource.RUSAGE_SELF)
+    time.sleep(duration)
+    statistics = client.get_runtime_statistics()
+    usage_end = resource.getrusage(resource.RUSAGE_SELF)
+    statistics["voluntary_context_switches"] = usage_end.ru_nvcsw - usage_start.ru_nvcsw
+    statistics["involuntary_context_switches"] = usage_end.ru_nivcsw - usage_start.ru_nivcsw
+
+    client.stop(timeout=5)
+    for server in servers:
+        server.stop()
+    return statistics
+
+
+def main():
+    server_count = 20
+    duration = 10
+    for shared_event_loop, base_port in [(False, 15020), (True, 16020)]:
+        statistics = run(shared_event_loop, server_count, duration, base_port)
+        print(f"shared_event_loop={shared_event_loop}")
+        for key, value in statistics.items():
+            print(f"   {key.ljust(30)} {value}")
+        print(f"   Remaining threads: {threading.active_count()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import timeit
+
+from wattson.protocols.modbus.model.array_modbus_unit_memory import ArrayModbusUnitMemory
+from wattson.protocols.modbus.model.modbus_endian import ModbusEndian
+from wattson.protocols.modbus.model.modbus_server_value_definition import ModbusServerValueDefinition
+from wattson.protocols.modbus.model.modbus_table import ModbusTable
+from wattson.protocols.modbus.model.modbus_unit_memory import ModbusUnitMemory
+
+
+def create_memory(memory_class, value_count: int) -> ModbusUnitMemory:
+    """
+    Creates a unit memory with value_count consecutive uint16 holding registers and value_count consecutive coils.
+    """
+    memory = memory_class(0)
+    memory.logger.setLevel("WARNING")
+    for i in range(value_count):
+        for table, type_id, prefix in [(ModbusTable.HOLDING_REGISTER, "uint16", "hr"), (ModbusTable.COIL, "bool", "co")]:
+            memory.register_value(ModbusServerValueDefinition(
+                f"{prefix}-{i}", 0, modbus_table=table, type_id=type_id, register_width=1, start_address=i,
+                endian=ModbusEndian.BIG_ENDIAN, unit_memory=memory
+            ))
+    return memory
+
+
+def main():
+    value_count = 1000
+    repetitions = 2000
+    for memory_class in [ModbusUnitMemory, ArrayModbusUnitMemory]:
+        memory = create_memory(memory_class, value_count)
+        benchmarks = {
+            "read 125 registers": lambda: memory.read_registers(100, 125, ModbusTable.HOLDING_REGISTER),
+            "write 100 registers": lambda: memory.write_registers(100, list(range(100))),
+            "read 2000 coils": lambda: memory.read_coils(0, 2000),
+            "raw read 125 registers": lambda: memory.read_raw_values(100, 125, ModbusTable.HOLDING_REGISTER),
+        }
+        print(memory_class.__name__)
+        for name, benchmark in benchmarks.items():
+            duration = timeit.timeit(benchmark, number=repetitions)
+            print(f"   {name.ljust(25)} {duration / repetitions * 1e6:10.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import asyncio
+import threading
+from typing import Dict, List, Optional
+
+from wattson.util.threading import set_thread_name
+
+
+class ModbusEventLoopPool:
+    """
+    A fixed-size pool of asyncio event loops, each running in a dedicated thread.
+    Modbus clients, their periodic polling and Modbus servers can share these loops instead of running
+    (at least) one thread and event loop per connection.
+    Loops are started on first use and stopped once no user holds a reference anymore.
+    """
+    _shared_pool: Optional['ModbusEventLoopPool'] = None
+    _shared_pool_lock = threading.Lock()
+
+    def __init__(self, size: int = 1, name: str = "W/MB/Loop"):
+        if size < 1:
+            raise ValueError("The pool requires at least one event loop")
+        self.size = size
+        self.name = name
+        self._lock = threading.Lock()
+        self._loops: List[Optional[asyncio.AbstractEventLoop]] = [None] * size
+        self._threads: List[Optional[threading.Thread]] = [None] * size
+        self._references: List[int] = [0] * size
+
+    @classmethod
+    def get_shared(cls, size: int = 1) -> 'ModbusEventLoopPool':
+        """
+        Returns the process-wide pool. The size is only considered when the pool is created.
+        """
+        with cls._shared_pool_lock:
+            if cls._shared_pool is None:
+                cls._shared_pool = ModbusEventLoopPool(size=size)
+            return cls._shared_pool
+
+    def acquire(self) -> asyncio.AbstractEventLoop:
+        """
+        Returns the least used event loop of this pool and starts it if required.
+        Each call has to be matched with a call to release.
+        """
+        with self._lock:
+            index = self._references.index(min(self._references))
+            if self._loops[index] is None:
+                self._start_loop(index)
+            self._references[index] += 1
+            return self._loops[index]
+
+    def release(self, loop: asyncio.AbstractEventLoop):
+        """
+        Releases a reference to the given event loop. The loop is stopped once it is no longer referenced.
+        """
+        with self._lock:
+            if loop not in self._loops:
+                return
+            index = self._loops.index(loop)
+            self._references[index] = max(0, self._references[index] - 1)
+            if self._references[index] > 0:
+                return
+            thread = self._threads[index]
+            self._loops[index] = None
+            self._threads[index] = None
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not threading.current_thread():
+            thread.join(timeout=5)
+
+    def is_loop_thread(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> bool:
+        """
+        Returns whether the calling thread runs the given loop (or any loop of this pool).
+        """
+        with self._lock:
+            for i, thread in enumerate(self._threads):
+                if thread is threading.current_thread():
+                    return loop is None or self._loops[i] is loop
+        return False
+
+    def get_statistics(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "loops": len([loop for loop in self._loops if loop is not None]),
+                "references": sum(self._references)
+            }
+
+    def _start_loop(self, index: int):
+        loop = asyncio.new_event_loop()
+        started = threading.Event()
+
+        def run():
+            set_thread_name(f"{self.name}/{index}")
+            asyncio.set_event_loop(loop)
+            loop.call_soon(started.set)
+            loop.run_forever()
+            loop.close()
+
+        thread = threading.Thread(target=run, daemon=True)
+        self._loops[index] = loop
+        self._threads[index] = thread
+        thread.start()
+        started.wait()
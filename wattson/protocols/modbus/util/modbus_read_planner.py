@@ -0,0 +1,122 @@
+from typing import Dict, List, Optional, Tuple
+
+from wattson.protocols.modbus.model.modbus_client_value_definition import ModbusClientValueDefinition
+from wattson.protocols.modbus.model.modbus_table import ModbusTable
+
+# Maximum number of registers / bits per read request as defined by the Modbus specification
+MAX_READ_REGISTER_COUNT = 125
+MAX_READ_BIT_COUNT = 2000
+
+
+class ModbusReadBlock:
+    """
+    A contiguous (relative) address range of a single table of a single unit that is read with one request.
+    The read values are distributed to the value definitions covered by this block.
+    """
+    def __init__(self, server_id: str, unit_id: int, modbus_table: ModbusTable, periodicity: Optional[float],
+                 start_address: int, count: int, value_definitions: List[ModbusClientValueDefinition]):
+        self.server_id = server_id
+        self.unit_id = unit_id
+        self.modbus_table = modbus_table
+        self.periodicity = periodicity
+        # Relative start address
+        self.start_address = start_address
+        self.count = count
+        self.value_definitions = value_definitions
+
+    @property
+    def end_address(self) -> int:
+        return self.start_address + self.count - 1
+
+    def split_values(self, data: List[int] | List[bool]) -> List[Tuple[ModbusClientValueDefinition, List[int] | List[bool]]]:
+        """
+        Splits the raw values read for this block into the raw values of the individual value definitions.
+        Args:
+            data: The raw values as returned by the server, starting at this block's start_address.
+
+        Returns:
+            A list of value definitions and their respective raw values.
+        """
+        values = []
+        for value_definition in self.value_definitions:
+            offset = value_definition.get_relative_address() - self.start_address
+            values.append((value_definition, data[offset:offset + value_definition.register_width]))
+        return values
+
+
+class ModbusReadPlanner:
+    """
+    Coalesces the reads of multiple value definitions into as few range reads as possible.
+    Value definitions are grouped by server, unit, table and periodicity. Within each group, value definitions with
+    contiguous (or nearly contiguous, see gap_tolerance) addresses are merged into a single ModbusReadBlock as long as
+    the block does not exceed the maximum number of registers or bits per request.
+    """
+    def __init__(self, gap_tolerance: int = 0,
+                 max_register_count: int = MAX_READ_REGISTER_COUNT,
+                 max_bit_count: int = MAX_READ_BIT_COUNT):
+        """
+        Args:
+            gap_tolerance: The maximum number of unused registers / bits between two value definitions in the same block.
+            max_register_count: The maximum number of registers read with a single request.
+            max_bit_count: The maximum number of coils / discrete inputs read with a single request.
+        """
+        self.gap_tolerance = max(0, gap_tolerance)
+        self.max_register_count = max_register_count
+        self.max_bit_count = max_bit_count
+
+    def plan(self, value_definitions: List[ModbusClientValueDefinition],
+             group_by_periodicity: bool = True) -> List[ModbusReadBlock]:
+        """
+        Computes the read blocks for the given value definitions.
+        Args:
+            value_definitions: The value definitions to read.
+            group_by_periodicity: Whether only value definitions with the same periodicity may share a block.
+
+        Returns:
+            The list of blocks covering all given value definitions.
+        """
+        groups: Dict[Tuple[str, int, ModbusTable, Optional[float]], List[ModbusClientValueDefinition]] = {}
+        for value_definition in value_definitions:
+            server_id = value_definition.unit_client.device_client.server_id
+            periodicity = value_definition.periodicity if group_by_periodicity else None
+            key = (server_id, value_definition.unit_id, value_definition.modbus_table, periodicity)
+            groups.setdefault(key, []).append(value_definition)
+
+        blocks = []
+        for (server_id, unit_id, modbus_table, periodicity), group in groups.items():
+            max_count = self.max_register_count if modbus_table.is_register() else self.max_bit_count
+            group.sort(key=lambda v: (v.get_relative_address(), v.register_width))
+            block: Optional[ModbusReadBlock] = None
+            for value_definition in group:
+                start = value_definition.get_relative_address()
+                end = start + value_definition.register_width - 1
+                if block is not None and start - block.end_address - 1 <= self.gap_tolerance:
+                    new_end = max(block.end_address, end)
+                    if new_end - block.start_address + 1 <= max_count:
+                        block.count = new_end - block.start_address + 1
+                        block.value_definitions.append(value_definition)
+                        continue
+                block = ModbusReadBlock(server_id=server_id, unit_id=unit_id, modbus_table=modbus_table,
+                                        periodicity=periodicity, start_address=start,
+                                        count=value_definition.register_width, value_definitions=[value_definition])
+                blocks.append(block)
+        return blocks
+
+    @staticmethod
+    def get_statistics(blocks: List[ModbusReadBlock]) -> Dict[Optional[float], dict]:
+        """
+        Summarizes the given blocks per periodicity.
+        Args:
+            blocks: The planned read blocks.
+
+        Returns:
+            A dict with the number of values, the number of requests and the number of saved requests per cycle
+            for each periodicity.
+        """
+        statistics = {}
+        for block in blocks:
+            entry = statistics.setdefault(block.periodicity, {"values": 0, "requests": 0, "requests_saved": 0})
+            entry["values"] += len(block.value_definitions)
+            entry["requests"] += 1
+            entry["requests_saved"] += len(block.value_definitions) - 1
+        return statistics
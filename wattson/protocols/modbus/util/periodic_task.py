@@ -1,4 +1,5 @@
 import asyncio
+import inspect
 import logging
 import traceback
 from contextlib import suppress
@@ -11,6 +12,7 @@ class PeriodicTask:
     """
     A PeriodicTask should be run in a dedicated thread with an existing asyncio event loop.
     With the given periodicity, the respective callback will be called. For each call, the provided arguments are passed.
+    If the callback returns an awaitable, it is awaited before the next period starts.
     """
     def __init__(self, period_seconds: float, callback: Callable, callback_args: list, logger: Optional[logging.Logger] = None):
         self.period_seconds = period_seconds
@@ -36,6 +38,8 @@ class PeriodicTask:
         while True:
             await asyncio.sleep(self.period_seconds)
             try:
-                self.callback(*self.callback_args)
+                result = self.callback(*self.callback_args)
+                if inspect.isawaitable(result):
+                    await result
             except Exception as e:
                 self.logger.debug(e)
@@ -1,2 +1,3 @@
 from .wattson_time import WattsonTime
 from .wattson_time_type import WattsonTimeType
+from .discrete_event_scheduler import DiscreteEventScheduler, DiscreteEventParticipant
@@ -0,0 +1,201 @@
+import heapq
+import itertools
+import threading
+from typing import List, Optional, Tuple
+
+
+class DiscreteEventParticipant:
+    """
+    A participant of the DiscreteEventScheduler, e.g., a thread that executes a periodic task.
+    A participant is busy until it waits for its next event. Simulated time only advances while all participants wait.
+    """
+    def __init__(self, scheduler: 'DiscreteEventScheduler', name: str, priority: int, order: int):
+        self.scheduler = scheduler
+        self.name = name
+        self.priority = priority
+        self.order = order
+        self.waiting: bool = False
+        self.wake_time: Optional[float] = None
+        self.wake_event: Optional[threading.Event] = None
+        self.wait_token: int = 0
+
+    def __repr__(self):
+        return f"DiscreteEventParticipant({self.name})"
+
+    def wait_until(self, timestamp: float, wake_event: Optional[threading.Event] = None) -> bool:
+        return self.scheduler.wait_until(self, timestamp, wake_event)
+
+    def wait(self, seconds: float, wake_event: Optional[threading.Event] = None) -> bool:
+        return self.scheduler.wait_until(self, self.scheduler.now() + seconds, wake_event)
+
+    def wake(self):
+        self.scheduler.wake(self)
+
+    def unregister(self):
+        self.scheduler.unregister(self)
+
+
+class DiscreteEventScheduler:
+    """
+    The central event scheduler of the discrete-event time mode.
+    Instead of deriving simulated time from the wall clock, simulated time is only advanced by the scheduler: Each
+    participant waits for its next event (e.g., the next profile step or the next power flow) and, once all registered
+    participants wait, simulated time jumps to the earliest scheduled event and only the respective participant is
+    released. Participants are thus executed one at a time and events with identical timestamps are processed in the
+    order of their priority and the participants' registration, i.e., a run is deterministic and progresses as fast as
+    the participants process their events.
+    Participants can be woken before their event, e.g., as an iteration of the power flow is required. They are busy
+    until they wait again, i.e., the triggered work is completed before simulated time advances.
+    """
+    def __init__(self, start_time: float, end_time: Optional[float] = None):
+        """
+        Args:
+            start_time (float):
+                The simulated timestamp to start at.
+            end_time (Optional[float], optional):
+                The simulated timestamp to stop at. Events after this timestamp are not released. Instead, the
+                scheduler stops once the next event would exceed this timestamp, i.e., all waiting participants are
+                released and the finished_event is set.
+                (Default value = None)
+        """
+        self._now = start_time
+        self._end_time = end_time
+        self._condition = threading.Condition()
+        self._participants: List[DiscreteEventParticipant] = []
+        self._order = itertools.count()
+        self._sequence = itertools.count()
+        # (timestamp, priority, participant order, sequence, wait token, participant)
+        self._events: List[Tuple[float, int, int, int, int, DiscreteEventParticipant]] = []
+        self._stopped = False
+        self.finished_event = threading.Event()
+        self.event_count: int = 0
+
+    def is_finished(self) -> bool:
+        """
+        Returns whether the scheduler has been stopped or the run reached its end time.
+        """
+        return self.finished_event.is_set()
+
+    def now(self) -> float:
+        return self._now
+
+    @property
+    def end_time(self) -> Optional[float]:
+        return self._end_time
+
+    def register(self, name: str, priority: int = 0) -> DiscreteEventParticipant:
+        """
+        Registers a new participant. The participant is busy until it waits for the first time, i.e., it should be
+        registered before the simulation starts.
+
+        Args:
+            name (str):
+                The participant's name.
+            priority (int, optional):
+                The priority of the participant's events over other events with the same timestamp (lower first).
+                (Default value = 0)
+
+        Returns:
+            DiscreteEventParticipant: The participant.
+        """
+        with self._condition:
+            participant = DiscreteEventParticipant(self, name, priority, next(self._order))
+            self._participants.append(participant)
+            return participant
+
+    def unregister(self, participant: DiscreteEventParticipant):
+        with self._condition:
+            if participant in self._participants:
+                self._participants.remove(participant)
+            participant.waiting = False
+            participant.wait_token += 1
+            self._advance()
+            self._condition.notify_all()
+
+    def wait_until(self, participant: DiscreteEventParticipant, timestamp: float,
+                   wake_event: Optional[threading.Event] = None) -> bool:
+        """
+        Blocks the given participant until simulated time reaches the given timestamp, the participant is woken or the
+        scheduler is stopped.
+
+        Args:
+            participant (DiscreteEventParticipant):
+                The waiting participant.
+            timestamp (float):
+                The simulated timestamp of the participant's next event.
+            wake_event (Optional[threading.Event], optional):
+                An event that wakes the participant when it is set (in combination with wake).
+                (Default value = None)
+
+        Returns:
+            bool: Whether the participant has been woken before its event, i.e., whether the wake event is set or the
+            scheduler has been stopped.
+        """
+        with self._condition:
+            if self._stopped or (wake_event is not None and wake_event.is_set()):
+                return True
+            if participant not in self._participants:
+                return True
+            participant.wait_token += 1
+            token = participant.wait_token
+            participant.waiting = True
+            participant.wake_time = max(timestamp, self._now)
+            participant.wake_event = wake_event
+            heapq.heappush(self._events, (participant.wake_time, participant.priority, participant.order,
+                                          next(self._sequence), token, participant))
+            self._advance()
+            while participant.waiting and not self._stopped:
+                self._condition.wait()
+            participant.wake_event = None
+            woken = participant.wait_token != token or self._stopped
+            if woken:
+                return True
+            return wake_event is not None and wake_event.is_set()
+
+    def wake(self, participant: DiscreteEventParticipant):
+        """
+        Releases the given participant before its next event. Simulated time does not advance before the participant
+        waits again.
+
+        Args:
+            participant (DiscreteEventParticipant):
+                The participant to wake.
+        """
+        with self._condition:
+            if participant.waiting:
+                participant.waiting = False
+                # Invalidate the pending event
+                participant.wait_token += 1
+                self._condition.notify_all()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self.finished_event.set()
+            self._condition.notify_all()
+
+    def _advance(self):
+        # Called with the condition's lock held
+        if self._stopped:
+            return
+        for participant in self._participants:
+            if not participant.waiting:
+                return
+        while len(self._events) > 0:
+            timestamp, _, _, _, token, participant = self._events[0]
+            if token != participant.wait_token or not participant.waiting or participant not in self._participants:
+                # Stale event
+                heapq.heappop(self._events)
+                continue
+            if self._end_time is not None and timestamp > self._end_time:
+                # The run is complete - release all participants such that they can terminate
+                self._stopped = True
+                self.finished_event.set()
+                self._condition.notify_all()
+                return
+            heapq.heappop(self._events)
+            self._now = max(self._now, timestamp)
+            self.event_count += 1
+            participant.waiting = False
+            self._condition.notify_all()
+            return
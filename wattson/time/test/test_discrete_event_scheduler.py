@@ -0,0 +1,41 @@
+import threading
+
+from wattson.time import DiscreteEventScheduler
+
+
+def test_run_ends_at_end_time():
+    scheduler = DiscreteEventScheduler(start_time=0, end_time=10)
+    fired = []
+    fired_lock = threading.Lock()
+
+    def run(name: str, interval: float, participant):
+        while True:
+            with fired_lock:
+                fired.append((scheduler.now(), name))
+            if participant.wait(interval):
+                break
+
+    participants = [
+        ("profiles", 2, scheduler.register("profiles", priority=0)),
+        ("power-flow", 5, scheduler.register("power-flow", priority=1)),
+    ]
+    threads = [threading.Thread(target=run, args=participant, daemon=True) for participant in participants]
+    for thread in threads:
+        thread.start()
+    assert scheduler.finished_event.wait(timeout=10)
+    for thread in threads:
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+
+    assert scheduler.now() == 10
+    # Initial steps are executed concurrently, all later events in order of time and priority
+    assert sorted(fired[:2]) == [(0, "power-flow"), (0, "profiles")]
+    assert fired[2:] == [
+        (2, "profiles"),
+        (4, "profiles"),
+        (5, "power-flow"),
+        (6, "profiles"),
+        (8, "profiles"),
+        (10, "profiles"),
+        (10, "power-flow"),
+    ]
@@ -1,11 +1,13 @@
 import datetime
 import re
+import threading
 import time
 from pathlib import Path
 from typing import Callable, TYPE_CHECKING, Optional
 
 from wattson.cosimulation.control.messages.wattson_notification import WattsonNotification
 from wattson.cosimulation.control.messages.wattson_notification_topic import WattsonNotificationTopic
+from wattson.time.discrete_event_scheduler import DiscreteEventScheduler, DiscreteEventParticipant
 from wattson.time.wattson_time_type import WattsonTimeType
 
 if TYPE_CHECKING:
@@ -17,6 +19,7 @@ class WattsonTime:
     A representation for time in both, the wall-clock perspective and the simulated time.
     Simulated time is defined at a different speed and with a given offset to wall-clock time, i.e.,
     the offset is derived from a representation of a wall-clock timestamp that corresponds to a simulation clock timestamp.
+    In the discrete-event mode, simulated time is not derived from the wall-clock but given by a DiscreteEventScheduler.
 
     """
     def __init__(self,
@@ -46,6 +49,7 @@ class WattsonTime:
         self._sync_push: bool = False
         self._sync_pull: bool = False
         self._wattson_client: Optional['WattsonClient'] = None
+        self._scheduler: Optional[DiscreteEventScheduler] = None
 
     def __repr__(self):
         return f"W: {self.to_local_datetime(WattsonTimeType.WALL)} | S: {self.to_local_datetime(WattsonTimeType.SIM)} | SPEED: {self.speed}"
@@ -84,18 +88,92 @@ class WattsonTime:
         return True
 
     def copy(self, safe: bool = True) -> 'WattsonTime':
-        copied_time = WattsonTime(
-            wall_clock_reference=self.reference_wall,
-            sim_clock_reference=self.reference_sim,
-            speed=self.speed
-        )
+        if self._scheduler is not None and safe:
+            # Safe copies do not share the scheduler - they continue from the current simulated time
+            copied_time = WattsonTime(
+                wall_clock_reference=self.wall_clock_time(),
+                sim_clock_reference=self.sim_clock_time(),
+                speed=self.speed
+            )
+        else:
+            copied_time = WattsonTime(
+                wall_clock_reference=self.reference_wall,
+                sim_clock_reference=self.reference_sim,
+                speed=self.speed
+            )
         copied_time._wall_clock_function = self._wall_clock_function
         if not safe:
+            copied_time._scheduler = self._scheduler
             copied_time._wattson_client = self._wattson_client
             copied_time._sync_pull = self._sync_pull
             copied_time._sync_push = self._sync_push
         return copied_time
 
+    def enable_discrete_event_mode(self, scheduler: DiscreteEventScheduler):
+        """
+        Lets the given scheduler define the simulated time. The simulation clock reference is set to the scheduler's
+        current time, such that the passed simulated seconds refer to the scheduler's start.
+
+        Args:
+            scheduler (DiscreteEventScheduler):
+                The scheduler to use.
+        """
+        self._scheduler = scheduler
+        self._reference_sim = scheduler.now()
+
+    def is_discrete_event_mode(self) -> bool:
+        return self._scheduler is not None
+
+    def get_scheduler(self) -> Optional[DiscreteEventScheduler]:
+        return self._scheduler
+
+    def register_participant(self, name: str, priority: int = 0) -> Optional[DiscreteEventParticipant]:
+        """
+        Registers a participant with the discrete-event scheduler.
+
+        Args:
+            name (str):
+                The participant's name.
+            priority (int, optional):
+                The priority of the participant's events over other events with the same timestamp (lower first).
+                (Default value = 0)
+
+        Returns:
+            Optional[DiscreteEventParticipant]: The participant, or None if the discrete-event mode is not enabled.
+        """
+        if self._scheduler is None:
+            return None
+        return self._scheduler.register(name=name, priority=priority)
+
+    def wait(self,
+             seconds: float,
+             participant: Optional[DiscreteEventParticipant] = None,
+             wake_event: Optional[threading.Event] = None) -> bool:
+        """
+        Waits for the given number of simulated seconds. In the discrete-event mode, the given participant waits for
+        the scheduler to advance simulated time. Otherwise, the respective number of wall-clock seconds is waited.
+
+        Args:
+            seconds (float):
+                The simulated seconds to wait.
+            participant (Optional[DiscreteEventParticipant], optional):
+                The waiting participant (required in the discrete-event mode).
+                (Default value = None)
+            wake_event (Optional[threading.Event], optional):
+                An event that ends waiting early when it is set.
+                (Default value = None)
+
+        Returns:
+            bool: Whether waiting ended early, i.e., as the wake_event has been set.
+        """
+        if self._scheduler is not None and participant is not None:
+            return participant.wait(max(0.0, seconds), wake_event=wake_event)
+        wall_seconds = max(0.0, seconds / self.speed)
+        if wake_event is not None:
+            return wake_event.wait(wall_seconds)
+        time.sleep(wall_seconds)
+        return False
+
     def enable_synchronization(
             self,
             wattson_client: 'WattsonClient',
@@ -189,6 +267,8 @@ class WattsonTime:
         Returns the current simulation clock timestamp
 
         """
+        if self._scheduler is not None:
+            return self._scheduler.now()
         sim_time_passed = self.passed_sim_clock_seconds()
         return self._reference_sim + sim_time_passed
 
@@ -244,6 +324,8 @@ class WattsonTime:
         Returns the number of seconds passed since the start of the simulation in simulation clock time
 
         """
+        if self._scheduler is not None:
+            return self._scheduler.now() - self._reference_sim
         return self.passed_wall_clock_seconds() * self.speed
 
     def iso_format(self, time_type: WattsonTimeType, timezone: datetime.tzinfo = datetime.timezone.utc) -> str:
@@ -0,0 +1,267 @@
+import enum
+import gzip
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from wattson.util.persistence_drivers.batch_writer import BatchWriter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class JSONLExportWriter:
+    """
+    Exports dictionaries as JSON lines into one file per stream (e.g., per notification topic).
+    Entries are queued and written by a background thread in batches, bounded by their size (batch_size) and the time
+    since the first queued entry (flush_interval). Each batch is serialized with orjson (or ujson) and written with a
+    single write call per stream (falling back to the standard json module if neither is installed). Entries that
+    cannot be serialized this way are encoded with the PickleEncoder.
+    Files can be compressed ("gzip" or "zstd") and rotated into numbered segments once max_segment_size (uncompressed)
+    bytes have been written. Files are only flushed on rotation, on flush and on stop, i.e., compressed streams are not
+    forced to emit a block per batch.
+    """
+    COMPRESSION_SUFFIXES = {
+        None: "",
+        "gzip": ".gz",
+        "zstd": ".zst"
+    }
+
+    def __init__(self, base_folder: Path, batch_size: int = 1000, flush_interval: float = 1,
+                 compression: Optional[str] = None, compression_level: Optional[int] = None,
+                 max_segment_size: Optional[int] = None, max_queue_size: int = 0, append: bool = True,
+                 name: str = "W/JSONLExport", logger: Optional[logging.Logger] = None):
+        if compression not in JSONLExportWriter.COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unsupported compression {compression}")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression requires the zstandard package")
+        self.base_folder = base_folder
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compression = compression
+        self.compression_level = compression_level
+        self.max_segment_size = max_segment_size
+        self.max_queue_size = max_queue_size
+        self.append = append
+        self.name = name
+        self.logger = logger if logger is not None else logging.getLogger("JSONLExportWriter")
+        self._writer: Optional[BatchWriter] = None
+        self._lock = threading.Lock()
+        # Separate lock for the counters to not block producers while a batch is written
+        self._statistics_lock = threading.Lock()
+        # stream -> (handle, segment index, written bytes of the segment)
+        self._handles: Dict[str, Tuple[BinaryIO, int, int]] = {}
+        self._statistics = {
+            "queued": 0,
+            "dropped": 0,
+            "written": 0,
+            "batches": 0,
+            "bytes": 0,
+            "segments": 0,
+            "errors": 0
+        }
+        self._start_time: Optional[float] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._writer is not None and self._writer.is_running
+
+    def start(self):
+        self.base_folder.mkdir(parents=True, exist_ok=True)
+        self._start_time = time.monotonic()
+        self._writer = BatchWriter(self._write_batch, batch_size=self.batch_size, flush_interval=self.flush_interval,
+                                   name=self.name, max_queue_size=self.max_queue_size, logger=self.logger)
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        Writes all queued entries and closes the export files.
+
+        Args:
+            timeout (Optional[float], optional):
+                The maximum number of seconds to wait for the queued entries to be written.
+                (Default value = None)
+
+        Returns:
+            bool: Whether all entries have been written and the files have been closed.
+        """
+        if self._writer is not None and not self._writer.stop(timeout=timeout):
+            # The writer thread still uses the files
+            self.logger.error(f"Could not write all queued entries within {timeout} seconds")
+            return False
+        with self._lock:
+            for stream, (handle, _, _) in self._handles.items():
+                try:
+                    handle.close()
+                except Exception as e:
+                    self.logger.error(f"Could not close export of {stream}: {e=}")
+            self._handles.clear()
+        return True
+
+    def flush(self):
+        """
+        Blocks until all queued entries are written and flushes the export files.
+        """
+        if self._writer is not None:
+            self._writer.flush()
+        with self._lock:
+            for stream, (handle, _, _) in self._handles.items():
+                try:
+                    handle.flush()
+                except Exception as e:
+                    self.logger.error(f"Could not flush export of {stream}: {e=}")
+
+    def write(self, stream: str, entry: dict) -> bool:
+        """
+        Queues the entry to be written to the given stream. Does not block if the queue is full, but drops the entry.
+
+        Returns:
+            bool: Whether the entry has been queued.
+        """
+        if self._writer is None:
+            return False
+        queued = self._writer.put((stream, entry), block=False)
+        with self._statistics_lock:
+            self._statistics["queued" if queued else "dropped"] += 1
+        return queued
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """
+        Returns the export counters, the current backlog (queued entries that have not been written yet) and the
+        average throughput in entries and (uncompressed) bytes per second since the writer has been started.
+        """
+        with self._statistics_lock:
+            statistics = dict(self._statistics)
+        statistics["backlog"] = self._writer.backlog if self._writer is not None else 0
+        duration = time.monotonic() - self._start_time if self._start_time is not None else 0
+        statistics["entries_per_second"] = statistics["written"] / duration if duration > 0 else 0
+        statistics["bytes_per_second"] = statistics["bytes"] / duration if duration > 0 else 0
+        return statistics
+
+    @staticmethod
+    def _default(obj):
+        if isinstance(obj, enum.Enum):
+            return obj.value
+        if isinstance(obj, (set, frozenset, tuple)):
+            return list(obj)
+        # NumPy scalars and arrays
+        if hasattr(obj, "tolist"):
+            return obj.tolist()
+        raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+    @staticmethod
+    def encode(entry: dict) -> bytes:
+        """
+        Serializes the entry as a single JSON line.
+        """
+        try:
+            if orjson is not None:
+                return orjson.dumps(entry, default=JSONLExportWriter._default,
+                                    option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+            if ujson is not None:
+                return ujson.dumps(entry, default=JSONLExportWriter._default).encode("utf-8") + b"\n"
+            return json.dumps(entry, default=JSONLExportWriter._default).encode("utf-8") + b"\n"
+        except (TypeError, ValueError, OverflowError):
+            pass
+        from wattson.util.json.pickle_encoder import PickleEncoder
+        return json.dumps(entry, cls=PickleEncoder).encode("utf-8") + b"\n"
+
+    def _write_batch(self, entries: List[Tuple[str, dict]]):
+        lines_by_stream: Dict[str, List[bytes]] = {}
+        errors = 0
+        for stream, entry in entries:
+            try:
+                lines_by_stream.setdefault(stream, []).append(JSONLExportWriter.encode(entry))
+            except Exception as e:
+                errors += 1
+                self.logger.error(f"Could not encode export entry for {stream}: {e=}")
+        written = 0
+        written_bytes = 0
+        with self._lock:
+            for stream, lines in lines_by_stream.items():
+                try:
+                    written_bytes += self._write_lines(stream, lines)
+                    written += len(lines)
+                except Exception as e:
+                    errors += len(lines)
+                    self.logger.error(f"Could not write export of {stream}: {e=}")
+        with self._statistics_lock:
+            self._statistics["written"] += written
+            self._statistics["bytes"] += written_bytes
+            self._statistics["errors"] += errors
+            self._statistics["batches"] += 1
+
+    def _write_lines(self, stream: str, lines: List[bytes]) -> int:
+        total = 0
+        while len(lines) > 0:
+            handle, index, size = self._get_handle(stream)
+            if self.max_segment_size is None:
+                chunk = lines
+            else:
+                # Fill the current segment, but write at least one line per segment
+                chunk_size = 0
+                count = 0
+                for line in lines:
+                    if count > 0 and size + chunk_size + len(line) > self.max_segment_size:
+                        break
+                    chunk_size += len(line)
+                    count += 1
+                chunk = lines[:count]
+            lines = lines[len(chunk):]
+            data = b"".join(chunk)
+            handle.write(data)
+            size += len(data)
+            total += len(data)
+            if self.max_segment_size is not None and size >= self.max_segment_size:
+                handle.close()
+                self._open_segment(stream, index + 1, truncate=True)
+            else:
+                self._handles[stream] = (handle, index, size)
+        return total
+
+    def get_segment_file(self, stream: str, index: int) -> Path:
+        suffix = JSONLExportWriter.COMPRESSION_SUFFIXES[self.compression]
+        if index == 0:
+            return self.base_folder.joinpath(f"{stream}.jsonl{suffix}")
+        return self.base_folder.joinpath(f"{stream}.{index}.jsonl{suffix}")
+
+    def _get_handle(self, stream: str) -> Tuple[BinaryIO, int, int]:
+        if stream not in self._handles:
+            index = 0
+            if self.append and self.max_segment_size is not None:
+                # Continue with the latest existing segment
+                while self.get_segment_file(stream, index + 1).exists():
+                    index += 1
+            self._open_segment(stream, index, truncate=not self.append)
+        return self._handles[stream]
+
+    def _open_segment(self, stream: str, index: int, truncate: bool):
+        file = self.get_segment_file(stream, index)
+        mode = "wb" if truncate else "ab"
+        # For compressed files, the compressed size is used when continuing an existing segment
+        size = file.stat().st_size if not truncate and file.exists() else 0
+        if self.compression == "gzip":
+            level = self.compression_level if self.compression_level is not None else 6
+            handle = gzip.open(file, mode, compresslevel=level)
+        elif self.compression == "zstd":
+            level = self.compression_level if self.compression_level is not None else 3
+            handle = zstandard.ZstdCompressor(level=level).stream_writer(file.open(mode))
+        else:
+            handle = file.open(mode)
+        self._handles[stream] = (handle, index, size)
+        with self._statistics_lock:
+            self._statistics["segments"] += 1
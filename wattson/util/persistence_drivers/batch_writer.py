@@ -0,0 +1,140 @@
+import atexit
+import inspect
+import logging
+import queue
+import threading
+import time
+import weakref
+from typing import Any, Callable, List, Optional
+
+# Writers that have not been stopped yet, stopped at interpreter exit.
+# Weak references do not keep discarded writers (and their owners) alive until then.
+_running_writers: "weakref.WeakSet[BatchWriter]" = weakref.WeakSet()
+
+
+def _stop_running_writers():
+    for writer in list(_running_writers):
+        writer.stop()
+
+
+atexit.register(_stop_running_writers)
+
+
+class BatchWriter:
+    """
+    Collects items in a background thread and hands them to the write_batch callback in batches.
+    A batch is written once it reaches batch_size items or once flush_interval seconds have passed since its first item.
+    If max_queue_size is set, at most this many items are queued, and non-blocking puts fail once the queue is full.
+    Pending items are written on stop, which is also called at interpreter exit for writers that are not stopped
+    explicitly.
+    A bound method passed as write_batch is only weakly referenced, such that the writer does not keep its owner
+    alive, e.g., a persistence driver that stops its writer when it is garbage collected.
+    """
+    _FLUSH = object()
+    _STOP = object()
+
+    def __init__(self, write_batch: Callable[[List[Any]], None], batch_size: int = 500, flush_interval: float = 0.5,
+                 name: str = "W/BatchWriter", max_queue_size: int = 0, logger: Optional[logging.Logger] = None):
+        if inspect.ismethod(write_batch):
+            self._get_write_batch = weakref.WeakMethod(write_batch)
+        else:
+            self._get_write_batch = lambda: write_batch
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max(0, max_queue_size))
+        self.logger = logger if logger is not None else logging.getLogger(name)
+        self._thread: Optional[threading.Thread] = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        _running_writers.add(self)
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def backlog(self) -> int:
+        """
+        The (approximate) number of queued items that have not been written yet.
+        """
+        return self._queue.qsize()
+
+    def put(self, item: Any, block: bool = True) -> bool:
+        """
+        Queues the item for writing.
+        Returns False if the queue is full and block is False.
+        """
+        try:
+            self._queue.put(item, block=block)
+        except queue.Full:
+            return False
+        return True
+
+    def flush(self):
+        """
+        Blocks until all items that have been put so far are written.
+        """
+        if not self.is_running:
+            return
+        self._queue.put(BatchWriter._FLUSH)
+        self._queue.join()
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        Writes all pending items and stops the writer thread.
+
+        Args:
+            timeout (Optional[float], optional):
+                The maximum number of seconds to wait for the pending items to be written.
+                (Default value = None)
+
+        Returns:
+            bool: Whether the writer thread has stopped, i.e., False if the timeout expired before.
+        """
+        _running_writers.discard(self)
+        if not self.is_running:
+            return True
+        self._queue.put(BatchWriter._STOP)
+        self._thread.join(timeout=timeout)
+        if self._thread.is_alive():
+            self.logger.warning(f"Writer did not stop within {timeout} seconds - {self.backlog} items pending")
+            return False
+        self._thread = None
+        return True
+
+    def _run(self):
+        batch = []
+        # Number of queue items taken but not yet marked as done (including markers)
+        taken = 0
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+                taken += 1
+            except queue.Empty:
+                item = BatchWriter._FLUSH
+            if item is not BatchWriter._FLUSH and item is not BatchWriter._STOP:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+            if len(batch) >= self.batch_size or item is BatchWriter._FLUSH or item is BatchWriter._STOP:
+                self._write(batch)
+                for _ in range(taken):
+                    self._queue.task_done()
+                batch = []
+                taken = 0
+                deadline = None
+            if item is BatchWriter._STOP:
+                return
+
+    def _write(self, batch: List[Any]):
+        if len(batch) == 0:
+            return
+        write_batch = self._get_write_batch()
+        if write_batch is None:
+            self.logger.error(f"Could not write batch of {len(batch)} items: The owner of the writer has been discarded")
+            return
+        try:
+            write_batch(batch)
+        except Exception as e:
+            self.logger.error(f"Could not write batch of {len(batch)} items: {e=}")
@@ -1,143 +1,250 @@
+import json
+import operator
 import threading
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-import sqlite3
+from typing import Dict, Any, Optional, List, Tuple, BinaryIO, Iterator
 
+from wattson.util.persistence_drivers.batch_writer import BatchWriter
 from wattson.util.persistence_drivers.persistence_driver import PersistenceDriver
 
 
 class JSONLDriver(PersistenceDriver):
-    def __init__(self, clear: bool = False, db_path: Optional[Path] = None):
+    """
+    Persists entries as append-only JSON lines, using one file per domain.
+    Inserts are queued and appended by a background thread in batches.
+    For indexed keys, the byte offsets of all entries are kept per value, such that equality searches on these keys
+    only read the matching lines. Deletes rewrite the domain's file.
+    """
+    _OPERATORS = {
+        "=": operator.eq,
+        "==": operator.eq,
+        "!=": operator.ne,
+        "<>": operator.ne,
+        "<": operator.lt,
+        "<=": operator.le,
+        ">": operator.gt,
+        ">=": operator.ge,
+    }
+
+    def __init__(self, clear: bool = False, db_path: Optional[Path] = None, batch_size: int = 500, flush_interval: float = 0.5):
         if db_path is None:
             self._db_base = Path(".").joinpath("persistence")
         else:
             self._db_base = db_path
         self._db_base.mkdir(exist_ok=True, parents=True)
-        self._lock = threading.Lock()
+        self._lock = threading.RLock()
+        self._files: Dict[str, BinaryIO] = {}
+        # domain -> key -> value -> byte offsets
+        self._indices: Dict[str, Dict[str, Dict[Any, List[int]]]] = {}
         super().__init__(clear)
-        self._max_files = 10000
+        self._writer = BatchWriter(self._write_batch, batch_size=batch_size, flush_interval=flush_interval,
+                                   name="W/JSONL")
 
     def __del__(self):
-        try:
-            with self._lock:
-                self._cursor.close()
-                self._connection.close()
-        except Exception as e:
-            print(f"Failed to shutdown SQLite: {e=}")
+        self.close()
 
-    @staticmethod
-    def _row_factory(cursor, row):
-        d = {}
-        for idx, col in enumerate(cursor.description):
-            d[col[0]] = row[idx]
-        return d
+    def _get_domain_file(self, domain: str) -> Path:
+        return self._db_base.joinpath(f"{domain}.jsonl")
 
-    def _connect(self):
-        try:
-            self._connection = sqlite3.connect(self._db_base, check_same_thread=False)
-            self._connection.row_factory = self._row_factory
-            self._cursor = self._connection.cursor()
-        except Exception as e:
-            print(f"Could not connect SQLite: {e=}")
+    def _get_handle(self, domain: str) -> BinaryIO:
+        handle = self._files.get(domain)
+        if handle is None:
+            handle = self._get_domain_file(domain).open("ab")
+            self._files[domain] = handle
+        return handle
 
-    def create_domain(self, domain: str, keys: List[str]):
+    def close(self):
         try:
+            self._writer.stop()
             with self._lock:
-                self._cursor.execute(f"CREATE TABLE IF NOT EXISTS {domain} ({', '.join(keys)})")
-                self._connection.commit()
+                for handle in self._files.values():
+                    handle.close()
+                self._files.clear()
         except Exception as e:
-            print(f"Could create SQLite domain: {e=}")
+            print(f"Failed to shutdown JSONL: {e=}")
 
-    def store(self, domain: str, values: Dict[str, Any]):
-        try:
-            sql_keys = []
-            sql_values = []
-            sql_placeholders = []
-            for key, value in values.items():
-                sql_keys.append(key)
-                sql_values.append(value)
-                sql_placeholders.append("?")
+    def flush(self):
+        self._writer.flush()
 
+    def create_domain(self, domain: str, keys: List[str], indices: Optional[List[str]] = None):
+        try:
             with self._lock:
-                self._cursor.execute(f"INSERT INTO {domain} ({', '.join(sql_keys)}) VALUES ({', '.join(sql_placeholders)})", sql_values)
-                self._connection.commit()
+                self._get_handle(domain)
+                if indices is not None and len(indices) > 0:
+                    self._indices[domain] = {key: {} for key in indices}
+                    self._rebuild_indices(domain)
         except Exception as e:
-            print(f"Could not store SQLite: {e=}")
+            print(f"Could create JSONL domain: {e=}")
+
+    def _rebuild_indices(self, domain: str):
+        indices = self._indices.get(domain)
+        if indices is None:
+            return
+        for index in indices.values():
+            index.clear()
+        for offset, row in self._read_rows(domain):
+            self._index_row(domain, offset, row)
+
+    def _index_row(self, domain: str, offset: int, row: Dict[str, Any]):
+        for key, index in self._indices.get(domain, {}).items():
+            value = row.get(key)
+            if isinstance(value, (list, dict)):
+                continue
+            index.setdefault(value, []).append(offset)
+
+    def store(self, domain: str, values: Dict[str, Any]):
+        entry = (domain, values)
+        if self._writer.is_running:
+            self._writer.put(entry)
+        else:
+            self._write_batch([entry])
+
+    def _write_batch(self, entries: List[Tuple[str, Dict[str, Any]]]):
+        with self._lock:
+            touched = set()
+            for domain, values in entries:
+                try:
+                    line = json.dumps(values, default=str).encode("utf-8") + b"\n"
+                except Exception as e:
+                    print(f"Could not store JSONL: {e=}")
+                    continue
+                handle = self._get_handle(domain)
+                offset = handle.tell()
+                handle.write(line)
+                self._index_row(domain, offset, values)
+                touched.add(domain)
+            for domain in touched:
+                self._files[domain].flush()
+
+    def _read_rows(self, domain: str, offsets: Optional[List[int]] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        file = self._get_domain_file(domain)
+        if not file.exists():
+            return
+        with file.open("rb") as f:
+            if offsets is None:
+                offset = 0
+                for line in f:
+                    if line.strip():
+                        yield offset, json.loads(line)
+                    offset += len(line)
+            else:
+                for offset in sorted(offsets):
+                    f.seek(offset)
+                    yield offset, json.loads(f.readline())
+
+    def _get_matcher(self, search: Optional[Dict[str, Any]]):
+        conditions = []
+        for key, config in (search or {}).items():
+            if isinstance(config, dict):
+                op = config.get("op", "=")
+                value = config["value"]
+            else:
+                op = "="
+                value = config
+            if op not in JSONLDriver._OPERATORS:
+                raise ValueError(f"Unsupported operator {op}")
+            conditions.append((key, JSONLDriver._OPERATORS[op], value))
+
+        def matches(row: Dict[str, Any]) -> bool:
+            for _key, _op, _value in conditions:
+                try:
+                    if not _op(row.get(_key), _value):
+                        return False
+                except TypeError:
+                    return False
+            return True
+        return matches
+
+    def _get_candidate_offsets(self, domain: str, search: Optional[Dict[str, Any]]) -> Optional[List[int]]:
+        """
+        Returns the offsets of the entries that can match the search based on the indexed keys,
+        or None if no index is applicable.
+        """
+        candidates = None
+        indices = self._indices.get(domain, {})
+        for key, config in (search or {}).items():
+            if key not in indices:
+                continue
+            if isinstance(config, dict):
+                if config.get("op", "=") not in ["=", "=="]:
+                    continue
+                value = config["value"]
+            else:
+                value = config
+            offsets = indices[key].get(value, [])
+            if candidates is None or len(offsets) < len(candidates):
+                candidates = offsets
+        return None if candidates is None else list(candidates)
+
+    def _select(self, domain: str, search: Optional[Dict[str, Any]], order: Optional[Dict[str, str]],
+                limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        self.flush()
+        matches = self._get_matcher(search)
+        with self._lock:
+            offsets = self._get_candidate_offsets(domain, search)
+            rows = [row for _, row in self._read_rows(domain, offsets) if matches(row)]
+        if order is not None and len(order) > 0:
+            for col, direction in reversed(list(order.items())):
+                rows.sort(key=lambda row: (row.get(col) is None, row.get(col)), reverse=direction.upper() == "DESC")
+        if limit is not None:
+            rows = rows[:limit]
+        return rows
 
     def delete(self, domain: str, search: Dict[str, Any]):
+        self.flush()
         try:
+            matches = self._get_matcher(search)
             with self._lock:
-                where, where_data = self._build_where_clause(search=search, empty_query="WHERE 1")
-                query = f"DELETE FROM {domain} {where}"
-                self._cursor.execute(query, where_data)
+                file = self._get_domain_file(domain)
+                if not file.exists():
+                    return True
+                handle = self._files.pop(domain, None)
+                if handle is not None:
+                    handle.close()
+                temporary_file = file.with_suffix(".jsonl.tmp")
+                with temporary_file.open("wb") as f:
+                    for _, row in self._read_rows(domain):
+                        if not matches(row):
+                            f.write(json.dumps(row).encode("utf-8") + b"\n")
+                temporary_file.replace(file)
+                self._rebuild_indices(domain)
                 return True
         except Exception as e:
-            print(f"Could not search SQLite: {e=}")
+            print(f"Could not delete JSONL: {e=}")
             return False
 
-    def _build_where_clause(self, search: Dict[str, Any], empty_query: str = ""):
-        where = empty_query
-        data = []
-        if search is not None and len(search) > 0:
-            where = " WHERE "
-            wheres = []
-            for key, config in search.items():
-                if isinstance(config, dict):
-                    op = config.get("op", "=")
-                    value = config["value"]
-                else:
-                    op = "="
-                    value = config
-                data.append(value)
-                wheres.append(f"{key} {op} ?")
-            where += ' AND '.join(wheres)
-        return where, data
-
-    def _build_select_query(self, domain: str, search: Dict[str, Any], order: Optional[Dict[str, str]], limit: Optional[int] = None):
-        orderBy = ""
-        if order is not None and len(order) > 0:
-            orderBy = " ORDER BY "
-            orderBy += ", ".join([f"{col} {direction}" for col, direction in order.items()])
-
-        where, where_data = self._build_where_clause(search=search, empty_query="")
-
-        if limit is None:
-            limit = ""
-        else:
-            limit = f"LIMIT {limit}"
-
-        query = f"SELECT * FROM {domain} {where} {orderBy} {limit}"
-        return query, where_data
-
     def get_all(self, domain: str, order: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
         try:
             return self.search(domain, {}, order)
         except Exception as e:
-            print(f"Could not get_all SQLite: {e=}")
+            print(f"Could not get_all JSONL: {e=}")
             return []
 
     def search(self, domain: str, search: Dict[str, Any], order: Optional[Dict[str, str]]) -> List[Dict[str, Any]]:
         try:
-            with self._lock:
-                query, data = self._build_select_query(domain, search, order)
-                self._cursor.execute(query, data)
-                return self._cursor.fetchall()
+            return self._select(domain, search, order)
         except Exception as e:
-            print(f"Could not search SQLite: {e=}")
+            print(f"Could not search JSONL: {e=}")
             return []
 
     def get_one(self, domain: str, search: Dict[str, Any], order: Optional[Dict[str, str]]) -> Optional[Dict[str, Any]]:
         try:
-            with self._lock:
-                query, data = self._build_select_query(domain, search, order, 1)
-                self._cursor.execute(query, data)
-                return self._cursor.fetchone()
+            rows = self._select(domain, search, order, 1)
+            return rows[0] if len(rows) > 0 else None
         except Exception as e:
-            print(f"Could not get_one SQLite: {e=}")
+            print(f"Could not get_one JSONL: {e=}")
             return None
 
     def clear(self):
         try:
-            self._db_base.unlink(missing_ok=True)
+            with self._lock:
+                for handle in self._files.values():
+                    handle.close()
+                self._files.clear()
+                for file in self._db_base.glob("*.jsonl"):
+                    file.unlink(missing_ok=True)
+                for index in self._indices.values():
+                    for values in index.values():
+                        values.clear()
         except Exception as e:
-            print(f"Could not clear SQLite: {e=}")
+            print(f"Could not clear JSONL: {e=}")
@@ -34,3 +34,15 @@ class PersistenceDriver(abc.ABC):
     @abc.abstractmethod
     def clear(self):
         pass
+
+    def flush(self):
+        """
+        Blocks until all stored entries have been persisted.
+        """
+        pass
+
+    def close(self):
+        """
+        Persists all pending entries and releases the underlying resources.
+        """
+        pass
@@ -1,13 +1,22 @@
+import itertools
 import threading
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 import sqlite3
 
+from wattson.util.persistence_drivers.batch_writer import BatchWriter
 from wattson.util.persistence_drivers.persistence_driver import PersistenceDriver
 
 
 class SQLiteDriver(PersistenceDriver):
-    def __init__(self, clear: bool = False, db_path: Optional[Path] = None):
+    """
+    Persists entries in an SQLite database in WAL journal mode.
+    Inserts are queued and written by a background thread in batches, each batch being a single transaction.
+    If a batch fails, its inserts are retried per domain and columns, and then per row, such that only the failing
+    rows are dropped.
+    Reads and deletes first wait for all queued inserts to be written.
+    """
+    def __init__(self, clear: bool = False, db_path: Optional[Path] = None, batch_size: int = 500, flush_interval: float = 0.5):
         if db_path is None:
             self._db_file = Path("sqlite.db")
         else:
@@ -16,15 +25,13 @@ class SQLiteDriver(PersistenceDriver):
         super().__init__(clear)
         self._connection: Optional[sqlite3.Connection] = None
         self._cursor: Optional[sqlite3.Cursor] = None
+        self._insert_queries: Dict[Tuple[str, Tuple[str, ...]], str] = {}
         self._connect()
+        self._writer = BatchWriter(self._write_batch, batch_size=batch_size, flush_interval=flush_interval,
+                                   name="W/SQLite")
 
     def __del__(self):
-        try:
-            with self._lock:
-                self._cursor.close()
-                self._connection.close()
-        except Exception as e:
-            print(f"Failed to shutdown SQLite: {e=}")
+        self.close()
 
     @staticmethod
     def _row_factory(cursor, row):
@@ -35,64 +42,104 @@ class SQLiteDriver(PersistenceDriver):
 
     def _connect(self):
         try:
-            self._connection = sqlite3.connect(self._db_file, check_same_thread=False)
+            self._connection = sqlite3.connect(self._db_file, check_same_thread=False, cached_statements=256)
             self._connection.row_factory = self._row_factory
             self._cursor = self._connection.cursor()
+            self._cursor.execute("PRAGMA journal_mode=WAL")
+            self._cursor.execute("PRAGMA synchronous=NORMAL")
         except Exception as e:
             print(f"Could not connect SQLite: {e=}")
 
+    def close(self):
+        try:
+            self._writer.stop()
+            with self._lock:
+                if self._connection is not None:
+                    self._cursor.close()
+                    self._connection.close()
+                    self._connection = None
+        except Exception as e:
+            print(f"Failed to shutdown SQLite: {e=}")
+
+    def flush(self):
+        self._writer.flush()
+
     def create_domain(self, domain: str, keys: List[str], indices: Optional[List[str]] = None):
         try:
             with self._lock:
                 self._cursor.execute(f"CREATE TABLE IF NOT EXISTS {domain} ({', '.join(keys)})")
-                for key in indices:
-                    if not self._check_if_index_exists(domain, key):
-                        index_name = f"{domain}_{key}_index"
-                        self._cursor.execute(f"CREATE INDEX {index_name} ON {domain} ({key})")
+                for key in indices or []:
+                    index_name = f"{domain}_{key}_index"
+                    self._cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {domain} ({key})")
                 self._connection.commit()
         except Exception as e:
             print(f"Could create SQLite domain: {e=}")
 
-    def _check_if_index_exists(self, domain: str, index_key: str):
-        index_name = f"{domain}_{index_key}_index"
-        try:
-            with self._lock:
-                self._cursor.execute(
-                    f"SELECT COUNT(1) IndexIsThere FROM INFORMATION_SCHEMA.STATISTICS WHERE table_schema=DATABASE() AND table_name=? AND index_name=?",
-                    [domain, index_name]
-                )
-                result = self._cursor.fetchone()
-                print(f"{repr(result)}")
-                return result["IndexIsThere"] > 0
-        except Exception as e:
-            print(f"Could not query indices: {e=}")
-        return False
+    def _get_insert_query(self, domain: str, keys: Tuple[str, ...]) -> str:
+        """
+        Returns the (cached) insert statement for the given domain and columns.
+        As the statement text is stable, SQLite reuses the prepared statement.
+        """
+        query = self._insert_queries.get((domain, keys))
+        if query is None:
+            query = f"INSERT INTO {domain} ({', '.join(keys)}) VALUES ({', '.join(['?'] * len(keys))})"
+            self._insert_queries[(domain, keys)] = query
+        return query
 
     def store(self, domain: str, values: Dict[str, Any]):
-        try:
-            sql_keys = []
-            sql_values = []
-            sql_placeholders = []
-            for key, value in values.items():
-                sql_keys.append(key)
-                sql_values.append(value)
-                sql_placeholders.append("?")
-
-            with self._lock:
-                self._cursor.execute(f"INSERT INTO {domain} ({', '.join(sql_keys)}) VALUES ({', '.join(sql_placeholders)})", sql_values)
+        keys = tuple(values.keys())
+        entry = (domain, keys, tuple(values.values()))
+        if self._writer.is_running:
+            self._writer.put(entry)
+        else:
+            try:
+                self._write_batch([entry])
+            except Exception as e:
+                self._writer.logger.error(f"Could not store SQLite: {e=}")
+
+    def _write_batch(self, entries: List[Tuple[str, Tuple[str, ...], Tuple]]):
+        groups = [(domain, keys, [entry[2] for entry in group])
+                  for (domain, keys), group in itertools.groupby(entries, key=lambda entry: (entry[0], entry[1]))]
+        with self._lock:
+            try:
+                for domain, keys, rows in groups:
+                    self._cursor.executemany(self._get_insert_query(domain, keys), rows)
                 self._connection.commit()
-        except Exception as e:
-            print(f"Could not store SQLite: {e=}")
+                return
+            except Exception:
+                self._connection.rollback()
+            # Retry per group and per row of failing groups to only drop the failing rows
+            failed = 0
+            error = None
+            for domain, keys, rows in groups:
+                query = self._get_insert_query(domain, keys)
+                try:
+                    self._cursor.executemany(query, rows)
+                    self._connection.commit()
+                    continue
+                except Exception:
+                    self._connection.rollback()
+                for row in rows:
+                    try:
+                        self._cursor.execute(query, row)
+                    except Exception as e:
+                        failed += 1
+                        error = e
+                self._connection.commit()
+        if error is not None:
+            raise RuntimeError(f"Could not store {failed} of {len(entries)} SQLite rows: {error}") from error
 
     def delete(self, domain: str, search: Dict[str, Any]):
+        self.flush()
         try:
             with self._lock:
                 where, where_data = self._build_where_clause(search=search, empty_query="WHERE 1")
                 query = f"DELETE FROM {domain} {where}"
                 self._cursor.execute(query, where_data)
+                self._connection.commit()
                 return True
         except Exception as e:
-            print(f"Could not search SQLite: {e=}")
+            print(f"Could not delete SQLite: {e=}")
             return False
 
     def _build_where_clause(self, search: Dict[str, Any], empty_query: str = ""):
@@ -137,6 +184,7 @@ class SQLiteDriver(PersistenceDriver):
             return []
 
     def search(self, domain: str, search: Dict[str, Any], order: Optional[Dict[str, str]]) -> List[Dict[str, Any]]:
+        self.flush()
         try:
             with self._lock:
                 query, data = self._build_select_query(domain, search, order)
@@ -147,6 +195,7 @@ class SQLiteDriver(PersistenceDriver):
             return []
 
     def get_one(self, domain: str, search: Dict[str, Any], order: Optional[Dict[str, str]]) -> Optional[Dict[str, Any]]:
+        self.flush()
         try:
             with self._lock:
                 query, data = self._build_select_query(domain, search, order, 1)
@@ -159,5 +208,8 @@ class SQLiteDriver(PersistenceDriver):
     def clear(self):
         try:
             self._db_file.unlink(missing_ok=True)
+            # Write-ahead log and shared memory file of the WAL mode
+            Path(f"{self._db_file}-wal").unlink(missing_ok=True)
+            Path(f"{self._db_file}-shm").unlink(missing_ok=True)
         except Exception as e:
             print(f"Could not clear SQLite: {e=}")
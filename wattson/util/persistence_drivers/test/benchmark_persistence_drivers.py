@@ -0,0 +1,60 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from wattson.util.persistence_drivers.jsonl_driver import JSONLDriver
+from wattson.util.persistence_drivers.persistence_driver import PersistenceDriver
+from wattson.util.persistence_drivers.sqlite_driver import SQLiteDriver
+
+
+def run(driver: PersistenceDriver, entry_count: int) -> dict:
+    """
+    Stores entry_count entries in a single domain and measures the insert throughput (including the time to
+    persist all pending entries) as well as the time of an indexed and a non-indexed search.
+    """
+    driver.create_domain("events", ["timestamp", "source", "value"], indices=["source"])
+    start = time.perf_counter()
+    for i in range(entry_count):
+        driver.store("events", {"timestamp": i, "source": f"source-{i % 100}", "value": i * 0.5})
+    driver.flush()
+    insert_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    indexed_results = driver.search("events", {"source": "source-42"}, None)
+    indexed_search_duration = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scan_results = driver.search("events", {"value": {"op": ">=", "value": entry_count * 0.25}}, None)
+    scan_search_duration = time.perf_counter() - start
+
+    driver.close()
+    return {
+        "inserts_per_second": entry_count / insert_duration,
+        "indexed_search_ms": indexed_search_duration * 1000,
+        "indexed_search_results": len(indexed_results),
+        "scan_search_ms": scan_search_duration * 1000,
+        "scan_search_results": len(scan_results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser("Compares the insert throughput of the persistence drivers")
+    parser.add_argument("--entries", type=int, default=100000, help="Number of entries to insert")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        drivers = {
+            "sqlite": SQLiteDriver(clear=True, db_path=directory.joinpath("benchmark.db")),
+            "jsonl": JSONLDriver(clear=True, db_path=directory.joinpath("jsonl")),
+        }
+        for name, driver in drivers.items():
+            statistics = run(driver, args.entries)
+            print(f"{name} ({args.entries} entries)")
+            for key, value in statistics.items():
+                print(f"   {key.ljust(25)} {value:.1f}" if isinstance(value, float) else f"   {key.ljust(25)} {value}")
+
+
+if __name__ == "__main__":
+    main()
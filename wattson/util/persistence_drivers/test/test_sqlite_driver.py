@@ -0,0 +1,34 @@
+import gc
+
+from wattson.util.persistence_drivers.sqlite_driver import SQLiteDriver
+
+
+def test_failing_rows_do_not_drop_batch(tmp_path):
+    driver = SQLiteDriver(db_path=tmp_path.joinpath("sqlite.db"), batch_size=100, flush_interval=10)
+    driver.create_domain("events", ["timestamp", "value"])
+    for i in range(10):
+        driver.store("events", {"timestamp": i, "value": i})
+    driver.store("events", {"timestamp": 10, "unknown": 10})
+    for i in range(11, 14):
+        driver.store("events", {"timestamp": i, "value": i})
+    driver.flush()
+
+    rows = driver.get_all("events", {"timestamp": "ASC"})
+    assert [row["timestamp"] for row in rows] == [i for i in range(14) if i != 10]
+    driver.close()
+
+
+def test_discarded_driver_writes_pending_rows(tmp_path):
+    db_file = tmp_path.joinpath("sqlite.db")
+    driver = SQLiteDriver(db_path=db_file, batch_size=100, flush_interval=10)
+    driver.create_domain("events", ["timestamp"])
+    for i in range(5):
+        driver.store("events", {"timestamp": i})
+    writer = driver._writer
+    del driver
+    gc.collect()
+    assert not writer.is_running
+
+    driver = SQLiteDriver(db_path=db_file)
+    assert len(driver.get_all("events")) == 5
+    driver.close()